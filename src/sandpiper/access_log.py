@@ -0,0 +1,70 @@
+"""アクセスログ用のASGIミドルウェア
+
+レスポンスボディを読み切らずに、送信されるメッセージを横から観察して
+メソッド・パス・ステータス・バイト数・処理時間を1行のJSONで出力する。
+ストリーミングレスポンスもそのまま流れる。
+
+ボディの記録はデバッグ用のオプトインで、先頭 body_limit バイトまでしか保持しない。
+"""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BODY_LIMIT = 2048
+
+
+class AccessLogMiddleware:
+    """構造化アクセスログを出力するピュアASGIミドルウェア"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capture_body: bool = False,
+        body_limit: int = DEFAULT_BODY_LIMIT,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.app = app
+        self.capture_body = capture_body
+        self.body_limit = body_limit
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code: int | None = None
+        byte_count = 0
+        captured = bytearray()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, byte_count
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                chunk: bytes = message.get("body", b"")
+                byte_count += len(chunk)
+                if self.capture_body and len(captured) < self.body_limit:
+                    captured.extend(chunk[: self.body_limit - len(captured)])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record: dict[str, Any] = {
+                "method": scope["method"],
+                "path": scope["path"],
+                # レスポンス開始前に例外が発生した場合は500として記録する
+                "status": status_code if status_code is not None else 500,
+                "bytes": byte_count,
+                "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            }
+            if self.capture_body:
+                record["body"] = captured.decode("utf-8", errors="replace")
+                record["body_truncated"] = byte_count > len(captured)
+            self.log(json.dumps(record, ensure_ascii=False))
@@ -1,25 +1,35 @@
 """FastAPIアプリケーション"""
 
-import json
 import os
-from collections.abc import AsyncIterator, Awaitable, Callable
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.responses import Response, StreamingResponse
 
+from sandpiper.access_log import DEFAULT_BODY_LIMIT, AccessLogMiddleware
 from sandpiper.app.app import bootstrap
+from sandpiper.routers.notion import build_webhook_job_handlers
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
+from sandpiper.shared.infrastructure.sqlite_job_queue import JobWorkerPool, SqliteJobQueue
+from sandpiper.shared.infrastructure.webhook_deduplicator import DEFAULT_TTL_SECONDS, WebhookDeduplicator
+from sandpiper.shared.utils.data_dir import data_dir
 
 from . import __version__
-from .routers import embed, health, maintenance, notion, recipe
+from .routers import embed, health, jobs, maintenance, notion, recipe
 
 # 環境設定
 ENVIRONMENT = os.getenv("ENVIRONMENT", "production")  # デフォルトは本番環境
 DEBUG = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "").split(",") if os.getenv("ALLOWED_ORIGINS") else []
+ACCESS_LOG_CAPTURE_BODY = os.getenv("ACCESS_LOG_CAPTURE_BODY", "false").lower() in ("true", "1", "yes")
+ACCESS_LOG_BODY_LIMIT = int(os.getenv("ACCESS_LOG_BODY_LIMIT", str(DEFAULT_BODY_LIMIT)))
+WEBHOOK_JOB_WORKERS = int(os.getenv("WEBHOOK_JOB_WORKERS", "4"))
+WEBHOOK_JOB_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_JOB_MAX_ATTEMPTS", "5"))
+WEBHOOK_JOB_DB_PATH = os.getenv("WEBHOOK_JOB_DB_PATH")
+WEBHOOK_DEDUP_TTL_SECONDS = float(os.getenv("WEBHOOK_DEDUP_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
 
 # 開発環境判定
 IS_DEVELOPMENT = ENVIRONMENT.lower() in ("development", "dev", "local") or DEBUG
@@ -41,6 +51,27 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     app.state.sandpiper_app = bootstrap()
     print("Sandpiperアプリケーションの初期化が完了しました")
 
+    # 永続化されたタスク終了通知のタイマーを再登録して発火させる
+    task_end_scheduler = app.state.sandpiper_app.task_end_scheduler
+    if task_end_scheduler is not None:
+        task_end_scheduler.start()
+
+    # Webhookのジョブキュー(プロセスが再起動しても未完了のジョブは再開される)
+    job_queue = SqliteJobQueue(
+        path=WEBHOOK_JOB_DB_PATH or data_dir() / "webhook_jobs.sqlite3",
+        max_attempts=WEBHOOK_JOB_MAX_ATTEMPTS,
+    )
+    job_worker_pool = JobWorkerPool(
+        queue=job_queue,
+        handlers=build_webhook_job_handlers(app.state.sandpiper_app),
+        workers=WEBHOOK_JOB_WORKERS,
+    )
+    job_worker_pool.start()
+    app.state.job_worker_pool = job_worker_pool
+    # 同じWebhookの重複配信(オートメーションの多重送信やボタンの二度押し)を捨てる
+    app.state.webhook_deduplicator = WebhookDeduplicator(ttl_seconds=WEBHOOK_DEDUP_TTL_SECONDS)
+    print(f"Webhookジョブワーカーを起動しました(ワーカー数: {WEBHOOK_JOB_WORKERS})")
+
     # yieldは非同期コンテキストマネージャーの境界線
     # yieldより前: アプリケーション起動時に1回だけ実行される処理(初期化)
     # yieldより後: アプリケーション終了時に1回だけ実行される処理(クリーンアップ)
@@ -48,6 +79,11 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     yield
 
     # 終了時の処理
+    job_worker_pool.stop()
+    job_queue.close()
+    if task_end_scheduler is not None:
+        task_end_scheduler.stop()
+    await AsyncNotionGateway.close_instance()
     print("👋 FastAPIアプリケーション終了")
 
 
@@ -88,37 +124,12 @@ else:
     )
 
 
-# レスポンスログ出力ミドルウェア
-@app.middleware("http")
-async def log_response(request: Request, call_next: Callable[[Request], Awaitable[StreamingResponse]]) -> Response:
-    """レスポンスをログ出力するミドルウェア"""
-    response: StreamingResponse = await call_next(request)
-
-    # レスポンスボディを取得
-    body_bytes = b""
-    async for chunk in response.body_iterator:
-        if isinstance(chunk, bytes):
-            body_bytes += chunk
-        elif isinstance(chunk, str):
-            body_bytes += chunk.encode()
-        else:
-            body_bytes += bytes(chunk)
-
-    # ログ出力
-    print(f"📤 Response: {request.method} {request.url.path} -> {response.status_code}")
-    try:
-        body_dict = json.loads(body_bytes)
-        print(json.dumps(body_dict, ensure_ascii=False, indent=2))
-    except Exception:
-        print(body_bytes.decode())
-
-    # 新しいレスポンスを作成して返却
-    return Response(
-        content=body_bytes,
-        status_code=response.status_code,
-        headers=dict(response.headers),
-        media_type=response.media_type,
-    )
+# アクセスログ出力ミドルウェア(ボディの記録はデバッグ用のオプトイン)
+app.add_middleware(
+    AccessLogMiddleware,
+    capture_body=ACCESS_LOG_CAPTURE_BODY,
+    body_limit=ACCESS_LOG_BODY_LIMIT,
+)
 
 
 @app.get("/", tags=["Root"])
@@ -141,3 +152,4 @@ app.include_router(notion.router, prefix="/api", tags=["Notion"])
 app.include_router(maintenance.router, prefix="/api", tags=["Maintenance"])
 app.include_router(recipe.router, prefix="/api", tags=["Recipe"])
 app.include_router(embed.router, prefix="/api", tags=["Embed"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
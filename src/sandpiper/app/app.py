@@ -3,10 +3,13 @@ from sandpiper.app.handlers.handle_special_todo import HandleSpecialTodo
 from sandpiper.app.message_dispatcher import MessageDispatcher
 from sandpiper.calendar.application.create_calendar_event import CreateCalendarEvent
 from sandpiper.calendar.application.delete_calendar_events import DeleteCalendarEvents
-from sandpiper.calendar.infrastructure.notion_calendar_repository import NotionCalendarRepository
+from sandpiper.calendar.infrastructure.notion_calendar_repository import (
+    AsyncNotionCalendarRepository,
+    NotionCalendarRepository,
+)
 from sandpiper.clips.application.create_clip import CreateClip
 from sandpiper.clips.application.list_unprocessed_clips import ListUnprocessedClips
-from sandpiper.clips.infrastructure.notion_clips_repository import NotionClipsRepository
+from sandpiper.clips.infrastructure.notion_clips_repository import AsyncNotionClipsRepository, NotionClipsRepository
 from sandpiper.clips.query.clips_query import NotionClipsQuery
 from sandpiper.obsidian.application.list_obsidian_notes import ListObsidianNotes
 from sandpiper.obsidian.query.obsidian_query import NotionObsidianQuery
@@ -16,7 +19,10 @@ from sandpiper.perform.application.handle_todo_created import HandleTodoCreated
 from sandpiper.perform.application.handle_todo_started import HandleTodoStarted
 from sandpiper.perform.application.mark_remaining_todos_as_today import MarkRemainingTodosAsToday
 from sandpiper.perform.application.override_section_by_schedule import OverrideSectionBySchedule
-from sandpiper.perform.application.schedule_task_end_notification import ScheduleTaskEndNotification
+from sandpiper.perform.application.schedule_task_end_notification import (
+    CancelTaskEndNotification,
+    ScheduleTaskEndNotification,
+)
 from sandpiper.perform.application.start_todo import StartTodo
 from sandpiper.perform.infrastructure.notion_todo_repository import NotionTodoRepository as PerformNotionTodoRepository
 from sandpiper.perform.query.incidental_task_query import NotionIncidentalTaskQuery
@@ -54,11 +60,19 @@ from sandpiper.shared.event.todo_completed import TodoCompleted
 from sandpiper.shared.event.todo_created import TodoCreated
 from sandpiper.shared.event.todo_started import TodoStarted
 from sandpiper.shared.infrastructure.archive_deleted_pages import ArchiveDeletedPages
-from sandpiper.shared.infrastructure.archive_old_todos import ArchiveOldTodos
-from sandpiper.shared.infrastructure.event_bus import EventBus
+from sandpiper.shared.infrastructure.archive_old_todos import ArchiveJournal, ArchiveOldTodos
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
+from sandpiper.shared.infrastructure.event_bus import DispatchMode, EventBus
 from sandpiper.shared.infrastructure.github_client import GitHubClient
+from sandpiper.shared.infrastructure.http_etag_cache import HttpEtagCache
+from sandpiper.shared.infrastructure.jira_issue_cache import JiraIssueCache
 from sandpiper.shared.infrastructure.notion_commentator import NotionCommentator
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
+from sandpiper.shared.infrastructure.notion_project_directory import NotionProjectDirectory
+from sandpiper.shared.infrastructure.persistent_timer_scheduler import PersistentTimerScheduler
 from sandpiper.shared.infrastructure.slack_notice_messanger import SlackNoticeMessanger
+from sandpiper.shared.utils.data_dir import data_dir
 from sandpiper.taste.application.add_taste import AddTaste
 from sandpiper.taste.application.list_taste import ListTaste
 from sandpiper.taste.infrastructure.notion_taste_repository import NotionTasteRepository
@@ -96,6 +110,7 @@ class SandPiperApp:
         list_obsidian_notes: ListObsidianNotes,
         add_taste: AddTaste,
         list_taste: ListTaste,
+        task_end_scheduler: PersistentTimerScheduler | None = None,
     ) -> None:
         self.create_todo = create_todo
         self.create_project = create_project
@@ -126,26 +141,37 @@ class SandPiperApp:
         self.list_obsidian_notes = list_obsidian_notes
         self.add_taste = add_taste
         self.list_taste = list_taste
+        # タスク終了通知のタイマー。発火させるのは start() したプロセス(APIサーバー)だけ
+        self.task_end_scheduler = task_end_scheduler
 
 
 def bootstrap() -> SandPiperApp:
-    event_bus = EventBus()
+    # ハンドラーは同時に実行し、1つの失敗・遅延が発行元や他のハンドラーに波及しないようにする
+    event_bus = EventBus(mode=DispatchMode.CONCURRENT, handler_timeout=30.0)
 
     # infrastructure setup
-    project_task_query = NotionProjectTaskQuery()
+    # 明日のTODOリスト作成など、1回の実行で同じデータベースを何度も読む処理で共有する
+    notion_snapshot = NotionDatabaseSnapshot()
+    # APIのasyncルートから使う非同期ゲートウェイ(コネクションプールはプロセス全体で共有)
+    notion_gateway = AsyncNotionGateway.get_instance()
+    # 読み込み専用のクエリは、差分同期するローカルレプリカから読む
+    notion_replica = NotionDatabaseReplica.get_instance()
+    # プロジェクト一覧はプロジェクトタスクのクエリ・整理・Jira同期で共有する
+    project_directory = NotionProjectDirectory(replica=notion_replica)
+    project_task_query = NotionProjectTaskQuery(replica=notion_replica, project_directory=project_directory)
     project_task_repository = NotionProjectTaskRepository()
-    todo_query = NotionTodoQuery()
+    todo_query = NotionTodoQuery(replica=notion_replica)
     calendar_query = NotionCalendarQuery()
-    plan_notion_todo_repository = PlanNotionTodoRepository()
-    perform_notion_todo_repository = PerformNotionTodoRepository()
-    routine_repository = NotionRoutineRepository()
-    project_repository = NotionProjectRepository()
+    plan_notion_todo_repository = PlanNotionTodoRepository(snapshot=notion_snapshot)
+    perform_notion_todo_repository = PerformNotionTodoRepository(snapshot=notion_snapshot, replica=notion_replica)
+    routine_repository = NotionRoutineRepository(replica=notion_replica)
+    project_repository = NotionProjectRepository(project_directory=project_directory)
     calendar_repository = NotionCalendarRepository()
     default_notice_messanger = SlackNoticeMessanger(channel_id="C04Q3AV4TA5")
     commentator = NotionCommentator()
 
     # GitHub integration setup
-    github_client = GitHubClient()
+    github_client = GitHubClient(etag_cache=HttpEtagCache.get_instance())
     github_activity_query = GitHubActivityQuery(github_client)
 
     # Recipe integration setup
@@ -158,18 +184,26 @@ def bootstrap() -> SandPiperApp:
     # Subscribe event handlers
     handle_todo_created = HandleTodoCreated(perform_notion_todo_repository)
     event_bus.subscribe(TodoCreated, handle_todo_created)
-    incidental_task_query = NotionIncidentalTaskQuery()
+    incidental_task_query = NotionIncidentalTaskQuery(replica=notion_replica)
     handle_todo_started = HandleTodoStarted(
         incidental_task_query=incidental_task_query,
         slack_messanger=default_notice_messanger,
     )
-    event_bus.subscribe(TodoStarted, handle_todo_started)
+    # Slack通知のみで結果を使わないので、完了を待たずに開始処理から戻る
+    event_bus.subscribe(TodoStarted, handle_todo_started, background=True)
+    task_end_scheduler = PersistentTimerScheduler(
+        path=data_dir(create=False) / "task_end_timers.sqlite3",
+        handler=default_notice_messanger.send,
+    )
     schedule_task_end_notification = ScheduleTaskEndNotification(
         slack_messanger=default_notice_messanger,
+        scheduler=task_end_scheduler,
     )
     event_bus.subscribe(TodoStarted, schedule_task_end_notification)
+    event_bus.subscribe(TodoCompleted, CancelTaskEndNotification(task_end_scheduler))
     handle_todo_completed = HandleCompletedTask(plan_notion_todo_repository, default_notice_messanger, commentator)
-    event_bus.subscribe(TodoCompleted, handle_todo_completed)
+    # 次のTODO作成・Slack通知・コメントは完了処理の結果に影響しないので、完了を待たずに戻る
+    event_bus.subscribe(TodoCompleted, handle_todo_completed, background=True)
 
     # Create message dispatcher
     dispatcher = MessageDispatcher(event_bus)
@@ -179,7 +213,7 @@ def bootstrap() -> SandPiperApp:
         project_task_query=project_task_query,
         todo_repository=plan_notion_todo_repository,
     )
-    plan_todo_query = PlanNotionTodoQuery()
+    plan_todo_query = PlanNotionTodoQuery(snapshot=notion_snapshot)
     create_repeat_task = CreateRepeatTask(
         routine_repository=routine_repository,
         todo_repository=plan_notion_todo_repository,
@@ -200,7 +234,9 @@ def bootstrap() -> SandPiperApp:
     )
 
     # Archive service for logical deletion cleanup
-    archive_deleted_pages = ArchiveDeletedPages()
+    archive_deleted_pages = ArchiveDeletedPages(
+        snapshot=notion_snapshot, gateway=notion_gateway, replica=notion_replica
+    )
 
     # Create prepare_tomorrow_todos use case
     mark_remaining_todos_as_today = MarkRemainingTodosAsToday(
@@ -213,6 +249,8 @@ def bootstrap() -> SandPiperApp:
         create_tasks_by_someday_list=create_tasks_by_someday_list,
         create_schedule_tasks=create_schedule_tasks,
         archive_deleted_pages=archive_deleted_pages,
+        snapshot=notion_snapshot,
+        max_workers=4,
     )
 
     # Create special todo handler and register handlers
@@ -260,6 +298,7 @@ def bootstrap() -> SandPiperApp:
         ),
         create_calendar_event=CreateCalendarEvent(
             calendar_repository=calendar_repository,
+            async_calendar_repository=AsyncNotionCalendarRepository(gateway=notion_gateway),
         ),
         delete_calendar_events=DeleteCalendarEvents(
             calendar_repository=calendar_repository,
@@ -275,14 +314,15 @@ def bootstrap() -> SandPiperApp:
             shopping_repository=shopping_repository,
         ),
         sync_jira_to_project=SyncJiraToProject(
-            jira_ticket_query=RestApiJiraTicketQuery(),
+            jira_ticket_query=RestApiJiraTicketQuery(cache=JiraIssueCache.get_instance()),
             project_repository=project_repository,
             project_task_repository=project_task_repository,
         ),
         archive_deleted_pages=archive_deleted_pages,
-        archive_old_todos=ArchiveOldTodos(),
+        archive_old_todos=ArchiveOldTodos(journal=ArchiveJournal(data_dir(create=False) / "archive_old_todos.jsonl")),
         create_clip=CreateClip(
             clips_repository=NotionClipsRepository(),
+            async_clips_repository=AsyncNotionClipsRepository(gateway=notion_gateway),
         ),
         list_unprocessed_clips=ListUnprocessedClips(
             clips_query=NotionClipsQuery(),
@@ -304,4 +344,5 @@ def bootstrap() -> SandPiperApp:
         ),
         add_taste=AddTaste(repository=NotionTasteRepository()),
         list_taste=ListTaste(repository=NotionTasteRepository()),
+        task_end_scheduler=task_end_scheduler,
     )
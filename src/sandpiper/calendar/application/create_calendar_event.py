@@ -1,8 +1,9 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 
 from sandpiper.calendar.domain.calendar_event import CalendarEvent, EventCategory, InsertedCalendarEvent
-from sandpiper.calendar.domain.calendar_repository import CalendarRepository
+from sandpiper.calendar.domain.calendar_repository import AsyncCalendarRepository, CalendarRepository
 
 
 @dataclass
@@ -16,15 +17,33 @@ class CreateCalendarEventRequest:
 @dataclass
 class CreateCalendarEvent:
     _calendar_repository: CalendarRepository
+    _async_calendar_repository: AsyncCalendarRepository | None
 
-    def __init__(self, calendar_repository: CalendarRepository) -> None:
+    def __init__(
+        self,
+        calendar_repository: CalendarRepository,
+        async_calendar_repository: AsyncCalendarRepository | None = None,
+    ) -> None:
         self._calendar_repository = calendar_repository
+        self._async_calendar_repository = async_calendar_repository
 
     def execute(self, request: CreateCalendarEventRequest) -> InsertedCalendarEvent:
-        event = CalendarEvent(
+        return self._calendar_repository.create(self._to_event(request))
+
+    async def execute_async(self, request: CreateCalendarEventRequest) -> InsertedCalendarEvent:
+        """イベントループを塞がずにカレンダーイベントを作成する
+
+        非同期リポジトリがない場合は同期版をワーカースレッドで実行する。
+        """
+        if self._async_calendar_repository is None:
+            return await asyncio.to_thread(self.execute, request)
+        return await self._async_calendar_repository.create(self._to_event(request))
+
+    @staticmethod
+    def _to_event(request: CreateCalendarEventRequest) -> CalendarEvent:
+        return CalendarEvent(
             name=request.name,
             category=request.category,
             start_datetime=request.start_datetime,
             end_datetime=request.end_datetime,
         )
-        return self._calendar_repository.create(event)
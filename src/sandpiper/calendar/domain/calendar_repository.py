@@ -20,3 +20,11 @@ class CalendarRepository(ABC):
             削除されたイベントの数
         """
         pass
+
+
+class AsyncCalendarRepository(ABC):
+    """イベントループを塞がずにカレンダーイベントを作成するリポジトリ"""
+
+    @abstractmethod
+    async def create(self, event: CalendarEvent) -> InsertedCalendarEvent:
+        pass
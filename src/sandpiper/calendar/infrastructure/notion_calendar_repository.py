@@ -3,7 +3,8 @@ from datetime import date, datetime
 from lotion import Lotion
 
 from sandpiper.calendar.domain.calendar_event import CalendarEvent, EventCategory, InsertedCalendarEvent
-from sandpiper.calendar.domain.calendar_repository import CalendarRepository
+from sandpiper.calendar.domain.calendar_repository import AsyncCalendarRepository, CalendarRepository
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
 from sandpiper.shared.notion.databases.calendar import (
     CalendarEventCategory,
     CalendarEventDateRange,
@@ -74,3 +75,19 @@ class NotionCalendarRepository(CalendarRepository):
                 deleted_count += 1
 
         return deleted_count
+
+
+class AsyncNotionCalendarRepository(AsyncCalendarRepository):
+    def __init__(self, gateway: AsyncNotionGateway | None = None) -> None:
+        self.gateway = gateway or AsyncNotionGateway.get_instance()
+
+    async def create(self, event: CalendarEvent) -> InsertedCalendarEvent:
+        notion_event = _generate_calendar_event_page(event)
+        page = await self.gateway.create_page(notion_event)
+        return InsertedCalendarEvent(
+            id=page.id,
+            name=event.name,
+            category=event.category,
+            start_datetime=event.start_datetime,
+            end_datetime=event.end_datetime,
+        )
@@ -1,10 +1,11 @@
+import asyncio
 import re
 from dataclasses import dataclass
 
 import httpx
 
 from sandpiper.clips.domain.clip import Clip, InsertedClip
-from sandpiper.clips.domain.clips_repository import ClipsRepository
+from sandpiper.clips.domain.clips_repository import AsyncClipsRepository, ClipsRepository
 from sandpiper.shared.infrastructure.youtube_client import YouTubeClient
 from sandpiper.shared.notion.databases.inbox import InboxType
 
@@ -79,11 +80,37 @@ class CreateClipRequest:
 @dataclass
 class CreateClip:
     _clips_repository: ClipsRepository
+    _async_clips_repository: AsyncClipsRepository | None
 
-    def __init__(self, clips_repository: ClipsRepository) -> None:
+    def __init__(
+        self,
+        clips_repository: ClipsRepository,
+        async_clips_repository: AsyncClipsRepository | None = None,
+    ) -> None:
         self._clips_repository = clips_repository
+        self._async_clips_repository = async_clips_repository
 
     def execute(self, request: CreateClipRequest) -> InsertedClip:
+        clip = self._build_clip(request)
+        inserted_clip = self._clips_repository.save(clip)
+        print(f"Created Clip: {inserted_clip}")
+        return inserted_clip
+
+    async def execute_async(self, request: CreateClipRequest) -> InsertedClip:
+        """イベントループを塞がずにClipを作成する
+
+        タイトル取得(同期HTTP)はワーカースレッドで行い、保存は非同期リポジトリで行う。
+        非同期リポジトリがない場合は同期版をワーカースレッドで実行する。
+        """
+        if self._async_clips_repository is None:
+            return await asyncio.to_thread(self.execute, request)
+        clip = await asyncio.to_thread(self._build_clip, request)
+        inserted_clip = await self._async_clips_repository.save(clip)
+        print(f"Created Clip: {inserted_clip}")
+        return inserted_clip
+
+    @staticmethod
+    def _build_clip(request: CreateClipRequest) -> Clip:
         title = request.title
         inbox_type = InboxType.from_url(request.url)
 
@@ -93,7 +120,4 @@ class CreateClip:
             if title is None:
                 title = DEFAULT_TITLE
 
-        clip = Clip(title=title, url=request.url, inbox_type=inbox_type)
-        inserted_clip = self._clips_repository.save(clip)
-        print(f"Created Clip: {inserted_clip}")
-        return inserted_clip
+        return Clip(title=title, url=request.url, inbox_type=inbox_type)
@@ -10,3 +10,12 @@ class ClipsRepository(ABC):
     def save(self, clip: Clip) -> InsertedClip:
         """Save a clip to the repository."""
         ...
+
+
+class AsyncClipsRepository(ABC):
+    """Async repository interface for Clips (does not block the event loop)."""
+
+    @abstractmethod
+    async def save(self, clip: Clip) -> InsertedClip:
+        """Save a clip to the repository."""
+        ...
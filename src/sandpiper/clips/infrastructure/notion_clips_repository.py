@@ -1,7 +1,8 @@
 from lotion import BasePage, Lotion, notion_database
 
 from sandpiper.clips.domain.clip import Clip, InsertedClip
-from sandpiper.clips.domain.clips_repository import ClipsRepository
+from sandpiper.clips.domain.clips_repository import AsyncClipsRepository, ClipsRepository
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
 from sandpiper.shared.notion.databases import clips as clips_db
 from sandpiper.shared.notion.databases.clips import (
     ClipsName,
@@ -43,3 +44,19 @@ class NotionClipsRepository(ClipsRepository):
             inbox_type=clip.inbox_type,
             unprocessed=clip.unprocessed,
         )
+
+
+class AsyncNotionClipsRepository(AsyncClipsRepository):
+    def __init__(self, gateway: AsyncNotionGateway | None = None) -> None:
+        self._gateway = gateway or AsyncNotionGateway.get_instance()
+
+    async def save(self, clip: Clip) -> InsertedClip:
+        clips_page = ClipsPage.generate(clip)
+        page = await self._gateway.create_page(clips_page)
+        return InsertedClip(
+            id=page.id,
+            title=clip.title,
+            url=clip.url,
+            inbox_type=clip.inbox_type,
+            unprocessed=clip.unprocessed,
+        )
@@ -3,6 +3,7 @@
 import subprocess
 import sys
 from datetime import UTC, datetime
+from datetime import time as dt_time
 from pathlib import Path
 
 import typer
@@ -17,6 +18,8 @@ from sandpiper.plan.application.create_someday_item import CreateSomedayItemRequ
 from sandpiper.plan.application.create_todo import CreateNewToDoRequest
 from sandpiper.plan.domain.someday_item import SomedayTiming
 from sandpiper.recipe.application.create_recipe import CreateRecipeRequest, IngredientRequest
+from sandpiper.review.query.activity_log_item import ActivityLogItem, ActivityType
+from sandpiper.review.query.github_activity_dto import GitHubActivityDto, GitHubActivitySummary
 from sandpiper.shared.infrastructure.cron_notifier import CronNotifier
 from sandpiper.shared.infrastructure.slack_notice_messanger import SlackNoticeMessanger
 from sandpiper.shared.utils.date_utils import jst_now
@@ -386,96 +389,167 @@ def create_schedule_tasks(
 @app.command()
 def get_github_activity(
     date: str = typer.Option(None, help="対象日 (YYYY-MM-DD形式)"),
+    from_date: str = typer.Option(None, "--from", help="期間の開始日 (YYYY-MM-DD形式)。指定すると日ごとに出力する"),
+    to_date: str = typer.Option(None, "--to", help="期間の終了日 (YYYY-MM-DD形式、省略時は今日)"),
     username: str = typer.Option("koboriakira", help="GitHubユーザー名"),
     json: bool = typer.Option(False, "--json", help="JSON形式で出力する"),
     markdown: bool = typer.Option(False, "--markdown", help="Markdown形式で出力する"),
 ) -> None:
     """GitHubの活動ログを取得します"""
     import json as _json
-    from datetime import datetime
 
-    # 日付パース
-    target_date = None
-    if date:
-        try:
-            date_obj = datetime.strptime(date, "%Y-%m-%d")
-            target_date = date_obj.replace(tzinfo=UTC)
-        except ValueError:
-            console.print("[red]エラー: 日付の形式が正しくありません。YYYY-MM-DD形式で指定してください。[/red]")
+    if date and (from_date or to_date):
+        console.print("[red]エラー: --date と --from/--to は同時に指定できません。[/red]")
+        raise typer.Exit(code=1)
+    if to_date and not from_date:
+        console.print("[red]エラー: --to を指定する場合は --from も指定してください。[/red]")
+        raise typer.Exit(code=1)
+
+    if from_date:
+        start = _parse_github_activity_date(from_date)
+        end = _parse_github_activity_date(to_date) if to_date else datetime.now(UTC)
+        if end.date() < start.date():
+            console.print("[red]エラー: --to には --from 以降の日付を指定してください。[/red]")
             raise typer.Exit(code=1)
 
     # GitHub活動ログ取得
     try:
-        result = sandpiper_app.get_github_activity.execute(
-            username=username,
-            target_date=target_date,
-        )
+        if from_date:
+            range_result = sandpiper_app.get_github_activity.execute_range(
+                start_date=start,
+                end_date=end,
+                username=username,
+            )
+        else:
+            result = sandpiper_app.get_github_activity.execute(
+                username=username,
+                target_date=_parse_github_activity_date(date) if date else None,
+            )
     except ValueError as e:
         console.print(f"[red]エラー: {e}[/red]")
         console.print("[yellow]GITHUB_TOKEN環境変数が設定されているか確認してください。[/yellow]")
         raise typer.Exit(code=1)
 
     # 出力
+    if from_date:
+        if json:
+            range_dict = {
+                "from": range_result.start_date,
+                "to": range_result.end_date,
+                "username": range_result.username,
+                "summary": _github_activity_summary_dict(range_result.summary),
+                "days": [_github_activity_dict(day) for day in range_result.days],
+            }
+            console.print(_json.dumps(range_dict, ensure_ascii=False, indent=2))
+            return
+        if markdown:
+            console.print(f"# GitHub Activity Log - {range_result.start_date} to {range_result.end_date}")
+            console.print(f"**User:** {range_result.username}\n")
+            console.print("## Summary")
+        else:
+            console.print(
+                f"[bold cyan]📅 GitHub Activity Log - {range_result.start_date} to {range_result.end_date}[/bold cyan]"
+            )
+            console.print(f"[bold]👤 User:[/bold] {range_result.username}\n")
+            console.print("[bold green]📈 Summary:[/bold green]")
+        _print_github_activity_summary(range_result.summary, markdown)
+        # 活動のない日は省略する
+        for day in range_result.days:
+            if day.summary.total_events:
+                _print_github_activity(day, markdown)
+        return
+
     if json:
-        activity_dict = {
-            "date": result.date,
-            "username": result.username,
-            "summary": {
-                "total_events": result.summary.total_events,
-                "commits_count": result.summary.commits_count,
-                "pull_requests_count": result.summary.pull_requests_count,
-                "issues_count": result.summary.issues_count,
-                "reviews_count": result.summary.reviews_count,
-            },
-            "commits": [
-                {
-                    "sha": commit.sha,
-                    "message": commit.message,
-                    "repo": commit.repo,
-                    "committed_at": commit.committed_at.isoformat(),
-                }
-                for commit in result.commits
-            ],
-            "pull_requests": [
-                {
-                    "number": pr.number,
-                    "title": pr.title,
-                    "action": pr.action,
-                    "repo": pr.repo,
-                    "created_at": pr.created_at.isoformat(),
-                }
-                for pr in result.pull_requests
-            ],
-            "issues": [
-                {
-                    "number": issue.number,
-                    "title": issue.title,
-                    "action": issue.action,
-                    "repo": issue.repo,
-                    "created_at": issue.created_at.isoformat(),
-                }
-                for issue in result.issues
-            ],
-            "reviews": [
-                {
-                    "pr_number": review.pr_number,
-                    "state": review.state,
-                    "repo": review.repo,
-                    "created_at": review.created_at.isoformat(),
-                }
-                for review in result.reviews
-            ],
-        }
-        console.print(_json.dumps(activity_dict, ensure_ascii=False, indent=2))
-    elif markdown:
+        console.print(_json.dumps(_github_activity_dict(result), ensure_ascii=False, indent=2))
+    else:
+        _print_github_activity(result, markdown)
+
+
+def _parse_github_activity_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=UTC)
+    except ValueError:
+        console.print("[red]エラー: 日付の形式が正しくありません。YYYY-MM-DD形式で指定してください。[/red]")
+        raise typer.Exit(code=1)
+
+
+def _github_activity_summary_dict(summary: GitHubActivitySummary) -> dict[str, int]:
+    return {
+        "total_events": summary.total_events,
+        "commits_count": summary.commits_count,
+        "pull_requests_count": summary.pull_requests_count,
+        "issues_count": summary.issues_count,
+        "reviews_count": summary.reviews_count,
+    }
+
+
+def _github_activity_dict(result: GitHubActivityDto) -> dict[str, object]:
+    return {
+        "date": result.date,
+        "username": result.username,
+        "summary": _github_activity_summary_dict(result.summary),
+        "commits": [
+            {
+                "sha": commit.sha,
+                "message": commit.message,
+                "repo": commit.repo,
+                "committed_at": commit.committed_at.isoformat(),
+            }
+            for commit in result.commits
+        ],
+        "pull_requests": [
+            {
+                "number": pr.number,
+                "title": pr.title,
+                "action": pr.action,
+                "repo": pr.repo,
+                "created_at": pr.created_at.isoformat(),
+            }
+            for pr in result.pull_requests
+        ],
+        "issues": [
+            {
+                "number": issue.number,
+                "title": issue.title,
+                "action": issue.action,
+                "repo": issue.repo,
+                "created_at": issue.created_at.isoformat(),
+            }
+            for issue in result.issues
+        ],
+        "reviews": [
+            {
+                "pr_number": review.pr_number,
+                "state": review.state,
+                "repo": review.repo,
+                "created_at": review.created_at.isoformat(),
+            }
+            for review in result.reviews
+        ],
+    }
+
+
+def _print_github_activity_summary(summary: GitHubActivitySummary, markdown: bool) -> None:
+    if markdown:
+        console.print(f"- Total Events: {summary.total_events}")
+        console.print(f"- Commits: {summary.commits_count}")
+        console.print(f"- Pull Requests: {summary.pull_requests_count}")
+        console.print(f"- Issues: {summary.issues_count}")
+        console.print(f"- Reviews: {summary.reviews_count}\n")
+    else:
+        console.print(f"  - Total Events: {summary.total_events}")
+        console.print(f"  - Commits: {summary.commits_count}")
+        console.print(f"  - Pull Requests: {summary.pull_requests_count}")
+        console.print(f"  - Issues: {summary.issues_count}")
+        console.print(f"  - Reviews: {summary.reviews_count}\n")
+
+
+def _print_github_activity(result: GitHubActivityDto, markdown: bool) -> None:
+    if markdown:
         console.print(f"# GitHub Activity Log - {result.date}")
         console.print(f"**User:** {result.username}\n")
         console.print("## Summary")
-        console.print(f"- Total Events: {result.summary.total_events}")
-        console.print(f"- Commits: {result.summary.commits_count}")
-        console.print(f"- Pull Requests: {result.summary.pull_requests_count}")
-        console.print(f"- Issues: {result.summary.issues_count}")
-        console.print(f"- Reviews: {result.summary.reviews_count}\n")
+        _print_github_activity_summary(result.summary, markdown)
 
         if result.commits:
             console.print("## Commits")
@@ -504,11 +578,7 @@ def get_github_activity(
         console.print(f"[bold cyan]📅 GitHub Activity Log - {result.date}[/bold cyan]")
         console.print(f"[bold]👤 User:[/bold] {result.username}\n")
         console.print("[bold green]📈 Summary:[/bold green]")
-        console.print(f"  - Total Events: {result.summary.total_events}")
-        console.print(f"  - Commits: {result.summary.commits_count}")
-        console.print(f"  - Pull Requests: {result.summary.pull_requests_count}")
-        console.print(f"  - Issues: {result.summary.issues_count}")
-        console.print(f"  - Reviews: {result.summary.reviews_count}\n")
+        _print_github_activity_summary(result.summary, markdown)
 
         if result.commits:
             console.print("[bold blue]💻 Commits:[/bold blue]")
@@ -550,8 +620,10 @@ def search_jira_tickets(
 
     from rich.table import Table
 
+    from sandpiper.plan.query.jira_ticket_dto import JiraFieldProfile
     from sandpiper.plan.query.jira_ticket_query import RestApiJiraTicketQuery
 
+    is_json = output_format.lower() == "json"
     try:
         query = RestApiJiraTicketQuery()
         tickets = query.search_tickets(
@@ -561,13 +633,15 @@ def search_jira_tickets(
             status=status,
             assignee=assignee,
             max_results=max_results,
+            # テーブル表示に使う項目だけを取得する(JSONは全項目)
+            profile=JiraFieldProfile.FULL if is_json else JiraFieldProfile.LIST,
         )
 
         if not tickets:
             console.print("[yellow]チケットが見つかりませんでした[/yellow]")
             return
 
-        if output_format.lower() == "json":
+        if is_json:
             # JSON出力
             tickets_data = [ticket.to_dict() for ticket in tickets]
             console.print_json(json.dumps(tickets_data, ensure_ascii=False, indent=2))
@@ -868,18 +942,22 @@ def archive_old_todos(
     days: int = typer.Option(1, help="閾値日数: 本日0時からN-1日前が閾値 (デフォルト: 1=前日以前)"),
     dry_run: bool = typer.Option(False, "--dry-run", help="実際にアーカイブせず対象のみ表示"),
     notify: bool = typer.Option(False, "--notify", help="実行結果をSlackに通知する (cron実行用)"),
+    workers: int = typer.Option(3, "--workers", help="並行して処理するTODOの数"),
 ) -> None:
     """完了したTODOをアーカイブ/削除します
 
     DONEステータスで前日以前に完了したタスクを処理します。
     - リピート(ルーティン)種別: アーカイブせず削除のみ
     - それ以外: アーカイブ用データベースに移動後、元のデータベースから削除
+
+    途中で中断した場合は、再実行するとコピー済みのTODOは削除だけを行います。
     """
-    from sandpiper.shared.infrastructure.archive_old_todos import ArchiveOldTodos
+    from sandpiper.shared.infrastructure.archive_old_todos import ArchiveJournal, ArchiveOldTodos
+    from sandpiper.shared.utils.data_dir import data_dir
 
     if dry_run:
         console.print(f"[dim]ドライラン: {days}日閾値で完了したTODOを検索中...[/dim]")
-        archive_service = ArchiveOldTodos(archive_days=days)
+        archive_service = ArchiveOldTodos(archive_days=days, max_workers=workers)
         result = archive_service.execute(dry_run=True)
         total = result.archived_count + result.deleted_routine_count
         if total == 0:
@@ -900,10 +978,16 @@ def archive_old_todos(
 
     try:
         console.print("[bold]前日以前に完了したTODOを処理中...[/bold]")
-        archive_service = ArchiveOldTodos(archive_days=days)
+        archive_service = ArchiveOldTodos(
+            archive_days=days,
+            max_workers=workers,
+            journal=ArchiveJournal(data_dir() / "archive_old_todos.jsonl"),
+        )
         result = archive_service.execute()
 
         summary = f"アーカイブ{result.archived_count}件、ルーティン削除{result.deleted_routine_count}件"
+        if result.skipped_count > 0:
+            summary += f"、処理済みスキップ{result.skipped_count}件"
         if result.archived_count == 0 and result.deleted_routine_count == 0:
             console.print("[yellow]処理対象のTODOはありませんでした[/yellow]")
         else:
@@ -915,6 +999,17 @@ def archive_old_todos(
                 console.print(f"[green][bold]ルーティン削除: {result.deleted_routine_count}件[/bold][/green]")
                 for title in result.deleted_routine_titles:
                     console.print(f"  - {title}")
+        console.print(
+            f"[dim]{result.scanned_count}件を{result.elapsed_seconds:.1f}秒で処理"
+            f" ({result.throughput_per_second:.1f}件/秒)[/dim]"
+        )
+
+        if result.failed_count > 0:
+            # 失敗したTODOは次回の実行で再処理される
+            console.print(f"[red][bold]失敗: {result.failed_count}件[/bold][/red]")
+            for title in result.failed_titles:
+                console.print(f"  - {title}")
+            raise RuntimeError(f"{summary}、失敗{result.failed_count}件: {', '.join(result.failed_titles)}")
 
         if notifier:
             notifier.notify_success(command="archive-old-todos", summary=summary)
@@ -1050,55 +1145,84 @@ def cleanup_project_tasks(
 
 @app.command()
 def export_donelist(
-    date_filter: str = typer.Option(..., "--date", help="対象日付 (YYYY-MM-DD形式)"),
+    date_filter: str = typer.Option(None, "--date", help="対象日付 (YYYY-MM-DD形式)"),
+    from_date: str = typer.Option(None, "--from", help="期間の開始日 (YYYY-MM-DD形式)。日ごとにまとめて出力する"),
+    to_date: str = typer.Option(None, "--to", help="期間の終了日 (YYYY-MM-DD形式、省略時は今日)"),
     notify: bool = typer.Option(False, "--notify", help="実行結果をSlackに通知する (cron実行用)"),
 ) -> None:
     """完了タスクとカレンダー予定をObsidian DailyNoteに書き出します
 
-    get-todo-logと同じデータを取得し、Obsidian Vaultの
+    対象日の完了タスクとカレンダー予定を開始時刻の順に取得し、Obsidian Vaultの
     dailynote/YYYY/MM/DD/donelist.md に上書き出力します。
+    --from/--to を指定すると期間をまとめて1回で取得し、日ごとのファイルを並行して書き出します。
+    期間の出力では、項目のない日のファイルがまだなければ作りません。
+    内容が変わっていないファイルは書き直しません。
     """
+    from datetime import date, timedelta
     from datetime import datetime as dt
     from pathlib import Path
 
-    from sandpiper.review.query.activity_log_item import ActivityType
+    from sandpiper.shared.infrastructure.text_file_writer import write_files
+
+    if date_filter and (from_date or to_date):
+        console.print("[red]エラー: --date と --from/--to は同時に指定できません。[/red]")
+        raise typer.Exit(code=1)
+    if not date_filter and not from_date:
+        console.print("[red]エラー: --date または --from を指定してください。[/red]")
+        raise typer.Exit(code=1)
 
     try:
-        target_date = dt.strptime(date_filter, "%Y-%m-%d").date()
+        start_date = dt.strptime(date_filter or from_date, "%Y-%m-%d").date()
+        if date_filter:
+            end_date = start_date
+        else:
+            end_date = dt.strptime(to_date, "%Y-%m-%d").date() if to_date else jst_now().date()
     except ValueError:
         console.print("[red]エラー: 日付の形式が正しくありません。YYYY-MM-DD形式で指定してください。[/red]")
         raise typer.Exit(code=1)
+    if end_date < start_date:
+        console.print("[red]エラー: --to には --from 以降の日付を指定してください。[/red]")
+        raise typer.Exit(code=1)
 
     _DONELIST_SLACK_CHANNEL_ID = "C0AJQR86PK9"
     notifier = CronNotifier(messanger=SlackNoticeMessanger(channel_id=_DONELIST_SLACK_CHANNEL_ID)) if notify else None
 
     try:
-        result = sandpiper_app.get_todo_log.execute(target_date)
-
-        # 通常テキスト形式で行を生成
-        lines: list[str] = []
+        # 期間をまとめて1回で取得し、日ごとに振り分ける(開始時刻の順に並んでいる)
+        result = sandpiper_app.get_todo_log.execute_between(start_date, end_date)
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        lines_by_day: dict[date, list[str]] = {day: [] for day in days}
         for item in result:
-            if item.activity_type == ActivityType.TODO:
-                prefix = f"【TODO {item.kind}】" + (f"[{item.project_name}] " if item.project_name else "")
-            else:
-                prefix = f"【予定 {item.category}】" if item.category else "【予定】"
-            time_range = f" ({item.start_datetime.strftime('%H:%M')} - {item.end_datetime.strftime('%H:%M')})"
-            lines.append(f"- {prefix}{item.title}{time_range}")
-
-        content = "\n".join(lines) + "\n" if lines else ""
+            if (day := item.start_datetime.date()) in lines_by_day:
+                lines_by_day[day].append(_donelist_line(item))
 
         # Obsidian Vault に書き出し
         vault_path = Path.home() / "Library/Mobile Documents/iCloud~md~obsidian/Documents/my-vault"
-        output_path = vault_path / "dailynote" / f"{target_date:%Y/%m/%d}" / "donelist.md"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding="utf-8")
+        output_paths = {day: vault_path / "dailynote" / f"{day:%Y/%m/%d}" / "donelist.md" for day in days}
+        # 期間の出力では、項目のない日の空ファイル(とディレクトリ)を新たに作らない
+        target_days = [day for day in days if date_filter or lines_by_day[day] or output_paths[day].exists()]
+        written = write_files(
+            {output_paths[day]: "\n".join(lines_by_day[day]) + "\n" if lines_by_day[day] else "" for day in target_days}
+        )
 
-        summary = f"{len(lines)}件を {output_path} に出力"
+        total = sum(len(lines) for lines in lines_by_day.values())
+        if date_filter:
+            output_path = output_paths[start_date]
+            summary = f"{total}件を {output_path} に出力" + ("" if written[output_path] else "(変更なし)")
+            period = date_filter
+        else:
+            written_count = sum(written.values())
+            summary = (
+                f"{len(days)}日分 {total}件を出力"
+                f"(書き込み {written_count}日、変更なし {len(written) - written_count}日、"
+                f"空のためスキップ {len(days) - len(written)}日)"
+            )
+            period = f"{start_date}〜{end_date}"
         console.print(f"[green]{summary}[/green]")
 
         # Slack通知
         slack_messanger = SlackNoticeMessanger(channel_id=_DONELIST_SLACK_CHANNEL_ID)
-        slack_messanger.send(f"[export-donelist] {date_filter}: {len(lines)}件出力しました")
+        slack_messanger.send(f"[export-donelist] {period}: {total}件出力しました")
 
         if notifier:
             notifier.notify_success(command="export-donelist", summary=summary)
@@ -1110,6 +1234,16 @@ def export_donelist(
         raise typer.Exit(code=1)
 
 
+def _donelist_line(item: ActivityLogItem) -> str:
+    """donelist.md の1行(通常テキスト形式)"""
+    if item.activity_type == ActivityType.TODO:
+        prefix = f"【TODO {item.kind}】" + (f"[{item.project_name}] " if item.project_name else "")
+    else:
+        prefix = f"【予定 {item.category}】" if item.category else "【予定】"
+    time_range = f" ({item.start_datetime.strftime('%H:%M')} - {item.end_datetime.strftime('%H:%M')})"
+    return f"- {prefix}{item.title}{time_range}"
+
+
 @app.command()
 def check_dakoku(
     notify: bool = typer.Option(False, "--notify", help="未完了時にSlackに通知する (cron実行用)"),
@@ -1414,49 +1548,25 @@ def _filter_todos_by_schedule(
     to_time: str | None,
 ) -> list:
     """予定プロパティでTODOリストを絞り込む"""
-    result = todos
-
-    if scheduled:
-        result = [t for t in result if t.scheduled_start_datetime is not None]
+    from sandpiper.perform.query.todo_read_model import TodoReadModel
 
-    if all_day:
-        result = [
-            t
-            for t in result
-            if t.scheduled_start_datetime is not None
-            and t.scheduled_start_datetime.hour == 0
-            and t.scheduled_start_datetime.minute == 0
-        ]
+    return TodoReadModel(todos).find(
+        scheduled=scheduled,
+        all_day=all_day,
+        scheduled_from=_parse_hh_mm(from_time, "--from"),
+        scheduled_to=_parse_hh_mm(to_time, "--to"),
+    )
 
-    if from_time is not None:
-        try:
-            fh, fm = (int(x) for x in from_time.split(":"))
-        except ValueError:
-            msg = f"--from の形式が不正です: {from_time} (HH:MM 形式で指定してください)"
-            raise typer.BadParameter(msg)
-        from_minutes = fh * 60 + fm
-        result = [
-            t
-            for t in result
-            if t.scheduled_start_datetime is not None
-            and t.scheduled_start_datetime.hour * 60 + t.scheduled_start_datetime.minute >= from_minutes
-        ]
-
-    if to_time is not None:
-        try:
-            th, tm = (int(x) for x in to_time.split(":"))
-        except ValueError:
-            msg = f"--to の形式が不正です: {to_time} (HH:MM 形式で指定してください)"
-            raise typer.BadParameter(msg)
-        to_minutes = th * 60 + tm
-        result = [
-            t
-            for t in result
-            if t.scheduled_start_datetime is not None
-            and t.scheduled_start_datetime.hour * 60 + t.scheduled_start_datetime.minute <= to_minutes
-        ]
 
-    return result
+def _parse_hh_mm(value: str | None, option_name: str) -> dt_time | None:
+    if value is None:
+        return None
+    try:
+        hour, minute = (int(x) for x in value.split(":"))
+        return dt_time(hour, minute)
+    except ValueError:
+        msg = f"{option_name} の形式が不正です: {value} (HH:MM 形式で指定してください)"
+        raise typer.BadParameter(msg)
 
 
 @_todo_app.command("list")
@@ -1473,8 +1583,9 @@ def todo_list(
     import json as _json
 
     from sandpiper.perform.infrastructure.notion_todo_repository import NotionTodoRepository as PerformRepo
+    from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
 
-    repo = PerformRepo()
+    repo = PerformRepo(replica=NotionDatabaseReplica.get_instance())
 
     if status is None or status == "TODO":
         todos = repo.find_by_status(ToDoStatusEnum.TODO)
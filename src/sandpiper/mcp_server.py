@@ -23,6 +23,7 @@ from sandpiper.plan.infrastructure.notion_todo_repository import NotionTodoRepos
 from sandpiper.plan.query.project_task_query import NotionProjectTaskQuery
 from sandpiper.review.query.todo_query import NotionTodoQuery
 from sandpiper.shared.infrastructure.event_bus import EventBus
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
 from sandpiper.shared.model.someday_item import SomedayItem
 from sandpiper.shared.utils.date_utils import jst_now, jst_today
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
@@ -74,7 +75,7 @@ def _serialize_someday_item(item: SomedayItem) -> dict[str, str | bool | list[st
 @mcp.tool()
 def get_in_progress_todos() -> list[dict[str, str | None]]:
     """現在取りかかっている作業の一覧を取得する。IN_PROGRESSステータスのタスクを返す。"""
-    repo = NotionTodoRepository()
+    repo = NotionTodoRepository(replica=NotionDatabaseReplica.get_instance())
     todos = repo.find_by_status(ToDoStatusEnum.IN_PROGRESS)
     return [_serialize_todo(todo) for todo in todos]
 
@@ -82,7 +83,7 @@ def get_in_progress_todos() -> list[dict[str, str | None]]:
 @mcp.tool()
 def get_pending_todos() -> list[dict[str, str | None]]:
     """まだ着手していないタスクの一覧を取得する。TODOステータスのタスクを返す。"""
-    repo = NotionTodoRepository()
+    repo = NotionTodoRepository(replica=NotionDatabaseReplica.get_instance())
     todos = repo.find_by_status(ToDoStatusEnum.TODO)
     return [_serialize_todo(todo) for todo in todos]
 
@@ -1,17 +1,32 @@
 import asyncio
 import logging
 
+from sandpiper.shared.event.todo_completed import TodoCompleted
 from sandpiper.shared.event.todo_started import TodoStarted
+from sandpiper.shared.infrastructure.persistent_timer_scheduler import PersistentTimerScheduler
 from sandpiper.shared.infrastructure.slack_notice_messanger import SlackNoticeMessanger
 
 logger = logging.getLogger(__name__)
 
 
+def task_end_timer_key(page_id: str) -> str:
+    return f"task_end:{page_id}"
+
+
 class ScheduleTaskEndNotification:
-    """タスク開始時に所要時間後のSlack通知をスケジュールするハンドラー"""
+    """タスク開始時に所要時間後のSlack通知をスケジュールするハンドラー
+
+    scheduler を渡した場合は永続化されたタイマーとして登録する(再起動しても失われず、完了時に取り消せる)。
+    渡さない場合は実行中のイベントループ上で待機する(プロセスが終了すると失われる)。
+    """
 
-    def __init__(self, slack_messanger: SlackNoticeMessanger) -> None:
+    def __init__(
+        self,
+        slack_messanger: SlackNoticeMessanger,
+        scheduler: PersistentTimerScheduler | None = None,
+    ) -> None:
         self._slack_messanger = slack_messanger
+        self._scheduler = scheduler
 
     def __call__(self, event: TodoStarted) -> None:
         if event.scheduled_duration is None:
@@ -28,6 +43,14 @@ class ScheduleTaskEndNotification:
             duration_seconds,
         )
 
+        if self._scheduler is not None and event.page_id is not None:
+            self._scheduler.schedule(
+                key=task_end_timer_key(event.page_id),
+                fire_at=event.execution_time.timestamp() + duration_seconds,
+                payload=self._message(task_name),
+            )
+            return
+
         # asyncio.create_taskで非同期タスクをスケジュール
         try:
             loop = asyncio.get_running_loop()
@@ -45,6 +68,20 @@ class ScheduleTaskEndNotification:
     async def _send_notification_after_delay(self, task_name: str, delay_seconds: float) -> None:
         """指定秒数後にSlack通知を送信"""
         await asyncio.sleep(delay_seconds)
-        message = f"「{task_name}」の予定時間が終了しました"
         logger.info("Sending task end notification for '%s'", task_name)
-        self._slack_messanger.send(message)
+        self._slack_messanger.send(self._message(task_name))
+
+    @staticmethod
+    def _message(task_name: str) -> str:
+        return f"「{task_name}」の予定時間が終了しました"
+
+
+class CancelTaskEndNotification:
+    """予定時間より早くタスクが完了したら、スケジュール済みの終了通知を取り消すハンドラー"""
+
+    def __init__(self, scheduler: PersistentTimerScheduler) -> None:
+        self._scheduler = scheduler
+
+    def __call__(self, event: TodoCompleted) -> None:
+        if self._scheduler.cancel(task_end_timer_key(event.page_id)):
+            logger.info("Cancelled task end notification for '%s'", event.title)
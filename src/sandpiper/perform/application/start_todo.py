@@ -38,6 +38,7 @@ class StartTodo:
                 execution_time=jst_now(),
                 context=context,
                 scheduled_duration=todo.scheduled_duration,
+                page_id=page_id,
             )
         )
 
@@ -1,8 +1,16 @@
 import contextlib
+import threading
+from collections.abc import Iterator
 
 from lotion import BasePage, Lotion, notion_database
+from lotion.filter import Builder, Cond
+from lotion.lotion import NotionApiError
+from lotion.properties.property import Property
 
 from sandpiper.perform.domain.todo import ToDo
+from sandpiper.perform.query.todo_read_model import TodoReadModel
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica, is_page_gone_error
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
 from sandpiper.shared.notion.databases import todo as todo_db
 from sandpiper.shared.notion.databases.todo import (
     TodoClaudeUrl,
@@ -69,8 +77,18 @@ class TodoPage(BasePage):  # type: ignore[misc]
 
 
 class NotionTodoRepository:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        snapshot: NotionDatabaseSnapshot | None = None,
+        replica: NotionDatabaseReplica | None = None,
+    ) -> None:
         self.client = Lotion.get_instance()
+        self._snapshot = snapshot
+        # レプリカを渡した場合、一覧の取得はレプリカの差分を反映した読み取りモデルから答える
+        self._replica = replica
+        self._read_model = TodoReadModel()
+        self._read_model_generation = 0
+        self._read_model_lock = threading.Lock()
 
     def find(self, page_id: str) -> ToDo:
         page = self.client.retrieve_page(page_id, TodoPage)
@@ -78,61 +96,113 @@ class NotionTodoRepository:
 
     def save(self, todo: ToDo) -> None:
         print(f"Saving ToDo: {todo}")
-        page = self.client.retrieve_page(todo.id, TodoPage)
-        page.set_prop(TodoStatus.from_status_name(todo.status.value))
-        page.set_prop(
-            TodoLogDate.from_range(
-                start=todo.log_start_datetime,
-                end=todo.log_end_datetime,
+        with self._forget_if_gone(todo.id):
+            page = self.client.retrieve_page(todo.id, TodoPage)
+            page.set_prop(TodoStatus.from_status_name(todo.status.value))
+            page.set_prop(
+                TodoLogDate.from_range(
+                    start=todo.log_start_datetime,
+                    end=todo.log_end_datetime,
+                )
             )
-        )
 
-        if todo.section:
-            page.set_prop(TodoSection.from_name(todo.section.value))
+            if todo.section:
+                page.set_prop(TodoSection.from_name(todo.section.value))
 
-        self.client.update(page)
+            self.client.update(page)
 
     def update_section(self, page_id: str, section: TaskChuteSection) -> None:
         """セクションのみを更新する"""
-        page = self.client.retrieve_page(page_id, TodoPage)
-        page.set_prop(TodoSection.from_name(section.value))
-        self.client.update(page)
+        with self._forget_if_gone(page_id):
+            page = self.client.retrieve_page(page_id, TodoPage)
+            page.set_prop(TodoSection.from_name(section.value))
+            self.client.update(page)
 
     def find_by_status(self, status: ToDoStatusEnum) -> list[ToDo]:
-        """指定されたステータスのTODOリストを取得する"""
-        pages = self.client.retrieve_database(todo_db.DATABASE_ID)
-        result: list[ToDo] = []
-        for page in pages:
-            page_status = ToDoStatusEnum(page.get_status("ステータス").status_name)
-            if page_status == status:
-                todo_page = self.client.retrieve_page(page.id, TodoPage)
-                if todo_page.is_deleted and todo_page.is_deleted.checked:
-                    continue
-                result.append(todo_page.to_domain())
-        return result
+        """指定されたステータスのTODOリストを取得する
+
+        ステータスと論理削除の条件はNotion側のフィルタで絞り込み、
+        クエリ結果から直接TodoPageを復元する(ページ単位の再取得は行わない)。
+        スナップショットが有効な場合はメモリ上のページから絞り込む。
+        レプリカを渡した場合は読み取りモデルのインデックスから引く。
+        """
+        if self._snapshot is not None and self._snapshot.is_active:
+            snapshot_pages = self._snapshot.retrieve_database(todo_db.DATABASE_ID, cls=TodoPage)
+            return [
+                page.to_domain()
+                for page in snapshot_pages
+                if ToDoStatusEnum(page.get_status("ステータス").status_name) == status
+                and not page.get_checkbox("論理削除").checked
+            ]
+        if self._replica is not None:
+            return self.read_model().find(status=status)
+        filter_param = (
+            Builder.create()
+            .add(TodoStatus.from_status_name(status.value), Cond.EQUALS)
+            .add_filter_param({"property": TodoIsDeleted.PROP_NAME, "checkbox": {"equals": False}})
+            .build()
+        )
+        pages: list[TodoPage] = self.client.retrieve_database(
+            database_id=todo_db.DATABASE_ID, filter_param=filter_param, cls=TodoPage
+        )
+        return [page.to_domain() for page in pages]
 
     def mark_as_today(self, page_id: str) -> None:
         """「今日中にやる」フラグを有効化する"""
-        page = self.client.retrieve_page(page_id, TodoPage)
-        page.set_prop(TodoIsTodayProp.true())
-        self.client.update(page)
+        properties: list[Property] = [TodoIsTodayProp.true()]
+        with self._forget_if_gone(page_id):
+            self.client.update_page(page_id, properties)
+        if self._snapshot is not None:
+            self._snapshot.update_properties(todo_db.DATABASE_ID, page_id, properties)
 
     def fetch_all(self) -> list[ToDo]:
+        if self._replica is not None:
+            return self.read_model().find()
         pages: list[TodoPage] = self.client.retrieve_database(todo_db.DATABASE_ID, cls=TodoPage)
         return [page.to_domain() for page in pages if not (page.is_deleted and page.is_deleted.checked)]  # type: ignore[return-value]
 
     def update_status(self, page_id: str, status: ToDoStatusEnum) -> None:
-        page = self.client.retrieve_page(page_id, TodoPage)
-        page.set_prop(TodoStatus.from_status_name(status.value))
-        self.client.update(page)
+        with self._forget_if_gone(page_id):
+            page = self.client.retrieve_page(page_id, TodoPage)
+            page.set_prop(TodoStatus.from_status_name(status.value))
+            self.client.update(page)
 
     def update_title(self, page_id: str, title: str) -> None:
-        page = self.client.retrieve_page(page_id, TodoPage)
-        page.set_prop(TodoName.from_plain_text(title))
-        self.client.update(page)
+        with self._forget_if_gone(page_id):
+            page = self.client.retrieve_page(page_id, TodoPage)
+            page.set_prop(TodoName.from_plain_text(title))
+            self.client.update(page)
 
     def delete(self, page_id: str) -> None:
         """論理削除: is_deleted フラグを true に設定する"""
-        page = self.client.retrieve_page(page_id, TodoPage)
-        page.set_prop(TodoIsDeleted.true())
-        self.client.update(page)
+        with self._forget_if_gone(page_id):
+            page = self.client.retrieve_page(page_id, TodoPage)
+            page.set_prop(TodoIsDeleted.true())
+            self.client.update(page)
+
+    @contextlib.contextmanager
+    def _forget_if_gone(self, page_id: str) -> Iterator[None]:
+        """書き込み先のページが削除済みだった場合、レプリカからも取り除いてから例外を送出する"""
+        try:
+            yield
+        except NotionApiError as e:
+            if self._replica is not None and is_page_gone_error(e):
+                self._replica.remove_page(todo_db.DATABASE_ID, page_id)
+            raise
+
+    def read_model(self) -> TodoReadModel:
+        """レプリカの変更分を反映した読み取りモデルを返す(論理削除したTODOは含まない)"""
+        if self._replica is None:
+            msg = "read_model requires a replica"
+            raise RuntimeError(msg)
+        with self._read_model_lock:
+            changes = self._replica.changes_since(todo_db.DATABASE_ID, self._read_model_generation, cls=TodoPage)
+            for page_id in changes.deleted_page_ids:
+                self._read_model.remove(page_id)
+            for page in changes.pages:
+                if page.get_checkbox("論理削除").checked:
+                    self._read_model.remove(page.id)
+                else:
+                    self._read_model.upsert(page.to_domain())
+            self._read_model_generation = changes.generation
+            return self._read_model
@@ -2,6 +2,7 @@ from typing import Protocol
 
 from lotion import Lotion
 
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
 from sandpiper.shared.notion.databases import someday as someday_db
 from sandpiper.shared.valueobject.context import Context
 
@@ -17,12 +18,14 @@ class IncidentalTaskQuery(Protocol):
 class NotionIncidentalTaskQuery:
     """Notionを使用した「ついでに」タスククエリ"""
 
-    def __init__(self) -> None:
+    def __init__(self, replica: NotionDatabaseReplica | None = None) -> None:
         self.client = Lotion.get_instance()
+        # レプリカがあれば差分同期したローカルのデータを読む
+        self._reader: Lotion | NotionDatabaseReplica = replica if replica is not None else self.client
 
     def fetch_by_context(self, context: Context) -> list[str]:
         """指定されたコンテクストの「ついでに」タスクのタイトルを取得"""
-        items = self.client.retrieve_database(someday_db.DATABASE_ID)
+        items = self._reader.retrieve_database(someday_db.DATABASE_ID)
         result = []
 
         for item in items:
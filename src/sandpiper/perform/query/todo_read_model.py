@@ -0,0 +1,197 @@
+"""TODOの読み取りモデル
+
+TODOをメモリ上に保持し、ステータス・セクション・種別・コンテクスト・予定日・実施日・予定開始時刻の
+セカンダリインデックスで絞り込む。条件ごとのインデックスを小さい順に突き合わせるので、
+全件を走査せずに結果の件数に比例した時間で答えられる。
+読み取りモデルはリクエストとジョブワーカーのスレッドで共有されるので、操作はすべてロックの中で行う。
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from datetime import date, datetime, time
+
+from sandpiper.perform.domain.todo import ToDo
+from sandpiper.shared.valueobject.context import Context
+from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
+from sandpiper.shared.valueobject.todo_kind import ToDoKind
+from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
+
+
+class TodoReadModel:
+    """セカンダリインデックス付きのTODO読み取りモデル(スレッドセーフ)"""
+
+    def __init__(self, todos: Iterable[ToDo] = ()) -> None:
+        # upsert の中で remove を呼ぶので再入可能なロックにする
+        self._lock = threading.RLock()
+        self._todos: dict[str, ToDo] = {}
+        # 登録順を保つための連番(結果を元の並び順で返す)
+        self._order: dict[str, int] = {}
+        self._next_order = 0
+        self._by_status: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._by_section: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._by_kind: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._by_context: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._by_scheduled_date: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._by_log_date: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._scheduled: set[str] = set()
+        self._all_day: set[str] = set()
+        # (予定開始時刻の0時からの分, 登録順, ページID) の昇順リスト
+        self._by_scheduled_minutes: list[tuple[int, int, str]] = []
+        for todo in todos:
+            self.upsert(todo)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._todos)
+
+    def get(self, page_id: str) -> ToDo | None:
+        with self._lock:
+            return self._todos.get(page_id)
+
+    def upsert(self, todo: ToDo) -> None:
+        """TODOを追加・更新する"""
+        with self._lock:
+            self._upsert(todo)
+
+    def remove(self, page_id: str) -> None:
+        """TODOを取り除く(なければ何もしない)"""
+        with self._lock:
+            self._remove(page_id)
+
+    def _upsert(self, todo: ToDo) -> None:
+        if todo.id in self._todos:
+            self._remove(todo.id)
+        if todo.id not in self._order:
+            self._order[todo.id] = self._next_order
+            self._next_order += 1
+        self._todos[todo.id] = todo
+        for index, key in self._index_keys(todo):
+            index[key].add(todo.id)
+        scheduled_start = todo.scheduled_start_datetime
+        if scheduled_start is not None:
+            self._scheduled.add(todo.id)
+            if _is_all_day(scheduled_start):
+                self._all_day.add(todo.id)
+            bisect.insort(self._by_scheduled_minutes, (_minutes(scheduled_start), self._order[todo.id], todo.id))
+
+    def _remove(self, page_id: str) -> None:
+        todo = self._todos.pop(page_id, None)
+        if todo is None:
+            return
+        for index, key in self._index_keys(todo):
+            index[key].discard(page_id)
+            if not index[key]:
+                del index[key]
+        scheduled_start = todo.scheduled_start_datetime
+        if scheduled_start is not None:
+            self._scheduled.discard(page_id)
+            self._all_day.discard(page_id)
+            entry = (_minutes(scheduled_start), self._order[page_id], page_id)
+            position = bisect.bisect_left(self._by_scheduled_minutes, entry)
+            if position < len(self._by_scheduled_minutes) and self._by_scheduled_minutes[position] == entry:
+                del self._by_scheduled_minutes[position]
+
+    def find(
+        self,
+        status: ToDoStatusEnum | None = None,
+        section: TaskChuteSection | None = None,
+        kind: ToDoKind | None = None,
+        context: Context | None = None,
+        scheduled_on: date | None = None,
+        logged_on: date | None = None,
+        scheduled: bool = False,
+        all_day: bool = False,
+        scheduled_from: time | None = None,
+        scheduled_to: time | None = None,
+    ) -> list[ToDo]:
+        """すべての条件を満たすTODOを登録順で返す(条件を指定しなければ全件)
+
+        Args:
+            scheduled_on: 予定の開始日
+            logged_on: 実施期間の開始日
+            scheduled: 予定が設定されているもの
+            all_day: 終日予定(開始時刻が 00:00)のもの
+            scheduled_from: 予定開始時刻の下限(この時刻を含む)
+            scheduled_to: 予定開始時刻の上限(この時刻を含む)
+        """
+        with self._lock:
+            return self._find(
+                status=status,
+                section=section,
+                kind=kind,
+                context=context,
+                scheduled_on=scheduled_on,
+                logged_on=logged_on,
+                scheduled=scheduled,
+                all_day=all_day,
+                scheduled_from=scheduled_from,
+                scheduled_to=scheduled_to,
+            )
+
+    def _find(
+        self,
+        status: ToDoStatusEnum | None,
+        section: TaskChuteSection | None,
+        kind: ToDoKind | None,
+        context: Context | None,
+        scheduled_on: date | None,
+        logged_on: date | None,
+        scheduled: bool,
+        all_day: bool,
+        scheduled_from: time | None,
+        scheduled_to: time | None,
+    ) -> list[ToDo]:
+        candidates: list[set[str]] = []
+        for index, key in (
+            (self._by_status, status),
+            (self._by_section, section),
+            (self._by_kind, kind),
+            (self._by_context, context),
+            (self._by_scheduled_date, scheduled_on),
+            (self._by_log_date, logged_on),
+        ):
+            if key is not None:
+                candidates.append(index.get(key, set()))
+        if scheduled:
+            candidates.append(self._scheduled)
+        if all_day:
+            candidates.append(self._all_day)
+        if scheduled_from is not None or scheduled_to is not None:
+            candidates.append(self._scheduled_between(scheduled_from, scheduled_to))
+
+        if not candidates:
+            page_ids: set[str] | Iterable[str] = self._todos.keys()
+        else:
+            candidates.sort(key=len)
+            page_ids = candidates[0].intersection(*candidates[1:])
+        return [self._todos[page_id] for page_id in sorted(page_ids, key=self._order.__getitem__)]
+
+    def _scheduled_between(self, scheduled_from: time | None, scheduled_to: time | None) -> set[str]:
+        lower = (scheduled_from.hour * 60 + scheduled_from.minute) if scheduled_from is not None else 0
+        upper = (scheduled_to.hour * 60 + scheduled_to.minute) if scheduled_to is not None else 24 * 60
+        start = bisect.bisect_left(self._by_scheduled_minutes, (lower,))
+        end = bisect.bisect_left(self._by_scheduled_minutes, (upper + 1,))
+        return {page_id for _, _, page_id in self._by_scheduled_minutes[start:end]}
+
+    def _index_keys(self, todo: ToDo) -> list[tuple[defaultdict[Hashable, set[str]], Hashable]]:
+        keys: list[tuple[defaultdict[Hashable, set[str]], Hashable]] = [(self._by_status, todo.status)]
+        if todo.section is not None:
+            keys.append((self._by_section, todo.section))
+        if todo.kind is not None:
+            keys.append((self._by_kind, todo.kind))
+        keys.extend((self._by_context, context) for context in set(todo.contexts))
+        if todo.scheduled_start_datetime is not None:
+            keys.append((self._by_scheduled_date, todo.scheduled_start_datetime.date()))
+        if todo.log_start_datetime is not None:
+            keys.append((self._by_log_date, todo.log_start_datetime.date()))
+        return keys
+
+
+def _minutes(value: datetime) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _is_all_day(value: datetime) -> bool:
+    return value.hour == 0 and value.minute == 0
@@ -1,6 +1,9 @@
 from datetime import date, timedelta
+from typing import Any
 
+from sandpiper.plan.domain.todo import ToDo
 from sandpiper.plan.domain.todo_repository import TodoRepository
+from sandpiper.plan.query.block_children_loader import load_block_children
 from sandpiper.plan.query.project_task_dto import ProjectTaskDto
 from sandpiper.plan.query.project_task_query import ProjectTaskQuery
 from sandpiper.plan.query.project_task_rule import group_next_project_tasks_by_project
@@ -23,16 +26,28 @@ class CreateRepeatProjectTask:
 
         grouped_tasks = group_next_project_tasks_by_project(project_task_dtos)
 
+        # 選ばれたタスクのブロックだけをまとめて取得する
+        load_block_children(project_task.block_children for project_task in grouped_tasks.values())
+
         # プロジェクトタスクをToDoに変換(プロジェクトタスクのブロックもコピーする)
+        todos: list[ToDo] = []
+        options_list: list[dict[str, Any] | None] = []
         for project_task in grouped_tasks.values():
             todo = project_task.to_todo_model(basis_date)
             print(todo)
-            # ToDoを保存
-            options = {
-                "is_tomorrow": is_tomorrow,
-                "block_children": project_task.block_children,
-            }
-            _inserted_todo = self.todo_repository.save(todo, options)
+            todos.append(todo)
+            options_list.append(
+                {
+                    "is_tomorrow": is_tomorrow,
+                    "block_children": project_task.block_children.get(),
+                }
+            )
+        if not todos:
+            return
+
+        # ToDoをまとめて保存
+        self.todo_repository.save_many(todos, options_list)
+        for todo in todos:
             print(f"Create repeat project task: {todo.title}")
 
     @staticmethod
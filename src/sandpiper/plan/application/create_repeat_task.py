@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 from datetime import date, datetime
+from typing import Any
 
+from sandpiper.plan.domain.routine import Routine
 from sandpiper.plan.domain.routine_repository import RoutineRepository
 from sandpiper.plan.domain.todo import ToDo, ToDoKind
-from sandpiper.plan.domain.todo_repository import TodoRepository
+from sandpiper.plan.domain.todo_repository import SaveManyError, TodoRepository
+from sandpiper.plan.query.block_children_loader import load_block_children
 from sandpiper.plan.query.todo_query import TodoQuery
 from sandpiper.shared.utils.date_utils import JST
 
@@ -33,6 +36,9 @@ class CreateRepeatTask:
         routines = self.routine_repository.fetch()
         todos: list[ToDo] = self.todo_query.fetch_todos_not_is_today()
         todo_names = [todo.title for todo in todos]
+        new_todos: list[ToDo] = []
+        created_routines: list[Routine] = []
+        next_routines: list[Routine] = []
         for routine in routines:
             # 今日の日付以前のルーチンタスクのみ処理する
             if routine.date > basis_date:
@@ -63,11 +69,28 @@ class CreateRepeatTask:
                 scheduled_start_datetime=scheduled_start_datetime,
                 scheduled_end_datetime=scheduled_end_datetime,
             )
-            if not self.is_debug:
-                self.todo_repository.save(todo, {"block_children": routine.block_children})
+            new_todos.append(todo)
+            created_routines.append(routine)
+            next_routines.append(routine.next_cycle(basis_date=basis_date))
 
-            # Routineの次回実行日を更新する
-            routine = routine.next_cycle(basis_date=basis_date)
+        if self.is_debug or not new_todos:
+            return
+
+        # ブロックはTODOを作成するルーチンの分だけまとめて取得する
+        load_block_children(routine.block_children for routine in created_routines)
+        options_list: list[dict[str, Any] | None] = [
+            {"block_children": routine.block_children.get()} for routine in created_routines
+        ]
+        # TODOをまとめて作成し、作成できたらRoutineの次回実行日を更新する
+        try:
+            self.todo_repository.save_many(new_todos, options_list)
+        except SaveManyError as e:
+            # 作成できたTODOのRoutineだけ次回実行日を進めてから失敗を伝える(再実行で重複作成しないため)
+            self._update_routines([next_routines[i] for i in e.succeeded_indexes()])
+            raise
+        self._update_routines(next_routines)
+
+    def _update_routines(self, routines: list[Routine]) -> None:
+        for routine in routines:
             print(f"Update routine next date: {routine.title} -> {routine.date}")
-            if not self.is_debug:
-                self.routine_repository.update(routine)
+            self.routine_repository.update(routine)
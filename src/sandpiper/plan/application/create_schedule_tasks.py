@@ -69,7 +69,7 @@ class CreateScheduleTasks:
         existing_todos = self.todo_query.fetch_todos_not_is_today()
         existing_todo_names = [todo.title for todo in existing_todos]
 
-        created_count = 0
+        todos: list[ToDo] = []
         for event in events:
             # すでに同じタイトルのタスクが存在する場合はスキップ
             if event.name in existing_todo_names:
@@ -104,8 +104,10 @@ class CreateScheduleTasks:
                 f"Create schedule task: {event.name} (section: {section.value}, duration: {execution_time}min, sort: {sort_order})"
             )
 
-            if not self.is_debug:
-                self.todo_repository.save(todo)
-                created_count += 1
+            todos.append(todo)
 
-        return CreateScheduleTasksResult(created_count=created_count)
+        if self.is_debug or not todos:
+            return CreateScheduleTasksResult(created_count=0)
+
+        self.todo_repository.save_many(todos)
+        return CreateScheduleTasksResult(created_count=len(todos))
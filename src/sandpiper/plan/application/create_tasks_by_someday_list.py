@@ -4,7 +4,7 @@ from datetime import date
 from sandpiper.plan.domain.someday_item import SomedayItem
 from sandpiper.plan.domain.someday_repository import SomedayRepository
 from sandpiper.plan.domain.todo import ToDo, ToDoKind
-from sandpiper.plan.domain.todo_repository import TodoRepository
+from sandpiper.plan.domain.todo_repository import SaveManyError, TodoRepository
 
 
 @dataclass
@@ -35,31 +35,38 @@ class CreateTasksBySomedayList:
         # 「明日やる」にチェックの入っているアイテムを取得
         tomorrow_items = self._someday_repository.fetch_tomorrow_items()
 
-        created_titles: list[str] = []
+        if not tomorrow_items:
+            return CreateTasksBySomedayListResult(created_count=0, created_titles=[])
 
-        for item in tomorrow_items:
-            # TODOを作成(タスク種別は「単発」)
-            self._create_todo_from_someday_item(item, basis_date=basis_date)
-            created_titles.append(item.title)
+        # TODOをまとめて作成(タスク種別は「単発」)
+        todos = [self._to_todo(item, basis_date=basis_date) for item in tomorrow_items]
+        try:
+            self._todo_repository.save_many(todos)
+        except SaveManyError as e:
+            # 作成できたTODOの元アイテムだけ削除してから失敗を伝える(再実行で重複作成しないため)
+            for i in e.succeeded_indexes():
+                self._someday_repository.delete(tomorrow_items[i].id)
+            raise
 
-            # サムデイリストのアイテムを論理削除
+        # サムデイリストのアイテムを論理削除
+        for item in tomorrow_items:
             self._someday_repository.delete(item.id)
 
         return CreateTasksBySomedayListResult(
-            created_count=len(created_titles),
-            created_titles=created_titles,
+            created_count=len(tomorrow_items),
+            created_titles=[item.title for item in tomorrow_items],
         )
 
-    def _create_todo_from_someday_item(self, item: SomedayItem, basis_date: date | None = None) -> None:
-        """サムデイアイテムからTODOを作成
+    @staticmethod
+    def _to_todo(item: SomedayItem, basis_date: date | None = None) -> ToDo:
+        """サムデイアイテムからTODOを生成
 
         Args:
             item: サムデイアイテム
             basis_date: 処理基準日。TODOの「予定」プロパティに設定される。
         """
-        todo = ToDo(
+        return ToDo(
             title=item.title,
             kind=ToDoKind.SINGLE,
             scheduled_start_datetime=basis_date,
         )
-        self._todo_repository.save(todo)
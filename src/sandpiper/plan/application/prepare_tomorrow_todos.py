@@ -7,21 +7,44 @@
 4. ルーチンタスクからTODOを作成
 5. サムデイリストからTODOを作成
 6. カレンダーイベントからスケジュールタスクを作成
+
+スナップショットが渡された場合、実行中はTODOデータベースなどの取得結果を
+各ステップで共有し、データベースごとの全件取得を1回に抑える。
+
+3〜6は参照するデータベースが互いに重ならず、TODOデータベースへは追加のみを行うため、
+max_workers に2以上を指定するとスレッドプールで並行に実行する。
+3〜6の失敗は他のステップを止めず、ステップごとに結果へ記録する。
 """
 
-from dataclasses import dataclass
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from zoneinfo import ZoneInfo
 
 from sandpiper.perform.application.mark_remaining_todos_as_today import MarkRemainingTodosAsToday
 from sandpiper.plan.application.create_repeat_project_task import CreateRepeatProjectTask
 from sandpiper.plan.application.create_repeat_task import CreateRepeatTask
-from sandpiper.plan.application.create_schedule_tasks import CreateScheduleTasks
-from sandpiper.plan.application.create_tasks_by_someday_list import CreateTasksBySomedayList
+from sandpiper.plan.application.create_schedule_tasks import CreateScheduleTasks, CreateScheduleTasksResult
+from sandpiper.plan.application.create_tasks_by_someday_list import (
+    CreateTasksBySomedayList,
+    CreateTasksBySomedayListResult,
+)
 from sandpiper.shared.infrastructure.archive_deleted_pages import ArchiveDeletedPages
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
 
 JST = ZoneInfo("Asia/Tokyo")
 
+logger = logging.getLogger(__name__)
+
+STEP_PROJECT_TASK = "プロジェクトタスク"
+STEP_ROUTINE = "ルーチンタスク"
+STEP_SOMEDAY = "サムデイリスト"
+STEP_SCHEDULE = "スケジュール"
+
 
 @dataclass
 class PrepareTomorrowTodosResult:
@@ -32,6 +55,11 @@ class PrepareTomorrowTodosResult:
     marked_as_today_count: int
     someday_created_count: int
     schedule_created_count: int
+    step_errors: dict[str, str] = field(default_factory=dict)  # ステップ名 → エラーメッセージ
+
+    @property
+    def has_errors(self) -> bool:
+        return len(self.step_errors) > 0
 
     @property
     def summary(self) -> str:
@@ -45,6 +73,9 @@ class PrepareTomorrowTodosResult:
         message = f"{self.target_label}のTODOリストを作成しました"
         if details:
             message += f"({', '.join(details)})"
+        if self.step_errors:
+            errors = ", ".join(f"{step}: {error}" for step, error in self.step_errors.items())
+            message += f" ※失敗したステップ: {errors}"
         return message
 
 
@@ -52,6 +83,7 @@ class PrepareTomorrowTodos:
     """明日(または今日)のTODOリストを一括作成するユースケース
 
     日本時間18:00〜23:59は「明日」、00:00〜17:59は「今日」として扱う。
+    max_workers が1(デフォルト)の場合、各ステップは順番に実行する。
     """
 
     def __init__(
@@ -62,6 +94,8 @@ class PrepareTomorrowTodos:
         create_tasks_by_someday_list: CreateTasksBySomedayList,
         create_schedule_tasks: CreateScheduleTasks,
         archive_deleted_pages: ArchiveDeletedPages,
+        snapshot: NotionDatabaseSnapshot | None = None,
+        max_workers: int = 1,
     ) -> None:
         self._mark_remaining_todos_as_today = mark_remaining_todos_as_today
         self._create_repeat_project_task = create_repeat_project_task
@@ -69,6 +103,8 @@ class PrepareTomorrowTodos:
         self._create_tasks_by_someday_list = create_tasks_by_someday_list
         self._create_schedule_tasks = create_schedule_tasks
         self._archive_deleted_pages = archive_deleted_pages
+        self._snapshot = snapshot
+        self._max_workers = max_workers
 
     def execute(self, is_tomorrow: bool, basis_date: date) -> PrepareTomorrowTodosResult:
         """TODOリストを一括作成する
@@ -82,32 +118,66 @@ class PrepareTomorrowTodos:
         """
         target_label = "明日" if is_tomorrow else "今日"
 
-        # 1. 未完了タスクに「今日中にやる」フラグを付ける
-        mark_result = self._mark_remaining_todos_as_today.execute()
-
-        # 2. 論理削除されたページをアーカイブ
-        self._archive_deleted_pages.execute()
-
-        # 3. プロジェクトタスクからTODOを作成
-        self._create_repeat_project_task.execute(is_tomorrow=is_tomorrow)
-
-        # 4. ルーチンタスクからTODOを作成
-        self._create_repeat_task.execute(basis_date=basis_date)
-
-        # 5. サムデイリストからTODOを作成
-        someday_result = self._create_tasks_by_someday_list.execute(basis_date=basis_date)
-
-        # 6. カレンダーイベントからスケジュールタスクを作成
-        schedule_result = self._create_schedule_tasks.execute(target_date=basis_date)
-
+        with self._snapshot.activate() if self._snapshot is not None else nullcontext():
+            # 1. 未完了タスクに「今日中にやる」フラグを付ける
+            mark_result = self._mark_remaining_todos_as_today.execute()
+
+            # 2. 論理削除されたページをアーカイブ
+            self._archive_deleted_pages.execute()
+
+            # 3〜6. 各ソースからTODOを作成(並行実行可能)
+            results, step_errors = self._run_creation_steps(
+                {
+                    STEP_PROJECT_TASK: lambda: self._create_repeat_project_task.execute(is_tomorrow=is_tomorrow),
+                    STEP_ROUTINE: lambda: self._create_repeat_task.execute(basis_date=basis_date),
+                    STEP_SOMEDAY: lambda: self._create_tasks_by_someday_list.execute(basis_date=basis_date),
+                    STEP_SCHEDULE: lambda: self._create_schedule_tasks.execute(target_date=basis_date),
+                }
+            )
+
+        someday_result = results.get(STEP_SOMEDAY)
+        schedule_result = results.get(STEP_SCHEDULE)
         return PrepareTomorrowTodosResult(
             target_label=target_label,
             basis_date=basis_date,
             marked_as_today_count=mark_result.marked_count,
-            someday_created_count=someday_result.created_count,
-            schedule_created_count=schedule_result.created_count,
+            someday_created_count=(
+                someday_result.created_count if isinstance(someday_result, CreateTasksBySomedayListResult) else 0
+            ),
+            schedule_created_count=(
+                schedule_result.created_count if isinstance(schedule_result, CreateScheduleTasksResult) else 0
+            ),
+            step_errors=step_errors,
         )
 
+    def _run_creation_steps(self, steps: dict[str, Callable[[], object]]) -> tuple[dict[str, object], dict[str, str]]:
+        """TODO作成ステップを実行し、ステップごとの結果と失敗を集める
+
+        Returns:
+            (ステップ名 → 結果, ステップ名 → エラーメッセージ) のタプル
+        """
+        results: dict[str, object] = {}
+        errors: dict[str, str] = {}
+
+        def collect(name: str, run: Callable[[], object]) -> None:
+            try:
+                results[name] = run()
+            except Exception as e:
+                logger.exception("TODO作成ステップ(%s)に失敗しました", name)
+                errors[name] = str(e)
+
+        if self._max_workers <= 1:
+            for name, step in steps.items():
+                collect(name, step)
+            return results, errors
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            # スナップショットなどのContextVarをワーカースレッドへ引き継ぐ
+            futures = {name: executor.submit(copy_context().run, step) for name, step in steps.items()}
+            for name, future in futures.items():
+                collect(name, future.result)
+        return results, errors
+
     @staticmethod
     def resolve_params_from_now(now_hour: int, today: date) -> tuple[bool, date]:
         """現在時刻から is_tomorrow と basis_date を決定する
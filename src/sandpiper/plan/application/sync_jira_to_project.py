@@ -4,7 +4,7 @@ from sandpiper.plan.domain.project import InsertedProject, Project
 from sandpiper.plan.domain.project_repository import ProjectRepository
 from sandpiper.plan.domain.project_task import ProjectTask
 from sandpiper.plan.domain.project_task_repository import ProjectTaskRepository
-from sandpiper.plan.query.jira_ticket_dto import JiraTicketDto
+from sandpiper.plan.query.jira_ticket_dto import JiraFieldProfile, JiraTicketDto
 from sandpiper.plan.query.jira_ticket_query import JiraTicketQuery
 from sandpiper.shared.utils.date_utils import jst_today
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
@@ -58,6 +58,8 @@ class SyncJiraToProject:
             status="In Progress",
             assignee="currentUser()",
             max_results=100,
+            # 同期に使うのはキー・要約・ステータス・URLだけなので、説明文などは取得しない
+            profile=JiraFieldProfile.SYNC,
         )
 
         # Notion側のJira URL付きプロジェクトを一括取得
@@ -84,10 +86,16 @@ class SyncJiraToProject:
         completed_projects: list[InsertedProject] = []
         notion_only_projects: list[InsertedProject] = []
 
+        # チケットは key in (...) の検索でまとめて取得する(存在しないチケットは結果に含まれない)
+        candidate_issue_keys = {project.id: _issue_key(project) for project in notion_only_candidates}
+        candidate_tickets = (
+            self._jira_ticket_query.get_tickets(list(candidate_issue_keys.values()), profile=JiraFieldProfile.SYNC)
+            if candidate_issue_keys
+            else {}
+        )
+
         for project in notion_only_candidates:
-            assert project.jira_url is not None
-            issue_key = project.jira_url.split("/browse/")[-1]
-            ticket = self._jira_ticket_query.get_ticket(issue_key)
+            ticket = candidate_tickets.get(candidate_issue_keys[project.id])
             if ticket is None or ticket.status == "Done":
                 self._project_repository.update_status(project.id, ToDoStatusEnum.DONE)
                 completed_projects.append(project)
@@ -136,3 +144,8 @@ class SyncJiraToProject:
             notion_only_projects=notion_only_projects,
             completed_projects=completed_projects,
         )
+
+
+def _issue_key(project: InsertedProject) -> str:
+    assert project.jira_url is not None
+    return project.jira_url.split("/browse/")[-1]
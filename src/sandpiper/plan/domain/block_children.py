@@ -0,0 +1,34 @@
+from collections.abc import Callable
+from threading import Lock
+from typing import Any
+
+
+class BlockChildren:
+    """ページ本文のブロックを、必要になったときに一度だけ取得して保持するハンドル
+
+    ルーチンやプロジェクトタスクの一覧を取得した時点ではブロックを取得せず、
+    TODOとして作成するものだけ load_block_children() でまとめて取得する。
+    """
+
+    def __init__(self, loader: Callable[[], list[Any]] | None = None, blocks: list[Any] | None = None) -> None:
+        # loader がなければ取得済み(ブロックなし)として扱う
+        self._loader = loader
+        self._blocks = blocks if blocks is not None or loader is not None else []
+        self._lock = Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._blocks is not None
+
+    def get(self) -> list[Any]:
+        """ブロックを返す(初回のみ取得する)"""
+        with self._lock:
+            if self._blocks is None:
+                if self._loader is None:
+                    msg = "BlockChildren has neither blocks nor a loader"
+                    raise RuntimeError(msg)
+                self._blocks = self._loader()
+            return self._blocks
+
+    def __repr__(self) -> str:
+        return f"BlockChildren({len(self._blocks)} blocks)" if self._blocks is not None else "BlockChildren(not loaded)"
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
 from datetime import date as Date
 from datetime import time
-from typing import Any
 
+from sandpiper.plan.domain.block_children import BlockChildren
 from sandpiper.plan.domain.routine_cycle import RoutineCycle
 from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
 
@@ -15,7 +15,7 @@ class Routine:
     section: TaskChuteSection
     cycle: RoutineCycle
     execution_time: int | None = None
-    block_children: list[Any] = field(default_factory=list)
+    block_children: BlockChildren = field(default_factory=BlockChildren, compare=False)
     context: list[str] = field(default_factory=list)
     sort_order: str | None = None
     scheduled_start_time: time | None = None
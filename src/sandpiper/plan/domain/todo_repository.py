@@ -3,9 +3,35 @@ from typing import Any, Protocol
 from sandpiper.plan.domain.todo import InsertedToDo, ToDo
 
 
+class SaveManyError(Exception):
+    """save_many で一部のTODOの作成に失敗した
+
+    results は入力と同じ順序で、作成できたTODOは InsertedToDo、失敗したTODOは発生した例外を持つ。
+    """
+
+    def __init__(self, results: list[InsertedToDo | Exception]) -> None:
+        self.results = results
+        self.errors = [result for result in results if isinstance(result, Exception)]
+        super().__init__(f"{len(self.errors)}/{len(results)}件のTODOの作成に失敗しました: {self.errors}")
+
+    def succeeded_indexes(self) -> list[int]:
+        """作成に成功したTODOの入力上の位置"""
+        return [i for i, result in enumerate(self.results) if isinstance(result, InsertedToDo)]
+
+
 class TodoRepository(Protocol):
     def save(self, todo: ToDo, options: dict[str, Any] | None = None) -> InsertedToDo: ...
 
+    def save_many(
+        self, todos: list[ToDo], options_list: list[dict[str, Any] | None] | None = None
+    ) -> list[InsertedToDo]:
+        """複数のTODOをまとめて保存し、入力と同じ順序で返す
+
+        options_list を指定する場合は todos と同じ長さで、各TODOの options に対応する。
+        一部の作成に失敗した場合は、全件の作成を試みたうえで SaveManyError を送出する。
+        """
+        ...
+
     def fetch(self) -> list[ToDo]: ...
 
     def find(self, page_id: str) -> ToDo: ...
@@ -4,6 +4,7 @@ from lotion import BasePage, Lotion, notion_database
 from lotion.filter import Builder, Cond
 
 from sandpiper.plan.domain.project import InsertedProject, Project
+from sandpiper.shared.infrastructure.notion_project_directory import NotionProjectDirectory
 from sandpiper.shared.notion.databases import project as project_db
 from sandpiper.shared.notion.databases.project import (
     ProjectClaudeUrl,
@@ -91,12 +92,15 @@ class ProjectPage(BasePage):  # type: ignore[misc]
 
 
 class NotionProjectRepository:
-    def __init__(self) -> None:
+    def __init__(self, project_directory: NotionProjectDirectory | None = None) -> None:
         self.client = Lotion.get_instance()
+        # 一覧の取得はプロジェクトタスクのクエリなどと共有するキャッシュから読む
+        self._project_directory = project_directory or NotionProjectDirectory()
 
     def save(self, project: Project) -> InsertedProject:
         notion_project = ProjectPage.generate(project)
         page = self.client.create_page(notion_project)
+        self._project_directory.invalidate()
         return InsertedProject(
             id=page.id,
             name=project.name,
@@ -123,12 +127,8 @@ class NotionProjectRepository:
 
     def fetch_all_jira_urls(self) -> set[str]:
         """すべてのプロジェクトからJira URLの一覧を取得する"""
-        filter_param = Builder.create().add(ProjectJiraUrl, Cond.IS_NOT_EMPTY).build()
-        pages: list[ProjectPage] = self.client.retrieve_database(
-            database_id=project_db.DATABASE_ID, filter_param=filter_param, cls=ProjectPage
-        )
         jira_urls: set[str] = set()
-        for page in pages:
+        for page in self._project_directory.pages(cls=ProjectPage).values():
             jira_url_prop = page.get_url("Jira")
             if jira_url_prop and jira_url_prop.url:
                 jira_urls.add(jira_url_prop.url)
@@ -136,22 +136,19 @@ class NotionProjectRepository:
 
     def fetch_all(self) -> list[InsertedProject]:
         """すべてのプロジェクトを取得する"""
-        pages: list[ProjectPage] = self.client.retrieve_database(database_id=project_db.DATABASE_ID, cls=ProjectPage)
-        results: list[InsertedProject] = []
-        for page in pages:
-            try:
-                results.append(page.to_inserted())
-            except ValueError:
-                # start_dateが未設定のプロジェクトはスキップ
-                continue
-        return results
+        return self._to_inserted_list(list(self._project_directory.pages(cls=ProjectPage).values()))
 
     def fetch_projects_with_jira_url(self) -> list[InsertedProject]:
         """Jira URLを持つすべてのプロジェクトを取得する"""
-        filter_param = Builder.create().add(ProjectJiraUrl, Cond.IS_NOT_EMPTY).build()
-        pages: list[ProjectPage] = self.client.retrieve_database(
-            database_id=project_db.DATABASE_ID, filter_param=filter_param, cls=ProjectPage
-        )
+        pages = [
+            page
+            for page in self._project_directory.pages(cls=ProjectPage).values()
+            if (jira_url_prop := page.get_url("Jira")) and jira_url_prop.url
+        ]
+        return self._to_inserted_list(pages)
+
+    @staticmethod
+    def _to_inserted_list(pages: list[ProjectPage]) -> list[InsertedProject]:
         results: list[InsertedProject] = []
         for page in pages:
             try:
@@ -169,13 +166,16 @@ class NotionProjectRepository:
         page = self.client.retrieve_page(page_id, ProjectPage)
         page.set_prop(ProjectStatus.from_status_name(status.value))
         self.client.update(page)
+        self._project_directory.invalidate()
 
     def update_name(self, page_id: str, name: str) -> None:
         page = self.client.retrieve_page(page_id, ProjectPage)
         page.set_prop(ProjectName.from_plain_text(name))
         self.client.update(page)
+        self._project_directory.invalidate()
 
     def update_end_date(self, page_id: str, end_date: date) -> None:
         page = self.client.retrieve_page(page_id, ProjectPage)
         page.set_prop(ProjectEndDate.from_start_date(end_date))
         self.client.update(page)
+        self._project_directory.invalidate()
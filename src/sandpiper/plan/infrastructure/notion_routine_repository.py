@@ -1,19 +1,32 @@
+from functools import partial
+
 from lotion import Lotion
+from lotion.block import Block
 
+from sandpiper.plan.domain.block_children import BlockChildren
 from sandpiper.plan.domain.routine import Routine
 from sandpiper.plan.domain.routine_cycle import RoutineCycle
 from sandpiper.plan.domain.routine_repository import RoutineRepository
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import routine as routine_db
 from sandpiper.shared.notion.databases.routine import RoutineNextDate
 from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
 
 
 class NotionRoutineRepository(RoutineRepository):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        replica: NotionDatabaseReplica | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+    ) -> None:
         self.client = Lotion.get_instance()
+        # レプリカがあれば差分同期したローカルのデータを読む
+        self._reader: Lotion | NotionDatabaseReplica = replica if replica is not None else self.client
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
 
     def fetch(self) -> list[Routine]:
-        items = self.client.retrieve_database(routine_db.DATABASE_ID)
+        items = self._reader.retrieve_database(routine_db.DATABASE_ID)
         routines = []
         for item in items:
             start_date = item.get_date("次回実行日").start_date
@@ -36,7 +49,8 @@ class NotionRoutineRepository(RoutineRepository):
                 section=TaskChuteSection(section_name),
                 cycle=RoutineCycle(cycle),
                 execution_time=int(execution_time) if execution_time else None,
-                block_children=item.block_children,
+                # ブロックはTODOを作成するルーチンだけ後から取得する
+                block_children=BlockChildren(loader=partial(self._list_blocks, item.id)),
                 context=context,
                 sort_order=sort_order,
                 scheduled_start_time=scheduled_start_time,
@@ -45,6 +59,9 @@ class NotionRoutineRepository(RoutineRepository):
             routines.append(routine)
         return routines
 
+    def _list_blocks(self, page_id: str) -> list[Block]:
+        return self._rate_limiter.call(partial(self.client.list_blocks, page_id))
+
     def update(self, routine: Routine) -> None:
         # Use update_page directly to avoid redundant retrieve_page API call
         self.client.update_page(routine.id, [RoutineNextDate.from_start_date(routine.date)])
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
 from typing import Any
 
 from lotion import BasePage, Lotion, notion_database
@@ -5,6 +7,9 @@ from lotion.block import Block
 from lotion.block.rich_text.rich_text_builder import RichTextBuilder
 
 from sandpiper.plan.domain.todo import InsertedToDo, ToDo, ToDoKind, ToDoStatus
+from sandpiper.plan.domain.todo_repository import SaveManyError
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import todo as todo_db
 from sandpiper.shared.notion.databases.todo import (
     TodoClaudeUrl,
@@ -94,15 +99,31 @@ class TodoPage(BasePage):
 
 
 class NotionTodoRepository:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        snapshot: NotionDatabaseSnapshot | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+        max_workers: int = 3,
+    ) -> None:
         self.client = Lotion.get_instance()
+        self._snapshot = snapshot
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+        self._max_workers = max_workers
 
     def save(self, todo: ToDo, options: dict[str, Any] | None = None) -> InsertedToDo:
         options = options or {}
-        # Use pre-fetched block_children from options if available, avoiding redundant API call
-        blocks = options.get("block_children") or self._get_blocks_from_other_pages(todo)
+        # Use pre-fetched block_children from options if available (even if empty), avoiding redundant API call
+        blocks = options["block_children"] if "block_children" in options else self._get_blocks_from_other_pages(todo)
         notion_todo = TodoPage.generate(todo, options=options, blocks=blocks)
-        page = self.client.create_page(notion_todo)
+        # ページ作成・ブロック追加・作成後の再取得でおおよそ2〜3リクエストになる。
+        # 再試行はページ作成自体が429で拒否された場合のみ(作成後の処理で429になった場合に重複作成しないため)
+        page = self._rate_limiter.call(
+            lambda: self.client.create_page(notion_todo),
+            cost=3 if blocks else 2,
+            should_retry=lambda e: e.database_id is not None,
+        )
+        if self._snapshot is not None:
+            self._snapshot.put(todo_db.DATABASE_ID, page)
         return InsertedToDo(
             id=page.id,
             title=todo.title,
@@ -115,6 +136,41 @@ class NotionTodoRepository:
             claude_url=todo.claude_url,
         )
 
+    def save_many(
+        self, todos: list[ToDo], options_list: list[dict[str, Any] | None] | None = None
+    ) -> list[InsertedToDo]:
+        """複数のTODOを並行して作成する
+
+        リクエストはレートリミッターで平均3件/秒程度に抑え、429は Retry-After に従って再試行する。
+        戻り値は入力と同じ順序。いずれかの作成に失敗した場合も残りの作成は中断せず、
+        全件の処理を終えてから各TODOの成否を持つ SaveManyError を送出する。
+        """
+        if options_list is None:
+            options_list = [None] * len(todos)
+        if len(options_list) != len(todos):
+            raise ValueError("options_list must have the same length as todos")
+        if not todos:
+            return []
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [
+                executor.submit(copy_context().run, self.save, todo, options)
+                for todo, options in zip(todos, options_list, strict=True)
+            ]
+            wait(futures)
+        results: list[InsertedToDo | Exception] = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif isinstance(error, Exception):
+                results.append(error)
+            else:
+                raise error
+        inserted = [result for result in results if isinstance(result, InsertedToDo)]
+        if len(inserted) != len(results):
+            raise SaveManyError(results)
+        return inserted
+
     def fetch(self) -> list[ToDo]:
         notion_pages = self.client.search_pages(
             cls=TodoPage, props=[TodoStatus.from_status_name(ToDoStatus.TODO.value)]
@@ -129,6 +185,6 @@ class NotionTodoRepository:
         page_id = todo.routine_page_id or todo.project_task_page_id
         if not page_id:
             return []
-        page = self.client.retrieve_page(page_id)
+        page = self._rate_limiter.call(lambda: self.client.retrieve_page(page_id))
         blocks: list[Block] = page.block_children
         return blocks
@@ -0,0 +1,21 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from sandpiper.plan.domain.block_children import BlockChildren
+
+
+def load_block_children(handles: Iterable[BlockChildren], max_workers: int = 3) -> None:
+    """未取得のハンドルのブロックを並行して取得する
+
+    ルーチンやプロジェクトタスクの一覧からTODOを作成するものが決まった後に、その分だけまとめて呼ぶ。
+    """
+    pending = [handle for handle in handles if not handle.is_loaded]
+    if len(pending) <= 1:
+        for handle in pending:
+            handle.get()
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        futures = [executor.submit(copy_context().run, handle.get) for handle in pending]
+        for future in futures:
+            future.result()
@@ -1,8 +1,55 @@
 from dataclasses import dataclass
 from datetime import datetime
+from enum import StrEnum
 from typing import Any
 
 
+class JiraFieldProfile(StrEnum):
+    """チケットを取得するときに問い合わせる項目の組
+
+    問い合わせなかった項目は JiraTicketDto で None になる。
+    """
+
+    # キー・要約・種別・ステータス(URLはキーから組み立てる)
+    MINIMAL = "minimal"
+    # 一覧表示用(MINIMAL + 担当者)
+    LIST = "list"
+    # プロジェクト同期用(MINIMAL + 作成・更新日時)
+    SYNC = "sync"
+    # JiraTicketDto のすべての項目(説明文などの大きな項目を含む)
+    FULL = "full"
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return _PROFILE_FIELDS[self]
+
+
+_MINIMAL_FIELDS = ("key", "summary", "issuetype", "status")
+_PROFILE_FIELDS: dict[JiraFieldProfile, tuple[str, ...]] = {
+    JiraFieldProfile.MINIMAL: _MINIMAL_FIELDS,
+    JiraFieldProfile.LIST: (*_MINIMAL_FIELDS, "assignee"),
+    JiraFieldProfile.SYNC: (*_MINIMAL_FIELDS, "created", "updated"),
+    JiraFieldProfile.FULL: (
+        *_MINIMAL_FIELDS,
+        "priority",
+        "assignee",
+        "reporter",
+        "created",
+        "updated",
+        "duedate",
+        "description",
+        "labels",
+        "fixVersions",
+        "components",
+        "parent",
+        "customfield_10020",
+        "customfield_10016",
+        "customfield_10014",
+        "customfield_10328",
+    ),
+}
+
+
 @dataclass(frozen=True)
 class JiraTicketDto:
     issue_key: str
@@ -1,11 +1,25 @@
+import math
 import os
+import re
+import time
+from collections.abc import Callable
 from datetime import datetime
+from itertools import batched
 from typing import Any, Protocol
 
 import requests
 from requests import Session
 
-from sandpiper.plan.query.jira_ticket_dto import JiraTicketDto
+from sandpiper.plan.query.jira_ticket_dto import JiraFieldProfile, JiraTicketDto
+from sandpiper.shared.infrastructure.http_transport import HttpTransport
+from sandpiper.shared.infrastructure.jira_issue_cache import JiraIssueCache
+
+# 差分で取り直すときは前回の同期時刻より少し前から問い合わせる(JQLの日時は分単位のため)
+DELTA_MARGIN_MINUTES = 2
+# キャッシュした検索結果を全件取得し直す間隔(差分では削除されたチケットに気づけないため)
+DEFAULT_FULL_SYNC_INTERVAL_SECONDS = 24 * 60 * 60
+# key in (...) で一度に問い合わせるチケット数
+KEY_BATCH_SIZE = 50
 
 
 class JiraTicketQuery(Protocol):
@@ -17,13 +31,35 @@ class JiraTicketQuery(Protocol):
         status: str | None = None,
         assignee: str | None = None,
         max_results: int = 50,
+        profile: JiraFieldProfile = JiraFieldProfile.FULL,
     ) -> list[JiraTicketDto]: ...
 
-    def get_ticket(self, issue_key: str) -> JiraTicketDto | None: ...
+    def get_ticket(self, issue_key: str, profile: JiraFieldProfile = JiraFieldProfile.FULL) -> JiraTicketDto | None: ...
+
+    def get_tickets(
+        self, issue_keys: list[str], profile: JiraFieldProfile = JiraFieldProfile.FULL
+    ) -> dict[str, JiraTicketDto]: ...
 
 
 class RestApiJiraTicketQuery(JiraTicketQuery):
-    def __init__(self, base_url: str | None = None, username: str | None = None, api_token: str | None = None) -> None:
+    """Jira REST API でチケットを検索するクエリ
+
+    cache を渡すと、条件を指定した検索(JQLを直接渡さない検索)の結果をキャッシュし、
+    2回目以降は前回の同期以降に更新されたチケットだけを問い合わせる。
+    リクエストは HttpTransport を通す(タイムアウト・再試行・コネクションプール)。
+    profile で問い合わせる項目を絞ると、応答が小さくなり解析する項目も減る。
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        username: str | None = None,
+        api_token: str | None = None,
+        cache: JiraIssueCache | None = None,
+        full_sync_interval: float = DEFAULT_FULL_SYNC_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time,
+        transport: HttpTransport | None = None,
+    ) -> None:
         self.base_url = base_url or os.getenv("BUSINESS_JIRA_BASE_URL", "https://jira.atlassian.com")
 
         username = username or os.getenv("BUSINESS_JIRA_USERNAME")
@@ -33,10 +69,14 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
             msg = "BUSINESS_JIRA_USERNAME and BUSINESS_JIRA_API_TOKEN must be set"
             raise ValueError(msg)
 
-        self.session = Session()
+        self._transport = transport or HttpTransport(session=Session())
+        self.session = self._transport.session
         self.session.auth = (username, api_token)
         self.session.headers.update({"Accept": "application/json"})
         self.default_project = os.getenv("BUSINESS_JIRA_PROJECT")
+        self._cache = cache
+        self._full_sync_interval = full_sync_interval
+        self._clock = clock
 
     def search_tickets(
         self,
@@ -46,24 +86,110 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
         status: str | None = None,
         assignee: str | None = None,
         max_results: int = 50,
+        profile: JiraFieldProfile = JiraFieldProfile.FULL,
     ) -> list[JiraTicketDto]:
         # Build JQL if not provided
         if not jql:
             jql = self._build_jql(project, issue_type, status, assignee)
+            if self._cache is not None:
+                return self._search_cached(self._cache, jql, max_results, profile)
 
+        return [self._parse_issue(issue, profile) for issue in self._search_issues(jql, max_results, profile)]
+
+    def _search_cached(
+        self, cache: JiraIssueCache, jql: str, max_results: int, profile: JiraFieldProfile
+    ) -> list[JiraTicketDto]:
+        """キャッシュを差分で最新化してから検索結果を返す
+
+        条件から組み立てたJQLは常に作成日時の降順なので、キャッシュから返すときも同じ順に並べる。
+        並べ替えに使うため、profile に含まれなくても作成日時は必ず問い合わせてキャッシュする。
+        """
+        now = self._clock()
+        cached = cache.search(jql, _cached_fields_param(profile))
+        if cached is None or not cached.complete or now - cached.full_synced_at >= self._full_sync_interval:
+            self._full_sync(cache, jql, max_results, profile, now)
+        else:
+            try:
+                self._delta_sync(cache, jql, cached.issue_keys, max_results, profile, now - cached.synced_at, now)
+            except requests.HTTPError as e:
+                # キャッシュ済みのチケットが削除されていると key in (...) がエラーになるので全件を取り直す
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                self._full_sync(cache, jql, max_results, profile, now)
+
+        issues = cache.issues(jql, _cached_fields_param(profile))
+        issues.sort(key=self._created_timestamp, reverse=True)
+        return [self._parse_issue(issue, profile) for issue in issues[:max_results]]
+
+    def _created_timestamp(self, issue: dict[str, Any]) -> float:
+        created = self._parse_datetime(issue.get("fields", {}).get("created"))
+        return created.timestamp() if created else 0.0
+
+    def _full_sync(
+        self, cache: JiraIssueCache, jql: str, max_results: int, profile: JiraFieldProfile, now: float
+    ) -> None:
+        fields = _cached_fields_param(profile)
+        issues = self._search_issues(jql, max_results, fields=fields)
+        cache.replace_search(jql, fields, issues, complete=len(issues) < max_results, synced_at=now)
+
+    def _delta_sync(
+        self,
+        cache: JiraIssueCache,
+        jql: str,
+        cached_keys: list[str],
+        max_results: int,
+        profile: JiraFieldProfile,
+        elapsed_seconds: float,
+        now: float,
+    ) -> None:
+        """前回の同期以降に更新されたチケットだけを問い合わせて反映する
+
+        条件に合うチケットを updated で絞り込んで取得し、キャッシュ済みのチケットのうち
+        更新されたのにその結果に含まれないもの(ステータスが変わった等)を検索結果から外す。
+        """
+        condition, order_by = _split_order_by(jql)
+        # 相対指定(-Nm)ならJiraのユーザー設定のタイムゾーンに左右されない
+        minutes = math.ceil(max(elapsed_seconds, 0.0) / 60) + DELTA_MARGIN_MINUTES
+        updated_since = f"updated >= -{minutes}m"
+        fields = _cached_fields_param(profile)
+        changed = self._search_issues(
+            f"({condition}) AND {updated_since} {order_by}" if condition else f"{updated_since} {order_by}",
+            max_results,
+            fields=fields,
+        )
+        if len(changed) >= max_results:
+            # 更新が多すぎて打ち切られた場合は全件を取り直す
+            self._full_sync(cache, jql, max_results, profile, now)
+            return
+        changed_keys = {issue["key"] for issue in changed}
+        removed_keys: list[str] = []
+        for chunk in batched(cached_keys, KEY_BATCH_SIZE):
+            rechecked = self._search_issues(
+                f"{_key_in(chunk)} AND {updated_since}", max_results=len(chunk), fields="key"
+            )
+            removed_keys.extend(issue["key"] for issue in rechecked if issue["key"] not in changed_keys)
+        cache.merge_search(jql, fields, changed, removed_keys, synced_at=now)
+
+    def _search_issues(
+        self,
+        jql: str,
+        max_results: int,
+        profile: JiraFieldProfile = JiraFieldProfile.FULL,
+        fields: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """JQLで検索し、チケットの生データを返す(ページネーションは内部で処理する)"""
         # Use new /search/jql endpoint (old /search was deprecated and removed)
         url = f"{self.base_url}/rest/api/3/search/jql"
         params: dict[str, str | int] = {
             "jql": jql,
             "maxResults": min(max_results, 100),  # JIRA limit
-            "fields": "key,summary,issuetype,status,priority,assignee,reporter,created,updated,duedate,description,labels,fixVersions,components,parent,customfield_10020,customfield_10016,customfield_10014,customfield_10328",
+            "fields": fields or _fields_param(profile),
         }
 
-        tickets: list[JiraTicketDto] = []
-        total_fetched = 0
+        issues: list[dict[str, Any]] = []
         next_page_token: str | None = None
 
-        while total_fetched < max_results:
+        while len(issues) < max_results:
             # Use nextPageToken for pagination (startAt is deprecated)
             if next_page_token:
                 params["nextPageToken"] = next_page_token
@@ -71,7 +197,7 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
                 del params["nextPageToken"]
 
             try:
-                response = self.session.get(url, params=params)
+                response = self._transport.get(url, params=params)
                 response.raise_for_status()
             except requests.HTTPError as e:
                 # Include response body for debugging
@@ -85,39 +211,65 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
                 raise requests.HTTPError(error_msg, response=e.response)
 
             data = response.json()
-            issues = data.get("issues", [])
+            page = data.get("issues", [])
 
-            if not issues:
+            if not page:
                 break
 
-            for issue in issues:
-                ticket = self._parse_issue(issue)
-                tickets.append(ticket)
-                total_fetched += 1
-
-                if total_fetched >= max_results:
-                    break
+            issues.extend(page[: max_results - len(issues)])
 
             # Check if there are more results using nextPageToken
             next_page_token = data.get("nextPageToken")
             if not next_page_token or data.get("isLast", True):
                 break
 
-        return tickets
+        return issues
 
-    def get_ticket(self, issue_key: str) -> JiraTicketDto | None:
+    def get_ticket(self, issue_key: str, profile: JiraFieldProfile = JiraFieldProfile.FULL) -> JiraTicketDto | None:
         url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
 
         try:
-            response = self.session.get(url)
+            response = self._transport.get(url, params={"fields": _fields_param(profile)})
             response.raise_for_status()
             data = response.json()
-            return self._parse_issue(data)
+            return self._parse_issue(data, profile)
         except requests.HTTPError as e:
             if e.response.status_code == 404:
                 return None
             raise
 
+    def get_tickets(
+        self, issue_keys: list[str], profile: JiraFieldProfile = JiraFieldProfile.FULL
+    ) -> dict[str, JiraTicketDto]:
+        """複数のチケットを key in (...) の検索でまとめて取得する
+
+        Returns:
+            指定したキーとチケットのマップ。移動・リネームされたチケットも指定したキーで引ける。
+            存在しない(削除された・権限がない)チケットは含まない
+        """
+        tickets: dict[str, JiraTicketDto] = {}
+        for chunk in batched(dict.fromkeys(issue_keys), KEY_BATCH_SIZE):
+            try:
+                issues = self._search_issues(_key_in(chunk), max_results=len(chunk), profile=profile)
+            except requests.HTTPError as e:
+                # 存在しないキーが含まれるとJQLがエラーになるので、1件ずつ取り直す
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                issues = []
+            for issue in issues:
+                ticket = self._parse_issue(issue, profile)
+                if ticket.issue_key in chunk:
+                    tickets[ticket.issue_key] = ticket
+            # 移動・リネームされたチケットは新しいキーで返るので、見つからなかったキーは1件ずつ取り直す
+            # (課題の取得APIは旧キーでも移動先のチケットを返す)
+            for issue_key in chunk:
+                if issue_key in tickets:
+                    continue
+                found = self.get_ticket(issue_key, profile)
+                if found is not None:
+                    tickets[issue_key] = found
+        return tickets
+
     def _build_jql(
         self,
         project: str | None = None,
@@ -153,26 +305,39 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
         jql = " AND ".join(conditions) if conditions else ""
         return jql + " ORDER BY created DESC" if jql else "ORDER BY created DESC"
 
-    def _parse_issue(self, issue: dict[str, Any]) -> JiraTicketDto:
+    def _parse_issue(self, issue: dict[str, Any], profile: JiraFieldProfile = JiraFieldProfile.FULL) -> JiraTicketDto:
+        """チケットの生データを変換する(profile で問い合わせなかった項目は解析せず None のままにする)"""
         fields = issue.get("fields", {})
+        requested = profile.fields
 
         # Parse basic fields
         issue_key = issue.get("key", "")
         summary = fields.get("summary", "")
         issue_type = fields.get("issuetype", {}).get("name", "")
         status = fields.get("status", {}).get("name", "")
-        priority = fields.get("priority", {}).get("name") if fields.get("priority") else None
+        # Build URL
+        url = f"{self.base_url}/browse/{issue_key}"
 
-        # Parse people
         assignee_field = fields.get("assignee")
         assignee = assignee_field.get("displayName") if assignee_field else None
+        created = self._parse_datetime(fields.get("created")) if "created" in requested else None
+        updated = self._parse_datetime(fields.get("updated")) if "updated" in requested else None
+
+        if profile is not JiraFieldProfile.FULL:
+            return JiraTicketDto(
+                issue_key=issue_key,
+                summary=summary,
+                issue_type=issue_type,
+                status=status,
+                assignee=assignee,
+                created=created,
+                updated=updated,
+                url=url,
+            )
 
+        priority = fields.get("priority", {}).get("name") if fields.get("priority") else None
         reporter_field = fields.get("reporter")
         reporter = reporter_field.get("displayName") if reporter_field else None
-
-        # Parse dates
-        created = self._parse_datetime(fields.get("created"))
-        updated = self._parse_datetime(fields.get("updated"))
         due_date = self._parse_datetime(fields.get("duedate"))
 
         # Parse other fields
@@ -191,9 +356,6 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
         parent_key = parent.get("key") if parent else None
         github_issue = fields.get("customfield_10328")
 
-        # Build URL
-        url = f"{self.base_url}/browse/{issue_key}"
-
         return JiraTicketDto(
             issue_key=issue_key,
             summary=summary,
@@ -228,6 +390,32 @@ class RestApiJiraTicketQuery(JiraTicketQuery):
             return None
 
 
+def _split_order_by(jql: str) -> tuple[str, str]:
+    """JQLを条件と ORDER BY 句に分ける"""
+    match = re.search(r"\border\s+by\b", jql, flags=re.IGNORECASE)
+    if match is None:
+        return jql.strip(), ""
+    return jql[: match.start()].strip(), jql[match.start() :].strip()
+
+
+def _fields_param(profile: JiraFieldProfile) -> str:
+    return ",".join(profile.fields)
+
+
+def _cached_fields_param(profile: JiraFieldProfile) -> str:
+    """キャッシュする検索で問い合わせる項目
+
+    並べ替えに使う作成日時と、キャッシュが変更を検知するのに使う更新日時を必ず含める。
+    """
+    extra = tuple(field for field in ("created", "updated") if field not in profile.fields)
+    return ",".join((*profile.fields, *extra))
+
+
+def _key_in(issue_keys: tuple[str, ...]) -> str:
+    keys = ", ".join(f'"{key}"' for key in issue_keys)
+    return f"key in ({keys})"
+
+
 if __name__ == "__main__":
     # uv run python -m src.sandpiper.plan.query.jira_ticket_query
     jira_query = RestApiJiraTicketQuery()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import date, datetime, time
-from typing import Any
 
+from sandpiper.plan.domain.block_children import BlockChildren
 from sandpiper.plan.domain.todo import ToDo, ToDoKind
 from sandpiper.shared.utils.date_utils import JST
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
@@ -14,7 +14,7 @@ class ProjectTaskDto:
     status: ToDoStatusEnum
     project_page_id: str
     is_next: bool
-    block_children: list[Any] = field(default_factory=list)
+    block_children: BlockChildren = field(default_factory=BlockChildren, compare=False)
     context: list[str] = field(default_factory=list)
     sort_order: str | None = None
     scheduled_start_time: time | None = None
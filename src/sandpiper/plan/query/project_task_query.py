@@ -1,11 +1,18 @@
 from dataclasses import dataclass
+from functools import partial
 from typing import Protocol
 
-from lotion import Lotion
+from lotion import BasePage, Lotion
+from lotion.block import Block
+from lotion.filter import Builder, Cond
 
+from sandpiper.plan.domain.block_children import BlockChildren
 from sandpiper.plan.query.project_task_dto import ProjectTaskDto
-from sandpiper.shared.notion.databases import project as project_db
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.infrastructure.notion_project_directory import NotionProjectDirectory
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import project_task as project_task_db
+from sandpiper.shared.notion.databases.project_task import ProjectTaskProjectProp, ProjectTaskStatus
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
 
 
@@ -22,14 +29,23 @@ class ProjectTaskQuery(Protocol):
 
 
 class NotionProjectTaskQuery(ProjectTaskQuery):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        replica: NotionDatabaseReplica | None = None,
+        project_directory: NotionProjectDirectory | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+    ) -> None:
         self.client = Lotion.get_instance()
+        # レプリカがあれば差分同期したローカルのデータを読む
+        self._replica = replica
+        self._project_directory = project_directory or NotionProjectDirectory(replica=replica)
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
 
     def fetch_undone_project_tasks(self) -> list[ProjectTaskDto]:
-        # プロジェクト情報(ステータス、Jira URL有無)を取得してキャッシュ
+        # プロジェクト情報(ステータス、Jira URL有無)は共有キャッシュから引く
         project_info_map = self._fetch_project_info_map()
 
-        items = self.client.retrieve_database(project_task_db.DATABASE_ID)
+        items = self._fetch_undone_items()
         project_dtos = []
         for item in items:
             status = ToDoStatusEnum(item.get_status("ステータス").status_name)
@@ -60,7 +76,8 @@ class NotionProjectTaskQuery(ProjectTaskQuery):
                 status=status,
                 project_page_id=project_page_id,
                 is_next=is_next,
-                block_children=item.block_children,
+                # ブロックはTODOを作成するタスクだけ後から取得する
+                block_children=BlockChildren(loader=partial(self._list_blocks, item.id)),
                 context=context,
                 sort_order=sort_order,
                 scheduled_start_time=scheduled_start_time,
@@ -70,11 +87,28 @@ class NotionProjectTaskQuery(ProjectTaskQuery):
             project_dtos.append(project_task)
         return project_dtos
 
+    def _list_blocks(self, page_id: str) -> list[Block]:
+        return self._rate_limiter.call(partial(self.client.list_blocks, page_id))
+
+    def _fetch_undone_items(self) -> list[BasePage]:
+        """未完了でプロジェクトが紐づいているプロジェクトタスクを取得する
+
+        Notionに問い合わせる場合はフィルタで絞り込む。レプリカはローカルにあるので全件を読み、呼び出し側で絞り込む。
+        """
+        if self._replica is not None:
+            return self._replica.retrieve_database(project_task_db.DATABASE_ID)
+        filter_param = (
+            Builder.create()
+            .add(ProjectTaskStatus.from_status_name(ToDoStatusEnum.DONE.value), Cond.DOES_NOT_EQUAL)
+            .add(ProjectTaskProjectProp, Cond.IS_NOT_EMPTY)
+            .build()
+        )
+        return self.client.retrieve_database(database_id=project_task_db.DATABASE_ID, filter_param=filter_param)
+
     def _fetch_project_info_map(self) -> dict[str, ProjectInfo]:
         """プロジェクトIDとプロジェクト情報のマップを取得する"""
-        items = self.client.retrieve_database(project_db.DATABASE_ID)
         result: dict[str, ProjectInfo] = {}
-        for item in items:
+        for item in self._project_directory.pages(cls=BasePage).values():
             status_prop = item.get_status("ステータス")
             status = ToDoStatusEnum(status_prop.status_name) if status_prop.status_name else None
             jira_url_prop = item.get_url("Jira")
@@ -3,6 +3,7 @@ from typing import Protocol
 from lotion import Lotion
 
 from sandpiper.plan.domain.todo import ToDo, ToDoKind
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
 from sandpiper.shared.notion.databases import todo as todo_db
 from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
@@ -15,12 +16,16 @@ class TodoQuery(Protocol):
 
 
 class NotionTodoQuery(TodoQuery):
-    def __init__(self) -> None:
+    def __init__(self, snapshot: NotionDatabaseSnapshot | None = None) -> None:
         self.client = Lotion.get_instance()
+        self._snapshot = snapshot
 
     def fetch_todos_not_is_today(self) -> list[ToDo]:
         """'今日中にやる'が無効かつTODOステータスのTODO一覧を取得する"""
-        items = self.client.retrieve_database(todo_db.DATABASE_ID)
+        if self._snapshot is not None:
+            items = self._snapshot.retrieve_database(todo_db.DATABASE_ID)
+        else:
+            items = self.client.retrieve_database(todo_db.DATABASE_ID)
         result: list[ToDo] = []
         for item in items:
             status = ToDoStatusEnum(item.get_status("ステータス").status_name)
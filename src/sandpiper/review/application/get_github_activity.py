@@ -2,7 +2,7 @@
 
 from datetime import UTC, datetime
 
-from sandpiper.review.query.github_activity_dto import GitHubActivityDto
+from sandpiper.review.query.github_activity_dto import GitHubActivityDto, GitHubActivityRangeDto
 from sandpiper.review.query.github_activity_query import GitHubActivityQuery
 
 
@@ -40,3 +40,26 @@ class GetGitHubActivity:
             username=username,
             target_date=target_date,
         )
+
+    def execute_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        username: str = "koboriakira",
+    ) -> GitHubActivityRangeDto:
+        """
+        期間のGitHub活動ログを日ごとに取得して返す
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日(この日を含む)
+            username: GitHubユーザー名(デフォルト: koboriakira)
+
+        Returns:
+            日ごとのGitHub活動ログと期間全体のサマリー
+        """
+        return self.github_activity_query.fetch_activity_range(
+            username=username,
+            start_date=start_date,
+            end_date=end_date,
+        )
@@ -1,3 +1,4 @@
+import heapq
 from datetime import date
 
 from sandpiper.review.query.activity_log_item import ActivityLogItem
@@ -6,6 +7,11 @@ from sandpiper.review.query.todo_query import TodoQuery
 
 
 class GetTodoLog:
+    """完了したTODOとカレンダーイベントを開始時刻の順に並べた活動ログを返す
+
+    どちらのクエリも開始時刻の昇順で返すので、並べ直さずにヒープマージで1本にする。
+    """
+
     def __init__(self, todo_query: TodoQuery, calendar_query: CalendarQuery) -> None:
         self.todo_query = todo_query
         self.calendar_query = calendar_query
@@ -18,9 +24,15 @@ class GetTodoLog:
         # カレンダーイベントを取得
         calendar_events = self.calendar_query.fetch_events_by_date(target_date)
 
-        # TODOとカレンダーイベントを統合
-        all_items = todos + calendar_events
+        # 開始時刻の昇順に統合(同じ開始時刻ならTODOが先)
+        return self._merge(todos, calendar_events)
+
+    def execute_between(self, start_date: date, end_date: date) -> list[ActivityLogItem]:
+        """指定期間(両端を含む)のDONE TODOとカレンダーイベントを取得"""
+        todos = self.todo_query.fetch_done_todos_between(start_date, end_date)
+        calendar_events = self.calendar_query.fetch_events_between(start_date, end_date)
+        return self._merge(todos, calendar_events)
 
-        # 開始時刻の昇順でソート
-        all_items.sort(key=lambda item: item.start_datetime)
-        return all_items
+    @staticmethod
+    def _merge(todos: list[ActivityLogItem], calendar_events: list[ActivityLogItem]) -> list[ActivityLogItem]:
+        return list(heapq.merge(todos, calendar_events, key=lambda item: item.start_datetime))
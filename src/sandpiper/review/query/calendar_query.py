@@ -1,24 +1,44 @@
-from datetime import date, datetime
-from typing import Protocol
+from datetime import date, datetime, time, timedelta
+from typing import Any, Protocol
 
 from lotion import Lotion
+from lotion.filter import Builder
 
 from sandpiper.review.query.activity_log_item import ActivityLogItem, ActivityType
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database
+from sandpiper.shared.notion.databases import calendar as calendar_db
 from sandpiper.shared.notion.databases.calendar import CalendarEventPage
-from sandpiper.shared.utils.date_utils import to_jst
+from sandpiper.shared.utils.date_utils import JST, to_jst
 
 
 class CalendarQuery(Protocol):
     def fetch_events_by_date(self, target_date: date) -> list[ActivityLogItem]: ...
 
+    def fetch_events_between(self, start_date: date, end_date: date) -> list[ActivityLogItem]: ...
+
 
 class NotionCalendarQuery:
+    """カレンダーイベントを取得するクエリ
+
+    期間の範囲をNotion側で絞り込み、期間の順に並べて取得する。結果は開始時刻の昇順で返す。
+    """
+
     def __init__(self) -> None:
         self.client = Lotion.get_instance()
 
     def fetch_events_by_date(self, target_date: date) -> list[ActivityLogItem]:
         """指定された日付のカレンダーイベントを取得する"""
-        pages = self.client.retrieve_pages(CalendarEventPage)
+        return self.fetch_events_between(target_date, target_date)
+
+    def fetch_events_between(self, start_date: date, end_date: date) -> list[ActivityLogItem]:
+        """指定された期間(両端を含む)に始まるカレンダーイベントを取得する"""
+        pages = iter_database(
+            calendar_db.DATABASE_ID,
+            filter_param=self._filter_param(start_date, end_date),
+            sorts=[{"property": "期間", "direction": "ascending"}],
+            cls=CalendarEventPage,
+            client=self.client,
+        )
         result = []
 
         for page in pages:
@@ -30,8 +50,8 @@ class NotionCalendarQuery:
 
             start_datetime = to_jst(datetime.fromisoformat(start_date_str))
 
-            # 指定日付のイベントのみ抽出
-            if start_datetime.date() != target_date:
+            # 指定期間のイベントのみ抽出
+            if not start_date <= start_datetime.date() <= end_date:
                 continue
 
             # 終了日時がない場合は開始日時と同じにする
@@ -50,4 +70,19 @@ class NotionCalendarQuery:
             )
             result.append(item)
 
+        # Notion側で並べて取得しているので、整列済みのリストの並べ直し(線形時間)で済む
+        result.sort(key=lambda item: item.start_datetime)
         return result
+
+    @staticmethod
+    def _filter_param(start_date: date, end_date: date) -> dict[str, Any]:
+        # 日付の境界はJSTで指定する(日付だけだとUTCの日付として比較される)
+        next_day = datetime.combine(end_date + timedelta(days=1), time.min, JST)
+        return (
+            Builder.create()
+            .add_filter_param(
+                {"property": "期間", "date": {"on_or_after": datetime.combine(start_date, time.min, JST).isoformat()}}
+            )
+            .add_filter_param({"property": "期間", "date": {"before": next_day.isoformat()}})
+            .build()
+        )
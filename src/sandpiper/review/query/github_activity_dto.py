@@ -68,3 +68,14 @@ class GitHubActivityDto:
     issues: list[GitHubIssueDto]
     reviews: list[GitHubReviewDto]
     summary: GitHubActivitySummary
+
+
+@dataclass
+class GitHubActivityRangeDto:
+    """期間のGitHub活動ログ"""
+
+    start_date: str  # YYYY-MM-DD
+    end_date: str  # YYYY-MM-DD
+    username: str
+    days: list[GitHubActivityDto]  # 開始日から終了日まで1日ずつ(活動のない日も含む)
+    summary: GitHubActivitySummary  # 期間全体のサマリー
@@ -1,31 +1,68 @@
 """GitHub活動ログクエリ"""
 
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from github.Event import Event
 
 from sandpiper.review.query.github_activity_dto import (
     GitHubActivityDto,
+    GitHubActivityRangeDto,
     GitHubActivitySummary,
     GitHubCommitDto,
     GitHubIssueDto,
     GitHubPullRequestDto,
     GitHubReviewDto,
 )
-from sandpiper.shared.infrastructure.github_client import GitHubClient
+from sandpiper.shared.infrastructure.github_client import (
+    EVENTS_RETENTION,
+    EventStream,
+    GitHubClient,
+    GitHubSearchActivity,
+)
+
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass
+class _DailyBucket:
+    """1日分の活動の集計先"""
+
+    commits: list[GitHubCommitDto] = field(default_factory=list)
+    pull_requests: list[GitHubPullRequestDto] = field(default_factory=list)
+    issues: list[GitHubIssueDto] = field(default_factory=list)
+    reviews: list[GitHubReviewDto] = field(default_factory=list)
+    total_events: int = 0
+
+    def summary(self) -> GitHubActivitySummary:
+        return GitHubActivitySummary(
+            total_events=self.total_events,
+            commits_count=len(self.commits),
+            pull_requests_count=len(self.pull_requests),
+            issues_count=len(self.issues),
+            reviews_count=len(self.reviews),
+        )
 
 
 class GitHubActivityQuery:
-    """GitHub APIからデータを取得するクエリクラス(CQRS: 読み取り専門)"""
+    """GitHub APIからデータを取得するクエリクラス(CQRS: 読み取り専門)
 
-    def __init__(self, client: GitHubClient) -> None:
+    イベントAPIは直近の最大300件しか返さないため、イベントの範囲より古い日は
+    検索APIとコミットAPIで活動を取得する。
+    """
+
+    def __init__(self, client: GitHubClient, clock: Callable[[], datetime] | None = None) -> None:
         """
         GitHubActivityQueryを初期化
 
         Args:
             client: GitHubクライアント
+            clock: 現在時刻を返す関数(省略時はUTCの現在時刻)
         """
         self.client = client
+        self._clock = clock or (lambda: datetime.now(UTC))
 
     def fetch_daily_activity(
         self,
@@ -42,54 +79,170 @@ class GitHubActivityQuery:
         Returns:
             GitHub活動ログDTO
         """
-        # ユーザーイベントを取得してフィルタリング
-        events = self.client.get_user_events(username)
-        filtered_events = self.client.filter_events_by_date(events, target_date)
-
-        # イベントを種類別に分類
-        commits: list[GitHubCommitDto] = []
-        pull_requests: list[GitHubPullRequestDto] = []
-        issues: list[GitHubIssueDto] = []
-        reviews: list[GitHubReviewDto] = []
-
-        for event in filtered_events:
-            event_type = event.type
-            repo_name = event.repo.name if event.repo else "N/A"
-
-            if event_type == "PushEvent":
-                commits.extend(self._extract_commits(event, repo_name))
-            elif event_type == "PullRequestEvent":
-                pr_dto = self._extract_pull_request(event, repo_name)
-                if pr_dto:
-                    pull_requests.append(pr_dto)
-            elif event_type == "IssuesEvent":
-                issue_dto = self._extract_issue(event, repo_name)
-                if issue_dto:
-                    issues.append(issue_dto)
-            elif event_type == "PullRequestReviewEvent":
-                review_dto = self._extract_review(event, repo_name)
-                if review_dto:
-                    reviews.append(review_dto)
-
-        # サマリーを作成
-        summary = GitHubActivitySummary(
-            total_events=len(filtered_events),
-            commits_count=len(commits),
-            pull_requests_count=len(pull_requests),
-            issues_count=len(issues),
-            reviews_count=len(reviews),
-        )
+        return self.fetch_activity_range(username, target_date, target_date).days[0]
+
+    def fetch_activity_range(
+        self,
+        username: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> GitHubActivityRangeDto:
+        """
+        期間(開始日から終了日まで、両端を含む)のGitHub活動を日ごとに取得
 
-        return GitHubActivityDto(
-            date=target_date.strftime("%Y-%m-%d"),
+        イベントは一度だけ新しい順に読み、取得したページから順に日ごとへ振り分ける。
+        開始日より古いイベントが現れたら以降のページは取得しない。
+        イベントの範囲が届かなかった日だけを、まとめて検索APIで取得する。
+
+        Args:
+            username: GitHubユーザー名
+            start_date: 開始日(UTC)
+            end_date: 終了日(UTC)
+
+        Returns:
+            日ごとのGitHub活動ログと期間全体のサマリー
+        """
+        since = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        until = end_date.replace(hour=0, minute=0, second=0, microsecond=0) + ONE_DAY
+        if until <= since:
+            msg = f"end_date ({end_date:%Y-%m-%d}) must not be before start_date ({start_date:%Y-%m-%d})"
+            raise ValueError(msg)
+        buckets = [_DailyBucket() for _ in range((until - since) // ONE_DAY)]
+
+        # イベントAPIの保持期間より前の日は、イベントを読まずに検索APIで取得する
+        events_since = min(until, max(since, _day_start_at_or_after(since, self._clock() - EVENTS_RETENTION)))
+        search_until = events_since
+        if events_since < until:
+            stream = EventStream(self.client.get_user_events(username), events_since, until)
+            for event in stream:
+                self._add_event(buckets[(event.created_at - since) // ONE_DAY], event)
+            if not stream.covers_period:
+                # 最も古いイベントの日は途中からしか取得できていないので、その日までを検索APIで取得する
+                oldest = stream.oldest_created_at
+                search_until = (
+                    until if oldest is None else min(until, max(events_since, _next_day_start(since, oldest)))
+                )
+                for index in range((search_until - since) // ONE_DAY):
+                    buckets[index] = _DailyBucket()
+
+        if since < search_until:
+            activity = self.client.search_activity(username, since, search_until)
+            self._add_search_activity(buckets, since, search_until, activity)
+
+        days = [
+            GitHubActivityDto(
+                date=(since + index * ONE_DAY).strftime("%Y-%m-%d"),
+                username=username,
+                commits=bucket.commits,
+                pull_requests=bucket.pull_requests,
+                issues=bucket.issues,
+                reviews=bucket.reviews,
+                summary=bucket.summary(),
+            )
+            for index, bucket in enumerate(buckets)
+        ]
+        return GitHubActivityRangeDto(
+            start_date=days[0].date,
+            end_date=days[-1].date,
             username=username,
-            commits=commits,
-            pull_requests=pull_requests,
-            issues=issues,
-            reviews=reviews,
-            summary=summary,
+            days=days,
+            summary=GitHubActivitySummary(
+                total_events=sum(day.summary.total_events for day in days),
+                commits_count=sum(day.summary.commits_count for day in days),
+                pull_requests_count=sum(day.summary.pull_requests_count for day in days),
+                issues_count=sum(day.summary.issues_count for day in days),
+                reviews_count=sum(day.summary.reviews_count for day in days),
+            ),
         )
 
+    def _add_event(self, bucket: _DailyBucket, event: Event) -> None:
+        """イベントを種類別に分類して集計先へ加える"""
+        bucket.total_events += 1
+        event_type = event.type
+        repo_name = event.repo.name if event.repo else "N/A"
+
+        if event_type == "PushEvent":
+            bucket.commits.extend(self._extract_commits(event, repo_name))
+        elif event_type == "PullRequestEvent":
+            pr_dto = self._extract_pull_request(event, repo_name)
+            if pr_dto:
+                bucket.pull_requests.append(pr_dto)
+        elif event_type == "IssuesEvent":
+            issue_dto = self._extract_issue(event, repo_name)
+            if issue_dto:
+                bucket.issues.append(issue_dto)
+        elif event_type == "PullRequestReviewEvent":
+            review_dto = self._extract_review(event, repo_name)
+            if review_dto:
+                bucket.reviews.append(review_dto)
+
+    def _add_search_activity(
+        self,
+        buckets: list[_DailyBucket],
+        since: datetime,
+        until: datetime,
+        activity: GitHubSearchActivity,
+    ) -> None:
+        """検索APIとコミットAPIの結果を日ごとの集計先へ加える
+
+        イベントを経由しないので、取得した活動1件をイベント1件として数える。
+        """
+
+        def bucket_of(at: datetime) -> _DailyBucket | None:
+            if not since <= at < until:
+                return None
+            bucket = buckets[(at - since) // ONE_DAY]
+            bucket.total_events += 1
+            return bucket
+
+        for commit in activity.commits:
+            committed_at = _parse_datetime(commit["commit"]["committer"]["date"])
+            if bucket := bucket_of(committed_at):
+                bucket.commits.append(
+                    GitHubCommitDto(
+                        sha=commit["sha"][:7],
+                        message=commit["commit"].get("message", ""),
+                        repo=commit["repository"],
+                        committed_at=committed_at,
+                    )
+                )
+        for action, item in activity.pull_requests:
+            created_at = _parse_datetime(_action_timestamp(action, item))
+            if bucket := bucket_of(created_at):
+                bucket.pull_requests.append(
+                    GitHubPullRequestDto(
+                        number=item.get("number", 0),
+                        title=item.get("title", ""),
+                        action=action,
+                        repo=item["repository"],
+                        created_at=created_at,
+                    )
+                )
+        for action, item in activity.issues:
+            created_at = _parse_datetime(_action_timestamp(action, item))
+            if bucket := bucket_of(created_at):
+                bucket.issues.append(
+                    GitHubIssueDto(
+                        number=item.get("number", 0),
+                        title=item.get("title", ""),
+                        action=action,
+                        repo=item["repository"],
+                        created_at=created_at,
+                    )
+                )
+        for review in activity.reviews:
+            submitted_at = _parse_datetime(review["submitted_at"])
+            if bucket := bucket_of(submitted_at):
+                bucket.reviews.append(
+                    GitHubReviewDto(
+                        pr_number=review["pull_number"],
+                        # イベントAPIのペイロードに合わせて小文字にする
+                        state=review.get("state", "").lower(),
+                        repo=review["repository"],
+                        created_at=submitted_at,
+                    )
+                )
+
     def _extract_commits(self, event: Event, repo_name: str) -> list[GitHubCommitDto]:
         """PushEventからコミット情報を抽出"""
         commits = []
@@ -167,3 +320,25 @@ class GitHubActivityQuery:
             )
 
         return None
+
+
+def _action_timestamp(action: str, item: dict[str, Any]) -> str:
+    if action == "merged":
+        return str(item["pull_request"]["merged_at"])
+    if action == "closed":
+        return str(item["closed_at"])
+    return str(item["created_at"])
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _day_start_at_or_after(since: datetime, moment: datetime) -> datetime:
+    """moment 以降で最初に来る日の始まり(since を起点に数える)"""
+    return since + -((since - moment) // ONE_DAY) * ONE_DAY
+
+
+def _next_day_start(since: datetime, moment: datetime) -> datetime:
+    """moment より後で最初に来る日の始まり(since を起点に数える)"""
+    return since + ((moment - since) // ONE_DAY + 1) * ONE_DAY
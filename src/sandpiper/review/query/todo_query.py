@@ -1,35 +1,64 @@
-from datetime import date, datetime
-from typing import Protocol
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime, time, timedelta
+from typing import Any, Protocol
 
 from lotion import BasePage, Lotion
+from lotion.filter import Builder
 
 from sandpiper.review.query.activity_log_item import ActivityLogItem, ActivityType
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database, retrieve_page
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import project as project_db
 from sandpiper.shared.notion.databases import todo as todo_db
-from sandpiper.shared.utils.date_utils import to_jst
+from sandpiper.shared.utils.date_utils import JST, to_jst
 from sandpiper.shared.valueobject.todo_kind import ToDoKind
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
 
+# 参照先のプロジェクトページを取得する同時実行数(リクエストのペースはレートリミッターで抑える)
+DEFAULT_MAX_WORKERS = 3
+
 
 class TodoQuery(Protocol):
     def fetch_done_todos_by_date(self, target_date: date) -> list[ActivityLogItem]: ...
 
+    def fetch_done_todos_between(self, start_date: date, end_date: date) -> list[ActivityLogItem]: ...
+
 
 class NotionTodoQuery:
-    def __init__(self) -> None:
+    """DONEのTODOを取得するクエリ
+
+    結果は開始時刻の昇順で返す(カレンダーイベントとヒープマージできるように)。
+    Notionから取得する場合は、ステータスと実施期間の範囲をNotion側で絞り込み、実施期間の順に並べて取得する。
+    プロジェクト名は、対象のTODOが参照しているプロジェクトのページだけを取得して引く。
+    """
+
+    def __init__(
+        self,
+        replica: NotionDatabaseReplica | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
         self.client = Lotion.get_instance()
+        # レプリカがあれば差分同期したローカルのデータを読む
+        self._replica = replica
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+        self._max_workers = max_workers
 
     def fetch_done_todos_by_date(self, target_date: date) -> list[ActivityLogItem]:
         """指定された日付以降のDONEステータスのTODOを取得する"""
-        items = self.client.retrieve_database(todo_db.DATABASE_ID)
-        project_list = self.client.retrieve_database(project_db.DATABASE_ID)
+        return self._fetch_done_todos(target_date, None)
 
-        projects: dict[str, BasePage] = {}
-        for project in project_list:
-            projects[project.id] = project
+    def fetch_done_todos_between(self, start_date: date, end_date: date) -> list[ActivityLogItem]:
+        """指定された期間(両端を含む)に実施したDONEステータスのTODOを取得する"""
+        return self._fetch_done_todos(start_date, end_date)
 
-        result = []
-        for item in items:
+    def _fetch_done_todos(self, start_date: date, end_date: date | None) -> list[ActivityLogItem]:
+        # (TODO, 開始日時, 終了日時, 種別, 参照しているプロジェクトのページID)
+        rows: list[tuple[BasePage, datetime, datetime, ToDoKind, str | None]] = []
+        for item in self._iter_todo_pages(start_date, end_date):
             status = ToDoStatusEnum(item.get_status("ステータス").status_name)
             if status != ToDoStatusEnum.DONE:
                 continue
@@ -40,8 +69,8 @@ class NotionTodoQuery:
             start_datetime = to_jst(datetime.fromisoformat(perform_range.start))
             end_datetime = to_jst(datetime.fromisoformat(perform_range.end))
 
-            # 指定日付以降のタスクのみ抽出
-            if start_datetime.date() < target_date:
+            # 指定期間のタスクのみ抽出
+            if start_datetime.date() < start_date or (end_date is not None and start_datetime.date() > end_date):
                 continue
 
             kind_name = item.get_select("タスク種別").selected_name
@@ -49,22 +78,71 @@ class NotionTodoQuery:
                 continue
 
             kind = ToDoKind(kind_name)
-            project_name = ""
+            project_page_id = None
             if kind == ToDoKind.PROJECT:
                 project_page_id_list = item.get_relation("プロジェクト").id_list
                 if not project_page_id_list:
                     continue
                 project_page_id = project_page_id_list[0]
-                project = projects[project_page_id]
-                project_name = project.get_title_text()
+            rows.append((item, start_datetime, end_datetime, kind, project_page_id))
 
-            activity = ActivityLogItem(
+        project_names = self._project_names({project_page_id for *_, project_page_id in rows if project_page_id})
+        result = [
+            ActivityLogItem(
                 activity_type=ActivityType.TODO,
                 title=item.get_title_text(),
                 start_datetime=start_datetime,
                 end_datetime=end_datetime,
                 kind=kind.value,
-                project_name=project_name,
+                project_name=project_names[project_page_id] if project_page_id else "",
             )
-            result.append(activity)
+            for item, start_datetime, end_datetime, kind, project_page_id in rows
+        ]
+        # Notion側で並べて取得しているので、整列済みのリストの並べ直し(線形時間)で済む(レプリカは順不同)
+        result.sort(key=lambda activity: activity.start_datetime)
         return result
+
+    def _iter_todo_pages(self, start_date: date, end_date: date | None) -> Iterable[BasePage]:
+        if self._replica is not None:
+            return self._replica.retrieve_database(todo_db.DATABASE_ID)
+        # 全件を読み込まず、取得できた分から順に処理する
+        return iter_database(
+            todo_db.DATABASE_ID,
+            filter_param=self._filter_param(start_date, end_date),
+            sorts=[{"property": "実施期間", "direction": "ascending"}],
+            client=self.client,
+            rate_limiter=self._rate_limiter,
+        )
+
+    def _project_names(self, project_page_ids: set[str]) -> dict[str, str]:
+        """プロジェクトのページIDとプロジェクト名のマップを返す"""
+        if self._replica is not None:
+            projects: list[BasePage] = self._replica.retrieve_database(project_db.DATABASE_ID)
+            return {project.id: project.get_title_text() for project in projects if project.id in project_page_ids}
+        page_ids = sorted(project_page_ids)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [executor.submit(copy_context().run, self._retrieve_project, page_id) for page_id in page_ids]
+            return {
+                page_id: future.result().get_title_text() for page_id, future in zip(page_ids, futures, strict=True)
+            }
+
+    def _retrieve_project(self, page_id: str) -> BasePage:
+        return retrieve_page(page_id, client=self.client, rate_limiter=self._rate_limiter)
+
+    @staticmethod
+    def _filter_param(start_date: date, end_date: date | None) -> dict[str, Any]:
+        # 日付の境界はJSTで指定する(日付だけだとUTCの日付として比較される)
+        builder = (
+            Builder.create()
+            .add_filter_param({"property": "ステータス", "status": {"equals": ToDoStatusEnum.DONE.value}})
+            .add_filter_param(
+                {
+                    "property": "実施期間",
+                    "date": {"on_or_after": datetime.combine(start_date, time.min, JST).isoformat()},
+                }
+            )
+        )
+        if end_date is not None:
+            next_day = datetime.combine(end_date + timedelta(days=1), time.min, JST)
+            builder = builder.add_filter_param({"property": "実施期間", "date": {"before": next_day.isoformat()}})
+        return builder.build()
@@ -1,8 +1,18 @@
 from fastapi import Request
 
 from sandpiper.app.app import SandPiperApp
+from sandpiper.shared.infrastructure.sqlite_job_queue import JobWorkerPool
+from sandpiper.shared.infrastructure.webhook_deduplicator import WebhookDeduplicator
 
 
 def get_sandpiper_app(request: Request) -> SandPiperApp:
     print("依存性注入: SandPiperAppを取得")
     return request.app.state.sandpiper_app  # type: ignore[no-any-return]
+
+
+def get_job_worker_pool(request: Request) -> JobWorkerPool:
+    return request.app.state.job_worker_pool  # type: ignore[no-any-return]
+
+
+def get_webhook_deduplicator(request: Request) -> WebhookDeduplicator:
+    return request.app.state.webhook_deduplicator  # type: ignore[no-any-return]
@@ -0,0 +1,58 @@
+"""Webhookジョブの状態確認エンドポイント"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from sandpiper.app.app import SandPiperApp
+from sandpiper.routers.dependency.deps import get_job_worker_pool, get_sandpiper_app, get_webhook_deduplicator
+from sandpiper.shared.infrastructure.sqlite_job_queue import JobStatus, JobWorkerPool
+from sandpiper.shared.infrastructure.webhook_deduplicator import WebhookDeduplicator
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+)
+
+
+@router.get("")
+async def list_jobs(
+    status: JobStatus | None = None,
+    limit: int = 50,
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
+    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+) -> JSONResponse:
+    """ジョブの件数(状態ごと)と新しい順のジョブ一覧、重複配信の検出状況、未発火のタイマー数を返す
+
+    Args:
+        status: 指定した状態のジョブだけを返す
+        limit: 返すジョブの最大件数
+    """
+    queue = job_worker_pool.queue
+    counts = await run_in_threadpool(queue.count_by_status)
+    jobs = await run_in_threadpool(queue.list_jobs, status, limit)
+    task_end_scheduler = sandpiper_app.task_end_scheduler
+    pending_task_end_timers = (
+        await run_in_threadpool(task_end_scheduler.pending_count) if task_end_scheduler is not None else 0
+    )
+    return JSONResponse(
+        content={
+            "counts": counts,
+            "jobs": [job.to_dict() for job in jobs],
+            "deduplication": webhook_deduplicator.stats().to_dict(),
+            "timers": {"task_end_pending": pending_task_end_timers},
+        }
+    )
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: int,
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+) -> JSONResponse:
+    """ジョブの状態を返す"""
+    job = await run_in_threadpool(job_worker_pool.queue.find, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return JSONResponse(content=job.to_dict())
@@ -2,9 +2,11 @@
 
 import logging
 from datetime import datetime
+from functools import partial
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from lotion import BasePage
 from pydantic import BaseModel
@@ -14,7 +16,9 @@ from sandpiper.calendar.application.create_calendar_event import CreateCalendarE
 from sandpiper.calendar.application.delete_calendar_events import DeleteCalendarEventsRequest
 from sandpiper.calendar.domain.calendar_event import EventCategory
 from sandpiper.clips.application.create_clip import CreateClipRequest
-from sandpiper.routers.dependency.deps import get_sandpiper_app
+from sandpiper.routers.dependency.deps import get_job_worker_pool, get_sandpiper_app, get_webhook_deduplicator
+from sandpiper.shared.infrastructure.sqlite_job_queue import JobHandler, JobWorkerPool, NonRetryableJobError
+from sandpiper.shared.infrastructure.webhook_deduplicator import WebhookDeduplicator
 
 logger = logging.getLogger(__name__)
 
@@ -43,83 +47,108 @@ class CreateClipApiRequest(BaseModel):
     title: str | None = None
 
 
+JOB_START_TODO = "start_todo"
+JOB_COMPLETE_TODO = "complete_todo"
+JOB_CONVERT_TO_PROJECT = "convert_to_project"
+JOB_HANDLE_SPECIAL_TODO = "handle_special_todo"
+JOB_OVERRIDE_SECTION = "override_section"
+
+
 def _execute_start_todo(sandpiper_app: SandPiperApp, page_id: str) -> None:
-    """バックグラウンドでTodo開始処理を実行する"""
-    try:
-        sandpiper_app.start_todo.execute(page_id=page_id)
-        logger.info("Todo started successfully: %s", page_id)
-    except Exception:
-        logger.exception("Failed to start todo: %s", page_id)
+    """Todo開始処理を実行する"""
+    sandpiper_app.start_todo.execute(page_id=page_id)
+    logger.info("Todo started successfully: %s", page_id)
 
 
 def _execute_complete_todo(sandpiper_app: SandPiperApp, page_id: str) -> None:
-    """バックグラウンドでTodo完了処理を実行する"""
-    try:
-        sandpiper_app.complete_todo.execute(page_id=page_id)
-        logger.info("Todo completed successfully: %s", page_id)
-    except Exception:
-        logger.exception("Failed to complete todo: %s", page_id)
+    """Todo完了処理を実行する"""
+    sandpiper_app.complete_todo.execute(page_id=page_id)
+    logger.info("Todo completed successfully: %s", page_id)
 
 
 def _execute_convert_to_project(sandpiper_app: SandPiperApp, page_id: str) -> None:
-    """バックグラウンドでTodo→Project変換処理を実行する"""
-    try:
-        sandpiper_app.convert_to_project.execute(page_id=page_id)
-        logger.info("Todo converted to project successfully: %s", page_id)
-    except Exception:
-        logger.exception("Failed to convert todo to project: %s", page_id)
+    """Todo→Project変換処理を実行する"""
+    sandpiper_app.convert_to_project.execute(page_id=page_id)
+    logger.info("Todo converted to project successfully: %s", page_id)
 
 
 def _execute_handle_special_todo(sandpiper_app: SandPiperApp, page_id: str) -> None:
-    """バックグラウンドで特殊Todo処理を実行する"""
-    try:
-        result = sandpiper_app.handle_special_todo.execute(page_id=page_id)
-        if result.success:
-            logger.info("Special todo handled successfully: %s (handler: %s)", page_id, result.handler_name)
-        else:
-            logger.warning("Special todo handler not found: %s - %s", page_id, result.message)
-    except Exception:
-        logger.exception("Failed to handle special todo: %s", page_id)
+    """特殊Todo処理を実行する"""
+    result = sandpiper_app.handle_special_todo.execute(page_id=page_id)
+    if not result.success:
+        # 対応するハンドラーがないTODOは再試行しても変わらない
+        raise NonRetryableJobError(f"Special todo handler not found: {result.message}")
+    logger.info("Special todo handled successfully: %s (handler: %s)", page_id, result.handler_name)
 
 
 def _execute_override_section(sandpiper_app: SandPiperApp, page_id: str) -> None:
-    """バックグラウンドでセクション上書き処理を実行する"""
+    """セクション上書き処理を実行する"""
     try:
         result = sandpiper_app.override_section_by_schedule.execute(page_id=page_id)
-        logger.info(
-            "Section overridden successfully: %s (%s -> %s)",
-            page_id,
-            result.old_section.value if result.old_section else "None",
-            result.new_section.value,
-        )
     except ValueError as e:
-        logger.warning("Failed to override section: %s - %s", page_id, str(e))
-    except Exception:
-        logger.exception("Failed to override section: %s", page_id)
+        # 予定が未設定などの入力エラーは再試行しても変わらない
+        raise NonRetryableJobError(f"Failed to override section: {e}") from e
+    logger.info(
+        "Section overridden successfully: %s (%s -> %s)",
+        page_id,
+        result.old_section.value if result.old_section else "None",
+        result.new_section.value,
+    )
+
+
+def build_webhook_job_handlers(sandpiper_app: SandPiperApp) -> dict[str, JobHandler]:
+    """Webhookジョブの種類ごとの処理を返す(ジョブワーカーに登録する)
+
+    例外を送出するとジョブは失敗扱いになり、NonRetryableJobError 以外は再試行される。
+    """
+    return {
+        JOB_START_TODO: partial(_execute_start_todo, sandpiper_app),
+        JOB_COMPLETE_TODO: partial(_execute_complete_todo, sandpiper_app),
+        JOB_CONVERT_TO_PROJECT: partial(_execute_convert_to_project, sandpiper_app),
+        JOB_HANDLE_SPECIAL_TODO: partial(_execute_handle_special_todo, sandpiper_app),
+        JOB_OVERRIDE_SECTION: partial(_execute_override_section, sandpiper_app),
+    }
+
+
+def _accept_webhook_job(
+    job_worker_pool: JobWorkerPool,
+    webhook_deduplicator: WebhookDeduplicator,
+    kind: str,
+    request: NotionWebhookRequest,
+) -> JSONResponse:
+    """Webhookをジョブとして受け付ける
+
+    ジョブキューへのSQLiteの書き込みでイベントループを止めないよう、run_in_threadpool で呼ぶ。
+    """
+    base_page = BasePage.from_data(request.data)
+    last_edited_time = request.data.get("last_edited_time")
+    if webhook_deduplicator.is_duplicate(page_id=base_page.id, endpoint=kind, last_edited_time=last_edited_time):
+        logger.info("Duplicate webhook ignored: %s (%s, %s)", base_page.id, kind, last_edited_time)
+        return JSONResponse(content={"page_id": base_page.id, "status": "duplicate", "job_id": None})
+    job = job_worker_pool.submit(kind=kind, page_id=base_page.id)
+    return JSONResponse(content={"page_id": base_page.id, "status": "accepted", "job_id": job.id})
 
 
 @router.post("/todo/start")
 async def start_todo(
     request: NotionWebhookRequest,
-    background_tasks: BackgroundTasks,
-    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
 ) -> JSONResponse:
     """Todoタスクを開始する(非同期処理)"""
-    base_page = BasePage.from_data(request.data)
-    background_tasks.add_task(_execute_start_todo, sandpiper_app, base_page.id)
-    return JSONResponse(content={"page_id": base_page.id, "status": "accepted"})
+    return await run_in_threadpool(_accept_webhook_job, job_worker_pool, webhook_deduplicator, JOB_START_TODO, request)
 
 
 @router.post("/todo/complete")
 async def complete_todo(
     request: NotionWebhookRequest,
-    background_tasks: BackgroundTasks,
-    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
 ) -> JSONResponse:
     """Todoタスクを完了する(非同期処理)"""
-    base_page = BasePage.from_data(request.data)
-    background_tasks.add_task(_execute_complete_todo, sandpiper_app, base_page.id)
-    return JSONResponse(content={"page_id": base_page.id, "status": "accepted"})
+    return await run_in_threadpool(
+        _accept_webhook_job, job_worker_pool, webhook_deduplicator, JOB_COMPLETE_TODO, request
+    )
 
 
 @router.post("/calendar")
@@ -142,7 +171,7 @@ async def create_calendar_event(
         start_datetime=request.start_datetime,
         end_datetime=request.end_datetime,
     )
-    inserted_event = sandpiper_app.create_calendar_event.execute(create_request)
+    inserted_event = await sandpiper_app.create_calendar_event.execute_async(create_request)
     return JSONResponse(
         content={
             "id": inserted_event.id,
@@ -157,8 +186,8 @@ async def create_calendar_event(
 @router.post("/todo/to_project")
 async def todo_to_project(
     request: NotionWebhookRequest,
-    background_tasks: BackgroundTasks,
-    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
 ) -> JSONResponse:
     """TodoをProjectに変換する(非同期処理)
 
@@ -167,22 +196,22 @@ async def todo_to_project(
 
     Args:
         request: Notion Webhookリクエスト
-        background_tasks: バックグラウンドタスク
-        sandpiper_app: SandPiper アプリケーション
+        job_worker_pool: Webhookジョブのワーカー
+        webhook_deduplicator: 重複配信の検出
 
     Returns:
-        JSONResponse: 受付結果のレスポンス
+        JSONResponse: 受付結果のレスポンス(ジョブIDを含む)
     """
-    base_page = BasePage.from_data(request.data)
-    background_tasks.add_task(_execute_convert_to_project, sandpiper_app, base_page.id)
-    return JSONResponse(content={"page_id": base_page.id, "status": "accepted"})
+    return await run_in_threadpool(
+        _accept_webhook_job, job_worker_pool, webhook_deduplicator, JOB_CONVERT_TO_PROJECT, request
+    )
 
 
 @router.post("/todo/special")
 async def handle_special_todo(
     request: NotionWebhookRequest,
-    background_tasks: BackgroundTasks,
-    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
 ) -> JSONResponse:
     """特定の名前のTODOに対して特殊処理を実行する(非同期処理)
 
@@ -195,23 +224,24 @@ async def handle_special_todo(
           サムデイリスト(「明日やる」フラグ付き)からTODOを自動生成
 
     NotionからのWebhookリクエストを受け取り、TODOの名前に応じた特殊処理を実行します。
-    処理結果はバックグラウンドで実行され、ログに出力されます。
+    処理はジョブキューに登録され、ワーカーで実行されます(失敗時は再試行されます)。
 
     Args:
         request: Notion Webhookリクエスト
-        background_tasks: バックグラウンドタスク
-        sandpiper_app: SandPiper アプリケーション
+        job_worker_pool: Webhookジョブのワーカー
+        webhook_deduplicator: 重複配信の検出
 
     Returns:
-        JSONResponse: 受付結果のレスポンス
+        JSONResponse: 受付結果のレスポンス(ジョブIDを含む)
     """
-    base_page = BasePage.from_data(request.data)
-    background_tasks.add_task(_execute_handle_special_todo, sandpiper_app, base_page.id)
-    return JSONResponse(content={"page_id": base_page.id, "status": "accepted"})
+    return await run_in_threadpool(
+        _accept_webhook_job, job_worker_pool, webhook_deduplicator, JOB_HANDLE_SPECIAL_TODO, request
+    )
 
 
 @router.post("/archive")
 async def archive_deleted_pages(
+    dry_run: bool = False,
     sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
 ) -> JSONResponse:
     """論理削除されたページを物理削除する
@@ -219,10 +249,13 @@ async def archive_deleted_pages(
     論理削除プロパティを持つデータベースから、
     論理削除プロパティが有効なページを物理削除します。
 
+    Args:
+        dry_run: True の場合は削除せず、ローカルのレプリカから削除対象の件数だけを返す
+
     Returns:
         JSONResponse: データベースごとの削除件数と合計
     """
-    result = sandpiper_app.archive_deleted_pages.execute()
+    result = await sandpiper_app.archive_deleted_pages.execute_async(dry_run=dry_run)
     return JSONResponse(
         content={
             "deleted_counts": result.deleted_counts,
@@ -255,7 +288,8 @@ async def delete_calendar_events(
         ) from e
 
     delete_request = DeleteCalendarEventsRequest(target_date=target_date)
-    result = sandpiper_app.delete_calendar_events.execute(delete_request)
+    # 同期処理のため、イベントループを塞がないようワーカースレッドで実行する
+    result = await run_in_threadpool(sandpiper_app.delete_calendar_events.execute, delete_request)
 
     return JSONResponse(
         content={
@@ -280,7 +314,7 @@ async def create_clip(
         JSONResponse: 作成されたClipの情報
     """
     create_request = CreateClipRequest(title=request.title, url=request.url)
-    inserted_clip = sandpiper_app.create_clip.execute(create_request)
+    inserted_clip = await sandpiper_app.create_clip.execute_async(create_request)
     return JSONResponse(
         content={
             "id": inserted_clip.id,
@@ -294,8 +328,8 @@ async def create_clip(
 @router.post("/todo/override-section")
 async def override_section_by_schedule(
     request: NotionWebhookRequest,
-    background_tasks: BackgroundTasks,
-    sandpiper_app: SandPiperApp = Depends(get_sandpiper_app),
+    job_worker_pool: JobWorkerPool = Depends(get_job_worker_pool),
+    webhook_deduplicator: WebhookDeduplicator = Depends(get_webhook_deduplicator),
 ) -> JSONResponse:
     """TODOの予定開始時刻からセクションを上書きする(非同期処理)
 
@@ -304,12 +338,12 @@ async def override_section_by_schedule(
 
     Args:
         request: Notion Webhookリクエスト
-        background_tasks: バックグラウンドタスク
-        sandpiper_app: SandPiper アプリケーション
+        job_worker_pool: Webhookジョブのワーカー
+        webhook_deduplicator: 重複配信の検出
 
     Returns:
-        JSONResponse: 受付結果のレスポンス
+        JSONResponse: 受付結果のレスポンス(ジョブIDを含む)
     """
-    base_page = BasePage.from_data(request.data)
-    background_tasks.add_task(_execute_override_section, sandpiper_app, base_page.id)
-    return JSONResponse(content={"page_id": base_page.id, "status": "accepted"})
+    return await run_in_threadpool(
+        _accept_webhook_job, job_worker_pool, webhook_deduplicator, JOB_OVERRIDE_SECTION, request
+    )
@@ -10,3 +10,4 @@ class TodoStarted:
     execution_time: datetime
     context: Context | None = None
     scheduled_duration: timedelta | None = None
+    page_id: str | None = None
@@ -1,9 +1,21 @@
 """論理削除されたページを物理削除するサービス"""
 
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
-from lotion import Lotion
+from lotion import BasePage, Lotion
+from lotion.filter import Builder
 
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import project_task as project_task_db
 from sandpiper.shared.notion.databases import someday as someday_db
 from sandpiper.shared.notion.databases import todo as todo_db
@@ -15,6 +27,9 @@ DATABASES_WITH_LOGICAL_DELETION: list[str] = [
     project_task_db.DATABASE_ID,
 ]
 
+# ページ削除の同時実行数(リクエストのペースはレートリミッターで抑える)
+DEFAULT_MAX_WORKERS = 3
+
 
 @dataclass
 class ArchiveDeletedPagesResult:
@@ -32,6 +47,7 @@ class ArchiveDeletedPages:
 
     論理削除プロパティを持つデータベースから、
     論理削除プロパティが有効なページを物理削除します。
+    データベースごとの取得は並行して行い、削除は共有のレートリミッターを通して並行実行します。
     """
 
     LOGICAL_DELETION_PROPERTY_NAME = "論理削除"
@@ -39,33 +55,138 @@ class ArchiveDeletedPages:
     def __init__(
         self,
         database_ids: list[str] | None = None,
+        snapshot: NotionDatabaseSnapshot | None = None,
+        gateway: AsyncNotionGateway | None = None,
+        replica: NotionDatabaseReplica | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> None:
         self.client = Lotion.get_instance()
         self.database_ids = database_ids or DATABASES_WITH_LOGICAL_DELETION
-
-    def execute(self) -> ArchiveDeletedPagesResult:
+        self._snapshot = snapshot
+        self._gateway = gateway
+        # レプリカは削除の反映先、およびドライランで件数を数える索引として使う
+        self._replica = replica
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+        self._max_workers = max_workers
+
+    def execute(self, dry_run: bool = False) -> ArchiveDeletedPagesResult:
         """論理削除されたページを物理削除する
 
+        Args:
+            dry_run: True の場合は削除せず、削除対象の件数だけを返す。
+                同期済みのレプリカがあれば差分同期してからローカルの索引で数え、
+                なければ論理削除されたページだけをNotionに問い合わせて数える。
+
         Returns:
             ArchiveDeletedPagesResult: データベースごとの削除件数
         """
-        deleted_counts: dict[str, int] = {}
-
-        for database_id in self.database_ids:
-            deleted_count = self._archive_pages_in_database(database_id)
-            deleted_counts[database_id] = deleted_count
+        if dry_run:
+            return ArchiveDeletedPagesResult(
+                deleted_counts={
+                    database_id: self._count_deleted_pages(database_id) for database_id in self.database_ids
+                }
+            )
+
+        # データベースの取得は fetcher で並行させ、削除は remover に集約して同時実行数を抑える。
+        # 呼び出し元のコンテキスト(スナップショット)をワーカースレッドに引き継ぐ
+        with (
+            ThreadPoolExecutor(max_workers=self._max_workers) as remover,
+            ThreadPoolExecutor(max_workers=len(self.database_ids)) as fetcher,
+        ):
+            futures = {
+                database_id: fetcher.submit(copy_context().run, self._archive_pages_in_database, remover, database_id)
+                for database_id in self.database_ids
+            }
+            deleted_counts = {database_id: future.result() for database_id, future in futures.items()}
 
         return ArchiveDeletedPagesResult(deleted_counts=deleted_counts)
 
-    def _archive_pages_in_database(self, database_id: str) -> int:
-        """指定されたデータベースの論理削除されたページを物理削除"""
-        pages = self.client.retrieve_database(database_id)
-        deleted_count = 0
+    async def execute_async(self, dry_run: bool = False) -> ArchiveDeletedPagesResult:
+        """イベントループを塞がずに論理削除されたページを物理削除する
 
-        for page in pages:
-            is_deleted = page.get_checkbox(self.LOGICAL_DELETION_PROPERTY_NAME).checked
-            if is_deleted:
-                self.client.remove_page(page.id)
-                deleted_count += 1
-
-        return deleted_count
+        非同期ゲートウェイがない場合(およびドライラン)は同期版をワーカースレッドで実行する。
+        """
+        if self._gateway is None or dry_run:
+            return await asyncio.to_thread(self.execute, dry_run)
+
+        semaphore = asyncio.Semaphore(self._max_workers)
+        counts = await asyncio.gather(
+            *(
+                self._archive_pages_in_database_async(self._gateway, database_id, semaphore)
+                for database_id in self.database_ids
+            )
+        )
+        return ArchiveDeletedPagesResult(deleted_counts=dict(zip(self.database_ids, counts, strict=True)))
+
+    async def _archive_pages_in_database_async(
+        self,
+        gateway: AsyncNotionGateway,
+        database_id: str,
+        semaphore: asyncio.Semaphore,
+    ) -> int:
+        async def remove(page_id: str) -> None:
+            async with semaphore:
+                await gateway.remove_page(page_id)
+            self._forget(database_id, page_id)
+
+        page_ids = [
+            page.id
+            async for page in gateway.iter_database(database_id, filter_param=self._filter_param())
+            if self._is_deleted(page)
+        ]
+        await asyncio.gather(*(remove(page_id) for page_id in page_ids))
+        return len(page_ids)
+
+    def _archive_pages_in_database(self, remover: ThreadPoolExecutor, database_id: str) -> int:
+        """指定されたデータベースの論理削除されたページを物理削除"""
+        futures = [
+            remover.submit(copy_context().run, self._remove_page, database_id, page.id)
+            for page in self._candidate_pages(database_id)
+            if self._is_deleted(page)
+        ]
+        for future in futures:
+            future.result()
+        return len(futures)
+
+    def _remove_page(self, database_id: str, page_id: str) -> None:
+        self._rate_limiter.call(partial(self.client.remove_page, page_id))
+        self._forget(database_id, page_id)
+
+    def _forget(self, database_id: str, page_id: str) -> None:
+        """削除したページをスナップショット・レプリカから取り除く"""
+        if self._snapshot is not None:
+            self._snapshot.remove(database_id, page_id)
+        if self._replica is not None:
+            self._replica.remove_page(database_id, page_id)
+
+    def _candidate_pages(self, database_id: str) -> Iterable[BasePage]:
+        if self._snapshot is not None and self._snapshot.is_active:
+            # スナップショットは後続の処理でも使うので、全件を読み込んで共有する
+            return self._snapshot.retrieve_database(database_id)
+        # 論理削除されたページだけをNotion側で絞り込み、取得できた分から順に処理する
+        return iter_database(
+            database_id, filter_param=self._filter_param(), client=self.client, rate_limiter=self._rate_limiter
+        )
+
+    def _count_deleted_pages(self, database_id: str) -> int:
+        pages: Iterable[BasePage]
+        if self._replica is not None and self._replica.has_synced(database_id):
+            # 最新化してから数える(差分同期なら更新されたページだけを問い合わせる)
+            pages = self._replica.retrieve_database(database_id)
+        else:
+            # 未同期のレプリカを全件取得するより、論理削除されたページだけを問い合わせるほうが軽い
+            pages = iter_database(
+                database_id, filter_param=self._filter_param(), client=self.client, rate_limiter=self._rate_limiter
+            )
+        return sum(1 for page in pages if self._is_deleted(page))
+
+    def _is_deleted(self, page: BasePage) -> bool:
+        return page.get_checkbox(self.LOGICAL_DELETION_PROPERTY_NAME).checked
+
+    def _filter_param(self) -> dict[str, Any]:
+        return (
+            Builder.create()
+            .add_filter_param({"property": self.LOGICAL_DELETION_PROPERTY_NAME, "checkbox": {"equals": True}})
+            .build()
+        )
@@ -1,12 +1,32 @@
-"""完了して一定期間経過したTODOをアーカイブするサービス"""
-
+"""完了して一定期間経過したTODOをアーカイブするサービス
+
+対象のTODOはNotion側のフィルタで絞り込み、取得できた分から順にスレッドプールで並行して処理する。
+ジャーナルを渡すと処理の進捗を記録し、途中で失敗・中断しても再実行時に続きから処理する。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+from typing import Any
 
 from lotion import BasePage, Lotion, notion_database
+from lotion.filter import Builder, Cond
 
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.notion.databases import todo as todo_db
 from sandpiper.shared.notion.databases import todo_archive as todo_archive_db
+from sandpiper.shared.notion.databases.todo import TodoLogDate, TodoStatus
 from sandpiper.shared.notion.databases.todo_archive import (
     TodoArchiveContext,
     TodoArchiveExecutionTime,
@@ -25,7 +45,10 @@ from sandpiper.shared.utils.date_utils import jst_today_datetime
 from sandpiper.shared.valueobject.todo_kind import ToDoKind
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_ARCHIVE_DAYS = 1
+DEFAULT_MAX_WORKERS = 3
 
 
 @notion_database(todo_archive_db.DATABASE_ID)
@@ -42,6 +65,79 @@ class ArchiveOldTodosResult:
     archived_titles: list[str]
     deleted_routine_count: int = 0
     deleted_routine_titles: list[str] = field(default_factory=list)
+    # 前回までの実行で処理済みのためスキップした件数
+    skipped_count: int = 0
+    failed_titles: list[str] = field(default_factory=list)
+    # Notionから取得したTODOの件数(フィルタ後、処理対象外のものも含む)
+    scanned_count: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.failed_titles)
+
+    @property
+    def throughput_per_second(self) -> float:
+        """1秒あたりに処理(アーカイブ・削除)した件数"""
+        processed = self.archived_count + self.deleted_routine_count
+        return processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class ArchiveStage(StrEnum):
+    ARCHIVED = "archived"  # アーカイブDBへのコピーが完了
+    REMOVED = "removed"  # 元DBからの削除が完了
+
+
+class ArchiveJournal:
+    """アーカイブの進捗を記録するジャーナル(JSON Lines に追記する。スレッドセーフ)
+
+    アーカイブDBへのコピー後・元DBからの削除後にそれぞれ記録する。
+    再実行時はコピー済みのページを再度コピーせず、削除だけを行う。
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._stages: dict[str, ArchiveStage] | None = None
+
+    def stage(self, page_id: str) -> ArchiveStage | None:
+        with self._lock:
+            return self._load().get(page_id)
+
+    def record(self, page_id: str, stage: ArchiveStage) -> None:
+        with self._lock:
+            self._load()[page_id] = stage
+            # ファイルは最初の記録時に作る
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"page_id": page_id, "stage": stage.value}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """すべて処理し終えたら記録を破棄する"""
+        with self._lock:
+            self._stages = {}
+            self._path.unlink(missing_ok=True)
+
+    def _load(self) -> dict[str, ArchiveStage]:
+        if self._stages is None:
+            self._stages = {}
+            if self._path.exists():
+                for line in self._path.read_text(encoding="utf-8").splitlines():
+                    try:
+                        entry = json.loads(line)
+                        self._stages[entry["page_id"]] = ArchiveStage(entry["stage"])
+                    except (ValueError, KeyError):
+                        # 書き込み途中で中断した行は無視する
+                        continue
+        return self._stages
+
+
+class _Outcome(StrEnum):
+    ARCHIVED = "archived"
+    DELETED_ROUTINE = "deleted_routine"
+    SKIPPED = "skipped"
 
 
 class ArchiveOldTodos:
@@ -55,54 +151,113 @@ class ArchiveOldTodos:
     def __init__(
         self,
         archive_days: int = DEFAULT_ARCHIVE_DAYS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        journal: ArchiveJournal | None = None,
+        rate_limiter: NotionRateLimiter | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         self.client = Lotion.get_instance()
         self.archive_days = archive_days
+        self.max_workers = max(max_workers, 1)
+        self._journal = journal
+        self._rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+        self._clock = clock
 
     def execute(self, dry_run: bool = False) -> ArchiveOldTodosResult:
         """完了して一定期間経過したTODOをアーカイブまたは削除する
 
+        1件ごとの失敗は failed_titles に記録して残りの処理を続ける。
+
         Args:
             dry_run: Trueの場合、実際の処理は行わず対象のみを返す
 
         Returns:
-            ArchiveOldTodosResult: 処理されたTODOの件数とタイトル一覧
+            ArchiveOldTodosResult: 処理されたTODOの件数とタイトル一覧、処理速度
         """
         # 本日0時を基準に (archive_days - 1) 日前を閾値とする
         # archive_days=1 → 本日0時 = 前日以前のものが対象
         threshold_date = jst_today_datetime() - timedelta(days=self.archive_days - 1)
-
-        pages = self.client.retrieve_database(todo_db.DATABASE_ID)
-
-        archived_count = 0
-        archived_titles: list[str] = []
-        deleted_routine_count = 0
-        deleted_routine_titles: list[str] = []
-
-        for page in pages:
-            if not self._should_process(page, threshold_date):
-                continue
-
-            title = page.get_title_text()
-            is_routine = self._is_routine(page)
-
-            if not dry_run:
-                if not is_routine:
-                    self._archive_page(page)
-                self.client.remove_page(page.id)
-
-            if is_routine:
-                deleted_routine_count += 1
-                deleted_routine_titles.append(title)
-            else:
-                archived_count += 1
-                archived_titles.append(title)
-
-        return ArchiveOldTodosResult(
-            archived_count=archived_count,
-            archived_titles=archived_titles,
-            deleted_routine_count=deleted_routine_count,
-            deleted_routine_titles=deleted_routine_titles,
+        started_at = self._clock()
+        result = ArchiveOldTodosResult(archived_count=0, archived_titles=[])
+
+        # 全件を読み込まず、取得できた分から順に処理する
+        pages = iter_database(todo_db.DATABASE_ID, filter_param=self._filter_param(threshold_date), client=self.client)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="archive-old-todos") as executor:
+            # 処理待ちのページを一定数に抑え、取得済みのページを溜め込まないようにする
+            in_flight: deque[tuple[str, Future[_Outcome]]] = deque()
+            for page in pages:
+                result.scanned_count += 1
+                if not self._should_process(page, threshold_date):
+                    continue
+                in_flight.append((page.get_title_text(), executor.submit(self._process, page, dry_run)))
+                if len(in_flight) >= self.max_workers * 2:
+                    self._collect(*in_flight.popleft(), result)
+            while in_flight:
+                self._collect(*in_flight.popleft(), result)
+
+        result.elapsed_seconds = self._clock() - started_at
+        if self._journal is not None and not dry_run and not result.failed_titles:
+            self._journal.clear()
+        logger.info(
+            "Archived %d todos, deleted %d routines (%d skipped, %d failed) in %.1fs (%.2f/s)",
+            result.archived_count,
+            result.deleted_routine_count,
+            result.skipped_count,
+            result.failed_count,
+            result.elapsed_seconds,
+            result.throughput_per_second,
+        )
+        return result
+
+    def _process(self, page: BasePage, dry_run: bool) -> _Outcome:
+        is_routine = self._is_routine(page)
+        if not dry_run:
+            stage = self._journal.stage(page.id) if self._journal is not None else None
+            if stage == ArchiveStage.REMOVED:
+                return _Outcome.SKIPPED
+            # コピー済みなら再度コピーせず、削除だけ行う(二重にアーカイブしない)
+            if not is_routine and stage != ArchiveStage.ARCHIVED:
+                # 再試行はページ作成自体が429で拒否された場合のみ(作成後の再取得で429になった場合に重複コピーしないため)
+                self._rate_limiter.call(
+                    partial(self._archive_page, page), should_retry=lambda e: e.database_id is not None
+                )
+                self._record(page.id, ArchiveStage.ARCHIVED)
+            self._rate_limiter.call(partial(self.client.remove_page, page.id))
+            self._record(page.id, ArchiveStage.REMOVED)
+        return _Outcome.DELETED_ROUTINE if is_routine else _Outcome.ARCHIVED
+
+    def _collect(self, title: str, future: Future[_Outcome], result: ArchiveOldTodosResult) -> None:
+        try:
+            outcome = future.result()
+        except Exception:
+            logger.exception("Failed to archive todo: %s", title)
+            result.failed_titles.append(title)
+            return
+        if outcome == _Outcome.ARCHIVED:
+            result.archived_count += 1
+            result.archived_titles.append(title)
+        elif outcome == _Outcome.DELETED_ROUTINE:
+            result.deleted_routine_count += 1
+            result.deleted_routine_titles.append(title)
+        else:
+            result.skipped_count += 1
+
+    def _record(self, page_id: str, stage: ArchiveStage) -> None:
+        if self._journal is not None:
+            self._journal.record(page_id, stage)
+
+    @staticmethod
+    def _filter_param(threshold_date: datetime) -> dict[str, Any]:
+        """DONEで、実施期間が閾値より前のTODOに絞り込む
+
+        Notionの日付フィルタは期間の終了日時では絞り込めないため、ここでは開始日時で絞り込み、
+        終了日時は _should_process で判定する(開始 <= 終了なので取りこぼしはない)。
+        """
+        return (
+            Builder.create()
+            .add(TodoStatus.from_status_name(ToDoStatusEnum.DONE.value), Cond.EQUALS)
+            .add(TodoLogDate.from_start_date(threshold_date), Cond.BEFORE)
+            .build()
         )
 
     def _should_process(self, page: BasePage, threshold_date: datetime) -> bool:
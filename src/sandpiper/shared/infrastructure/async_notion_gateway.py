@@ -0,0 +1,173 @@
+"""非同期のNotion APIゲートウェイ
+
+FastAPIの async ルートからイベントループを塞がずにNotionへアクセスするためのクライアント。
+lotion のページモデル(BasePage)をそのまま受け渡しでき、内部では keep-alive 付きの
+httpx.AsyncClient をプロセス全体で共有してコネクションを再利用する。
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+from typing import Any, ClassVar
+
+import httpx
+from lotion import BasePage
+from lotion.lotion import NotionApiError
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError, HTTPResponseError
+
+NOTION_VERSION = "2022-06-28"
+RETRYABLE_STATUSES = (429, 502)
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+class AsyncNotionGateway:
+    """Notion APIの非同期ゲートウェイ
+
+    429(Retry-Afterに従う)と502は max_retry_count 回まで再試行する。
+    失敗時は同期版の lotion と同じく NotionApiError を送出する。
+    """
+
+    _instance: ClassVar["AsyncNotionGateway | None"] = None
+
+    def __init__(
+        self,
+        secret: str | None = None,
+        client: AsyncClient | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 30.0,
+        max_retry_count: int = 3,
+    ) -> None:
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                timeout=timeout,
+            )
+            client = AsyncClient(
+                auth=secret or os.getenv("NOTION_SECRET"),
+                notion_version=NOTION_VERSION,
+                client=http_client,
+            )
+        self.client = client
+        self.max_retry_count = max_retry_count
+
+    @classmethod
+    def get_instance(cls) -> "AsyncNotionGateway":
+        """プロセス全体で共有するゲートウェイを返す(コネクションプールを使い回すため)"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def close_instance(cls) -> None:
+        """共有ゲートウェイのコネクションプールを閉じる(アプリケーション終了時に呼ぶ)"""
+        if cls._instance is not None:
+            await cls._instance.aclose()
+            cls._instance = None
+
+    async def aclose(self) -> None:
+        """コネクションプールを閉じる"""
+        await self.client.aclose()
+
+    async def create_page[T: BasePage](self, page: T) -> T:
+        """ページを新規作成し、作成されたページを返す(ブロックも追加する)"""
+        database_id = page._get_own_database_id()
+        entity = await self._request(
+            lambda: self.client.pages.create(
+                parent={"type": "database_id", "database_id": database_id},
+                properties=_to_request_properties(page),
+            ),
+            database_id=database_id,
+        )
+        if page.block_children:
+            children = [block.to_dict(for_create=True) for block in page.block_children]
+            await self._request(
+                lambda: self.client.blocks.children.append(block_id=entity["id"], children=children),
+                page_id=entity["id"],
+            )
+        return type(page).from_data(data=entity, block_children=page.block_children)
+
+    async def retrieve_database[T: BasePage](
+        self,
+        database_id: str,
+        filter_param: dict[str, Any] | None = None,
+        cls: type[T] = BasePage,  # type: ignore[assignment]
+    ) -> list[T]:
+        """データベースのページを取得する(ページネーションは内部で処理する。ブロックは取得しない)"""
+        return [page async for page in self.iter_database(database_id, filter_param=filter_param, cls=cls)]
+
+    async def iter_database[T: BasePage](
+        self,
+        database_id: str,
+        filter_param: dict[str, Any] | None = None,
+        page_size: int = 100,
+        cls: type[T] = BasePage,  # type: ignore[assignment]
+    ) -> AsyncIterator[T]:
+        """データベースのページを、APIの応答を受け取るたびに順に返す(ブロックは取得しない)"""
+        start_cursor: str | None = None
+        while True:
+            body: dict[str, Any] = {"page_size": page_size}
+            if filter_param is not None:
+                body["filter"] = filter_param
+            if start_cursor:
+                body["start_cursor"] = start_cursor
+            data = await self._request(
+                partial(self.client.request, method="POST", path=f"databases/{database_id}/query", body=body),
+                database_id=database_id,
+            )
+            for entity in data.get("results", []):
+                yield cls.from_data(data=entity, block_children=[])
+            if not data.get("has_more"):
+                return
+            start_cursor = data.get("next_cursor")
+
+    async def remove_page(self, page_id: str) -> None:
+        """ページを削除(アーカイブ)する"""
+        await self._request(lambda: self.client.pages.update(page_id=page_id, archived=True), page_id=page_id)
+
+    async def _request(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        page_id: str | None = None,
+        database_id: str | None = None,
+    ) -> dict[str, Any]:
+        retry_count = 0
+        while True:
+            try:
+                result: dict[str, Any] = await call()
+                return result
+            except (APIResponseError, HTTPResponseError) as e:
+                if e.status not in RETRYABLE_STATUSES or retry_count >= self.max_retry_count:
+                    raise NotionApiError(page_id=page_id, database_id=database_id, e=e) from e
+                retry_count += 1
+                await asyncio.sleep(_retry_after_seconds(e))
+
+
+def _retry_after_seconds(error: HTTPResponseError) -> float:
+    retry_after = error.headers.get("Retry-After") if error.headers else None
+    try:
+        return float(retry_after) if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+def _to_request_properties(page: BasePage) -> dict[str, Any]:
+    """ページのプロパティをNotion APIのリクエスト形式に変換する
+
+    名前だけを指定したセレクトは id / color が None のままになるため、None の項目を取り除く
+    (同期版の lotion はセレクト一覧を取得して補完しているが、名前だけでもAPIは受け付ける)。
+    """
+    properties: dict[str, Any] = page.properties.exclude_for_update().__dict__()
+    for value in properties.values():
+        select = value.get("select")
+        if isinstance(select, dict):
+            value["select"] = {k: v for k, v in select.items() if v is not None}
+        multi_select = value.get("multi_select")
+        if isinstance(multi_select, list):
+            value["multi_select"] = [{k: v for k, v in option.items() if v is not None} for option in multi_select]
+    return properties
@@ -1,16 +1,169 @@
+"""イベントバス
+
+SERIAL(デフォルト)では、発行元のスレッドでハンドラーを登録順に1つずつ実行し、例外はそのまま送出する。
+CONCURRENT では、ハンドラーをスレッドプールで同時に実行する。
+- ハンドラーごとに例外を分離し、ログに出力して PublishResult にまとめる(発行元には送出しない)
+- ハンドラーごとのタイムアウトを過ぎたら待つのをやめる(スレッドは止められないのでそのまま完了まで動く。
+  コルーチンを返すハンドラーはタイムアウトでキャンセルされる)
+- background=True で登録したハンドラーは完了を待たずに publish から戻る(保存が終わった後の通知など)
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from enum import StrEnum
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class DispatchMode(StrEnum):
+    SERIAL = "serial"
+    CONCURRENT = "concurrent"
+
+
+@dataclass(frozen=True)
+class _HandlerOptions:
+    timeout: float | None = None
+    background: bool = False
+
+
+@dataclass
+class PublishResult:
+    """publish の結果(CONCURRENT でのみ失敗・タイムアウトが記録される。background のハンドラーは含まない)"""
+
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.timed_out
+
 
 class EventBus:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        mode: DispatchMode = DispatchMode.SERIAL,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        handler_timeout: float | None = None,
+    ) -> None:
         self._handlers: dict[type, list[Callable[..., Any]]] = defaultdict(list)
+        self._options: dict[type, list[_HandlerOptions]] = defaultdict(list)
+        self._mode = mode
+        self._max_workers = max_workers
+        self._handler_timeout = handler_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._background: set[Future[None]] = set()
+
+    def subscribe(
+        self,
+        event_type: type,
+        handler: Callable[..., Any],
+        timeout: float | None = None,
+        background: bool = False,
+    ) -> None:
+        """ハンドラーを登録する
 
-    def subscribe(self, event_type: type, handler: Callable[..., Any]) -> None:
+        Args:
+            timeout: このハンドラーのタイムアウト秒数(省略時はバス全体の handler_timeout)
+            background: True なら完了を待たずに publish から戻る(CONCURRENT のみ)
+        """
         self._handlers[event_type].append(handler)
+        self._options[event_type].append(_HandlerOptions(timeout=timeout, background=background))
 
-    def publish(self, event: object) -> None:
+    def publish(self, event: object) -> PublishResult:
         event_type = type(event)
-        for handler in self._handlers[event_type]:
-            handler(event)
+        subscriptions = list(zip(self._handlers[event_type], self._options[event_type], strict=True))
+        if self._mode == DispatchMode.SERIAL:
+            for handler, _ in subscriptions:
+                _invoke(handler, event, None)
+            return PublishResult()
+        return self._publish_concurrently(event, subscriptions)
+
+    def wait_for_background(self, timeout: float | None = None) -> bool:
+        """background のハンドラーの完了を待つ。すべて完了すれば True を返す"""
+        with self._lock:
+            pending = set(self._background)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self, wait_for_handlers: bool = True) -> None:
+        """スレッドプールを停止する(wait_for_handlers=True なら実行中のハンドラーの完了を待つ)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait_for_handlers)
+
+    def _publish_concurrently(
+        self,
+        event: object,
+        subscriptions: list[tuple[Callable[..., Any], _HandlerOptions]],
+    ) -> PublishResult:
+        result = PublishResult()
+        waiting: list[tuple[str, float | None, Future[None]]] = []
+        for handler, options in subscriptions:
+            timeout = options.timeout if options.timeout is not None else self._handler_timeout
+            # 呼び出し元のコンテキスト(スナップショットなど)をハンドラーのスレッドに引き継ぐ
+            future = self._get_executor().submit(copy_context().run, _invoke, handler, event, timeout)
+            if options.background:
+                self._track_background(_handler_name(handler), future)
+            else:
+                waiting.append((_handler_name(handler), timeout, future))
+
+        started_at = time.monotonic()
+        for name, timeout, future in waiting:
+            remaining = None if timeout is None else max(timeout - (time.monotonic() - started_at), 0.0)
+            done, _ = wait([future], timeout=remaining)
+            if not done:
+                logger.warning("Event handler timed out: %s (%s)", name, type(event).__name__)
+                result.timed_out.append(name)
+                continue
+            error = future.exception()
+            if error is not None:
+                logger.error("Event handler failed: %s (%s)", name, type(event).__name__, exc_info=error)
+                result.errors[name] = error
+        return result
+
+    def _track_background(self, name: str, future: Future[None]) -> None:
+        with self._lock:
+            self._background.add(future)
+
+        def on_done(done: Future[None]) -> None:
+            with self._lock:
+                self._background.discard(done)
+            error = done.exception()
+            if error is not None:
+                logger.error("Background event handler failed: %s", name, exc_info=error)
+
+        future.add_done_callback(on_done)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="event-bus")
+            return self._executor
+
+
+def _invoke(handler: Callable[..., Any], event: object, timeout: float | None) -> None:
+    """ハンドラーを実行する。コルーチンを返すハンドラーはこのスレッドのイベントループで完了まで実行する"""
+    result = handler(event)
+    if inspect.isawaitable(result):
+        asyncio.run(_await(result, timeout))
+
+
+async def _await(awaitable: Awaitable[Any], timeout: float | None) -> None:
+    await asyncio.wait_for(awaitable, timeout=timeout)
+
+
+def _handler_name(handler: Callable[..., Any]) -> str:
+    return getattr(handler, "__qualname__", None) or type(handler).__name__
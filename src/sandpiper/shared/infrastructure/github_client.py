@@ -1,22 +1,69 @@
 """GitHub API クライアント"""
 
+import json
 import os
-from collections.abc import Iterable
-from datetime import datetime, timedelta
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import urlencode
 
 from github import Auth, Github
 from github.Event import Event
+from requests import Session
+
+from sandpiper.shared.infrastructure.http_etag_cache import HttpEtagCache
+from sandpiper.shared.infrastructure.http_transport import HttpTransport
+
+API_URL = "https://api.github.com"
+NOT_MODIFIED = 304
+PER_PAGE = 100
+# 検索APIが返すのは最大1000件(100件 x 10ページ)
+MAX_PAGES = 10
+DEFAULT_MAX_WORKERS = 4
+# イベントAPIが返すのは直近90日(かつ最大300件)のイベントだけ
+EVENTS_RETENTION = timedelta(days=90)
+# イベントAPIの1ページの件数(最大100)。既定の30件だと300件を読むのに10ページかかる
+EVENTS_PER_PAGE = 100
+
+
+@dataclass(frozen=True)
+class GitHubSearchActivity:
+    """検索APIとコミットAPIで取得した期間内の活動(APIの生データ)"""
+
+    # コミットAPIの要素。"repository" にリポジトリ名(owner/name)を付ける
+    commits: list[dict[str, Any]]
+    # (アクション, 検索APIの要素) の組。アクションは opened / merged / closed。要素には "repository" を付ける
+    pull_requests: list[tuple[str, dict[str, Any]]]
+    issues: list[tuple[str, dict[str, Any]]]
+    # レビューAPIの要素。"repository" と "pull_number" を付ける
+    reviews: list[dict[str, Any]]
 
 
 class GitHubClient:
-    """PyGithubのラッパークラス - GitHub API操作を提供"""
+    """PyGithubのラッパークラス - GitHub API操作を提供
 
-    def __init__(self, token: str | None = None) -> None:
+    search_activity はイベントAPI(直近の最大300件しか返さない)を使わず、
+    検索APIとコミットAPIで任意の期間の活動を取得する。
+    etag_cache を渡すと応答を ETag 付きで保存し、同じ問い合わせは 304 で済ませる。
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        transport: HttpTransport | None = None,
+        etag_cache: HttpEtagCache | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
         """
         GitHubクライアントを初期化
 
         Args:
             token: GitHub Personal Access Token (省略時は環境変数GITHUB_TOKENから取得)
+            transport: REST APIを呼び出すトランスポート(省略時はタイムアウト・再試行付きで作成)
+            etag_cache: 応答のETagキャッシュ
+            max_workers: search_activity で同時に発行するリクエスト数
         """
         self.token = token or os.getenv("GITHUB_TOKEN")
         if not self.token:
@@ -24,7 +71,138 @@ class GitHubClient:
             raise ValueError(msg)
 
         auth = Auth.Token(self.token)
-        self._github = Github(auth=auth)
+        self._github = Github(auth=auth, per_page=EVENTS_PER_PAGE)
+        self._transport = transport or HttpTransport(session=Session())
+        self._transport.session.headers.update(
+            {
+                "Authorization": f"Bearer {self.token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            }
+        )
+        self._etag_cache = etag_cache
+        self._max_workers = max_workers
+
+    def search_activity(self, username: str, since: datetime, until: datetime) -> GitHubSearchActivity:
+        """
+        期間内のユーザーの活動を検索APIとコミットAPIで取得する
+
+        1. PR・イシューの検索、コミットの検索、最近pushしたリポジトリの一覧を並行して問い合わせる
+        2. 見つかったリポジトリごとのコミット一覧と、レビューしたPRのレビュー一覧を並行して問い合わせる
+
+        Args:
+            username: GitHubユーザー名
+            since: 期間の開始(この時刻を含む)
+            until: 期間の終了(この時刻を含まない)
+        """
+        period = f"{_iso(since)}..{_iso(until - timedelta(seconds=1))}"
+        searches: dict[str, str] = {
+            "opened_pull_requests": f"author:{username} is:pr created:{period}",
+            "merged_pull_requests": f"author:{username} is:pr merged:{period}",
+            "closed_pull_requests": f"author:{username} is:pr is:unmerged closed:{period}",
+            "opened_issues": f"author:{username} is:issue created:{period}",
+            "closed_issues": f"author:{username} is:issue closed:{period}",
+            # レビュー後にPRが更新されていても拾えるよう下限だけで絞り、期間は _reviews の submitted_at で判定する
+            "reviewed_pull_requests": f"reviewed-by:{username} -author:{username} is:pr updated:>={_iso(since)}",
+        }
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            search_futures = {name: executor.submit(self._search, "issues", query) for name, query in searches.items()}
+            commit_search = executor.submit(self._search, "commits", f"author:{username} committer-date:{period}")
+            pushed_repos = executor.submit(self._pushed_repositories, username, since)
+            found = {name: future.result() for name, future in search_futures.items()}
+
+            repositories = set(pushed_repos.result())
+            repositories.update(item["repository"]["full_name"] for item in commit_search.result())
+            for name in ("opened_pull_requests", "merged_pull_requests", "closed_pull_requests"):
+                repositories.update(_repository_name(item) for item in found[name])
+
+            commit_futures = [
+                executor.submit(self._commits, repository, username, since, until)
+                for repository in sorted(repositories)
+            ]
+            review_futures = [
+                executor.submit(self._reviews, item, username, since, until) for item in found["reviewed_pull_requests"]
+            ]
+            commits = _unique_commits(
+                [commit for future in commit_futures for commit in future.result()]
+                + [{**item, "repository": item["repository"]["full_name"]} for item in commit_search.result()]
+            )
+            reviews = [review for future in review_futures for review in future.result()]
+
+        return GitHubSearchActivity(
+            commits=commits,
+            pull_requests=[
+                (action, {**item, "repository": _repository_name(item)})
+                for action in ("opened", "merged", "closed")
+                for item in found[f"{action}_pull_requests"]
+            ],
+            issues=[
+                (action, {**item, "repository": _repository_name(item)})
+                for action in ("opened", "closed")
+                for item in found[f"{action}_issues"]
+            ],
+            reviews=reviews,
+        )
+
+    def _search(self, kind: str, query: str) -> list[dict[str, Any]]:
+        return self._get_pages(f"/search/{kind}", {"q": query}, lambda page: page.get("items", []))
+
+    def _pushed_repositories(self, username: str, since: datetime) -> list[str]:
+        """期間の開始以降にpushしたユーザーのリポジトリ(pushした日時の新しい順に返るので、古いものが出たら打ち切る)"""
+        repositories = self._get_json(f"/users/{username}/repos", {"sort": "pushed", "per_page": PER_PAGE})
+        return [
+            repository["full_name"]
+            for repository in repositories
+            if repository.get("pushed_at") and _parse_datetime(repository["pushed_at"]) >= since
+        ]
+
+    def _commits(self, repository: str, username: str, since: datetime, until: datetime) -> list[dict[str, Any]]:
+        params = {"author": username, "since": _iso(since), "until": _iso(until)}
+        commits = self._get_pages(f"/repos/{repository}/commits", params, lambda page: page)
+        return [{**commit, "repository": repository} for commit in commits]
+
+    def _reviews(
+        self, pull_request: dict[str, Any], username: str, since: datetime, until: datetime
+    ) -> list[dict[str, Any]]:
+        repository = _repository_name(pull_request)
+        number = pull_request["number"]
+        reviews = self._get_pages(f"/repos/{repository}/pulls/{number}/reviews", {}, lambda page: page)
+        return [
+            {**review, "repository": repository, "pull_number": number}
+            for review in reviews
+            if (review.get("user") or {}).get("login", "").lower() == username.lower()
+            and review.get("submitted_at")
+            and since <= _parse_datetime(review["submitted_at"]) < until
+        ]
+
+    def _get_pages(
+        self,
+        path: str,
+        params: dict[str, Any],
+        items_of: Callable[[Any], list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        for page_number in range(1, MAX_PAGES + 1):
+            page = items_of(self._get_json(path, {**params, "per_page": PER_PAGE, "page": page_number}))
+            items.extend(page)
+            if len(page) < PER_PAGE:
+                break
+        return items
+
+    def _get_json(self, path: str, params: dict[str, Any]) -> Any:
+        """GETリクエストの応答をJSONで返す(ETagキャッシュがあれば条件付きリクエストにする)"""
+        url = f"{API_URL}{path}"
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}"
+        cached = self._etag_cache.get(cache_key) if self._etag_cache is not None else None
+        headers = {"If-None-Match": cached.etag} if cached is not None else {}
+        response = self._transport.get(url, params=params, headers=headers)
+        if response.status_code == NOT_MODIFIED and cached is not None:
+            return json.loads(cached.body)
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        if self._etag_cache is not None and etag:
+            self._etag_cache.put(cache_key, etag, response.text)
+        return response.json()
 
     def get_user_events(self, username: str) -> Iterable[Event]:
         """
@@ -34,7 +212,7 @@ class GitHubClient:
             username: GitHubユーザー名
 
         Returns:
-            イベントのイテレータ
+            イベントのイテレータ(新しい順。ページは読み進めたときに取得される)
         """
         user = self._github.get_user(username)
         return user.get_events()
@@ -55,16 +233,50 @@ class GitHubClient:
             フィルタリングされたイベントのリスト
         """
         start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
-
-        filtered_events = []
-        # 最新90件のイベントをチェック(GitHub APIの制限)
-        for event in list(events)[:90]:
-            event_date = event.created_at
-            if start_of_day <= event_date < end_of_day:
-                filtered_events.append(event)
-            # 対象日より古いイベントが見つかったら終了
-            elif event_date < start_of_day:
-                break
+        return list(EventStream(events, start_of_day, start_of_day + timedelta(days=1)))
+
+
+class EventStream:
+    """新しい順のイベントから期間内のイベントだけを順に返すイテレーター
+
+    期間の開始より古いイベントが現れた時点で読むのをやめるので、それ以降のページは取得しない。
+    読み終えた後の covers_period で、イベントAPIの範囲が期間の開始まで届いていたかがわかる。
+    届いていなかった場合、oldest_created_at より後の時間帯はイベントで取得できている。
+    """
+
+    def __init__(self, events: Iterable[Event], since: datetime, until: datetime) -> None:
+        self._events = events
+        self.since = since
+        self.until = until
+        self.covers_period = False
+        self.oldest_created_at: datetime | None = None
+
+    def __iter__(self) -> Iterator[Event]:
+        for event in self._events:
+            self.oldest_created_at = event.created_at
+            if event.created_at >= self.until:
+                continue
+            if event.created_at < self.since:
+                self.covers_period = True
+                return
+            yield event
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _repository_name(search_item: dict[str, Any]) -> str:
+    # 検索APIの要素は repository_url (https://api.github.com/repos/owner/name) しか持たない
+    return str(search_item["repository_url"]).removeprefix(f"{API_URL}/repos/")
+
 
-        return filtered_events
+def _unique_commits(commits: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    unique: dict[tuple[str, str], dict[str, Any]] = {}
+    for commit in commits:
+        unique.setdefault((commit["repository"], commit["sha"]), commit)
+    return list(unique.values())
@@ -0,0 +1,92 @@
+"""ETag付きのHTTP応答のディスクキャッシュ
+
+GETの応答本文を ETag と一緒にSQLiteへ保存しておき、次回は If-None-Match を付けて問い合わせる。
+304 Not Modified が返れば保存済みの本文をそのまま使う(GitHub APIでは304はレート制限を消費しない)。
+日付ごとの検索などURLは増え続けるので、保存のたびに max_age より古い応答を捨て、件数も max_entries までに抑える。
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
+
+from sandpiper.shared.utils.data_dir import data_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    body TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_stored_at ON responses (stored_at);
+"""
+
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: str
+
+
+class HttpEtagCache:
+    """URLをキーにした ETag と応答本文のキャッシュ(スレッドセーフ)"""
+
+    _instance: ClassVar["HttpEtagCache | None"] = None
+
+    def __init__(
+        self,
+        path: Path | str,
+        clock: Callable[[], float] = time.time,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._path = str(path)
+        self._clock = clock
+        self._max_age = max_age
+        self._max_entries = max_entries
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "HttpEtagCache":
+        """プロセス全体で共有するキャッシュを返す(データディレクトリの http_etag_cache.sqlite3)"""
+        if cls._instance is None:
+            cls._instance = cls(path=data_dir(create=False) / "http_etag_cache.sqlite3")
+        return cls._instance
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._connection().execute("SELECT etag, body FROM responses WHERE url = ?", (url,)).fetchone()
+        return CachedResponse(etag=row[0], body=row[1]) if row else None
+
+    def put(self, url: str, etag: str, body: str) -> None:
+        """応答を保存し、古い応答と上限を超えた分を取り除く"""
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, body, stored_at) VALUES (?, ?, ?, ?)",
+                (url, etag, body, now),
+            )
+            conn.execute("DELETE FROM responses WHERE stored_at < ?", (now - self._max_age,))
+            conn.execute(
+                "DELETE FROM responses WHERE url NOT IN"
+                " (SELECT url FROM responses ORDER BY stored_at DESC, rowid DESC LIMIT ?)",
+                (self._max_entries,),
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # キャッシュを使わないCLIコマンドでファイルを作らないよう、初回利用時に開く
+        if self._conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
@@ -0,0 +1,140 @@
+"""外部APIを呼び出すHTTPトランスポート
+
+requests.Session に次の設定をまとめて施す。
+- 接続・読み込みのタイムアウト(応答しないサーバーで処理が止まり続けないように)
+- コネクションプールの大きさを指定した HTTPAdapter
+- 429・5xx・接続エラーの再試行(Retry-After があればその秒数、なければ指数バックオフで待つ)
+- gzip 圧縮の要求(Accept-Encoding)の有無
+- 呼び出しごとのレイテンシの記録
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+# Retry-After が極端に長くても、この秒数より長くは待たない
+MAX_WAIT_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class HttpCallMetric:
+    """1回の呼び出し(再試行を含む)の記録"""
+
+    method: str
+    path: str
+    status_code: int | None
+    elapsed_seconds: float
+    attempts: int
+
+
+class HttpTransport:
+    """タイムアウト・再試行・コネクションプールを設定した requests.Session のラッパー(スレッドセーフ)"""
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = DEFAULT_READ_TIMEOUT_SECONDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        gzip: bool = True,
+        metrics_size: int = 1000,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.session = session or Session()
+        # 再試行は自前で行う(Retry-After の上限やメトリクスの記録のため)ので、アダプターでは再試行しない
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # requests は既定で gzip を要求する。無効にする場合は圧縮しない応答を求める
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate" if gzip else "identity"})
+        self.timeout = (connect_timeout, read_timeout)
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._metrics: deque[HttpCallMetric] = deque(maxlen=metrics_size)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """GETリクエストを送る(再試行しても失敗した場合は最後の応答を返す。raise_for_status は呼び出し側で行う)"""
+        kwargs.setdefault("timeout", self.timeout)
+        started_at = self._clock()
+        attempts = 0
+        response: Response | None = None
+        try:
+            while True:
+                attempts += 1
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempts > self._max_retries:
+                        raise
+                    wait_seconds = self._backoff(attempts)
+                    logger.warning("GET %s failed (%s), retrying in %.1fs", _path(url), e, wait_seconds)
+                else:
+                    if response.status_code not in RETRYABLE_STATUSES or attempts > self._max_retries:
+                        return response
+                    wait_seconds = _retry_after_seconds(response) or self._backoff(attempts)
+                    logger.warning(
+                        "GET %s returned %s, retrying in %.1fs", _path(url), response.status_code, wait_seconds
+                    )
+                self._sleep(min(wait_seconds, MAX_WAIT_SECONDS))
+        finally:
+            self._record(
+                HttpCallMetric(
+                    method="GET",
+                    path=_path(url),
+                    status_code=response.status_code if response is not None else None,
+                    elapsed_seconds=self._clock() - started_at,
+                    attempts=attempts,
+                )
+            )
+
+    def metrics(self) -> list[HttpCallMetric]:
+        """直近の呼び出しの記録を古い順に返す"""
+        return list(self._metrics)
+
+    def _record(self, metric: HttpCallMetric) -> None:
+        self._metrics.append(metric)
+        logger.debug(
+            "%s %s -> %s in %.3fs (%d attempts)",
+            metric.method,
+            metric.path,
+            metric.status_code,
+            metric.elapsed_seconds,
+            metric.attempts,
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        return self._backoff_seconds * (2.0 ** (attempts - 1))
+
+
+def _retry_after_seconds(response: Response) -> float | None:
+    retry_after = response.headers.get("Retry-After") if response.headers else None
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except ValueError:
+        # HTTP日付形式の Retry-After は扱わず、指数バックオフで待つ
+        return None
+
+
+def _path(url: str) -> str:
+    return urlsplit(url).path
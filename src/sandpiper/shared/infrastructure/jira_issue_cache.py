@@ -0,0 +1,186 @@
+"""Jiraの検索結果のローカルキャッシュ
+
+検索で取得したチケット(APIの生データ)を、チケットのキーと updated でSQLiteに保存する。
+検索(JQLと取得フィールドの組)ごとに結果に含まれるチケットのキーと同期時刻を記録しておき、
+次回は前回の同期以降に更新されたチケットだけを問い合わせて反映できるようにする。
+どのJQLで差分を問い合わせるかは呼び出し側(Jiraのクエリ)が決める。
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+from sandpiper.shared.utils.data_dir import data_dir
+
+# スキーマを変えたら上げる(古いキャッシュは作り直す)
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    fields TEXT NOT NULL,
+    issue_key TEXT NOT NULL,
+    updated TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (fields, issue_key)
+);
+CREATE TABLE IF NOT EXISTS searches (
+    fields TEXT NOT NULL,
+    jql TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    full_synced_at REAL NOT NULL,
+    PRIMARY KEY (fields, jql)
+);
+CREATE TABLE IF NOT EXISTS search_members (
+    fields TEXT NOT NULL,
+    jql TEXT NOT NULL,
+    issue_key TEXT NOT NULL,
+    PRIMARY KEY (fields, jql, issue_key)
+);
+"""
+
+
+@dataclass(frozen=True)
+class JiraCachedSearch:
+    """キャッシュ済みの検索の状態"""
+
+    issue_keys: list[str]
+    # 件数の上限で打ち切らずに全件を取得できているか(打ち切った場合は差分を当てられない)
+    complete: bool
+    synced_at: float
+    full_synced_at: float
+
+
+class JiraIssueCache:
+    """Jiraの検索結果のキャッシュ(スレッドセーフ)"""
+
+    _instance: ClassVar["JiraIssueCache | None"] = None
+
+    def __init__(self, path: Path | str) -> None:
+        self._path = str(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "JiraIssueCache":
+        """プロセス全体で共有するキャッシュを返す(データディレクトリの jira_issue_cache.sqlite3)"""
+        if cls._instance is None:
+            cls._instance = cls(path=data_dir(create=False) / "jira_issue_cache.sqlite3")
+        return cls._instance
+
+    def search(self, jql: str, fields: str) -> JiraCachedSearch | None:
+        """検索の状態を返す(一度も同期していなければ None)"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT complete, synced_at, full_synced_at FROM searches WHERE fields = ? AND jql = ?", (fields, jql)
+            ).fetchone()
+            if row is None:
+                return None
+            keys = conn.execute(
+                "SELECT issue_key FROM search_members WHERE fields = ? AND jql = ? ORDER BY rowid", (fields, jql)
+            ).fetchall()
+        complete, synced_at, full_synced_at = row
+        return JiraCachedSearch(
+            issue_keys=[key for (key,) in keys],
+            complete=bool(complete),
+            synced_at=synced_at,
+            full_synced_at=full_synced_at,
+        )
+
+    def issues(self, jql: str, fields: str) -> list[dict[str, Any]]:
+        """検索結果に含まれるチケットの生データを返す"""
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT i.data FROM search_members m"
+                    " JOIN issues i ON i.fields = m.fields AND i.issue_key = m.issue_key"
+                    " WHERE m.fields = ? AND m.jql = ? ORDER BY m.rowid",
+                    (fields, jql),
+                )
+                .fetchall()
+            )
+        return [json.loads(data) for (data,) in rows]
+
+    def replace_search(
+        self, jql: str, fields: str, issues: list[dict[str, Any]], complete: bool, synced_at: float
+    ) -> None:
+        """全件取得した検索結果で置き換える"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._put_issues(conn, fields, issues)
+                conn.execute("DELETE FROM search_members WHERE fields = ? AND jql = ?", (fields, jql))
+                self._add_members(conn, jql, fields, (issue["key"] for issue in issues))
+                conn.execute(
+                    "INSERT OR REPLACE INTO searches (fields, jql, complete, synced_at, full_synced_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (fields, jql, int(complete), synced_at, synced_at),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def merge_search(
+        self,
+        jql: str,
+        fields: str,
+        changed_issues: list[dict[str, Any]],
+        removed_keys: list[str],
+        synced_at: float,
+    ) -> None:
+        """差分で取得したチケットを検索結果に加え、条件から外れたチケットを取り除く"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._put_issues(conn, fields, changed_issues)
+                self._add_members(conn, jql, fields, (issue["key"] for issue in changed_issues))
+                conn.executemany(
+                    "DELETE FROM search_members WHERE fields = ? AND jql = ? AND issue_key = ?",
+                    [(fields, jql, key) for key in removed_keys],
+                )
+                conn.execute("UPDATE searches SET synced_at = ? WHERE fields = ? AND jql = ?", (synced_at, fields, jql))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _put_issues(conn: sqlite3.Connection, fields: str, issues: list[dict[str, Any]]) -> None:
+        # キーと updated が同じチケットは書き換えない(updated を問い合わせていなければ常に書き換える)
+        conn.executemany(
+            "INSERT INTO issues (fields, issue_key, updated, data) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (fields, issue_key) DO UPDATE SET updated = excluded.updated, data = excluded.data"
+            " WHERE excluded.updated IS NULL OR issues.updated IS NOT excluded.updated",
+            [(fields, issue["key"], issue.get("fields", {}).get("updated"), json.dumps(issue)) for issue in issues],
+        )
+
+    @staticmethod
+    def _add_members(conn: sqlite3.Connection, jql: str, fields: str, issue_keys: Iterable[str]) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO search_members (fields, jql, issue_key) VALUES (?, ?, ?)",
+            [(fields, jql, key) for key in issue_keys],
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # キャッシュを使わないCLIコマンドでファイルを作らないよう、初回利用時に開く
+        if self._conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                self._conn.executescript(
+                    "DROP TABLE IF EXISTS issues; DROP TABLE IF EXISTS searches; DROP TABLE IF EXISTS search_members;"
+                )
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
@@ -0,0 +1,103 @@
+"""Notionデータベースのページを、APIの応答ごとに順に返すイテレーター
+
+Lotion.retrieve_database は全件を取得してからリストで返すため、メモリ使用量がデータベースの大きさに比例する。
+iter_database は応答(最大 page_size 件)を受け取るたびにページを返すので、全件を1回ずつ見るだけの処理は
+一定のメモリで動き、最初の応答が届いた時点から処理を始められる。
+retrieve_page は、参照先のページのプロパティだけが必要な場合に、ブロックを取得せずにページを1件取得する。
+"""
+
+from collections.abc import Iterator
+from functools import partial
+from typing import Any
+
+from lotion import BasePage, Lotion
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError, HTTPResponseError
+
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_database[T: BasePage](
+    database_id: str,
+    filter_param: dict[str, Any] | None = None,
+    sorts: list[dict[str, Any]] | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cls: type[T] = BasePage,  # type: ignore[assignment]
+    client: Lotion | None = None,
+    rate_limiter: NotionRateLimiter | None = None,
+) -> Iterator[T]:
+    """データベースのページを順に返す(ブロックは取得しない)
+
+    次の応答は、前の応答のページをすべて受け取ってから問い合わせる。
+    sorts を指定すると、Notion側で並べ替えた順に返す。
+    リクエストは共有のレートリミッターを通し、429の場合は Retry-After に従って、
+    5xxの場合は指数バックオフで再試行する(Lotion.retrieve_database と同じく502などの一時的なエラーで失敗しない)。
+    """
+    entities = iter_database_entities(
+        database_id,
+        filter_param=filter_param,
+        sorts=sorts,
+        page_size=page_size,
+        client=client,
+        rate_limiter=rate_limiter,
+    )
+    for entity in entities:
+        yield cls.from_data(data=entity, block_children=[])
+
+
+def iter_database_entities(
+    database_id: str,
+    filter_param: dict[str, Any] | None = None,
+    sorts: list[dict[str, Any]] | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    client: Lotion | None = None,
+    rate_limiter: NotionRateLimiter | None = None,
+) -> Iterator[dict[str, Any]]:
+    """iter_database と同じ問い合わせで、ページモデルに変換する前の生データを返す"""
+    client = client or Lotion.get_instance()
+    rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+    start_cursor: str | None = None
+    while True:
+        body: dict[str, Any] = {"page_size": page_size}
+        if filter_param is not None:
+            body["filter"] = filter_param
+        if sorts is not None:
+            body["sorts"] = sorts
+        if start_cursor:
+            body["start_cursor"] = start_cursor
+        data = rate_limiter.call(partial(_query_database, client, database_id, body), retry_server_errors=True)
+        yield from data.get("results", [])
+        if not data.get("has_more"):
+            return
+        start_cursor = data.get("next_cursor")
+
+
+def retrieve_page[T: BasePage](
+    page_id: str,
+    cls: type[T] = BasePage,  # type: ignore[assignment]
+    client: Lotion | None = None,
+    rate_limiter: NotionRateLimiter | None = None,
+) -> T:
+    """ページを1件取得する(Lotion.retrieve_page と違い、ブロックは取得しない)"""
+    client = client or Lotion.get_instance()
+    rate_limiter = rate_limiter or NotionRateLimiter.get_instance()
+    data = rate_limiter.call(partial(_retrieve_page, client, page_id), retry_server_errors=True)
+    return cls.from_data(data=data, block_children=[])
+
+
+def _retrieve_page(client: Lotion, page_id: str) -> dict[str, Any]:
+    try:
+        result: dict[str, Any] = client.client.request(method="GET", path=f"pages/{page_id}")
+        return result
+    except (APIResponseError, HTTPResponseError) as e:
+        raise NotionApiError(page_id=page_id, e=e) from e
+
+
+def _query_database(client: Lotion, database_id: str, body: dict[str, Any]) -> dict[str, Any]:
+    try:
+        result: dict[str, Any] = client.client.request(method="POST", path=f"databases/{database_id}/query", body=body)
+        return result
+    except (APIResponseError, HTTPResponseError) as e:
+        raise NotionApiError(database_id=database_id, e=e) from e
@@ -0,0 +1,362 @@
+"""Notionデータベースのローカルレプリカ
+
+データベースのページをSQLiteに保存しておき、読み込みのたびに前回から更新されたページだけを取得して反映する。
+- 差分取得: last_edited_time がウォーターマーク(保存済みページの最大の last_edited_time)以降のページだけを問い合わせる。
+  Notionの last_edited_time は分単位に丸められるため、ウォーターマークと同時刻のページも取り直す
+- 完全同期: 削除(アーカイブ・ゴミ箱)されたページはデータベースの問い合わせに出てこないので、
+  full_sync_interval ごとに全件を取得して置き換える。他のプロセスで削除されたページは、それまでレプリカに残る。
+  TODOデータベースは archive-old-todos が毎日ページを削除するので、間隔を短くしている(TODO_FULL_SYNC_INTERVAL_SECONDS)
+- 削除の検知: 書き込みが「ページがない・アーカイブ済み」で失敗した場合は、
+  is_page_gone_error で判定して remove_page で取り除く(完全同期を待たずに反映する)
+- 世代: 同期で変化があるたびにデータベースごとの世代を進め、ページと削除記録に世代を付ける。
+  changes_since で、読み取りモデルなどが前回以降の変更分だけを受け取れる
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+from lotion import BasePage, Lotion
+from lotion.lotion import NotionApiError
+from lotion.page.page_id import PageId
+
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database_entities
+from sandpiper.shared.notion.databases import todo as todo_db
+from sandpiper.shared.utils.data_dir import data_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FULL_SYNC_INTERVAL_SECONDS = 6 * 60 * 60
+TODO_FULL_SYNC_INTERVAL_SECONDS = 30 * 60
+
+# スキーマを変えたら上げる(古いレプリカは作り直して完全同期し直す)
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    database_id TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    last_edited_time TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (database_id, page_id)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_generation ON pages (database_id, generation);
+CREATE TABLE IF NOT EXISTS tombstones (
+    database_id TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (database_id, page_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    generation INTEGER NOT NULL,
+    last_full_sync_at REAL NOT NULL,
+    last_refreshed_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class ReplicaSyncResult:
+    database_id: str
+    full: bool
+    fetched_count: int
+    removed_count: int
+
+
+@dataclass(frozen=True)
+class ReplicaChanges[T: BasePage]:
+    """changes_since の結果"""
+
+    generation: int
+    pages: list[T]
+    deleted_page_ids: list[str]
+
+
+@dataclass(frozen=True)
+class _SyncState:
+    watermark: str | None
+    generation: int
+    last_full_sync_at: float
+    last_refreshed_at: float
+
+
+class NotionDatabaseReplica:
+    """Notionデータベースのローカルレプリカ(スレッドセーフ)
+
+    retrieve_database は lotion の Lotion.retrieve_database と同じ形でページを返す(ブロックは含まない)。
+    """
+
+    _instance: ClassVar["NotionDatabaseReplica | None"] = None
+
+    def __init__(
+        self,
+        path: Path | str,
+        client: Lotion | None = None,
+        full_sync_interval: float = DEFAULT_FULL_SYNC_INTERVAL_SECONDS,
+        min_refresh_interval: float = 0.0,
+        clock: Callable[[], float] = time.time,
+        full_sync_intervals: Mapping[str, float] | None = None,
+    ) -> None:
+        self._path = str(path)
+        self._client = client
+        self._full_sync_interval = full_sync_interval
+        # データベースごとの完全同期の間隔(指定のないデータベースは full_sync_interval)
+        self._full_sync_intervals = {_normalize_id(key): value for key, value in (full_sync_intervals or {}).items()}
+        self._min_refresh_interval = min_refresh_interval
+        self._clock = clock
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = threading.Lock()
+        # 同じデータベースの同期は1つずつ(待っていたスレッドは同期後のデータを読む)
+        self._sync_locks: dict[str, threading.Lock] = {}
+
+    @classmethod
+    def get_instance(cls) -> "NotionDatabaseReplica":
+        """プロセス全体で共有するレプリカを返す(データディレクトリの notion_replica.sqlite3)"""
+        if cls._instance is None:
+            cls._instance = cls(
+                path=data_dir(create=False) / "notion_replica.sqlite3",
+                full_sync_intervals={todo_db.DATABASE_ID: TODO_FULL_SYNC_INTERVAL_SECONDS},
+            )
+        return cls._instance
+
+    def retrieve_database[T: BasePage](
+        self,
+        database_id: str,
+        cls: type[T] = BasePage,  # type: ignore[assignment]
+        refresh: bool = True,
+    ) -> list[T]:
+        """レプリカを最新化してから、データベースの全ページを返す
+
+        refresh=False の場合はNotionに問い合わせず、ローカルに保持しているページだけを返す。
+        """
+        if refresh:
+            self.refresh(database_id)
+        with self._conn_lock:
+            rows = (
+                self._connection()
+                .execute("SELECT data FROM pages WHERE database_id = ? ORDER BY rowid", (database_id,))
+                .fetchall()
+            )
+        return [cls.from_data(data=json.loads(data), block_children=[]) for (data,) in rows]
+
+    def changes_since[T: BasePage](
+        self,
+        database_id: str,
+        generation: int,
+        cls: type[T] = BasePage,  # type: ignore[assignment]
+    ) -> ReplicaChanges[T]:
+        """レプリカを最新化してから、指定した世代より後に追加・更新・削除されたページを返す
+
+        generation=0 なら全ページを返す。戻り値の generation を次回の呼び出しに渡す。
+        """
+        self.refresh(database_id)
+        with self._conn_lock:
+            conn = self._connection()
+            state = self._sync_state(conn, database_id)
+            rows = conn.execute(
+                "SELECT data FROM pages WHERE database_id = ? AND generation > ? ORDER BY rowid",
+                (database_id, generation),
+            ).fetchall()
+            deleted = conn.execute(
+                "SELECT page_id FROM tombstones WHERE database_id = ? AND generation > ?", (database_id, generation)
+            ).fetchall()
+        return ReplicaChanges(
+            generation=state.generation if state is not None else 0,
+            pages=[cls.from_data(data=json.loads(data), block_children=[]) for (data,) in rows],
+            # ページモデルの id と同じ形式(ハイフン区切り)で返す
+            deleted_page_ids=[PageId(page_id).value for (page_id,) in deleted] if generation > 0 else [],
+        )
+
+    def refresh(self, database_id: str, full: bool = False) -> ReplicaSyncResult:
+        """レプリカを最新化する(完全同期が必要な場合か full=True の場合は全件を取り直す)"""
+        with self._sync_lock(database_id):
+            now = self._clock()
+            with self._conn_lock:
+                state = self._sync_state(self._connection(), database_id)
+            if state is None or full or now - state.last_full_sync_at >= self._full_sync_interval_for(database_id):
+                return self._full_sync(database_id, state, now)
+            if now - state.last_refreshed_at < self._min_refresh_interval:
+                return ReplicaSyncResult(database_id=database_id, full=False, fetched_count=0, removed_count=0)
+            return self._delta_sync(database_id, state, now)
+
+    def has_synced(self, database_id: str) -> bool:
+        """データベースを一度でも同期したことがあるか(差分同期だけで最新化できるか)"""
+        with self._conn_lock:
+            return self._sync_state(self._connection(), database_id) is not None
+
+    def remove_page(self, database_id: str, page_id: str) -> None:
+        """削除したページをレプリカからも取り除く(次の完全同期を待たずに反映する)"""
+        with self._conn_lock:
+            conn = self._connection()
+            state = self._sync_state(conn, database_id)
+            if state is None:
+                return
+            self._write(conn, database_id, state.watermark, state.generation + 1, [], [_normalize_id(page_id)])
+
+    def _full_sync(self, database_id: str, state: _SyncState | None, now: float) -> ReplicaSyncResult:
+        entities = self._query(database_id, filter_param=None)
+        live = [entity for entity in entities if not _is_deleted(entity)]
+        generation = (state.generation if state is not None else 0) + 1
+        with self._conn_lock:
+            conn = self._connection()
+            stored_ids = {
+                page_id
+                for (page_id,) in conn.execute("SELECT page_id FROM pages WHERE database_id = ?", (database_id,))
+            }
+            removed_ids = list(stored_ids - {_normalize_id(entity["id"]) for entity in live})
+            self._write(conn, database_id, _max_last_edited_time(entities), generation, live, removed_ids, now)
+        logger.info("Full sync %s: %d pages (%d removed)", database_id, len(live), len(removed_ids))
+        return ReplicaSyncResult(
+            database_id=database_id, full=True, fetched_count=len(entities), removed_count=len(removed_ids)
+        )
+
+    def _delta_sync(self, database_id: str, state: _SyncState, now: float) -> ReplicaSyncResult:
+        filter_param = (
+            None
+            if state.watermark is None
+            else {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": state.watermark}}
+        )
+        entities = self._query(database_id, filter_param=filter_param)
+        live = [entity for entity in entities if not _is_deleted(entity)]
+        deleted_ids = [_normalize_id(entity["id"]) for entity in entities if _is_deleted(entity)]
+        watermark = max(filter(None, [state.watermark, _max_last_edited_time(entities)]), default=None)
+        # ウォーターマークと同時刻のページは毎回取り直すので、内容が変わったものだけを変更として扱う
+        with self._conn_lock:
+            conn = self._connection()
+            changed = [entity for entity in live if self._has_changed(conn, database_id, entity)]
+            generation = state.generation + 1 if changed or deleted_ids else state.generation
+            self._write(conn, database_id, watermark, generation, changed, deleted_ids)
+            conn.execute("UPDATE sync_state SET last_refreshed_at = ? WHERE database_id = ?", (now, database_id))
+        return ReplicaSyncResult(
+            database_id=database_id, full=False, fetched_count=len(entities), removed_count=len(deleted_ids)
+        )
+
+    def _write(
+        self,
+        conn: sqlite3.Connection,
+        database_id: str,
+        watermark: str | None,
+        generation: int,
+        entities: list[dict[str, Any]],
+        removed_ids: list[str],
+        full_synced_at: float | None = None,
+    ) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages (database_id, page_id, last_edited_time, generation, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        database_id,
+                        _normalize_id(entity["id"]),
+                        entity["last_edited_time"],
+                        generation,
+                        json.dumps(entity),
+                    )
+                    for entity in entities
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM tombstones WHERE database_id = ? AND page_id = ?",
+                [(database_id, _normalize_id(entity["id"])) for entity in entities],
+            )
+            conn.executemany(
+                "DELETE FROM pages WHERE database_id = ? AND page_id = ?",
+                [(database_id, page_id) for page_id in removed_ids],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO tombstones (database_id, page_id, generation) VALUES (?, ?, ?)",
+                [(database_id, page_id, generation) for page_id in removed_ids],
+            )
+            if full_synced_at is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state"
+                    " (database_id, watermark, generation, last_full_sync_at, last_refreshed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (database_id, watermark, generation, full_synced_at, full_synced_at),
+                )
+            else:
+                conn.execute(
+                    "UPDATE sync_state SET watermark = ?, generation = ? WHERE database_id = ?",
+                    (watermark, generation, database_id),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _query(self, database_id: str, filter_param: dict[str, Any] | None) -> list[dict[str, Any]]:
+        if self._client is None:
+            self._client = Lotion.get_instance()
+        # ページモデルに変換する前の生データを保存する
+        return list(iter_database_entities(database_id, filter_param=filter_param, client=self._client))
+
+    def _full_sync_interval_for(self, database_id: str) -> float:
+        return self._full_sync_intervals.get(_normalize_id(database_id), self._full_sync_interval)
+
+    @staticmethod
+    def _has_changed(conn: sqlite3.Connection, database_id: str, entity: dict[str, Any]) -> bool:
+        row = conn.execute(
+            "SELECT data FROM pages WHERE database_id = ? AND page_id = ?", (database_id, _normalize_id(entity["id"]))
+        ).fetchone()
+        return row is None or row[0] != json.dumps(entity)
+
+    @staticmethod
+    def _sync_state(conn: sqlite3.Connection, database_id: str) -> _SyncState | None:
+        row = conn.execute(
+            "SELECT watermark, generation, last_full_sync_at, last_refreshed_at FROM sync_state WHERE database_id = ?",
+            (database_id,),
+        ).fetchone()
+        return _SyncState(*row) if row else None
+
+    def _sync_lock(self, database_id: str) -> threading.Lock:
+        with self._conn_lock:
+            return self._sync_locks.setdefault(database_id, threading.Lock())
+
+    def _connection(self) -> sqlite3.Connection:
+        # レプリカを使わないCLIコマンドでファイルを作らないよう、初回利用時に開く
+        if self._conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                self._conn.executescript(
+                    "DROP TABLE IF EXISTS pages; DROP TABLE IF EXISTS tombstones; DROP TABLE IF EXISTS sync_state;"
+                )
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+
+def _normalize_id(page_id: str) -> str:
+    return page_id.replace("-", "")
+
+
+def is_page_gone_error(error: NotionApiError) -> bool:
+    """ページが削除済み(存在しない・アーカイブ済み・ゴミ箱)のため書き込めなかったエラーかどうか"""
+    response_error = error.e
+    if response_error is None:
+        return False
+    if response_error.status == 404:
+        return True
+    return response_error.status == 400 and "archived" in str(response_error)
+
+
+def _is_deleted(entity: dict[str, Any]) -> bool:
+    return bool(entity.get("archived") or entity.get("in_trash"))
+
+
+def _max_last_edited_time(entities: list[dict[str, Any]]) -> str | None:
+    # ISO 8601(UTC, 同じ書式)なので文字列の比較で前後関係がわかる
+    return max((entity["last_edited_time"] for entity in entities), default=None)
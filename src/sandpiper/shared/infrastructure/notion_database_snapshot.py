@@ -0,0 +1,120 @@
+"""1回の処理実行の間だけNotionデータベースの取得結果を共有するスナップショット"""
+
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from lotion import BasePage, Lotion
+from lotion.page.page_id import PageId
+from lotion.properties.property import Property
+
+from sandpiper.shared.notion.page_cast import cast_page
+
+
+class NotionDatabaseSnapshot:
+    """Notionデータベースのリクエストスコープなスナップショット
+
+    activate() の範囲内では、各データベースは最初の参照時に一度だけNotionから取得され、
+    以降の参照はメモリ上のページを返す。範囲内で行ったページの作成・更新・削除は
+    put() / update_properties() / remove() でスナップショットにも反映し、整合性を保つ。
+
+    activate() の範囲外では何も保持せず、都度Notionへ問い合わせる。
+    範囲内の処理を複数スレッドで並行実行する場合は、contextvars.copy_context() で
+    コンテキストを引き継げば同じスナップショットを共有できる(内部はロックで保護する)。
+    同じデータベースを複数のスレッドが同時に参照した場合、Notionへの問い合わせは最初の1回だけで、
+    後から来たスレッドはその取得の完了を待つ。
+    """
+
+    def __init__(self) -> None:
+        self.client = Lotion.get_instance()
+        self._databases: ContextVar[dict[str, dict[str, BasePage]] | None] = ContextVar(
+            "notion_database_snapshot", default=None
+        )
+        # 取得中のデータベースIDと、取得の完了を知らせる Future
+        self._loading: ContextVar[dict[str, Future[None]] | None] = ContextVar(
+            "notion_database_snapshot_loading", default=None
+        )
+        self._lock = Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """スナップショットを有効化する。範囲を抜けると保持していたページは破棄される"""
+        token = self._databases.set({})
+        loading_token = self._loading.set({})
+        try:
+            yield
+        finally:
+            self._loading.reset(loading_token)
+            self._databases.reset(token)
+
+    @property
+    def is_active(self) -> bool:
+        return self._databases.get() is not None
+
+    def retrieve_database[T: BasePage](self, database_id: str, cls: type[T] = BasePage) -> list[T]:  # type: ignore[assignment]
+        """データベースの全ページを取得する(有効中は初回のみNotionに問い合わせる)"""
+        databases = self._databases.get()
+        if databases is None:
+            return self.client.retrieve_database(database_id, cls=cls)
+        loading = self._loading.get()
+        if loading is None:
+            msg = "NotionDatabaseSnapshot is active without its loading state"
+            raise RuntimeError(msg)
+        with self._lock:
+            loaded = databases.get(database_id)
+            in_flight = loading.get(database_id) if loaded is None else None
+            owned: Future[None] | None = None
+            if loaded is None and in_flight is None:
+                # 最初に参照したスレッドが取得を受け持つ
+                owned = loading[database_id] = Future()
+        if owned is not None:
+            # 取得中はロックを握らない(別データベースの取得を待たせない)
+            try:
+                pages: list[BasePage] = self.client.retrieve_database(database_id)
+            except BaseException as e:
+                with self._lock:
+                    loading.pop(database_id, None)
+                owned.set_exception(e)
+                raise
+            with self._lock:
+                databases[database_id] = {page.id: page for page in pages}
+                loading.pop(database_id, None)
+            owned.set_result(None)
+        elif in_flight is not None:
+            # 別のスレッドが取得中なら、その完了を待って結果を共有する(取得に失敗した場合は同じ例外を送出する)
+            in_flight.result()
+        with self._lock:
+            current = list(databases[database_id].values())
+        return [cast_page(page, cls) for page in current]
+
+    def put(self, database_id: str, page: BasePage) -> None:
+        """作成したページをスナップショットに追加する"""
+        with self._lock:
+            pages = self._loaded_pages(database_id)
+            if pages is not None:
+                pages[page.id] = page
+
+    def update_properties(self, database_id: str, page_id: str, properties: list[Property]) -> None:
+        """更新したプロパティをスナップショット上のページに反映する"""
+        with self._lock:
+            pages = self._loaded_pages(database_id)
+            page = pages.get(PageId(page_id).value) if pages is not None else None
+            if page is None:
+                return
+            for prop in properties:
+                page.set_prop(prop)
+
+    def remove(self, database_id: str, page_id: str) -> None:
+        """削除したページをスナップショットから取り除く"""
+        with self._lock:
+            pages = self._loaded_pages(database_id)
+            if pages is not None:
+                pages.pop(PageId(page_id).value, None)
+
+    def _loaded_pages(self, database_id: str) -> dict[str, BasePage] | None:
+        databases = self._databases.get()
+        if databases is None:
+            return None
+        return databases.get(database_id)
@@ -0,0 +1,70 @@
+"""プロジェクトデータベースの共有キャッシュ
+
+プロジェクト一覧は、プロジェクトタスクの絞り込み・プロジェクトタスクの整理・Jira同期などで何度も参照される。
+ページIDをキーにした一覧をメモリに保持し、参照のたびにデータベース全体を取り直さないようにする。
+- レプリカがある場合: 参照のたびにレプリカを差分同期し、前回以降に変わったページだけを一覧に反映する(TTLは使わない)
+- レプリカがない場合: ttl_seconds の間だけ一覧を保持し、期限が切れたらデータベース全体を取り直す
+プロジェクトを作成・更新したら invalidate() で破棄する。
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+from lotion import BasePage, Lotion
+
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica, ReplicaChanges
+from sandpiper.shared.notion.databases import project as project_db
+from sandpiper.shared.notion.page_cast import cast_page
+
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class NotionProjectDirectory:
+    """ページIDをキーにしたプロジェクト一覧のキャッシュ(スレッドセーフ)"""
+
+    def __init__(
+        self,
+        replica: NotionDatabaseReplica | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = Lotion.get_instance()
+        self._replica = replica
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pages: dict[str, BasePage] | None = None
+        self._loaded_at = 0.0
+        # レプリカから反映済みの世代
+        self._generation = 0
+
+    def pages[T: BasePage](self, cls: type[T] = BasePage) -> dict[str, T]:  # type: ignore[assignment]
+        """プロジェクトのページIDとページのマップを返す"""
+        with self._lock:
+            if self._replica is not None:
+                self._apply_replica_changes(self._replica)
+            elif self._pages is None or self._clock() - self._loaded_at >= self._ttl_seconds:
+                pages: list[BasePage] = self.client.retrieve_database(project_db.DATABASE_ID)
+                self._pages = {page.id: page for page in pages}
+                self._loaded_at = self._clock()
+            current = dict(self._pages or {})
+        return {page_id: cast_page(page, cls) for page_id, page in current.items()}
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄する(次の参照で取り直す)"""
+        with self._lock:
+            self._pages = None
+            self._generation = 0
+
+    def _apply_replica_changes(self, replica: NotionDatabaseReplica) -> None:
+        """レプリカを差分同期し、前回反映した世代より後の変更を一覧に反映する"""
+        if self._pages is None:
+            self._pages = {}
+            self._generation = 0
+        changes: ReplicaChanges[BasePage] = replica.changes_since(project_db.DATABASE_ID, self._generation)
+        for page_id in changes.deleted_page_ids:
+            self._pages.pop(page_id, None)
+        for page in changes.pages:
+            self._pages[page.id] = page
+        self._generation = changes.generation
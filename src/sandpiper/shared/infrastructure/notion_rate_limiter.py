@@ -0,0 +1,113 @@
+"""Notion APIのレート制限(平均3リクエスト/秒)に合わせたリクエスト制御
+
+トークンバケットでリクエストの発行ペースを抑え、それでも429が返った場合は
+Retry-Afterヘッダーの秒数だけ待ってから再試行する。
+何度送っても結果が変わらない読み込みは、5xx(502など一時的なサーバーエラー)も指数バックオフで再試行できる。
+"""
+
+import time
+from collections.abc import Callable
+from threading import Lock
+from typing import ClassVar
+
+from lotion.lotion import NotionApiError
+
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_RATE_LIMITED = 429
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+SERVER_ERROR_BACKOFF_SECONDS = 1.0
+
+
+class NotionRateLimiter:
+    """スレッドセーフなトークンバケット方式のレートリミッター
+
+    バケットには最大 capacity 個のトークンが貯まり、毎秒 rate 個ずつ補充される。
+    複数スレッドから同じインスタンスを共有して使う。
+    """
+
+    _instance: ClassVar["NotionRateLimiter | None"] = None
+
+    def __init__(
+        self,
+        rate: float = NOTION_REQUESTS_PER_SECOND,
+        capacity: float = NOTION_REQUESTS_PER_SECOND,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = Lock()
+
+    @classmethod
+    def get_instance(cls) -> "NotionRateLimiter":
+        """プロセス全体で共有するリミッターを返す(Notionの制限はインテグレーション単位のため)"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """トークンを取得する。足りない場合は補充されるまで待つ"""
+        tokens = min(tokens, self._capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_seconds = (tokens - self._tokens) / self._rate
+            self._sleep(wait_seconds)
+
+    def call[R](
+        self,
+        func: Callable[[], R],
+        cost: float = 1.0,
+        should_retry: Callable[[NotionApiError], bool] | None = None,
+        retry_server_errors: bool = False,
+    ) -> R:
+        """トークンを取得してから func を実行する。429の場合はRetry-After秒待って再試行する
+
+        Args:
+            func: Notion APIを呼び出す処理
+            cost: func が発行するおおよそのリクエスト数
+            should_retry: 再試行の対象のうち再試行してよいものを判定する(省略時はすべて再試行)
+            retry_server_errors: 5xxも指数バックオフで再試行する(読み込みなど、重複して送っても問題ない処理だけ)
+        """
+        retry_count = 0
+        while True:
+            self.acquire(cost)
+            try:
+                return func()
+            except NotionApiError as e:
+                wait_seconds = _retry_after_seconds(e)
+                if wait_seconds is None and retry_server_errors and _is_server_error(e):
+                    wait_seconds = SERVER_ERROR_BACKOFF_SECONDS * 2**retry_count
+                if wait_seconds is None or retry_count >= self._max_retries:
+                    raise
+                if should_retry is not None and not should_retry(e):
+                    raise
+                retry_count += 1
+                self._sleep(wait_seconds)
+
+
+def _retry_after_seconds(error: NotionApiError) -> float | None:
+    """429エラーであれば待機秒数を返す。それ以外のエラーは None"""
+    response_error = error.e
+    if response_error is None or response_error.status != NOTION_RATE_LIMITED:
+        return None
+    retry_after = response_error.headers.get("Retry-After") if response_error.headers else None
+    try:
+        return float(retry_after) if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+def _is_server_error(error: NotionApiError) -> bool:
+    return error.e is not None and error.e.status >= 500
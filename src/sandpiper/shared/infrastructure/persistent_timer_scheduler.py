@@ -0,0 +1,173 @@
+"""ディスクに永続化するタイマースケジューラー
+
+指定時刻に処理を1回実行するタイマーを、SQLiteとヒープで管理する。
+タイマーはキーで識別し、同じキーで登録し直すと上書き、cancel で取り消せる。
+
+- タイマーはSQLiteに保存されるので、プロセスが再起動しても start() で再登録される
+- start() していないプロセス(CLIなど)でも schedule() はでき、起動中のサーバープロセスが
+  sync_interval ごとにディスクを読み直して拾う
+- 発火時はディスクから行を削除できたプロセスだけが実行するので、二重に実行されない
+"""
+
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_INTERVAL_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+    key TEXT PRIMARY KEY,
+    fire_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+class PersistentTimerScheduler:
+    """ディスクに永続化するヒープベースのタイマースケジューラー(スレッドセーフ)
+
+    発火したタイマーは handler(payload) で処理する。
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        handler: Callable[[str], None],
+        sync_interval: float = DEFAULT_SYNC_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = str(path)
+        self._handler = handler
+        self._sync_interval = sync_interval
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._conn: sqlite3.Connection | None = None
+        # キー -> (発火時刻, ペイロード)。ヒープには取り消し済みの古い要素も残るので、ここと照合する
+        self._timers: dict[str, tuple[float, str]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def schedule(self, key: str, fire_at: float, payload: str) -> None:
+        """fire_at(UNIX時刻)に payload を処理するタイマーを登録する(同じキーがあれば上書き)"""
+        with self._condition:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO timers (key, fire_at, payload) VALUES (?, ?, ?)", (key, fire_at, payload)
+            )
+            self._arm(key, fire_at, payload)
+            self._condition.notify()
+
+    def cancel(self, key: str) -> bool:
+        """タイマーを取り消す。取り消すタイマーがあれば True を返す"""
+        with self._condition:
+            cursor = self._connection().execute("DELETE FROM timers WHERE key = ?", (key,))
+            self._timers.pop(key, None)
+            return cursor.rowcount > 0
+
+    def pending_count(self) -> int:
+        """未発火のタイマー数(他のプロセスで登録されたものも含む)"""
+        with self._condition:
+            row = self._connection().execute("SELECT COUNT(*) FROM timers").fetchone()
+            return int(row[0])
+
+    def start(self) -> None:
+        """ディスクに残っているタイマーを再登録し、発火用のスレッドを起動する"""
+        with self._condition:
+            self._stopping = False
+            self._sync()
+            logger.info("Re-armed %d pending timers", len(self._timers))
+        self._thread = threading.Thread(target=self._run, name="timer-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._condition:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def run_due(self) -> int:
+        """発火時刻を過ぎたタイマーを現在のスレッドで処理し、処理した件数を返す"""
+        with self._condition:
+            self._sync()
+        return self._fire_due()
+
+    def _run(self) -> None:
+        last_synced_at = self._clock()
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                now = self._clock()
+                if now - last_synced_at >= self._sync_interval:
+                    self._sync()
+                    last_synced_at = now
+                next_fire_at = self._next_fire_at()
+                timeout = self._sync_interval if next_fire_at is None else max(next_fire_at - now, 0.0)
+                if timeout > 0:
+                    # 登録・停止で起こされるか、次の発火時刻まで待ってから状態を確認し直す
+                    self._condition.wait(timeout=min(timeout, self._sync_interval))
+                    continue
+            self._fire_due()
+
+    def _fire_due(self) -> int:
+        fired = 0
+        while (due := self._pop_due()) is not None:
+            key, payload = due
+            try:
+                self._handler(payload)
+            except Exception:
+                logger.exception("Failed to handle timer: %s", key)
+            fired += 1
+        return fired
+
+    def _pop_due(self) -> tuple[str, str] | None:
+        with self._condition:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, key = heapq.heappop(self._heap)
+                if self._timers.get(key, (None,))[0] != fire_at:
+                    continue  # 取り消し・上書き済み
+                _, payload = self._timers.pop(key)
+                # 他のプロセスが先に発火・取り消ししていれば実行しない
+                cursor = self._connection().execute("DELETE FROM timers WHERE key = ? AND fire_at = ?", (key, fire_at))
+                if cursor.rowcount > 0:
+                    return key, payload
+            return None
+
+    def _next_fire_at(self) -> float | None:
+        while self._heap and self._timers.get(self._heap[0][1], (None,))[0] != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _sync(self) -> None:
+        """ディスクの内容でヒープを作り直す(他のプロセスでの登録・取り消しを反映する)"""
+        rows = self._connection().execute("SELECT key, fire_at, payload FROM timers").fetchall()
+        self._timers = {key: (fire_at, payload) for key, fire_at, payload in rows}
+        self._heap = [(fire_at, key) for key, (fire_at, _) in self._timers.items()]
+        heapq.heapify(self._heap)
+
+    def _arm(self, key: str, fire_at: float, payload: str) -> None:
+        self._timers[key] = (fire_at, payload)
+        heapq.heappush(self._heap, (fire_at, key))
+
+    def _connection(self) -> sqlite3.Connection:
+        # タイマーを使わないCLIコマンドでファイルを作らないよう、初回利用時に開く
+        if self._conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
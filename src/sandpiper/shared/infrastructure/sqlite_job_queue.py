@@ -0,0 +1,363 @@
+"""SQLiteに永続化するジョブキュー
+
+Webhookで受け付けた処理をジョブとして記録し、ワーカースレッドで実行する。
+プロセスが再起動しても未完了のジョブは失われず、失敗したジョブは指数バックオフで再試行する。
+同じページIDのジョブは受け付け順に1件ずつしか実行しない(同じTODOへの処理が競合しないように)。
+終わったジョブ(succeeded/failed)は増え続けるので、終わるたびに finished_max_age より古いものを捨て、
+件数も finished_max_entries までに抑える。
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[str], None]
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class NonRetryableJobError(Exception):
+    """再試行しても結果が変わらない失敗(即座に failed にする)"""
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    kind: str
+    page_id: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    next_run_at: float
+    last_error: str | None
+    created_at: float
+    updated_at: float
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "page_id": self.page_id,
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "next_run_at": self.next_run_at,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_run_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_next_run_at ON jobs (status, next_run_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_page_id_status ON jobs (page_id, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_updated_at ON jobs (status, updated_at);
+"""
+
+DEFAULT_FINISHED_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_FINISHED_MAX_ENTRIES = 1000
+
+_FINISHED_STATUSES = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+
+_COLUMNS = "id, kind, page_id, status, attempts, max_attempts, next_run_at, last_error, created_at, updated_at"
+
+
+class SqliteJobQueue:
+    """SQLiteに永続化するジョブキュー(複数スレッドから共有できる)"""
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 2.0,
+        backoff_max_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        finished_max_age: float = DEFAULT_FINISHED_MAX_AGE_SECONDS,
+        finished_max_entries: int = DEFAULT_FINISHED_MAX_ENTRIES,
+    ) -> None:
+        self._path = str(path)
+        self._max_attempts = max_attempts
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._clock = clock
+        self._finished_max_age = finished_max_age
+        self._finished_max_entries = finished_max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, kind: str, page_id: str, coalesce: bool = False) -> Job:
+        """ジョブを登録する
+
+        coalesce=True の場合、同じ種類・同じページIDでまだ一度も実行されていないジョブがあれば
+        新しく登録せずにそのジョブを返す(実行前の重複をまとめる)。
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            if coalesce:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND page_id = ? AND status = ? AND attempts = 0"
+                    " ORDER BY id LIMIT 1",
+                    (kind, page_id, JobStatus.PENDING.value),
+                ).fetchone()
+                if row is not None:
+                    return self._get(conn, row[0])
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, page_id, status, max_attempts, next_run_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, page_id, JobStatus.PENDING.value, self._max_attempts, now, now, now),
+            )
+            return self._get(conn, int(cursor.lastrowid or 0))
+
+    def claim(self) -> Job | None:
+        """実行可能なジョブを1件取り出して running にする
+
+        同じページIDで実行中のジョブ、またはより先に登録された未完了のジョブがあるものは取り出さない。
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs AS j"
+                " WHERE j.status = ? AND j.next_run_at <= ?"
+                " AND NOT EXISTS ("
+                "   SELECT 1 FROM jobs AS o WHERE o.page_id = j.page_id AND o.status IN (?, ?) AND o.id < j.id"
+                " )"
+                " AND NOT EXISTS (SELECT 1 FROM jobs AS r WHERE r.page_id = j.page_id AND r.status = ?)"
+                " ORDER BY j.next_run_at, j.id LIMIT 1",
+                (
+                    JobStatus.PENDING.value,
+                    now,
+                    JobStatus.PENDING.value,
+                    JobStatus.RUNNING.value,
+                    JobStatus.RUNNING.value,
+                ),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (JobStatus.RUNNING.value, now, row[0]),
+            )
+            return self._get(conn, row[0])
+
+    def mark_succeeded(self, job_id: int) -> None:
+        now = self._clock()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (JobStatus.SUCCEEDED.value, now, job_id),
+            )
+            self._prune_finished(conn, now)
+
+    def mark_failed(self, job_id: int, error: str, retryable: bool = True) -> Job:
+        """失敗を記録する。再試行回数が残っていれば指数バックオフ後に再実行する"""
+        now = self._clock()
+        with self._transaction() as conn:
+            job = self._get(conn, job_id)
+            if retryable and job.attempts < job.max_attempts:
+                delay = min(self._backoff_base_seconds * 2 ** (job.attempts - 1), self._backoff_max_seconds)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, next_run_at = ?, updated_at = ? WHERE id = ?",
+                    (JobStatus.PENDING.value, error, now + delay, now, job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (JobStatus.FAILED.value, error, now, job_id),
+                )
+            failed = self._get(conn, job_id)
+            self._prune_finished(conn, now)
+            return failed
+
+    def recover_running(self) -> int:
+        """前回のプロセスで実行中のまま残ったジョブを pending に戻す(起動時に呼ぶ)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JobStatus.PENDING.value, self._clock(), JobStatus.RUNNING.value),
+            )
+            return cursor.rowcount
+
+    def find(self, job_id: int) -> Job | None:
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return _to_job(row) if row else None
+
+    def list_jobs(self, status: JobStatus | None = None, limit: int = 50) -> list[Job]:
+        """新しい順にジョブを取得する"""
+        with self._transaction() as conn:
+            if status is None:
+                rows = conn.execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status.value, limit)
+                ).fetchall()
+            return [_to_job(row) for row in rows]
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update(dict(rows))
+        return counts
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _prune_finished(self, conn: sqlite3.Connection, now: float) -> None:
+        """終わったジョブのうち古いものと上限を超えた分を取り除く(実行待ち・実行中のジョブは残す)"""
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (*_FINISHED_STATUSES, now - self._finished_max_age),
+        )
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND id NOT IN"
+            " (SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY updated_at DESC, id DESC LIMIT ?)",
+            (*_FINISHED_STATUSES, *_FINISHED_STATUSES, self._finished_max_entries),
+        )
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, job_id: int) -> Job:
+        row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _to_job(row)
+
+
+def _to_job(row: tuple) -> Job:  # type: ignore[type-arg]
+    return Job(
+        id=row[0],
+        kind=row[1],
+        page_id=row[2],
+        status=JobStatus(row[3]),
+        attempts=row[4],
+        max_attempts=row[5],
+        next_run_at=row[6],
+        last_error=row[7],
+        created_at=row[8],
+        updated_at=row[9],
+    )
+
+
+class JobWorkerPool:
+    """ジョブキューからジョブを取り出して実行するワーカースレッド群"""
+
+    def __init__(
+        self,
+        queue: SqliteJobQueue,
+        handlers: dict[str, JobHandler],
+        workers: int = 4,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self._queue = queue
+        self._handlers = handlers
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def queue(self) -> SqliteJobQueue:
+        return self._queue
+
+    def submit(self, kind: str, page_id: str) -> Job:
+        """ジョブを登録してワーカーを起こす(実行待ちの同じジョブがあればまとめる)"""
+        job = self._queue.enqueue(kind=kind, page_id=page_id, coalesce=True)
+        self.notify()
+        return job
+
+    def start(self) -> None:
+        recovered = self._queue.recover_running()
+        if recovered:
+            logger.info("Recovered %d interrupted jobs", recovered)
+        self._stopping.clear()
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """新しいジョブの取り出しを止め、実行中のジョブの完了を待つ"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads.clear()
+
+    def notify(self) -> None:
+        """ジョブが登録されたことをワーカーに知らせる"""
+        self._wakeup.set()
+
+    def run_pending(self) -> int:
+        """実行可能なジョブがなくなるまで現在のスレッドで実行する(テスト・手動実行用)"""
+        executed = 0
+        while (job := self._queue.claim()) is not None:
+            self._execute(job)
+            executed += 1
+        return executed
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            job = self._queue.claim()
+            if job is None:
+                self._wakeup.wait(timeout=self._poll_interval)
+                self._wakeup.clear()
+                continue
+            self._execute(job)
+            # 同じページの後続ジョブが実行可能になったかもしれないので他のワーカーも起こす
+            self._wakeup.set()
+
+    def _execute(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            self._queue.mark_failed(job.id, f"Unknown job kind: {job.kind}", retryable=False)
+            return
+        try:
+            handler(job.page_id)
+        except NonRetryableJobError as e:
+            logger.warning("Job %d (%s) failed without retry: %s", job.id, job.kind, e)
+            self._queue.mark_failed(job.id, str(e), retryable=False)
+        except Exception as e:
+            updated = self._queue.mark_failed(job.id, str(e))
+            logger.exception("Job %d (%s) failed: attempt %d/%d", job.id, job.kind, job.attempts, job.max_attempts)
+            if updated.status == JobStatus.PENDING:
+                logger.info("Job %d will be retried at %s", job.id, updated.next_run_at)
+        else:
+            self._queue.mark_succeeded(job.id)
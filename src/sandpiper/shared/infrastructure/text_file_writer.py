@@ -0,0 +1,35 @@
+"""テキストファイルをまとめて書き出すライター
+
+内容が既存のファイルとバイト単位で同じなら書き込まない。
+iCloudなどで同期しているディレクトリでは、同じ内容を書き直すだけでも更新として同期されてしまうため。
+複数のファイルはスレッドで並行して書き出す(書き込み先のファイルはそれぞれ異なる前提)。
+"""
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def write_if_changed(path: Path, content: str, encoding: str = "utf-8") -> bool:
+    """内容が変わっている場合だけファイルに書き込む(書き込んだら True を返す)"""
+    data = content.encode(encoding)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def write_files(
+    files: Mapping[Path, str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    encoding: str = "utf-8",
+) -> dict[Path, bool]:
+    """複数のファイルを並行して書き出し、ファイルごとに書き込んだかどうかを返す"""
+    if not files:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+        futures = {path: executor.submit(write_if_changed, path, content, encoding) for path, content in files.items()}
+        return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,74 @@
+"""Webhookの重複配信を検出する
+
+Notionのオートメーションは同じWebhookを複数回送ることがあり、ボタンの二度押しも起こる。
+(ページID, エンドポイント, last_edited_time) をキーに、一定時間内に同じキーで届いた配信を重複とみなす。
+キャッシュは件数上限つきで、古いものから捨てる。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAX_ENTRIES = 1024
+
+type WebhookKey = tuple[str, str, str | None]
+
+
+@dataclass(frozen=True)
+class WebhookDeduplicatorStats:
+    hits: int
+    misses: int
+    size: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": self.size}
+
+
+class WebhookDeduplicator:
+    """TTLと件数上限つきのキャッシュで重複したWebhook配信を検出する(スレッドセーフ)"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # キー -> 有効期限。登録順に並ぶので先頭が最も古い
+        self._entries: OrderedDict[WebhookKey, float] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def is_duplicate(self, page_id: str, endpoint: str, last_edited_time: str | None) -> bool:
+        """同じキーの配信をTTL内に受け付けていれば True を返す。初回は記録して False を返す"""
+        key: WebhookKey = (page_id, endpoint, last_edited_time)
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+            if key in self._entries:
+                self._hits += 1
+                return True
+            self._misses += 1
+            self._entries[key] = now + self._ttl_seconds
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return False
+
+    def stats(self) -> WebhookDeduplicatorStats:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return WebhookDeduplicatorStats(hits=self._hits, misses=self._misses, size=len(self._entries))
+
+    def _evict_expired(self, now: float) -> None:
+        # TTLは一定なので、先頭から期限切れのものだけを取り除けばよい
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                return
+            del self._entries[key]
@@ -0,0 +1,12 @@
+"""取得済みのNotionページを、別のページクラスとして扱うためのヘルパー"""
+
+from dataclasses import fields
+
+from lotion import BasePage
+
+
+def cast_page[T: BasePage](page: BasePage, cls: type[T]) -> T:
+    """取得済みのページを指定されたページクラスとして扱えるように詰め替える"""
+    if isinstance(page, cls):
+        return page
+    return cls(**{f.name: getattr(page, f.name) for f in fields(page)})
@@ -0,0 +1,17 @@
+"""ローカルに永続化するデータの保存先ユーティリティ."""
+
+import os
+from pathlib import Path
+
+DEFAULT_DATA_DIR = Path.home() / ".sandpiper"
+
+
+def data_dir(create: bool = True) -> Path:
+    """ローカルデータの保存先ディレクトリを返す(create=True ならなければ作成する).
+
+    環境変数 SANDPIPER_DATA_DIR で変更できる。
+    """
+    path = Path(os.getenv("SANDPIPER_DATA_DIR", str(DEFAULT_DATA_DIR)))
+    if create:
+        path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
@@ -86,3 +86,39 @@ class TestCreateCalendarEvent:
         assert result.category == expected_category
         called_event = mock_repository.create.call_args[0][0]
         assert called_event.category == expected_category
+
+    @pytest.mark.asyncio
+    async def test_execute_async_uses_async_repository(self):
+        """非同期リポジトリがある場合はそちらでイベントを作成する"""
+        # Arrange
+        start_time = datetime(2024, 1, 15, 10, 0)
+        end_time = datetime(2024, 1, 15, 11, 0)
+        expected_inserted_event = InsertedCalendarEvent(
+            id="async-event-id",
+            name="非同期イベント",
+            category=EventCategory.PRIVATE,
+            start_datetime=start_time,
+            end_datetime=end_time,
+        )
+        mock_repository = Mock()
+        mock_async_repository = Mock()
+        mock_async_repository.create = AsyncMock(return_value=expected_inserted_event)
+        service = CreateCalendarEvent(
+            calendar_repository=mock_repository,
+            async_calendar_repository=mock_async_repository,
+        )
+        request = CreateCalendarEventRequest(
+            name="非同期イベント",
+            category=EventCategory.PRIVATE,
+            start_datetime=start_time,
+            end_datetime=end_time,
+        )
+
+        # Act
+        result = await service.execute_async(request)
+
+        # Assert
+        assert result == expected_inserted_event
+        mock_async_repository.create.assert_awaited_once()
+        assert mock_async_repository.create.call_args[0][0].name == "非同期イベント"
+        mock_repository.create.assert_not_called()
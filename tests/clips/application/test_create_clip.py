@@ -12,7 +12,7 @@ from sandpiper.clips.application.create_clip import (
     fetch_youtube_title,
 )
 from sandpiper.clips.domain.clip import Clip, InsertedClip
-from sandpiper.clips.domain.clips_repository import ClipsRepository
+from sandpiper.clips.domain.clips_repository import AsyncClipsRepository, ClipsRepository
 from sandpiper.shared.notion.databases.inbox import InboxType
 
 
@@ -168,3 +168,53 @@ class TestCreateClip:
 
         assert result.title == DEFAULT_TITLE
         assert result.inbox_type == InboxType.WEB
+
+
+class MockAsyncClipsRepository(AsyncClipsRepository):
+    """テスト用の非同期リポジトリ"""
+
+    def __init__(self):
+        self.saved_clips: list[Clip] = []
+
+    async def save(self, clip: Clip) -> InsertedClip:
+        self.saved_clips.append(clip)
+        return InsertedClip(
+            id="async-page-id",
+            title=clip.title,
+            url=clip.url,
+            inbox_type=clip.inbox_type,
+            unprocessed=clip.unprocessed,
+        )
+
+
+class TestCreateClipAsync:
+    """CreateClip.execute_async のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_execute_async_saves_with_async_repository(self):
+        """非同期リポジトリがある場合はそちらに保存する"""
+        repository = MockClipsRepository()
+        async_repository = MockAsyncClipsRepository()
+        use_case = CreateClip(clips_repository=repository, async_clips_repository=async_repository)
+
+        with patch(
+            "sandpiper.clips.application.create_clip.fetch_page_title",
+            return_value="Web Page Title",
+        ):
+            result = await use_case.execute_async(CreateClipRequest(url="https://example.com/article"))
+
+        assert result.id == "async-page-id"
+        assert result.title == "Web Page Title"
+        assert [clip.title for clip in async_repository.saved_clips] == ["Web Page Title"]
+        assert repository.saved_clips == []
+
+    @pytest.mark.asyncio
+    async def test_execute_async_without_async_repository_uses_sync_repository(self):
+        """非同期リポジトリがない場合は同期版で保存する"""
+        repository = MockClipsRepository()
+        use_case = CreateClip(clips_repository=repository)
+
+        result = await use_case.execute_async(CreateClipRequest(url="https://example.com", title="タイトル"))
+
+        assert result.title == "タイトル"
+        assert len(repository.saved_clips) == 1
@@ -4,8 +4,13 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from sandpiper.perform.application.schedule_task_end_notification import ScheduleTaskEndNotification
+from sandpiper.perform.application.schedule_task_end_notification import (
+    CancelTaskEndNotification,
+    ScheduleTaskEndNotification,
+)
+from sandpiper.shared.event.todo_completed import TodoCompleted
 from sandpiper.shared.event.todo_started import TodoStarted
+from sandpiper.shared.infrastructure.persistent_timer_scheduler import PersistentTimerScheduler
 from sandpiper.shared.infrastructure.slack_notice_messanger import SlackNoticeMessanger
 from sandpiper.shared.valueobject.context import Context
 
@@ -88,6 +93,42 @@ class TestScheduleTaskEndNotification:
         self.mock_slack_messanger.send.assert_not_called()
 
 
+class TestScheduleTaskEndNotificationWithScheduler:
+    """永続化タイマーを使う場合のテスト"""
+
+    def setup_method(self):
+        self.mock_slack_messanger = Mock(spec=SlackNoticeMessanger)
+        self.mock_scheduler = Mock(spec=PersistentTimerScheduler)
+        self.handler = ScheduleTaskEndNotification(self.mock_slack_messanger, scheduler=self.mock_scheduler)
+
+    def test_call_schedules_persistent_timer(self):
+        """ページIDがあれば開始時刻+所要時間に発火するタイマーを登録する"""
+        execution_time = datetime(2024, 1, 15, 10, 0)
+        event = TodoStarted(
+            name="テストタスク",
+            execution_time=execution_time,
+            scheduled_duration=timedelta(minutes=30),
+            page_id="page-id",
+        )
+
+        self.handler(event)
+
+        self.mock_scheduler.schedule.assert_called_once_with(
+            key="task_end:page-id",
+            fire_at=execution_time.timestamp() + 1800,
+            payload="「テストタスク」の予定時間が終了しました",
+        )
+        self.mock_slack_messanger.send.assert_not_called()
+
+    def test_cancel_on_completed(self):
+        """タスクが完了したらタイマーを取り消す"""
+        handler = CancelTaskEndNotification(self.mock_scheduler)
+
+        handler(TodoCompleted(page_id="page-id", title="テストタスク"))
+
+        self.mock_scheduler.cancel.assert_called_once_with("task_end:page-id")
+
+
 class TestScheduleTaskEndNotificationAsync:
     """非同期テスト"""
 
@@ -0,0 +1,76 @@
+"""perform の NotionTodoRepository のテスト"""
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from lotion import Lotion
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
+
+from sandpiper.perform.infrastructure.notion_todo_repository import NotionTodoRepository, TodoPage
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica
+from sandpiper.shared.notion.databases import todo as todo_db
+from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
+
+
+class TestFindByStatus:
+    @pytest.fixture()
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        client = MagicMock(spec=Lotion)
+        monkeypatch.setattr(Lotion, "get_instance", lambda: client)
+        return client
+
+    def test_filters_status_and_logical_deletion_on_notion(self, client: MagicMock) -> None:
+        """ステータスと論理削除の条件をNotion側で絞り込み、ページを再取得しない"""
+        page = MagicMock()
+        client.retrieve_database.return_value = [page]
+
+        result = NotionTodoRepository().find_by_status(ToDoStatusEnum.IN_PROGRESS)
+
+        assert result == [page.to_domain.return_value]
+        client.retrieve_database.assert_called_once_with(
+            database_id=todo_db.DATABASE_ID,
+            filter_param={
+                "and": [
+                    {"property": "ステータス", "status": {"equals": "InProgress"}},
+                    {"property": "論理削除", "checkbox": {"equals": False}},
+                ]
+            },
+            cls=TodoPage,
+        )
+        client.retrieve_page.assert_not_called()
+
+
+class TestWriteToDeletedPage:
+    @pytest.fixture()
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        client = MagicMock(spec=Lotion)
+        monkeypatch.setattr(Lotion, "get_instance", lambda: client)
+        return client
+
+    @staticmethod
+    def _api_error(status: int, message: str) -> NotionApiError:
+        response_error = APIResponseError(
+            code="error", status=status, message=message, headers=httpx.Headers({}), raw_body_text=""
+        )
+        return NotionApiError(page_id="page-1", e=response_error)
+
+    def test_archived_page_is_removed_from_replica(self, client: MagicMock) -> None:
+        """アーカイブ済みのページへの書き込みに失敗したら、レプリカからも取り除く"""
+        client.update.side_effect = self._api_error(400, "Can't edit block that is archived.")
+        replica = MagicMock(spec=NotionDatabaseReplica)
+
+        with pytest.raises(NotionApiError):
+            NotionTodoRepository(replica=replica).update_status("page-1", ToDoStatusEnum.DONE)
+
+        replica.remove_page.assert_called_once_with(todo_db.DATABASE_ID, "page-1")
+
+    def test_other_errors_keep_replica(self, client: MagicMock) -> None:
+        client.update_page.side_effect = self._api_error(400, "body failed validation")
+        replica = MagicMock(spec=NotionDatabaseReplica)
+
+        with pytest.raises(NotionApiError):
+            NotionTodoRepository(replica=replica).mark_as_today("page-1")
+
+        replica.remove_page.assert_not_called()
@@ -0,0 +1,135 @@
+import threading
+from datetime import datetime, time
+
+from sandpiper.perform.domain.todo import ToDo
+from sandpiper.perform.query.todo_read_model import TodoReadModel
+from sandpiper.shared.utils.date_utils import JST
+from sandpiper.shared.valueobject.context import Context
+from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
+from sandpiper.shared.valueobject.todo_kind import ToDoKind
+from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
+
+
+def _todo(
+    todo_id: str,
+    status: ToDoStatusEnum = ToDoStatusEnum.TODO,
+    scheduled_start: datetime | None = None,
+    log_start: datetime | None = None,
+    **kwargs,
+) -> ToDo:
+    return ToDo(
+        id=todo_id,
+        title=f"TODO {todo_id}",
+        status=status,
+        scheduled_start_datetime=scheduled_start,
+        log_start_datetime=log_start,
+        **kwargs,
+    )
+
+
+class TestTodoReadModel:
+    def test_find_without_conditions_returns_all_in_insertion_order(self):
+        model = TodoReadModel([_todo("t2"), _todo("t1"), _todo("t3")])
+
+        assert [t.id for t in model.find()] == ["t2", "t1", "t3"]
+
+    def test_find_by_status(self):
+        model = TodoReadModel(
+            [_todo("t1"), _todo("t2", status=ToDoStatusEnum.IN_PROGRESS), _todo("t3", status=ToDoStatusEnum.DONE)]
+        )
+
+        assert [t.id for t in model.find(status=ToDoStatusEnum.IN_PROGRESS)] == ["t2"]
+
+    def test_find_intersects_conditions(self):
+        done_on_day = datetime(2026, 3, 10, 9, 0, tzinfo=JST)
+        model = TodoReadModel(
+            [
+                _todo("t1", status=ToDoStatusEnum.DONE, log_start=done_on_day, kind=ToDoKind.PROJECT),
+                _todo("t2", status=ToDoStatusEnum.DONE, log_start=done_on_day, kind=ToDoKind.REPEAT),
+                _todo("t3", status=ToDoStatusEnum.DONE, log_start=datetime(2026, 3, 11, 9, 0, tzinfo=JST)),
+                _todo("t4", section=TaskChuteSection.A_07_10, contexts=[Context.WORK]),
+            ]
+        )
+
+        assert [t.id for t in model.find(status=ToDoStatusEnum.DONE, logged_on=done_on_day.date())] == ["t1", "t2"]
+        assert [t.id for t in model.find(kind=ToDoKind.REPEAT)] == ["t2"]
+        assert [t.id for t in model.find(section=TaskChuteSection.A_07_10, context=Context.WORK)] == ["t4"]
+        assert model.find(status=ToDoStatusEnum.TODO, kind=ToDoKind.PROJECT) == []
+
+    def test_find_by_scheduled_time_range_is_inclusive(self):
+        model = TodoReadModel(
+            [
+                _todo("t1", scheduled_start=datetime(2026, 3, 10, 9, 59, tzinfo=JST)),
+                _todo("t2", scheduled_start=datetime(2026, 3, 10, 10, 0, tzinfo=JST)),
+                _todo("t3", scheduled_start=datetime(2026, 3, 11, 13, 0, tzinfo=JST)),
+                _todo("t4", scheduled_start=datetime(2026, 3, 10, 13, 1, tzinfo=JST)),
+                _todo("t5"),
+            ]
+        )
+
+        result = model.find(scheduled_from=time(10, 0), scheduled_to=time(13, 0))
+
+        assert [t.id for t in result] == ["t2", "t3"]
+
+    def test_find_scheduled_and_all_day(self):
+        model = TodoReadModel(
+            [
+                _todo("t1", scheduled_start=datetime(2026, 3, 10, 0, 0, tzinfo=JST)),
+                _todo("t2", scheduled_start=datetime(2026, 3, 10, 12, 0, tzinfo=JST)),
+                _todo("t3"),
+            ]
+        )
+
+        assert [t.id for t in model.find(scheduled=True)] == ["t1", "t2"]
+        assert [t.id for t in model.find(all_day=True)] == ["t1"]
+
+    def test_upsert_reindexes_and_keeps_order(self):
+        model = TodoReadModel([_todo("t1"), _todo("t2")])
+
+        model.upsert(_todo("t1", status=ToDoStatusEnum.IN_PROGRESS, scheduled_start=datetime(2026, 3, 10, 11, 0)))
+
+        assert [t.id for t in model.find(status=ToDoStatusEnum.TODO)] == ["t2"]
+        assert [t.id for t in model.find(status=ToDoStatusEnum.IN_PROGRESS)] == ["t1"]
+        assert [t.id for t in model.find(scheduled_from=time(11, 0))] == ["t1"]
+        assert [t.id for t in model.find()] == ["t1", "t2"]
+
+    def test_remove(self):
+        model = TodoReadModel([_todo("t1", scheduled_start=datetime(2026, 3, 10, 11, 0)), _todo("t2")])
+
+        model.remove("t1")
+        model.remove("missing")
+
+        assert len(model) == 1
+        assert model.get("t1") is None
+        assert model.find(scheduled=True) == []
+        assert model.find(scheduled_to=time(23, 59)) == []
+
+    def test_find_while_other_thread_upserts_and_removes(self):
+        """他のスレッドが更新している間に検索しても例外にならない"""
+        model = TodoReadModel([_todo(f"t{i}") for i in range(200)])
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def writer() -> None:
+            i = 0
+            while not stop.is_set():
+                page_id = f"t{i % 200}"
+                model.remove(page_id)
+                model.upsert(_todo(page_id, status=ToDoStatusEnum.IN_PROGRESS if i % 2 else ToDoStatusEnum.TODO))
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(300):
+                try:
+                    model.find()
+                    model.find(status=ToDoStatusEnum.TODO)
+                except Exception as e:
+                    errors.append(e)
+                    break
+        finally:
+            stop.set()
+            thread.join()
+
+        assert errors == []
@@ -6,6 +6,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from sandpiper.plan.application.create_repeat_project_task import CreateRepeatProjectTask
+from sandpiper.plan.domain.block_children import BlockChildren
 from sandpiper.plan.query.project_task_dto import ProjectTaskDto
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
 
@@ -135,8 +136,8 @@ class TestCreateRepeatProjectTaskExecute:
         # Act
         self.use_case.execute(is_tomorrow=False)
 
-        # Assert - 2回saveが呼ばれる(両方のタスク)
-        assert self.mock_repository.save.call_count == 2
+        # Assert - 両方のタスクが保存される
+        assert len(self.mock_repository.save_many.call_args[0][0]) == 2
 
     @patch("sandpiper.plan.application.create_repeat_project_task.jst_today")
     def test_execute_saturday_excludes_work_projects(self, mock_jst_today):
@@ -152,10 +153,9 @@ class TestCreateRepeatProjectTaskExecute:
         # Act
         self.use_case.execute(is_tomorrow=False)
 
-        # Assert - 1回だけsaveが呼ばれる(非仕事系タスクのみ)
-        assert self.mock_repository.save.call_count == 1
-        saved_call = self.mock_repository.save.call_args
-        saved_todo = saved_call[0][0]
+        # Assert - 非仕事系タスクのみ保存される
+        assert len(self.mock_repository.save_many.call_args[0][0]) == 1
+        saved_todo = self.mock_repository.save_many.call_args[0][0][0]
         assert saved_todo.project_page_id == "proj-b"
 
     @patch("sandpiper.plan.application.create_repeat_project_task.jst_today")
@@ -172,8 +172,8 @@ class TestCreateRepeatProjectTaskExecute:
         # Act
         self.use_case.execute(is_tomorrow=False)
 
-        # Assert - 1回だけsaveが呼ばれる(非仕事系タスクのみ)
-        assert self.mock_repository.save.call_count == 1
+        # Assert - 非仕事系タスクのみ保存される
+        assert len(self.mock_repository.save_many.call_args[0][0]) == 1
 
     @patch("sandpiper.plan.application.create_repeat_project_task.jst_today")
     def test_execute_tomorrow_saturday_excludes_work_projects(self, mock_jst_today):
@@ -189,10 +189,9 @@ class TestCreateRepeatProjectTaskExecute:
         # Act
         self.use_case.execute(is_tomorrow=True)
 
-        # Assert - 明日(土曜日)なので仕事系は除外、1回だけsave
-        assert self.mock_repository.save.call_count == 1
-        saved_call = self.mock_repository.save.call_args
-        saved_todo = saved_call[0][0]
+        # Assert - 明日(土曜日)なので仕事系は除外
+        assert len(self.mock_repository.save_many.call_args[0][0]) == 1
+        saved_todo = self.mock_repository.save_many.call_args[0][0][0]
         assert saved_todo.project_page_id == "proj-b"
 
     @patch("sandpiper.plan.application.create_repeat_project_task.jst_today")
@@ -210,4 +209,30 @@ class TestCreateRepeatProjectTaskExecute:
         self.use_case.execute(is_tomorrow=True)
 
         # Assert - 明日(月曜日)なので全タスク含まれる
-        assert self.mock_repository.save.call_count == 2
+        assert len(self.mock_repository.save_many.call_args[0][0]) == 2
+
+    @patch("sandpiper.plan.application.create_repeat_project_task.jst_today")
+    def test_execute_loads_blocks_only_for_selected_tasks(self, mock_jst_today):
+        """プロジェクトごとに選ばれたタスクのブロックだけを取得することをテスト"""
+        # Arrange - 月曜日。proj-a は「次やる」のタスク2が選ばれる
+        mock_jst_today.return_value = date(2026, 1, 26)
+        loaders = {page_id: Mock(return_value=[f"block-{page_id}"]) for page_id in ("1", "2", "3")}
+        tasks = [
+            self._create_dto("1", "proj-a", is_work_project=False),
+            self._create_dto("2", "proj-a", is_work_project=False),
+            self._create_dto("3", "proj-b", is_work_project=False),
+        ]
+        tasks[0].is_next = False
+        for task in tasks:
+            task.block_children = BlockChildren(loader=loaders[task.page_id])
+        self.mock_query.fetch_undone_project_tasks.return_value = tasks
+
+        # Act
+        self.use_case.execute(is_tomorrow=False)
+
+        # Assert
+        loaders["1"].assert_not_called()
+        loaders["2"].assert_called_once()
+        loaders["3"].assert_called_once()
+        options_list = self.mock_repository.save_many.call_args[0][1]
+        assert [options["block_children"] for options in options_list] == [["block-2"], ["block-3"]]
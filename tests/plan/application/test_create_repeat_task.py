@@ -0,0 +1,82 @@
+"""繰り返しタスク作成ユースケースのテスト"""
+
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+
+from sandpiper.plan.application.create_repeat_task import CreateRepeatTask
+from sandpiper.plan.domain.block_children import BlockChildren
+from sandpiper.plan.domain.routine import Routine
+from sandpiper.plan.domain.routine_cycle import RoutineCycle
+from sandpiper.plan.domain.routine_repository import RoutineRepository
+from sandpiper.plan.domain.todo import InsertedToDo
+from sandpiper.plan.domain.todo_repository import SaveManyError, TodoRepository
+from sandpiper.plan.query.todo_query import TodoQuery
+from sandpiper.shared.valueobject.task_chute_section import TaskChuteSection
+
+BASIS_DATE = date(2026, 3, 10)
+
+
+def _routine(routine_id: str, routine_date: date = BASIS_DATE) -> Routine:
+    return Routine(
+        id=routine_id,
+        title=f"ルーティン{routine_id}",
+        date=routine_date,
+        section=TaskChuteSection.A_07_10,
+        cycle=RoutineCycle.DAILY,
+    )
+
+
+class TestCreateRepeatTask:
+    def setup_method(self):
+        self.routine_repository = Mock(spec=RoutineRepository)
+        self.todo_repository = Mock(spec=TodoRepository)
+        self.todo_query = Mock(spec=TodoQuery)
+        self.todo_query.fetch_todos_not_is_today.return_value = []
+        self.service = CreateRepeatTask(
+            routine_repository=self.routine_repository,
+            todo_repository=self.todo_repository,
+            todo_query=self.todo_query,
+        )
+
+    def test_updates_all_routines_after_save(self):
+        """全てのTODOを作成できたら、全てのルーティンの次回実行日を更新する"""
+        self.routine_repository.fetch.return_value = [_routine("1"), _routine("2")]
+
+        self.service.execute(basis_date=BASIS_DATE)
+
+        assert len(self.todo_repository.save_many.call_args[0][0]) == 2
+        updated = [call.args[0] for call in self.routine_repository.update.call_args_list]
+        assert [routine.id for routine in updated] == ["1", "2"]
+        assert all(routine.date == date(2026, 3, 11) for routine in updated)
+
+    def test_only_created_routines_are_updated_when_some_saves_fail(self):
+        """一部のTODOの作成に失敗した場合、作成できたルーティンだけ次回実行日を更新して例外を送出する"""
+        self.routine_repository.fetch.return_value = [_routine("1"), _routine("2"), _routine("3")]
+        self.todo_repository.save_many.side_effect = SaveManyError(
+            [RuntimeError("boom"), InsertedToDo(id="todo-2", title="ルーティン2"), RuntimeError("boom")]
+        )
+
+        with pytest.raises(SaveManyError):
+            self.service.execute(basis_date=BASIS_DATE)
+
+        updated = [call.args[0] for call in self.routine_repository.update.call_args_list]
+        assert [routine.id for routine in updated] == ["2"]
+
+    def test_loads_blocks_only_for_routines_that_become_todos(self):
+        """TODOを作成するルーティンのブロックだけを取得する"""
+        loaders = {routine_id: Mock(return_value=[f"block-{routine_id}"]) for routine_id in ("1", "2", "3")}
+        routines = [_routine("1"), _routine("2", routine_date=date(2026, 3, 12)), _routine("3")]
+        for routine in routines:
+            routine.block_children = BlockChildren(loader=loaders[routine.id])
+        self.routine_repository.fetch.return_value = routines
+        self.todo_query.fetch_todos_not_is_today.return_value = [Mock(title="ルーティン3")]
+
+        self.service.execute(basis_date=BASIS_DATE)
+
+        loaders["1"].assert_called_once()
+        loaders["2"].assert_not_called()
+        loaders["3"].assert_not_called()
+        options_list = self.todo_repository.save_many.call_args[0][1]
+        assert options_list == [{"block_children": ["block-1"]}]
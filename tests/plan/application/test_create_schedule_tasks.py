@@ -149,7 +149,7 @@ class TestCreateScheduleTasks:
 
         # Assert
         assert result.created_count == 0
-        self.mock_todo_repository.save.assert_not_called()
+        self.mock_todo_repository.save_many.assert_not_called()
 
     def test_execute_with_single_event(self):
         """1つのカレンダーイベントがある場合のテスト"""
@@ -168,9 +168,9 @@ class TestCreateScheduleTasks:
 
         # Assert
         assert result.created_count == 1
-        self.mock_todo_repository.save.assert_called_once()
+        self.mock_todo_repository.save_many.assert_called_once()
 
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert isinstance(saved_todo, ToDo)
         assert saved_todo.title == "チームミーティング"
         assert saved_todo.kind == ToDoKind.SCHEDULE
@@ -207,11 +207,10 @@ class TestCreateScheduleTasks:
 
         # Assert
         assert result.created_count == 3
-        assert self.mock_todo_repository.save.call_count == 3
+        assert len(self.mock_todo_repository.save_many.call_args[0][0]) == 3
 
         # 全てのTODOがSCHEDULE種別であることを確認
-        for call_args in self.mock_todo_repository.save.call_args_list:
-            saved_todo = call_args[0][0]
+        for saved_todo in self.mock_todo_repository.save_many.call_args[0][0]:
             assert saved_todo.kind == ToDoKind.SCHEDULE
 
     def test_execute_skips_existing_todos(self):
@@ -233,7 +232,7 @@ class TestCreateScheduleTasks:
 
         # Assert
         assert result.created_count == 0
-        self.mock_todo_repository.save.assert_not_called()
+        self.mock_todo_repository.save_many.assert_not_called()
 
     def test_execute_creates_only_new_events(self):
         """既存のTODOがあっても新規イベントは作成される"""
@@ -261,9 +260,9 @@ class TestCreateScheduleTasks:
 
         # Assert
         assert result.created_count == 1
-        self.mock_todo_repository.save.assert_called_once()
+        self.mock_todo_repository.save_many.assert_called_once()
 
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.title == "新規の会議"
 
     def test_todo_has_correct_execution_time(self):
@@ -282,7 +281,7 @@ class TestCreateScheduleTasks:
         self.service.execute(target_date=target_date)
 
         # Assert
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.execution_time == 45
 
     def test_todo_has_correct_sort_order(self):
@@ -301,7 +300,7 @@ class TestCreateScheduleTasks:
         self.service.execute(target_date=target_date)
 
         # Assert
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.sort_order == "14:30"
         assert saved_todo.section == TaskChuteSection.C_13_17
 
@@ -321,7 +320,7 @@ class TestCreateScheduleTasks:
         self.service.execute(target_date=target_date)
 
         # Assert
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         # 開始時刻: UTC 05:30 → JST 14:30
         assert saved_todo.scheduled_start_datetime == datetime(2024, 3, 20, 14, 30)
         # 終了時刻: UTC 06:30 → JST 15:30
@@ -1,14 +1,16 @@
 from datetime import date
 from unittest.mock import Mock, call
 
+import pytest
+
 from sandpiper.plan.application.create_tasks_by_someday_list import (
     CreateTasksBySomedayList,
     CreateTasksBySomedayListResult,
 )
 from sandpiper.plan.domain.someday_item import SomedayItem, SomedayTiming
 from sandpiper.plan.domain.someday_repository import SomedayRepository
-from sandpiper.plan.domain.todo import ToDo, ToDoKind
-from sandpiper.plan.domain.todo_repository import TodoRepository
+from sandpiper.plan.domain.todo import InsertedToDo, ToDo, ToDoKind
+from sandpiper.plan.domain.todo_repository import SaveManyError, TodoRepository
 
 
 class TestCreateTasksBySomedayList:
@@ -31,7 +33,7 @@ class TestCreateTasksBySomedayList:
         # Assert
         assert result.created_count == 0
         assert result.created_titles == []
-        self.mock_todo_repository.save.assert_not_called()
+        self.mock_todo_repository.save_many.assert_not_called()
         self.mock_someday_repository.delete.assert_not_called()
 
     def test_execute_with_single_item(self):
@@ -53,8 +55,8 @@ class TestCreateTasksBySomedayList:
         assert result.created_titles == ["明日やるタスク"]
 
         # TODOが作成されたことを確認
-        self.mock_todo_repository.save.assert_called_once()
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        self.mock_todo_repository.save_many.assert_called_once()
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert isinstance(saved_todo, ToDo)
         assert saved_todo.title == "明日やるタスク"
         assert saved_todo.kind == ToDoKind.SINGLE
@@ -94,18 +96,56 @@ class TestCreateTasksBySomedayList:
         assert result.created_count == 3
         assert result.created_titles == ["タスク1", "タスク2", "タスク3"]
 
-        # TODOが3回作成されたことを確認
-        assert self.mock_todo_repository.save.call_count == 3
+        # TODOが3件まとめて作成されたことを確認
+        assert len(self.mock_todo_repository.save_many.call_args[0][0]) == 3
 
         # 全てのTODOがSINGLE種別であることを確認
-        for call_args in self.mock_todo_repository.save.call_args_list:
-            saved_todo = call_args[0][0]
+        for saved_todo in self.mock_todo_repository.save_many.call_args[0][0]:
             assert saved_todo.kind == ToDoKind.SINGLE
 
         # サムデイアイテムが3回削除されたことを確認
         assert self.mock_someday_repository.delete.call_count == 3
         self.mock_someday_repository.delete.assert_has_calls([call("someday-1"), call("someday-2"), call("someday-3")])
 
+    def test_items_are_not_deleted_when_save_fails(self):
+        """TODOの作成に失敗した場合、サムデイアイテムは削除されない"""
+        # Arrange
+        someday_item = SomedayItem(
+            id="someday-1",
+            title="失敗するタスク",
+            timing=SomedayTiming.TOMORROW,
+            do_tomorrow=True,
+        )
+        self.mock_someday_repository.fetch_tomorrow_items.return_value = [someday_item]
+        self.mock_todo_repository.save_many.side_effect = RuntimeError("rate limited")
+
+        # Act & Assert
+        with pytest.raises(RuntimeError):
+            self.service.execute()
+        self.mock_someday_repository.delete.assert_not_called()
+
+    def test_only_created_items_are_deleted_when_some_saves_fail(self):
+        """一部のTODOの作成に失敗した場合、作成できたTODOのサムデイアイテムだけ削除して例外を送出する"""
+        # Arrange
+        items = [
+            SomedayItem(id=f"someday-{i}", title=f"タスク{i}", timing=SomedayTiming.TOMORROW, do_tomorrow=True)
+            for i in (1, 2, 3)
+        ]
+        self.mock_someday_repository.fetch_tomorrow_items.return_value = items
+        self.mock_todo_repository.save_many.side_effect = SaveManyError(
+            [
+                InsertedToDo(id="todo-1", title="タスク1"),
+                RuntimeError("boom"),
+                InsertedToDo(id="todo-3", title="タスク3"),
+            ]
+        )
+
+        # Act & Assert
+        with pytest.raises(SaveManyError):
+            self.service.execute()
+        self.mock_someday_repository.delete.assert_has_calls([call("someday-1"), call("someday-3")])
+        assert self.mock_someday_repository.delete.call_count == 2
+
     def test_todo_created_with_correct_kind(self):
         """TODOが正しいタスク種別で作成されることを確認"""
         # Arrange
@@ -121,7 +161,7 @@ class TestCreateTasksBySomedayList:
         self.service.execute()
 
         # Assert
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.kind == ToDoKind.SINGLE
 
     def test_execute_with_basis_date_sets_scheduled_start_datetime(self):
@@ -141,7 +181,7 @@ class TestCreateTasksBySomedayList:
 
         # Assert
         assert result.created_count == 1
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.scheduled_start_datetime == date(2024, 3, 20)
 
     def test_execute_without_basis_date_no_scheduled_datetime(self):
@@ -160,7 +200,7 @@ class TestCreateTasksBySomedayList:
 
         # Assert
         assert result.created_count == 1
-        saved_todo = self.mock_todo_repository.save.call_args[0][0]
+        saved_todo = self.mock_todo_repository.save_many.call_args[0][0][0]
         assert saved_todo.scheduled_start_datetime is None
 
 
@@ -1,7 +1,8 @@
 """PrepareTomorrowTodos ユースケースのテスト"""
 
+import threading
 from datetime import date
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -18,6 +19,7 @@ from sandpiper.plan.application.create_tasks_by_someday_list import (
 )
 from sandpiper.plan.application.prepare_tomorrow_todos import PrepareTomorrowTodos
 from sandpiper.shared.infrastructure.archive_deleted_pages import ArchiveDeletedPages
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
 
 
 class TestPrepareTomorrowTodos:
@@ -102,6 +104,76 @@ class TestPrepareTomorrowTodos:
 
         assert result.summary == "明日のTODOリストを作成しました"
 
+    def test_steps_run_inside_snapshot(self, mocks: dict[str, MagicMock]) -> None:
+        """スナップショットを渡すと全ステップがスナップショット有効中に実行される"""
+        snapshot = MagicMock(spec=NotionDatabaseSnapshot)
+        calls: list[str] = []
+        snapshot.activate.return_value.__enter__.side_effect = lambda: calls.append("enter")
+        snapshot.activate.return_value.__exit__.side_effect = lambda *_: calls.append("exit")
+        mocks["mark_remaining_todos_as_today"].execute.side_effect = lambda: (
+            calls.append("mark") or MarkRemainingTodosAsTodayResult(marked_count=0)
+        )
+        mocks["create_schedule_tasks"].execute.side_effect = lambda **_: (
+            calls.append("schedule") or CreateScheduleTasksResult(created_count=0)
+        )
+        use_case = PrepareTomorrowTodos(**mocks, snapshot=snapshot)
+
+        use_case.execute(is_tomorrow=True, basis_date=date(2026, 2, 26))
+
+        snapshot.activate.assert_called_once()
+        assert calls == ["enter", "mark", "schedule", "exit"]
+
+    def test_step_failure_is_recorded_without_stopping_others(self, mocks: dict[str, MagicMock]) -> None:
+        """作成ステップの失敗は結果に記録され、他のステップは実行される"""
+        mocks["create_repeat_task"].execute.side_effect = RuntimeError("routine db unavailable")
+        mocks["create_schedule_tasks"].execute.return_value = CreateScheduleTasksResult(created_count=2)
+        use_case = PrepareTomorrowTodos(**mocks)
+
+        result = use_case.execute(is_tomorrow=True, basis_date=date(2026, 2, 26))
+
+        mocks["create_tasks_by_someday_list"].execute.assert_called_once()
+        assert result.has_errors
+        assert result.step_errors == {"ルーチンタスク": "routine db unavailable"}
+        assert result.schedule_created_count == 2
+        assert "失敗したステップ: ルーチンタスク: routine db unavailable" in result.summary
+
+    def test_concurrent_mode_runs_creation_steps_in_parallel(self, mocks: dict[str, MagicMock]) -> None:
+        """max_workersを指定すると作成ステップが並行に実行される"""
+        # 4ステップが同時に到達しない限り通過できないバリア(逐次実行ならタイムアウトする)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def wait_then(value: object) -> object:
+            barrier.wait()
+            return value
+
+        mocks["create_repeat_project_task"].execute.side_effect = lambda **_: wait_then(None)
+        mocks["create_repeat_task"].execute.side_effect = lambda **_: wait_then(None)
+        mocks["create_tasks_by_someday_list"].execute.side_effect = lambda **_: wait_then(
+            CreateTasksBySomedayListResult(created_count=1, created_titles=["a"])
+        )
+        mocks["create_schedule_tasks"].execute.side_effect = lambda **_: wait_then(
+            CreateScheduleTasksResult(created_count=3)
+        )
+        use_case = PrepareTomorrowTodos(**mocks, max_workers=4)
+
+        result = use_case.execute(is_tomorrow=True, basis_date=date(2026, 2, 26))
+
+        assert result.step_errors == {}
+        assert result.someday_created_count == 1
+        assert result.schedule_created_count == 3
+
+    def test_concurrent_mode_shares_active_snapshot_with_workers(self, mocks: dict[str, MagicMock]) -> None:
+        """並行実行中のワーカーからも有効化したスナップショットが見える"""
+        with patch("sandpiper.shared.infrastructure.notion_database_snapshot.Lotion"):
+            snapshot = NotionDatabaseSnapshot()
+        observed: list[bool] = []
+        mocks["create_repeat_task"].execute.side_effect = lambda **_: observed.append(snapshot.is_active)
+        use_case = PrepareTomorrowTodos(**mocks, snapshot=snapshot, max_workers=4)
+
+        use_case.execute(is_tomorrow=True, basis_date=date(2026, 2, 26))
+
+        assert observed == [True]
+
 
 class TestResolveParamsFromNow:
     @pytest.mark.parametrize(
@@ -6,7 +6,7 @@ import pytest
 from sandpiper.plan.application.sync_jira_to_project import SyncJiraToProject
 from sandpiper.plan.domain.project import InsertedProject, Project
 from sandpiper.plan.domain.project_task import InsertedProjectTask, ProjectTask
-from sandpiper.plan.query.jira_ticket_dto import JiraTicketDto
+from sandpiper.plan.query.jira_ticket_dto import JiraFieldProfile, JiraTicketDto
 from sandpiper.shared.valueobject.todo_status_enum import ToDoStatusEnum
 
 
@@ -79,6 +79,7 @@ class TestSyncJiraToProject:
             status="In Progress",
             assignee="currentUser()",
             max_results=100,
+            profile=JiraFieldProfile.SYNC,
         )
 
         # Verify fetch_projects_with_jira_url was called once (API optimization)
@@ -230,6 +231,7 @@ class TestSyncJiraToProject:
             status="In Progress",
             assignee="currentUser()",
             max_results=100,
+            profile=JiraFieldProfile.SYNC,
         )
 
     def test_execute_prevents_duplicate_within_same_batch(
@@ -477,7 +479,7 @@ class TestSyncJiraToProject:
             status="Done",
             url="https://jira.example.com/browse/SU-700",
         )
-        mock_jira_ticket_query.get_ticket.return_value = done_ticket
+        mock_jira_ticket_query.get_tickets.return_value = {"SU-700": done_ticket}
 
         # Act
         result = sync_jira_to_project.execute(jira_project="SU")
@@ -516,7 +518,7 @@ class TestSyncJiraToProject:
             status="To Do",
             url="https://jira.example.com/browse/SU-800",
         )
-        mock_jira_ticket_query.get_ticket.return_value = active_ticket
+        mock_jira_ticket_query.get_tickets.return_value = {"SU-800": active_ticket}
 
         # Act
         result = sync_jira_to_project.execute(jira_project="SU")
@@ -547,8 +549,8 @@ class TestSyncJiraToProject:
         )
         mock_project_repository.fetch_projects_with_jira_url.return_value = [notion_project]
 
-        # Jira側で404
-        mock_jira_ticket_query.get_ticket.return_value = None
+        # Jira側で404(検索結果に含まれない)
+        mock_jira_ticket_query.get_tickets.return_value = {}
 
         # Act
         result = sync_jira_to_project.execute(jira_project="SU")
@@ -586,24 +588,22 @@ class TestSyncJiraToProject:
         )
         mock_project_repository.fetch_projects_with_jira_url.return_value = [done_project, active_project]
 
-        def get_ticket_side_effect(issue_key: str) -> JiraTicketDto | None:
-            if issue_key == "SU-1000":
-                return JiraTicketDto(
-                    issue_key="SU-1000",
-                    summary="Done feature",
-                    issue_type="Task",
-                    status="Done",
-                    url="https://jira.example.com/browse/SU-1000",
-                )
-            return JiraTicketDto(
+        mock_jira_ticket_query.get_tickets.return_value = {
+            "SU-1000": JiraTicketDto(
+                issue_key="SU-1000",
+                summary="Done feature",
+                issue_type="Task",
+                status="Done",
+                url="https://jira.example.com/browse/SU-1000",
+            ),
+            "SU-1001": JiraTicketDto(
                 issue_key="SU-1001",
                 summary="Active feature",
                 issue_type="Task",
                 status="In Progress",
                 url="https://jira.example.com/browse/SU-1001",
-            )
-
-        mock_jira_ticket_query.get_ticket.side_effect = get_ticket_side_effect
+            ),
+        }
 
         # Act
         result = sync_jira_to_project.execute(jira_project="SU")
@@ -614,3 +614,8 @@ class TestSyncJiraToProject:
         assert len(result.notion_only_projects) == 1
         assert result.notion_only_projects[0].id == "active-project"
         mock_project_repository.update_status.assert_called_once_with("done-project", ToDoStatusEnum.DONE)
+        # チケットは1回の問い合わせでまとめて取得する
+        mock_jira_ticket_query.get_tickets.assert_called_once_with(
+            ["SU-1000", "SU-1001"], profile=JiraFieldProfile.SYNC
+        )
+        mock_jira_ticket_query.get_ticket.assert_not_called()
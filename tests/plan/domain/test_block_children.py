@@ -0,0 +1,20 @@
+from unittest.mock import Mock
+
+from sandpiper.plan.domain.block_children import BlockChildren
+
+
+class TestBlockChildren:
+    def test_without_loader_is_loaded_and_empty(self):
+        handle = BlockChildren()
+
+        assert handle.is_loaded
+        assert handle.get() == []
+
+    def test_get_loads_once(self):
+        loader = Mock(return_value=["block"])
+        handle = BlockChildren(loader=loader)
+
+        assert not handle.is_loaded
+        assert handle.get() == ["block"]
+        assert handle.get() == ["block"]
+        loader.assert_called_once()
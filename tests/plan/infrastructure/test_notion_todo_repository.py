@@ -0,0 +1,54 @@
+"""plan の NotionTodoRepository のテスト"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from lotion import Lotion
+
+from sandpiper.plan.domain.todo import InsertedToDo, ToDo
+from sandpiper.plan.domain.todo_repository import SaveManyError
+from sandpiper.plan.infrastructure.notion_todo_repository import NotionTodoRepository, TodoPage
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
+
+
+class TestSaveMany:
+    @pytest.fixture()
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        client = MagicMock(spec=Lotion)
+        monkeypatch.setattr(Lotion, "get_instance", lambda: client)
+        return client
+
+    @staticmethod
+    def _repository() -> NotionTodoRepository:
+        rate_limiter = MagicMock(spec=NotionRateLimiter)
+        rate_limiter.call.side_effect = lambda func, **_: func()
+        return NotionTodoRepository(rate_limiter=rate_limiter)
+
+    def test_failure_does_not_cancel_other_creates(self, client: MagicMock) -> None:
+        """1件の作成に失敗しても残りは作成し、各TODOの成否を持つ例外を送出する"""
+
+        def create_page(page: TodoPage) -> MagicMock:
+            title = page.get_title_text()
+            if title == "B":
+                raise RuntimeError("boom")
+            return MagicMock(id=f"page-{title}")
+
+        client.create_page.side_effect = create_page
+        todos = [ToDo(title="A"), ToDo(title="B"), ToDo(title="C")]
+
+        with pytest.raises(SaveManyError) as exc_info:
+            self._repository().save_many(todos, [{"block_children": []}] * 3)
+
+        results = exc_info.value.results
+        assert client.create_page.call_count == 3
+        assert isinstance(results[0], InsertedToDo) and results[0].id == "page-A"
+        assert isinstance(results[1], RuntimeError)
+        assert isinstance(results[2], InsertedToDo) and results[2].id == "page-C"
+        assert exc_info.value.succeeded_indexes() == [0, 2]
+
+    def test_returns_inserted_todos_in_input_order(self, client: MagicMock) -> None:
+        client.create_page.side_effect = lambda page: MagicMock(id=f"page-{page.get_title_text()}")
+
+        result = self._repository().save_many([ToDo(title="A"), ToDo(title="B")], [{"block_children": []}] * 2)
+
+        assert [todo.id for todo in result] == ["page-A", "page-B"]
@@ -0,0 +1,22 @@
+import threading
+
+from sandpiper.plan.domain.block_children import BlockChildren
+from sandpiper.plan.query.block_children_loader import load_block_children
+
+
+class TestLoadBlockChildren:
+    def test_loads_pending_handles_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def loader(name: str) -> list[str]:
+            # 3件が同時に取得されないとバリアを通過できない
+            barrier.wait()
+            return [name]
+
+        handles = [BlockChildren(loader=lambda name=name: loader(name)) for name in ("a", "b", "c")]
+        loaded = BlockChildren(blocks=["x"])
+
+        load_block_children([*handles, loaded])
+
+        assert [handle.get() for handle in handles] == [["a"], ["b"], ["c"]]
+        assert loaded.get() == ["x"]
@@ -3,8 +3,34 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from sandpiper.plan.query.jira_ticket_dto import JiraTicketDto
+from sandpiper.plan.query.jira_ticket_dto import JiraFieldProfile, JiraTicketDto
 from sandpiper.plan.query.jira_ticket_query import RestApiJiraTicketQuery
+from sandpiper.shared.infrastructure.jira_issue_cache import JiraIssueCache
+
+JIRA_ENV = {
+    "BUSINESS_JIRA_BASE_URL": "https://jira.atlassian.com",
+    "BUSINESS_JIRA_USERNAME": "test@example.com",
+    "BUSINESS_JIRA_API_TOKEN": "test-token",
+}
+
+
+def _issue(key: str, status: str = "In Progress", created: str = "2024-01-01T10:00:00.000+0000") -> dict:
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Issue {key}",
+            "issuetype": {"name": "Task"},
+            "status": {"name": status},
+            "created": created,
+            "updated": created,
+        },
+    }
+
+
+def _response(issues: list[dict]) -> Mock:
+    response = Mock()
+    response.json.return_value = {"issues": issues, "isLast": True}
+    return response
 
 
 class TestRestApiJiraTicketQuery:
@@ -152,7 +178,11 @@ class TestRestApiJiraTicketQuery:
         assert ticket.status == "Done"
 
         # Check API call
-        jira_query.session.get.assert_called_once_with("https://jira.atlassian.com/rest/api/3/issue/TEST-456")
+        jira_query.session.get.assert_called_once_with(
+            "https://jira.atlassian.com/rest/api/3/issue/TEST-456",
+            params={"fields": ",".join(JiraFieldProfile.FULL.fields)},
+            timeout=(5.0, 30.0),
+        )
 
     def test_get_ticket_not_found(self, jira_query):
         # Setup 404 response
@@ -216,7 +246,7 @@ class TestRestApiJiraTicketQuery:
         """Test pagination using nextPageToken (new API)"""
         call_count = 0
 
-        def mock_get(url, params=None):  # noqa: ARG001
+        def mock_get(url, params=None, **_):  # noqa: ARG001
             nonlocal call_count
             mock_response = Mock()
 
@@ -275,6 +305,184 @@ class TestRestApiJiraTicketQuery:
         assert tickets[119].issue_key == "TEST-120"
         assert call_count == 2
 
+    def test_get_tickets_searches_keys_in_one_request(self, jira_query):
+        jira_query.session.get.return_value = _response([_issue("SU-1", status="Done"), _issue("SU-2")])
+
+        tickets = jira_query.get_tickets(["SU-1", "SU-2"])
+
+        assert set(tickets) == {"SU-1", "SU-2"}
+        assert tickets["SU-1"].status == "Done"
+        jira_query.session.get.assert_called_once()
+        assert jira_query.session.get.call_args.kwargs["params"]["jql"] == 'key in ("SU-1", "SU-2")'
+
+    def test_get_tickets_looks_up_missing_keys_one_by_one(self, jira_query):
+        requests = pytest.importorskip("requests")
+        not_found = Mock()
+        not_found.status_code = 404
+        not_found.raise_for_status.side_effect = requests.HTTPError(response=not_found)
+        jira_query.session.get.side_effect = [_response([_issue("SU-1")]), not_found]
+
+        tickets = jira_query.get_tickets(["SU-1", "SU-3"])
+
+        assert list(tickets) == ["SU-1"]
+        assert jira_query.session.get.call_args.args[0] == "https://jira.atlassian.com/rest/api/3/issue/SU-3"
+
+    def test_get_tickets_keys_renamed_ticket_by_requested_key(self, jira_query):
+        """移動・リネームされたチケットは、新しいキーではなく指定したキーで引ける"""
+        moved = Mock()
+        moved.json.return_value = _issue("NEW-7", status="In Progress")
+        jira_query.session.get.side_effect = [_response([_issue("NEW-7", status="In Progress")]), moved]
+
+        tickets = jira_query.get_tickets(["OLD-7"])
+
+        assert list(tickets) == ["OLD-7"]
+        assert tickets["OLD-7"].issue_key == "NEW-7"
+        assert tickets["OLD-7"].status == "In Progress"
+
+    def test_get_tickets_falls_back_to_single_lookups_on_invalid_key(self, jira_query):
+        requests = pytest.importorskip("requests")
+        bad_request = Mock()
+        bad_request.status_code = 400
+        bad_request.raise_for_status.side_effect = requests.HTTPError(response=bad_request)
+        bad_request.json.return_value = {"errorMessages": ["An issue with key 'SU-3' does not exist"]}
+        found = Mock()
+        found.json.return_value = _issue("SU-1")
+        not_found = Mock()
+        not_found.status_code = 404
+        not_found.raise_for_status.side_effect = requests.HTTPError(response=not_found)
+        jira_query.session.get.side_effect = [bad_request, found, not_found]
+
+        tickets = jira_query.get_tickets(["SU-1", "SU-3"])
+
+        assert list(tickets) == ["SU-1"]
+
+    def test_search_tickets_with_sync_profile_requests_and_parses_only_needed_fields(self, jira_query):
+        issue = _issue("SU-1")
+        issue["fields"]["description"] = {"type": "doc", "content": []}
+        jira_query.session.get.return_value = _response([issue])
+
+        (ticket,) = jira_query.search_tickets(project="SU", profile=JiraFieldProfile.SYNC)
+
+        params = jira_query.session.get.call_args.kwargs["params"]
+        assert params["fields"] == "key,summary,issuetype,status,created,updated"
+        assert ticket.issue_key == "SU-1"
+        assert ticket.status == "In Progress"
+        assert ticket.url == "https://jira.atlassian.com/browse/SU-1"
+        assert ticket.created == datetime(2024, 1, 1, 10, 0, 0, tzinfo=UTC)
+        assert ticket.description is None
+        assert ticket.labels is None
+
+    def test_get_ticket_with_minimal_profile(self, jira_query):
+        response = Mock()
+        response.json.return_value = _issue("SU-1")
+        jira_query.session.get.return_value = response
+
+        ticket = jira_query.get_ticket("SU-1", profile=JiraFieldProfile.MINIMAL)
+
+        assert ticket is not None
+        assert ticket.summary == "Issue SU-1"
+        assert ticket.created is None
+        assert jira_query.session.get.call_args.kwargs["params"] == {"fields": "key,summary,issuetype,status"}
+
+
+class TestRestApiJiraTicketQueryCache:
+    @pytest.fixture
+    def mock_session(self):
+        with patch("sandpiper.plan.query.jira_ticket_query.Session") as mock_session_class:
+            mock_session_instance = Mock()
+            mock_session_class.return_value = mock_session_instance
+            yield mock_session_instance
+
+    @pytest.fixture
+    def clock(self):
+        return Mock(return_value=1000.0)
+
+    @pytest.fixture
+    def jira_query(self, mock_session, tmp_path, clock):  # noqa: ARG002
+        with patch.dict("os.environ", JIRA_ENV):
+            return RestApiJiraTicketQuery(cache=JiraIssueCache(tmp_path / "jira.sqlite3"), clock=clock)
+
+    def test_second_search_queries_only_updated_issues(self, jira_query, clock):
+        jira_query.session.get.return_value = _response(
+            [_issue("SU-2", created="2024-01-02T10:00:00.000+0000"), _issue("SU-1")]
+        )
+        jira_query.search_tickets(project="SU", status="In Progress", max_results=100)
+
+        clock.return_value = 1000.0 + 2 * 60 * 60
+        # 差分: SU-3 が追加され、SU-1 は更新されて条件から外れた
+        jira_query.session.get.side_effect = [
+            _response([_issue("SU-3", created="2024-01-03T10:00:00.000+0000")]),
+            _response([{"key": "SU-1"}]),
+        ]
+        tickets = jira_query.search_tickets(project="SU", status="In Progress", max_results=100)
+
+        assert [ticket.issue_key for ticket in tickets] == ["SU-3", "SU-2"]
+        delta_jql = jira_query.session.get.call_args_list[1].kwargs["params"]["jql"]
+        assert delta_jql == ('(project = "SU" AND status = "In Progress") AND updated >= -122m ORDER BY created DESC')
+        recheck_params = jira_query.session.get.call_args_list[2].kwargs["params"]
+        assert recheck_params["jql"] == 'key in ("SU-2", "SU-1") AND updated >= -122m'
+        assert recheck_params["fields"] == "key"
+
+    def test_cached_search_with_minimal_profile_requests_created_for_sorting(self, jira_query):
+        jira_query.session.get.return_value = _response(
+            [
+                _issue("SU-1", created="2024-01-01T10:00:00.000+0000"),
+                _issue("SU-3", created="2024-01-03T10:00:00.000+0000"),
+                _issue("SU-2", created="2024-01-02T10:00:00.000+0000"),
+            ]
+        )
+
+        tickets = jira_query.search_tickets(project="SU", max_results=10, profile=JiraFieldProfile.MINIMAL)
+
+        params = jira_query.session.get.call_args.kwargs["params"]
+        assert params["fields"] == "key,summary,issuetype,status,created,updated"
+        assert [ticket.issue_key for ticket in tickets] == ["SU-3", "SU-2", "SU-1"]
+        # 作成日時は並べ替えにだけ使い、profile の契約どおり結果には含めない
+        assert all(ticket.created is None for ticket in tickets)
+
+    def test_cached_search_with_list_profile_reflects_status_change(self, jira_query, clock):
+        """updated を含まない profile でも、差分で取り直したチケットのステータスを反映する"""
+        jira_query.session.get.return_value = _response([_issue("SU-1", status="To Do")])
+        jira_query.search_tickets(project="SU", max_results=100, profile=JiraFieldProfile.LIST)
+
+        clock.return_value = 1000.0 + 60 * 60
+        changed = _issue("SU-1", status="Done")
+        changed["fields"]["updated"] = "2024-01-02T10:00:00.000+0000"
+        jira_query.session.get.side_effect = [_response([changed]), _response([{"key": "SU-1"}])]
+        (ticket,) = jira_query.search_tickets(project="SU", max_results=100, profile=JiraFieldProfile.LIST)
+
+        assert ticket.status == "Done"
+
+    def test_truncated_search_is_not_synced_by_delta(self, jira_query):
+        jira_query.session.get.return_value = _response([_issue("SU-1"), _issue("SU-2")])
+
+        jira_query.search_tickets(project="SU", max_results=2)
+        jira_query.search_tickets(project="SU", max_results=2)
+
+        # 件数の上限で打ち切られた結果は差分を当てられないので、毎回全件を取得する
+        jqls = [call.kwargs["params"]["jql"] for call in jira_query.session.get.call_args_list]
+        assert jqls == ['project = "SU" ORDER BY created DESC'] * 2
+
+    def test_full_sync_after_interval(self, jira_query, clock):
+        jira_query.session.get.return_value = _response([_issue("SU-1")])
+        jira_query.search_tickets(project="SU", max_results=100)
+
+        clock.return_value = 1000.0 + 24 * 60 * 60
+        jira_query.session.get.return_value = _response([])
+        tickets = jira_query.search_tickets(project="SU", max_results=100)
+
+        assert tickets == []
+        assert jira_query.session.get.call_args.kwargs["params"]["jql"] == 'project = "SU" ORDER BY created DESC'
+
+    def test_explicit_jql_is_not_cached(self, jira_query):
+        jira_query.session.get.return_value = _response([_issue("SU-1")])
+
+        jira_query.search_tickets(jql='project = "SU"')
+        jira_query.search_tickets(jql='project = "SU"')
+
+        jqls = [call.kwargs["params"]["jql"] for call in jira_query.session.get.call_args_list]
+        assert jqls == ['project = "SU"'] * 2
+
 
 class TestJiraTicketDto:
     def test_to_dict(self):
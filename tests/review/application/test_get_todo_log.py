@@ -100,7 +100,8 @@ class TestGetTodoLog:
             project_name="テストプロジェクト",
         )
 
-        self.mock_todo_query.fetch_done_todos_by_date.return_value = [todo2, todo1]  # 逆順
+        # クエリは開始時刻の昇順で返す
+        self.mock_todo_query.fetch_done_todos_by_date.return_value = [todo1, todo2]
         self.mock_calendar_query.fetch_events_by_date.return_value = [calendar1]
 
         result = self.get_todo_log.execute(target_date)
@@ -169,6 +170,34 @@ class TestGetTodoLog:
         result = self.get_todo_log.execute(target_date)
 
         assert len(result) == 2
-        # 同じ開始時刻の場合、安定ソートされる(元の順序が保持される)
+        # 同じ開始時刻の場合はTODOが先になる
         assert result[0] == todo1
         assert result[1] == calendar1
+
+    def test_execute_between_merges_sorted_streams(self):
+        """期間指定ではTODOとカレンダーの整列済みの結果をマージすることをテスト"""
+        start_date = date(2024, 1, 15)
+        end_date = date(2024, 1, 16)
+
+        def item(activity_type: ActivityType, title: str, start: datetime) -> ActivityLogItem:
+            return ActivityLogItem(
+                activity_type=activity_type, title=title, start_datetime=start, end_datetime=start, kind="SINGLE"
+            )
+
+        todos = [
+            item(ActivityType.TODO, "15日朝", datetime(2024, 1, 15, 9, 0)),
+            item(ActivityType.TODO, "16日昼", datetime(2024, 1, 16, 12, 0)),
+        ]
+        events = [
+            item(ActivityType.CALENDAR, "15日夜", datetime(2024, 1, 15, 20, 0)),
+            item(ActivityType.CALENDAR, "16日朝", datetime(2024, 1, 16, 8, 0)),
+        ]
+        self.mock_todo_query.fetch_done_todos_between.return_value = todos
+        self.mock_calendar_query.fetch_events_between.return_value = events
+
+        result = self.get_todo_log.execute_between(start_date, end_date)
+
+        assert [activity.title for activity in result] == ["15日朝", "15日夜", "16日朝", "16日昼"]
+        self.mock_todo_query.fetch_done_todos_between.assert_called_once_with(start_date, end_date)
+        self.mock_calendar_query.fetch_events_between.assert_called_once_with(start_date, end_date)
+        self.mock_todo_query.fetch_done_todos_by_date.assert_not_called()
@@ -0,0 +1,195 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+import pytest
+
+from sandpiper.review.query.github_activity_query import GitHubActivityQuery
+from sandpiper.shared.infrastructure.github_client import GitHubSearchActivity
+
+TARGET_DATE = datetime(2024, 3, 1, 15, 0, tzinfo=UTC)
+NOW = datetime(2024, 3, 10, tzinfo=UTC)
+
+
+def _event(event_type: str, created_at: datetime, payload: dict | None = None) -> Mock:
+    event = Mock()
+    event.type = event_type
+    event.created_at = created_at
+    event.repo.name = "me/app"
+    event.payload = payload or {}
+    return event
+
+
+def _client(events: list[Mock]) -> Mock:
+    client = Mock()
+    client.get_user_events.return_value = events
+    return client
+
+
+def _query(client: Mock) -> GitHubActivityQuery:
+    return GitHubActivityQuery(client, clock=lambda: NOW)
+
+
+class TestFetchDailyActivity:
+    def test_uses_events_when_feed_covers_the_day(self):
+        events = [
+            _event(
+                "PushEvent", datetime(2024, 3, 1, 10, tzinfo=UTC), {"commits": [{"sha": "abcdef123", "message": "m"}]}
+            ),
+            _event("WatchEvent", datetime(2024, 2, 29, 10, tzinfo=UTC)),
+        ]
+        client = _client(events)
+
+        result = _query(client).fetch_daily_activity("me", TARGET_DATE)
+
+        client.search_activity.assert_not_called()
+        assert [commit.sha for commit in result.commits] == ["abcdef1"]
+        assert result.summary.total_events == 1
+
+    def test_stops_reading_events_at_first_older_event(self):
+        read: list[Mock] = []
+
+        def events() -> Iterator[Mock]:
+            for event in [
+                _event("WatchEvent", datetime(2024, 3, 2, 1, tzinfo=UTC)),
+                _event("WatchEvent", datetime(2024, 3, 1, 9, tzinfo=UTC)),
+                _event("WatchEvent", datetime(2024, 2, 29, 23, tzinfo=UTC)),
+                _event("WatchEvent", datetime(2024, 2, 28, 23, tzinfo=UTC)),
+            ]:
+                read.append(event)
+                yield event
+
+        client = _client([])
+        client.get_user_events.return_value = events()
+
+        result = _query(client).fetch_daily_activity("me", TARGET_DATE)
+
+        assert len(read) == 3
+        assert result.summary.total_events == 1
+        client.search_activity.assert_not_called()
+
+    def test_skips_events_for_days_before_retention(self):
+        client = _client([])
+        client.search_activity.return_value = GitHubSearchActivity(commits=[], pull_requests=[], issues=[], reviews=[])
+
+        GitHubActivityQuery(client, clock=lambda: datetime(2024, 9, 1, tzinfo=UTC)).fetch_daily_activity(
+            "me", TARGET_DATE
+        )
+
+        client.get_user_events.assert_not_called()
+        client.search_activity.assert_called_once()
+
+    def test_falls_back_to_search_when_feed_does_not_reach_the_day(self):
+        client = _client([_event("PushEvent", datetime(2024, 3, 8, 10, tzinfo=UTC))])
+        client.search_activity.return_value = GitHubSearchActivity(
+            commits=[
+                {
+                    "sha": "1234567890",
+                    "repository": "me/app",
+                    "commit": {"message": "fix", "committer": {"date": "2024-03-01T10:00:00Z"}},
+                }
+            ],
+            pull_requests=[
+                (
+                    "merged",
+                    {
+                        "number": 3,
+                        "title": "PR",
+                        "repository": "me/app",
+                        "created_at": "2024-02-20T00:00:00Z",
+                        "pull_request": {"merged_at": "2024-03-01T11:00:00Z"},
+                    },
+                )
+            ],
+            issues=[
+                (
+                    "opened",
+                    {"number": 4, "title": "Issue", "repository": "me/app", "created_at": "2024-03-01T12:00:00Z"},
+                )
+            ],
+            reviews=[
+                {"pull_number": 9, "state": "APPROVED", "repository": "org/lib", "submitted_at": "2024-03-01T13:00:00Z"}
+            ],
+        )
+
+        result = _query(client).fetch_daily_activity("me", TARGET_DATE)
+
+        client.search_activity.assert_called_once_with(
+            "me", datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 2, tzinfo=UTC)
+        )
+        assert result.date == "2024-03-01"
+        assert [(commit.sha, commit.repo) for commit in result.commits] == [("1234567", "me/app")]
+        assert [(pr.number, pr.action, pr.created_at.hour) for pr in result.pull_requests] == [(3, "merged", 11)]
+        assert [(issue.number, issue.action) for issue in result.issues] == [(4, "opened")]
+        assert [(review.pr_number, review.state) for review in result.reviews] == [(9, "approved")]
+        assert result.summary.total_events == 4
+
+
+def _push(created_at: datetime, sha: str) -> Mock:
+    return _event("PushEvent", created_at, {"commits": [{"sha": sha, "message": sha}]})
+
+
+class TestFetchActivityRange:
+    def test_buckets_events_per_day_in_a_single_pass(self):
+        client = _client(
+            [
+                _push(datetime(2024, 3, 4, 1, tzinfo=UTC), "outside"),
+                _push(datetime(2024, 3, 3, 9, tzinfo=UTC), "c3"),
+                _event(
+                    "IssuesEvent", datetime(2024, 3, 3, 8, tzinfo=UTC), {"action": "opened", "issue": {"number": 1}}
+                ),
+                _push(datetime(2024, 3, 1, 9, tzinfo=UTC), "c1"),
+                _event("WatchEvent", datetime(2024, 2, 29, 9, tzinfo=UTC)),
+            ]
+        )
+
+        result = _query(client).fetch_activity_range(
+            "me", datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 3, tzinfo=UTC)
+        )
+
+        client.get_user_events.assert_called_once_with("me")
+        client.search_activity.assert_not_called()
+        assert (result.start_date, result.end_date) == ("2024-03-01", "2024-03-03")
+        assert [day.date for day in result.days] == ["2024-03-01", "2024-03-02", "2024-03-03"]
+        assert [[commit.sha for commit in day.commits] for day in result.days] == [["c1"], [], ["c3"]]
+        assert [day.summary.total_events for day in result.days] == [1, 0, 2]
+        assert result.summary.total_events == 3
+        assert result.summary.commits_count == 2
+        assert result.summary.issues_count == 1
+
+    def test_searches_only_days_the_feed_does_not_reach(self):
+        client = _client(
+            [
+                _push(datetime(2024, 3, 3, 9, tzinfo=UTC), "c3"),
+                # フィードの最も古いイベント。3/2 は途中からしか取得できていない
+                _push(datetime(2024, 3, 2, 10, tzinfo=UTC), "c2-partial"),
+            ]
+        )
+        client.search_activity.return_value = GitHubSearchActivity(
+            commits=[
+                {
+                    "sha": sha,
+                    "repository": "me/app",
+                    "commit": {"message": sha, "committer": {"date": committed_at}},
+                }
+                for sha, committed_at in [("s1", "2024-03-01T10:00:00Z"), ("s2", "2024-03-02T10:00:00Z")]
+            ],
+            pull_requests=[],
+            issues=[],
+            reviews=[],
+        )
+
+        result = _query(client).fetch_activity_range(
+            "me", datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 3, tzinfo=UTC)
+        )
+
+        client.search_activity.assert_called_once_with(
+            "me", datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 3, tzinfo=UTC)
+        )
+        assert [[commit.sha for commit in day.commits] for day in result.days] == [["s1"], ["s2"], ["c3"]]
+
+    def test_rejects_end_before_start(self):
+        with pytest.raises(ValueError):
+            _query(_client([])).fetch_activity_range(
+                "me", datetime(2024, 3, 2, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC)
+            )
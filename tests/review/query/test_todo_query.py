@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import Mock
 
 import pytest
@@ -13,11 +13,27 @@ class TestNotionTodoQuery:
     def mock_lotion_client(self, monkeypatch):
         mock_client = Mock(spec=Lotion)
         monkeypatch.setattr(Lotion, "get_instance", lambda: mock_client)
+        # iter_database はモックの retrieve_database の戻り値を順に返す
+        monkeypatch.setattr(
+            "sandpiper.review.query.todo_query.iter_database",
+            lambda database_id, **_: iter(mock_client.retrieve_database(database_id)),
+        )
         return mock_client
 
+    @pytest.fixture
+    def project_pages(self):
+        """参照先のプロジェクトページ"""
+        return {}
+
+    @pytest.fixture(autouse=True)
+    def mock_retrieve_page(self, monkeypatch, project_pages):
+        mock = Mock(side_effect=lambda page_id, **_: project_pages[page_id])
+        monkeypatch.setattr("sandpiper.review.query.todo_query.retrieve_page", mock)
+        return mock
+
     @pytest.fixture
     def query(self, mock_lotion_client):  # noqa: ARG002
-        return NotionTodoQuery()
+        return NotionTodoQuery(rate_limiter=Mock())
 
     @pytest.fixture
     def target_date(self):
@@ -32,7 +48,8 @@ class TestNotionTodoQuery:
 
         # Assert
         assert result == []
-        assert mock_lotion_client.retrieve_database.call_count == 2
+        # プロジェクトのデータベースは読まない
+        assert mock_lotion_client.retrieve_database.call_count == 1
 
     def test_fetch_done_todos_by_date_filters_non_done_status(self, query, mock_lotion_client, target_date):
         # Arrange
@@ -41,10 +58,7 @@ class TestNotionTodoQuery:
         mock_status.status_name = "ToDo"  # Not DONE
         mock_todo.get_status.return_value = mock_status
 
-        mock_lotion_client.retrieve_database.side_effect = [
-            [mock_todo],  # TODO database
-            [],  # PROJECT database
-        ]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -63,7 +77,7 @@ class TestNotionTodoQuery:
         mock_date_range.end = None
         mock_todo.get_date.return_value = mock_date_range
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -79,7 +93,7 @@ class TestNotionTodoQuery:
         self._setup_perform_range(mock_todo, "2024-01-14T09:00:00", "2024-01-14T10:00:00")
         self._setup_valid_task_kind(mock_todo, "単発")
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -98,7 +112,7 @@ class TestNotionTodoQuery:
         mock_select.selected_name = None
         mock_todo.get_select.return_value = mock_select
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -115,7 +129,7 @@ class TestNotionTodoQuery:
         mock_todo.get_title_text.return_value = "テストタスク"
         mock_todo.id = "test-todo-id"
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -130,7 +144,7 @@ class TestNotionTodoQuery:
         assert isinstance(activity.start_datetime, datetime)
         assert isinstance(activity.end_datetime, datetime)
 
-    def test_fetch_done_todos_by_date_project_task_success(self, query, mock_lotion_client, target_date):
+    def test_fetch_done_todos_by_date_project_task_success(self, query, mock_lotion_client, target_date, project_pages):
         # Arrange
         mock_todo = self._create_mock_todo_item()
         self._setup_done_status(mock_todo)
@@ -149,7 +163,8 @@ class TestNotionTodoQuery:
         mock_project.id = "project-123"
         mock_project.get_title_text.return_value = "テストプロジェクト"
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], [mock_project]]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
+        project_pages["project-123"] = mock_project
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -174,7 +189,7 @@ class TestNotionTodoQuery:
         mock_relation.id_list = []
         mock_todo.get_relation.return_value = mock_relation
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -198,7 +213,7 @@ class TestNotionTodoQuery:
         mock_todo2.get_title_text.return_value = "タスク2"
         mock_todo2.id = "todo-2"
 
-        mock_lotion_client.retrieve_database.side_effect = [[mock_todo1, mock_todo2], []]
+        mock_lotion_client.retrieve_database.side_effect = [[mock_todo1, mock_todo2]]
 
         # Act
         result = query.fetch_done_todos_by_date(target_date)
@@ -210,6 +225,61 @@ class TestNotionTodoQuery:
         assert result[1].title == "タスク2"
         assert result[1].kind == "差し込み"
 
+    def test_fetch_done_todos_between_filters_and_sorts_on_notion(self, query, monkeypatch):
+        # Arrange
+        later = self._create_done_single_todo("後", "2024-01-16T09:00:00")
+        earlier = self._create_done_single_todo("先", "2024-01-15T09:00:00")
+        outside = self._create_done_single_todo("範囲外", "2024-01-17T09:00:00")
+        mock_iter_database = Mock(return_value=iter([later, earlier, outside]))
+        monkeypatch.setattr("sandpiper.review.query.todo_query.iter_database", mock_iter_database)
+
+        # Act
+        result = query.fetch_done_todos_between(date(2024, 1, 15), date(2024, 1, 16))
+
+        # Assert
+        assert [activity.title for activity in result] == ["先", "後"]
+        kwargs = mock_iter_database.call_args.kwargs
+        assert kwargs["sorts"] == [{"property": "実施期間", "direction": "ascending"}]
+        assert kwargs["filter_param"] == {
+            "and": [
+                {"property": "ステータス", "status": {"equals": "Done"}},
+                {"property": "実施期間", "date": {"on_or_after": "2024-01-15T00:00:00+09:00"}},
+                {"property": "実施期間", "date": {"before": "2024-01-17T00:00:00+09:00"}},
+            ]
+        }
+
+    def test_fetch_done_todos_retrieves_each_referenced_project_once(
+        self, query, mock_lotion_client, target_date, project_pages, mock_retrieve_page
+    ):
+        # Arrange
+        todos = []
+        for title in ["タスク1", "タスク2"]:
+            todo = self._create_done_single_todo(title, "2024-01-15T09:00:00", kind_name="プロジェクト")
+            todo.get_relation.return_value = Mock(id_list=["project-123"])
+            todos.append(todo)
+        mock_project = Mock(spec=BasePage)
+        mock_project.get_title_text.return_value = "テストプロジェクト"
+        project_pages["project-123"] = mock_project
+        mock_lotion_client.retrieve_database.side_effect = [todos]
+
+        # Act
+        result = query.fetch_done_todos_by_date(target_date)
+
+        # Assert
+        assert [activity.project_name for activity in result] == ["テストプロジェクト", "テストプロジェクト"]
+        mock_retrieve_page.assert_called_once()
+        assert mock_retrieve_page.call_args.args == ("project-123",)
+
+    def _create_done_single_todo(self, title: str, start: str, kind_name: str = "単発"):
+        """DONEのTODOを作成(実施期間は開始から1時間)"""
+        mock_todo = self._create_mock_todo_item()
+        self._setup_done_status(mock_todo)
+        end = (datetime.fromisoformat(start) + timedelta(hours=1)).isoformat()
+        self._setup_perform_range(mock_todo, start, end)
+        self._setup_valid_task_kind(mock_todo, kind_name)
+        mock_todo.get_title_text.return_value = title
+        return mock_todo
+
     def _create_mock_todo_item(self):
         """モックのToDo項目を作成"""
         mock_item = Mock()
@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -33,9 +34,16 @@ class TestArchiveDeletedPagesResult:
 class TestArchiveDeletedPages:
     @pytest.fixture
     def mock_lotion(self):
-        with patch("sandpiper.shared.infrastructure.archive_deleted_pages.Lotion") as mock:
+        with (
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.Lotion") as mock,
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.iter_database") as mock_iter_database,
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.NotionRateLimiter") as mock_rate_limiter,
+        ):
+            mock_rate_limiter.get_instance.return_value.call.side_effect = lambda func, **_: func()
             mock_instance = MagicMock()
             mock.get_instance.return_value = mock_instance
+            # iter_database はモックの retrieve_database の戻り値を順に返す
+            mock_iter_database.side_effect = lambda database_id, **_: iter(mock_instance.retrieve_database(database_id))
             yield mock_instance
 
     def test_execute_archives_deleted_pages(self, mock_lotion):
@@ -52,10 +60,9 @@ class TestArchiveDeletedPages:
         page3.id = "page-3"
         page3.get_checkbox.return_value.checked = True
 
-        mock_lotion.retrieve_database.side_effect = [
-            [page1, page2],  # First database
-            [page3],  # Second database
-        ]
+        # データベースは並行して処理されるので、IDごとに返すページを決める
+        pages_by_database = {"db1": [page1, page2], "db2": [page3]}
+        mock_lotion.retrieve_database.side_effect = pages_by_database.get
 
         # Act
         usecase = ArchiveDeletedPages(database_ids=["db1", "db2"])
@@ -78,10 +85,8 @@ class TestArchiveDeletedPages:
         page2.id = "page-2"
         page2.get_checkbox.return_value.checked = False
 
-        mock_lotion.retrieve_database.side_effect = [
-            [page1],
-            [page2],
-        ]
+        pages_by_database = {"db1": [page1], "db2": [page2]}
+        mock_lotion.retrieve_database.side_effect = pages_by_database.get
 
         # Act
         usecase = ArchiveDeletedPages(database_ids=["db1", "db2"])
@@ -135,3 +140,193 @@ class TestArchiveDeletedPages:
         # Assert
         assert len(result.deleted_counts) == 3
         assert mock_lotion.retrieve_database.call_count == 3
+
+    def test_execute_with_snapshot_reads_and_updates_snapshot(self, mock_lotion):
+        # Arrange
+        page1 = MagicMock()
+        page1.id = "page-1"
+        page1.get_checkbox.return_value.checked = True
+        snapshot = MagicMock()
+        snapshot.retrieve_database.return_value = [page1]
+
+        # Act
+        usecase = ArchiveDeletedPages(database_ids=["db1"], snapshot=snapshot)
+        result = usecase.execute()
+
+        # Assert
+        assert result.total_deleted_count == 1
+        mock_lotion.retrieve_database.assert_not_called()
+        snapshot.retrieve_database.assert_called_once_with("db1")
+        mock_lotion.remove_page.assert_called_once_with("page-1")
+        snapshot.remove.assert_called_once_with("db1", "page-1")
+
+    def test_execute_filters_deleted_pages_on_notion(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = []
+        with patch("sandpiper.shared.infrastructure.archive_deleted_pages.iter_database") as mock_iter_database:
+            mock_iter_database.return_value = iter([])
+            ArchiveDeletedPages(database_ids=["db1"]).execute()
+
+        assert mock_iter_database.call_args.kwargs["filter_param"] == {
+            "property": "論理削除",
+            "checkbox": {"equals": True},
+        }
+
+    def test_execute_with_inactive_snapshot_queries_notion(self, mock_lotion):
+        page1 = MagicMock()
+        page1.id = "page-1"
+        page1.get_checkbox.return_value.checked = True
+        mock_lotion.retrieve_database.return_value = [page1]
+        snapshot = MagicMock()
+        snapshot.is_active = False
+
+        result = ArchiveDeletedPages(database_ids=["db1"], snapshot=snapshot).execute()
+
+        assert result.total_deleted_count == 1
+        snapshot.retrieve_database.assert_not_called()
+
+    def test_execute_removes_pages_from_replica(self, mock_lotion):
+        page1 = MagicMock()
+        page1.id = "page-1"
+        page1.get_checkbox.return_value.checked = True
+        mock_lotion.retrieve_database.return_value = [page1]
+        replica = MagicMock()
+
+        ArchiveDeletedPages(database_ids=["db1"], replica=replica).execute()
+
+        replica.remove_page.assert_called_once_with("db1", "page-1")
+
+    def test_dry_run_counts_from_refreshed_replica(self, mock_lotion):
+        deleted_page = MagicMock()
+        deleted_page.get_checkbox.return_value.checked = True
+        kept_page = MagicMock()
+        kept_page.get_checkbox.return_value.checked = False
+        replica = MagicMock()
+        replica.has_synced.return_value = True
+        replica.retrieve_database.return_value = [deleted_page, kept_page]
+
+        result = ArchiveDeletedPages(database_ids=["db1", "db2"], replica=replica).execute(dry_run=True)
+
+        assert result.deleted_counts == {"db1": 1, "db2": 1}
+        # 差分同期してから数える(古い索引のまま数えない)
+        replica.retrieve_database.assert_any_call("db1")
+        mock_lotion.retrieve_database.assert_not_called()
+        mock_lotion.remove_page.assert_not_called()
+        replica.remove_page.assert_not_called()
+
+    def test_dry_run_with_unsynced_replica_queries_notion(self, mock_lotion):
+        deleted_page = MagicMock()
+        deleted_page.get_checkbox.return_value.checked = True
+        mock_lotion.retrieve_database.return_value = [deleted_page]
+        replica = MagicMock()
+        replica.has_synced.return_value = False
+
+        result = ArchiveDeletedPages(database_ids=["db1"], replica=replica).execute(dry_run=True)
+
+        assert result.deleted_counts == {"db1": 1}
+        replica.retrieve_database.assert_not_called()
+        mock_lotion.remove_page.assert_not_called()
+
+    def test_dry_run_without_replica_does_not_remove(self, mock_lotion):
+        page1 = MagicMock()
+        page1.get_checkbox.return_value.checked = True
+        mock_lotion.retrieve_database.return_value = [page1]
+
+        result = ArchiveDeletedPages(database_ids=["db1"]).execute(dry_run=True)
+
+        assert result.total_deleted_count == 1
+        mock_lotion.remove_page.assert_not_called()
+
+
+class TestArchiveDeletedPagesAsync:
+    @pytest.fixture
+    def mock_lotion(self):
+        with (
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.Lotion") as mock,
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.iter_database") as mock_iter_database,
+            patch("sandpiper.shared.infrastructure.archive_deleted_pages.NotionRateLimiter") as mock_rate_limiter,
+        ):
+            mock_rate_limiter.get_instance.return_value.call.side_effect = lambda func, **_: func()
+            mock_instance = MagicMock()
+            mock.get_instance.return_value = mock_instance
+            # iter_database はモックの retrieve_database の戻り値を順に返す
+            mock_iter_database.side_effect = lambda database_id, **_: iter(mock_instance.retrieve_database(database_id))
+            yield mock_instance
+
+    @pytest.mark.asyncio
+    async def test_execute_async_uses_gateway(self, mock_lotion):
+        deleted_page = MagicMock()
+        deleted_page.id = "page-1"
+        deleted_page.get_checkbox.return_value.checked = True
+        kept_page = MagicMock()
+        kept_page.id = "page-2"
+        kept_page.get_checkbox.return_value.checked = False
+        gateway = MagicMock()
+
+        async def iter_database(database_id, filter_param=None):  # noqa: ARG001
+            assert filter_param == {"property": "論理削除", "checkbox": {"equals": True}}
+            for page in (deleted_page, kept_page):
+                yield page
+
+        gateway.iter_database = iter_database
+        gateway.remove_page = AsyncMock()
+        service = ArchiveDeletedPages(database_ids=["db1"], gateway=gateway)
+
+        result = await service.execute_async()
+
+        assert result.deleted_counts == {"db1": 1}
+        gateway.remove_page.assert_awaited_once_with("page-1")
+        mock_lotion.retrieve_database.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_async_without_gateway_falls_back_to_sync(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = []
+        service = ArchiveDeletedPages(database_ids=["db1"])
+
+        result = await service.execute_async()
+
+        assert result.deleted_counts == {"db1": 0}
+        mock_lotion.retrieve_database.assert_called_once_with("db1")
+
+    @pytest.mark.asyncio
+    async def test_execute_async_processes_databases_concurrently(self, mock_lotion):  # noqa: ARG002
+        pages = {}
+        for database_id in ("db1", "db2"):
+            page = MagicMock()
+            page.id = f"{database_id}-page"
+            page.get_checkbox.return_value.checked = True
+            pages[database_id] = page
+        started: list[str] = []
+        both_started = asyncio.Event()
+        gateway = MagicMock()
+
+        async def iter_database(database_id, filter_param=None):  # noqa: ARG001
+            started.append(database_id)
+            if len(started) == 2:
+                both_started.set()
+            # もう一方のデータベースの取得が始まるまで待つ(逐次処理ならここで止まる)
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            yield pages[database_id]
+
+        gateway.iter_database = iter_database
+        gateway.remove_page = AsyncMock()
+        replica = MagicMock()
+        service = ArchiveDeletedPages(database_ids=["db1", "db2"], gateway=gateway, replica=replica)
+
+        result = await service.execute_async()
+
+        assert result.deleted_counts == {"db1": 1, "db2": 1}
+        assert gateway.remove_page.await_count == 2
+        replica.remove_page.assert_any_call("db2", "db2-page")
+
+    @pytest.mark.asyncio
+    async def test_execute_async_dry_run_does_not_use_gateway(self, mock_lotion):  # noqa: ARG002
+        replica = MagicMock()
+        replica.retrieve_database.return_value = []
+        gateway = MagicMock()
+        gateway.remove_page = AsyncMock()
+        service = ArchiveDeletedPages(database_ids=["db1"], gateway=gateway, replica=replica)
+
+        result = await service.execute_async(dry_run=True)
+
+        assert result.deleted_counts == {"db1": 0}
+        gateway.remove_page.assert_not_awaited()
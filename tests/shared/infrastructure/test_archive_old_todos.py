@@ -1,13 +1,20 @@
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
 
+from sandpiper.shared.infrastructure import archive_old_todos
 from sandpiper.shared.infrastructure.archive_old_todos import (
     DEFAULT_ARCHIVE_DAYS,
+    ArchiveJournal,
     ArchiveOldTodos,
     ArchiveOldTodosResult,
+    ArchiveStage,
 )
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
 from sandpiper.shared.utils.date_utils import JST
 from sandpiper.shared.valueobject.todo_kind import ToDoKind
 
@@ -30,6 +37,12 @@ class TestArchiveOldTodosResult:
         assert result.archived_count == 0
         assert len(result.archived_titles) == 0
 
+    def test_throughput_per_second(self):
+        result = ArchiveOldTodosResult(archived_count=3, archived_titles=[], deleted_routine_count=1)
+        result.elapsed_seconds = 2.0
+        assert result.throughput_per_second == 2.0
+        assert ArchiveOldTodosResult(archived_count=0, archived_titles=[]).throughput_per_second == 0.0
+
     def test_routine_fields_default_to_zero(self):
         result = ArchiveOldTodosResult(archived_count=0, archived_titles=[])
         assert result.deleted_routine_count == 0
@@ -39,9 +52,17 @@ class TestArchiveOldTodosResult:
 class TestArchiveOldTodos:
     @pytest.fixture
     def mock_lotion(self):
-        with patch("sandpiper.shared.infrastructure.archive_old_todos.Lotion") as mock:
+        with (
+            patch("sandpiper.shared.infrastructure.archive_old_todos.Lotion") as mock,
+            patch("sandpiper.shared.infrastructure.archive_old_todos.iter_database") as mock_iter_database,
+            patch("sandpiper.shared.infrastructure.archive_old_todos.NotionRateLimiter") as mock_rate_limiter,
+        ):
+            # レートリミッターは待たずにそのまま実行する
+            mock_rate_limiter.get_instance.return_value.call.side_effect = lambda func, **_: func()
             mock_instance = MagicMock()
             mock.get_instance.return_value = mock_instance
+            # iter_database はモックの retrieve_database の戻り値を順に返す
+            mock_iter_database.side_effect = lambda database_id, **_: iter(mock_instance.retrieve_database(database_id))
             yield mock_instance
 
     @pytest.fixture
@@ -265,3 +286,134 @@ class TestArchiveOldTodos:
         assert "通常タスク" in result.archived_titles
         assert "ルーティンタスク" in result.deleted_routine_titles
         mock_lotion.create_page.assert_called_once()  # 通常タスクのみアーカイブ
+
+    def test_query_is_filtered_by_status_and_log_date(self, mock_lotion, mock_jst_today_datetime):  # noqa: ARG002
+        mock_lotion.retrieve_database.return_value = []
+
+        ArchiveOldTodos(archive_days=7).execute()
+
+        filter_param = archive_old_todos.iter_database.call_args.kwargs["filter_param"]
+        assert filter_param == {
+            "and": [
+                {"property": "ステータス", "status": {"equals": "Done"}},
+                {"property": "実施期間", "date": {"before": "2024-03-14T00:00:00+09:00"}},
+            ]
+        }
+
+    def test_failed_todo_does_not_stop_others(self, mock_lotion, mock_jst_today_datetime):  # noqa: ARG002
+        old_end_date = datetime(2024, 3, 10, 12, 0, 0, tzinfo=JST)
+        page1 = self._create_mock_page("page-1", "失敗するタスク", "Done", old_end_date)
+        page2 = self._create_mock_page("page-2", "成功するタスク", "Done", old_end_date)
+        mock_lotion.retrieve_database.return_value = [page1, page2]
+
+        def remove_page(page_id: str) -> None:
+            if page_id == "page-1":
+                raise RuntimeError("boom")
+
+        mock_lotion.remove_page.side_effect = remove_page
+
+        result = ArchiveOldTodos(archive_days=7, max_workers=2).execute()
+
+        assert result.failed_titles == ["失敗するタスク"]
+        assert result.archived_titles == ["成功するタスク"]
+        assert result.scanned_count == 2
+
+
+class TestArchiveOldTodosJournal:
+    @pytest.fixture
+    def mock_lotion(self):
+        with (
+            patch("sandpiper.shared.infrastructure.archive_old_todos.Lotion") as mock,
+            patch("sandpiper.shared.infrastructure.archive_old_todos.iter_database") as mock_iter_database,
+        ):
+            mock_instance = MagicMock()
+            mock.get_instance.return_value = mock_instance
+            mock_iter_database.side_effect = lambda database_id, **_: iter(mock_instance.retrieve_database(database_id))
+            yield mock_instance
+
+    @pytest.fixture(autouse=True)
+    def mock_jst_today_datetime(self):
+        with patch("sandpiper.shared.infrastructure.archive_old_todos.jst_today_datetime") as mock:
+            mock.return_value = datetime(2024, 3, 20, 0, 0, 0, tzinfo=JST)
+            yield mock
+
+    @pytest.fixture
+    def rate_limiter(self):
+        rate_limiter = MagicMock()
+        rate_limiter.call.side_effect = lambda func, **_: func()
+        return rate_limiter
+
+    def _page(self, page_id: str) -> MagicMock:
+        page = MagicMock()
+        page.id = page_id
+        page.get_title_text.return_value = page_id
+        page.get_status.return_value.status_name = "Done"
+        page.get_date.return_value.start = datetime(2024, 3, 10, 12, 0, 0, tzinfo=JST).isoformat()
+        page.get_date.return_value.end = datetime(2024, 3, 10, 12, 0, 0, tzinfo=JST).isoformat()
+        page.get_select.return_value.selected_name = ""
+        page.get_checkbox.return_value.checked = False
+        page.get_relation.return_value.id_list = []
+        page.get_number.return_value.number = None
+        page.get_multi_select.return_value.values = []
+        page.get_text.return_value.text = ""
+        return page
+
+    def test_resume_skips_copy_for_already_archived_page(self, tmp_path, mock_lotion, rate_limiter):
+        journal = ArchiveJournal(tmp_path / "journal.jsonl")
+        journal.record("page-1", ArchiveStage.ARCHIVED)
+        journal.record("page-2", ArchiveStage.REMOVED)
+        mock_lotion.retrieve_database.return_value = [self._page("page-1"), self._page("page-2"), self._page("page-3")]
+
+        service = ArchiveOldTodos(
+            archive_days=7, journal=ArchiveJournal(tmp_path / "journal.jsonl"), rate_limiter=rate_limiter
+        )
+        result = service.execute()
+
+        # page-1 はコピー済みなので削除のみ、page-2 は処理済み
+        assert mock_lotion.create_page.call_count == 1
+        assert sorted(call.args[0] for call in mock_lotion.remove_page.call_args_list) == ["page-1", "page-3"]
+        assert result.archived_count == 2
+        assert result.skipped_count == 1
+
+    def test_journal_is_cleared_after_successful_run(self, tmp_path, mock_lotion, rate_limiter):
+        path = tmp_path / "journal.jsonl"
+        mock_lotion.retrieve_database.return_value = [self._page("page-1")]
+
+        ArchiveOldTodos(archive_days=7, journal=ArchiveJournal(path), rate_limiter=rate_limiter).execute()
+
+        assert not path.exists()
+
+    def test_journal_keeps_progress_when_removal_fails(self, tmp_path, mock_lotion, rate_limiter):
+        path = tmp_path / "journal.jsonl"
+        mock_lotion.retrieve_database.return_value = [self._page("page-1")]
+        mock_lotion.remove_page.side_effect = RuntimeError("boom")
+
+        result = ArchiveOldTodos(archive_days=7, journal=ArchiveJournal(path), rate_limiter=rate_limiter).execute()
+
+        assert result.failed_count == 1
+        assert ArchiveJournal(path).stage("page-1") == ArchiveStage.ARCHIVED
+
+    def test_rate_limited_retrieve_after_create_is_not_retried(self, tmp_path, mock_lotion):
+        """作成後の再取得が429になっても、コピーを再試行して重複作成しない"""
+        path = tmp_path / "journal.jsonl"
+        mock_lotion.retrieve_database.return_value = [self._page("page-1")]
+        response_error = APIResponseError(
+            code="rate_limited", status=429, message="error", headers=httpx.Headers({}), raw_body_text=""
+        )
+        mock_lotion.create_page.side_effect = NotionApiError(page_id="archived-1", e=response_error)
+        rate_limiter = NotionRateLimiter(sleep=lambda _: None)
+
+        result = ArchiveOldTodos(archive_days=7, journal=ArchiveJournal(path), rate_limiter=rate_limiter).execute()
+
+        assert mock_lotion.create_page.call_count == 1
+        assert result.failed_count == 1
+        mock_lotion.remove_page.assert_not_called()
+
+    def test_journal_ignores_truncated_line(self, tmp_path):
+        path = tmp_path / "journal.jsonl"
+        path.write_text('{"page_id": "page-1", "stage": "removed"}\n{"page_id": "pa', encoding="utf-8")
+
+        journal = ArchiveJournal(path)
+
+        assert journal.stage("page-1") == ArchiveStage.REMOVED
+        assert journal.stage("page-2") is None
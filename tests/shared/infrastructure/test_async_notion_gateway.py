@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from lotion import BasePage
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
+
+from sandpiper.shared.infrastructure.async_notion_gateway import AsyncNotionGateway
+from sandpiper.shared.notion.databases.calendar import CalendarEventCategory, CalendarEventName, CalendarEventPage
+
+PAGE_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def _page_entity(page_id: str = PAGE_ID) -> dict:
+    return {
+        "object": "page",
+        "id": page_id,
+        "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        "created_time": "2024-01-01T00:00:00.000Z",
+        "last_edited_time": "2024-01-01T00:00:00.000Z",
+        "created_by": {"object": "user", "id": "user"},
+        "last_edited_by": {"object": "user", "id": "user"},
+        "parent": {"type": "database_id", "database_id": "db"},
+        "cover": None,
+        "icon": None,
+        "archived": False,
+        "properties": {},
+    }
+
+
+def _api_error(status: int, headers: dict[str, str] | None = None) -> APIResponseError:
+    return APIResponseError(
+        code="rate_limited", status=status, message="error", headers=httpx.Headers(headers or {}), raw_body_text=""
+    )
+
+
+@pytest.fixture
+def notion_client() -> MagicMock:
+    client = MagicMock()
+    client.pages.create = AsyncMock(return_value=_page_entity())
+    client.pages.update = AsyncMock(return_value=_page_entity())
+    client.blocks.children.append = AsyncMock()
+    client.request = AsyncMock()
+    return client
+
+
+class TestAsyncNotionGateway:
+    @pytest.mark.asyncio
+    async def test_create_page_sends_select_by_name(self, notion_client):
+        gateway = AsyncNotionGateway(client=notion_client)
+        page = CalendarEventPage.create(
+            properties=[CalendarEventName.from_plain_text("会議"), CalendarEventCategory.from_name("仕事")]
+        )
+
+        created = await gateway.create_page(page)
+
+        assert isinstance(created, CalendarEventPage)
+        assert created.id == PAGE_ID
+        properties = notion_client.pages.create.call_args.kwargs["properties"]
+        assert properties["カテゴリ"]["select"] == {"name": "仕事"}
+        notion_client.blocks.children.append.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retrieve_database_follows_pagination(self, notion_client):
+        notion_client.request.side_effect = [
+            {"results": [_page_entity()], "has_more": True, "next_cursor": "cursor-1"},
+            {"results": [_page_entity("22222222-2222-2222-2222-222222222222")], "has_more": False},
+        ]
+        gateway = AsyncNotionGateway(client=notion_client)
+
+        pages = await gateway.retrieve_database("db", filter_param={"property": "x"})
+
+        assert [page.id for page in pages] == [PAGE_ID, "22222222-2222-2222-2222-222222222222"]
+        assert all(isinstance(page, BasePage) for page in pages)
+        second_body = notion_client.request.call_args_list[1].kwargs["body"]
+        assert second_body == {"page_size": 100, "filter": {"property": "x"}, "start_cursor": "cursor-1"}
+
+    @pytest.mark.asyncio
+    async def test_iter_database_requests_next_response_only_when_consumed(self, notion_client):
+        notion_client.request.side_effect = [
+            {"results": [_page_entity()], "has_more": True, "next_cursor": "cursor-1"},
+            {"results": [_page_entity("22222222-2222-2222-2222-222222222222")], "has_more": False},
+        ]
+        gateway = AsyncNotionGateway(client=notion_client)
+
+        pages = gateway.iter_database("db")
+        first = await anext(pages)
+
+        assert first.id == PAGE_ID
+        assert notion_client.request.call_count == 1
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried_after_retry_after(self, notion_client):
+        notion_client.pages.update.side_effect = [_api_error(429, {"Retry-After": "0.5"}), _page_entity()]
+        gateway = AsyncNotionGateway(client=notion_client)
+
+        with patch("sandpiper.shared.infrastructure.async_notion_gateway.asyncio.sleep", new=AsyncMock()) as sleep:
+            await gateway.remove_page(PAGE_ID)
+
+        sleep.assert_awaited_once_with(0.5)
+        assert notion_client.pages.update.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_wrapped(self, notion_client):
+        notion_client.pages.update.side_effect = _api_error(400)
+        gateway = AsyncNotionGateway(client=notion_client)
+
+        with pytest.raises(NotionApiError):
+            await gateway.remove_page(PAGE_ID)
+        assert notion_client.pages.update.await_count == 1
@@ -1,8 +1,10 @@
+import asyncio
+import threading
 from unittest.mock import Mock
 
 import pytest
 
-from sandpiper.shared.infrastructure.event_bus import EventBus
+from sandpiper.shared.infrastructure.event_bus import DispatchMode, EventBus
 
 
 class DummyEvent:
@@ -165,3 +167,99 @@ class TestEventBus:
         # publishを呼んでもhandlersリストには空のリストが追加される(defaultdictの特性)
         # しかし、actual handlerは存在しないことを確認
         assert len(self.event_bus._handlers[DummyEvent]) == 0
+
+
+class TestConcurrentEventBus:
+    def setup_method(self):
+        self.event_bus = EventBus(mode=DispatchMode.CONCURRENT, max_workers=4)
+
+    def teardown_method(self):
+        self.event_bus.shutdown()
+
+    def test_handlers_run_concurrently(self):
+        """ハンドラーが同時に実行される(お互いの完了を待つハンドラーでも終わる)"""
+        barrier = threading.Barrier(2, timeout=5)
+        handler1 = Mock(side_effect=lambda _: barrier.wait())
+        handler2 = Mock(side_effect=lambda _: barrier.wait())
+        self.event_bus.subscribe(DummyEvent, handler1)
+        self.event_bus.subscribe(DummyEvent, handler2)
+
+        result = self.event_bus.publish(DummyEvent("test data"))
+
+        assert result.ok
+        handler1.assert_called_once()
+        handler2.assert_called_once()
+
+    def test_errors_are_isolated_per_handler(self):
+        """1つのハンドラーが失敗しても他のハンドラーは実行され、例外は送出されない"""
+        handler1 = Mock(side_effect=Exception("Handler error"))
+        handler2 = Mock()
+        self.event_bus.subscribe(DummyEvent, handler1)
+        self.event_bus.subscribe(DummyEvent, handler2)
+
+        result = self.event_bus.publish(DummyEvent("test data"))
+
+        handler2.assert_called_once()
+        assert len(result.errors) == 1
+        assert str(next(iter(result.errors.values()))) == "Handler error"
+
+    def test_slow_handler_times_out(self):
+        """タイムアウトを過ぎたハンドラーは待たない"""
+        release = threading.Event()
+        self.event_bus.subscribe(DummyEvent, Mock(side_effect=lambda _: release.wait(5)), timeout=0.05)
+        fast_handler = Mock()
+        self.event_bus.subscribe(DummyEvent, fast_handler)
+
+        result = self.event_bus.publish(DummyEvent("test data"))
+        release.set()
+
+        assert len(result.timed_out) == 1
+        fast_handler.assert_called_once()
+
+    def test_background_handler_does_not_block_publish(self):
+        """background のハンドラーは完了を待たずに publish から戻る"""
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_handler(_event: DummyEvent) -> None:
+            release.wait(5)
+            finished.set()
+
+        self.event_bus.subscribe(DummyEvent, slow_handler, background=True)
+
+        result = self.event_bus.publish(DummyEvent("test data"))
+
+        assert result.ok
+        assert not finished.is_set()
+        release.set()
+        assert self.event_bus.wait_for_background(timeout=5)
+        assert finished.is_set()
+
+    def test_async_handler(self):
+        """コルーチン関数のハンドラーも実行される"""
+        received: list[str] = []
+
+        async def async_handler(event: DummyEvent) -> None:
+            await asyncio.sleep(0)
+            received.append(event.data)
+
+        self.event_bus.subscribe(DummyEvent, async_handler)
+
+        self.event_bus.publish(DummyEvent("test data"))
+
+        assert received == ["test data"]
+
+    def test_async_handler_is_cancelled_on_timeout(self):
+        """タイムアウトしたコルーチンはキャンセルされる"""
+        completed = threading.Event()
+
+        async def slow_handler(_event: DummyEvent) -> None:
+            await asyncio.sleep(5)
+            completed.set()
+
+        self.event_bus.subscribe(DummyEvent, slow_handler, timeout=0.05)
+
+        result = self.event_bus.publish(DummyEvent("test data"))
+
+        assert result.timed_out or result.errors
+        assert not completed.is_set()
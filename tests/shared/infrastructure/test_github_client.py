@@ -0,0 +1,189 @@
+import json
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from sandpiper.shared.infrastructure.github_client import API_URL, GitHubClient
+from sandpiper.shared.infrastructure.http_etag_cache import HttpEtagCache
+
+SINCE = datetime(2024, 3, 1, tzinfo=UTC)
+UNTIL = datetime(2024, 3, 2, tzinfo=UTC)
+
+
+def _response(status_code: int, body: Any = None, etag: str | None = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {"ETag": etag} if etag else {}
+    response.text = json.dumps(body)
+    response.json.return_value = body
+    return response
+
+
+def _search_item(number: int, repository: str, **fields: Any) -> dict[str, Any]:
+    return {"number": number, "title": f"#{number}", "repository_url": f"{API_URL}/repos/{repository}", **fields}
+
+
+def _commit(sha: str) -> dict[str, Any]:
+    return {"sha": sha, "commit": {"message": sha, "committer": {"date": "2024-03-01T10:00:00Z"}}}
+
+
+class FakeTransport:
+    """パスと検索クエリに含まれる語("パス 語" のキー)で応答を返すトランスポート"""
+
+    def __init__(self, routes: dict[str, Any]) -> None:
+        self.routes = routes
+        self.session = Mock()
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def get(self, url: str, params: dict[str, Any], **_: Any) -> Mock:
+        path = url.removeprefix(API_URL)
+        self.calls.append((path, params))
+        for key, body in self.routes.items():
+            route_path, _, term = key.partition(" ")
+            if route_path == path and term in params.get("q", ""):
+                return _response(200, body)
+        return _response(200, {"items": []} if path.startswith("/search/") else [])
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport(
+        {
+            "/users/me/repos": [
+                {"full_name": "me/pushed", "pushed_at": "2024-03-01T09:00:00Z"},
+                {"full_name": "me/stale", "pushed_at": "2024-01-01T00:00:00Z"},
+            ],
+            "/search/commits author:me committer-date:2024-03-01T00:00:00Z..2024-03-01T23:59:59Z": {
+                "items": [{**_commit("abc"), "repository": {"full_name": "org/other"}}]
+            },
+            "/repos/me/pushed/commits": [_commit("def")],
+            "/repos/org/other/commits": [_commit("abc")],
+        }
+    )
+
+
+class TestSearchActivity:
+    def test_collects_commits_from_pushed_and_searched_repositories(self, transport):
+        client = GitHubClient(token="token", transport=transport)
+
+        activity = client.search_activity("me", SINCE, UNTIL)
+
+        assert sorted((commit["repository"], commit["sha"]) for commit in activity.commits) == [
+            ("me/pushed", "def"),
+            ("org/other", "abc"),
+        ]
+        commit_paths = {path for path, _ in transport.calls if path.endswith("/commits")}
+        assert "/repos/me/stale/commits" not in commit_paths
+        params = dict(transport.calls[[path for path, _ in transport.calls].index("/repos/me/pushed/commits")][1])
+        assert params["since"] == "2024-03-01T00:00:00Z"
+        assert params["until"] == "2024-03-02T00:00:00Z"
+
+    def test_labels_pull_requests_and_issues_with_action(self):
+        transport = FakeTransport({})
+        original_get = transport.get
+
+        def get(url: str, params: dict[str, Any], **kwargs: Any) -> Mock:
+            query = params.get("q", "")
+            if "is:pr merged:" in query:
+                return _response(200, {"items": [_search_item(2, "me/app")]})
+            if "is:issue closed:" in query:
+                return _response(200, {"items": [_search_item(5, "me/app")]})
+            return original_get(url, params, **kwargs)
+
+        transport.get = get  # type: ignore[method-assign]
+        client = GitHubClient(token="token", transport=transport)
+
+        activity = client.search_activity("me", SINCE, UNTIL)
+
+        assert [(action, item["number"], item["repository"]) for action, item in activity.pull_requests] == [
+            ("merged", 2, "me/app")
+        ]
+        assert [(action, item["number"]) for action, item in activity.issues] == [("closed", 5)]
+
+    def test_reviews_are_filtered_by_user_and_period(self):
+        reviews = [
+            {"user": {"login": "me"}, "state": "APPROVED", "submitted_at": "2024-03-01T12:00:00Z"},
+            {"user": {"login": "me"}, "state": "COMMENTED", "submitted_at": "2024-02-28T12:00:00Z"},
+            {"user": {"login": "me"}, "state": "CHANGES_REQUESTED", "submitted_at": "2024-03-05T12:00:00Z"},
+            {"user": {"login": "someone"}, "state": "APPROVED", "submitted_at": "2024-03-01T12:00:00Z"},
+        ]
+        transport = FakeTransport(
+            {
+                "/search/issues reviewed-by:me": {"items": [_search_item(7, "org/app")]},
+                "/repos/org/app/pulls/7/reviews": reviews,
+            }
+        )
+        client = GitHubClient(token="token", transport=transport)
+
+        activity = client.search_activity("me", SINCE, UNTIL)
+
+        assert [(review["pull_number"], review["state"]) for review in activity.reviews] == [(7, "APPROVED")]
+
+    def test_reviewed_pull_requests_are_searched_without_upper_bound(self, transport):
+        client = GitHubClient(token="token", transport=transport)
+
+        client.search_activity("me", SINCE, UNTIL)
+
+        queries = [params["q"] for path, params in transport.calls if path == "/search/issues"]
+        reviewed = next(query for query in queries if query.startswith("reviewed-by:me"))
+        assert reviewed.endswith("updated:>=2024-03-01T00:00:00Z")
+
+    def test_paginates_until_short_page(self):
+        pages = {1: [_commit(f"a{i}") for i in range(100)], 2: [_commit("b")]}
+        transport = FakeTransport({"/users/me/repos": [{"full_name": "me/app", "pushed_at": "2024-03-01T09:00:00Z"}]})
+        original_get = transport.get
+
+        def get(url: str, params: dict[str, Any], **kwargs: Any) -> Mock:
+            if url.endswith("/repos/me/app/commits"):
+                transport.calls.append((url, params))
+                return _response(200, pages[params["page"]])
+            return original_get(url, params, **kwargs)
+
+        transport.get = get  # type: ignore[method-assign]
+        client = GitHubClient(token="token", transport=transport)
+
+        activity = client.search_activity("me", SINCE, UNTIL)
+
+        assert len(activity.commits) == 101
+
+
+class TestEtagCache:
+    def test_reuses_cached_body_on_not_modified(self, tmp_path):
+        cache = HttpEtagCache(tmp_path / "etag.sqlite3")
+        transport = Mock()
+        transport.get.side_effect = [_response(200, [{"full_name": "me/app"}], etag='"v1"'), _response(304)]
+        client = GitHubClient(token="token", transport=transport, etag_cache=cache)
+
+        first = client._get_json("/users/me/repos", {"page": 1})
+        second = client._get_json("/users/me/repos", {"page": 1})
+
+        assert first == second == [{"full_name": "me/app"}]
+        assert transport.get.call_args_list[0].kwargs["headers"] == {}
+        assert transport.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_sets_github_headers(self):
+        transport = Mock()
+
+        GitHubClient(token="token", transport=transport)
+
+        headers = transport.session.headers.update.call_args.args[0]
+        assert headers["Authorization"] == "Bearer token"
+        assert headers["Accept"] == "application/vnd.github+json"
+
+
+class TestFilterEventsByDate:
+    def test_stops_at_first_event_before_the_day(self):
+        def event(created_at: datetime) -> Mock:
+            return Mock(created_at=created_at)
+
+        newer = event(datetime(2024, 3, 2, 1, tzinfo=UTC))
+        inside = event(datetime(2024, 3, 1, 9, tzinfo=UTC))
+        older = event(datetime(2024, 2, 29, 23, tzinfo=UTC))
+        events = iter([newer, inside, older, event(datetime(2024, 2, 28, tzinfo=UTC))])
+        client = GitHubClient(token="token", transport=Mock())
+
+        assert client.filter_events_by_date(events, SINCE) == [inside]
+        # 対象日より古いイベントの後は読まない
+        assert len(list(events)) == 1
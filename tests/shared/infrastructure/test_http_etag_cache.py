@@ -0,0 +1,50 @@
+from sandpiper.shared.infrastructure.http_etag_cache import CachedResponse, HttpEtagCache
+
+URL = "https://api.github.com/users/octocat/repos?page=1"
+
+
+class TestHttpEtagCache:
+    def test_get_is_none_before_put(self, tmp_path):
+        cache = HttpEtagCache(tmp_path / "etag.sqlite3")
+
+        assert cache.get(URL) is None
+
+    def test_put_replaces_previous_response(self, tmp_path):
+        cache = HttpEtagCache(tmp_path / "etag.sqlite3")
+
+        cache.put(URL, '"v1"', "[]")
+        cache.put(URL, '"v2"', '[{"id": 1}]')
+
+        assert cache.get(URL) == CachedResponse(etag='"v2"', body='[{"id": 1}]')
+
+    def test_persists_across_instances(self, tmp_path):
+        HttpEtagCache(tmp_path / "etag.sqlite3").put(URL, '"v1"', "[]")
+
+        assert HttpEtagCache(tmp_path / "etag.sqlite3").get(URL) == CachedResponse(etag='"v1"', body="[]")
+
+    def test_does_not_create_file_until_used(self, tmp_path):
+        HttpEtagCache(tmp_path / "cache" / "etag.sqlite3")
+
+        assert not (tmp_path / "cache").exists()
+
+    def test_put_prunes_responses_older_than_max_age(self, tmp_path):
+        now = [0.0]
+        cache = HttpEtagCache(tmp_path / "etag.sqlite3", clock=lambda: now[0], max_age=100)
+        cache.put(URL, '"v1"', "[]")
+
+        now[0] = 150
+        cache.put("https://api.github.com/users/octocat/repos?page=2", '"v2"', "[]")
+
+        assert cache.get(URL) is None
+        assert cache.get("https://api.github.com/users/octocat/repos?page=2") is not None
+
+    def test_put_keeps_only_newest_max_entries(self, tmp_path):
+        now = [0.0]
+        cache = HttpEtagCache(tmp_path / "etag.sqlite3", clock=lambda: now[0], max_entries=2)
+        for page in (1, 2, 3):
+            now[0] = float(page)
+            cache.put(f"https://api.github.com/users/octocat/repos?page={page}", f'"v{page}"', "[]")
+
+        assert cache.get("https://api.github.com/users/octocat/repos?page=1") is None
+        assert cache.get("https://api.github.com/users/octocat/repos?page=2") is not None
+        assert cache.get("https://api.github.com/users/octocat/repos?page=3") is not None
@@ -0,0 +1,108 @@
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from sandpiper.shared.infrastructure.http_transport import HttpTransport
+
+URL = "https://jira.example.com/rest/api/3/issue/SU-1"
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def session():
+    return Mock()
+
+
+@pytest.fixture
+def sleep():
+    return Mock()
+
+
+@pytest.fixture
+def transport(session, sleep):
+    return HttpTransport(session=session, max_retries=3, backoff_seconds=0.5, sleep=sleep)
+
+
+class TestHttpTransport:
+    def test_sets_timeout_pool_and_gzip(self, session):
+        transport = HttpTransport(session=session, connect_timeout=3.0, read_timeout=10.0, pool_size=4)
+        session.get.return_value = _response(200)
+
+        transport.get(URL, params={"a": 1})
+
+        session.get.assert_called_once_with(URL, params={"a": 1}, timeout=(3.0, 10.0))
+        adapter = session.mount.call_args_list[0].args[1]
+        assert adapter._pool_maxsize == 4
+        session.headers.update.assert_called_once_with({"Accept-Encoding": "gzip, deflate"})
+
+    def test_gzip_can_be_disabled(self, session):
+        HttpTransport(session=session, gzip=False)
+
+        session.headers.update.assert_called_once_with({"Accept-Encoding": "identity"})
+
+    def test_retries_with_exponential_backoff(self, transport, session, sleep):
+        session.get.side_effect = [_response(503), _response(502), _response(200)]
+
+        response = transport.get(URL)
+
+        assert response.status_code == 200
+        assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+
+    def test_honors_retry_after(self, transport, session, sleep):
+        session.get.side_effect = [_response(429, {"Retry-After": "7"}), _response(200)]
+
+        transport.get(URL)
+
+        sleep.assert_called_once_with(7.0)
+
+    def test_caps_long_retry_after(self, transport, session, sleep):
+        session.get.side_effect = [_response(429, {"Retry-After": "3600"}), _response(200)]
+
+        transport.get(URL)
+
+        sleep.assert_called_once_with(60.0)
+
+    def test_returns_last_response_when_retries_exhausted(self, transport, session):
+        session.get.return_value = _response(500)
+
+        response = transport.get(URL)
+
+        assert response.status_code == 500
+        assert session.get.call_count == 4
+
+    def test_does_not_retry_client_errors(self, transport, session, sleep):
+        session.get.return_value = _response(404)
+
+        transport.get(URL)
+
+        assert session.get.call_count == 1
+        sleep.assert_not_called()
+
+    def test_retries_connection_errors_then_raises(self, transport, session):
+        session.get.side_effect = requests.ConnectTimeout("timed out")
+
+        with pytest.raises(requests.ConnectTimeout):
+            transport.get(URL)
+
+        assert session.get.call_count == 4
+
+    def test_records_metrics(self, session, sleep):
+        clock = Mock(side_effect=[10.0, 10.25])
+        transport = HttpTransport(session=session, clock=clock, sleep=sleep)
+        session.get.side_effect = [_response(503), _response(200)]
+
+        transport.get(URL)
+
+        (metric,) = transport.metrics()
+        assert metric.method == "GET"
+        assert metric.path == "/rest/api/3/issue/SU-1"
+        assert metric.status_code == 200
+        assert metric.elapsed_seconds == 0.25
+        assert metric.attempts == 2
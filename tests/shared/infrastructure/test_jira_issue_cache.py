@@ -0,0 +1,76 @@
+from sandpiper.shared.infrastructure.jira_issue_cache import JiraIssueCache
+
+FIELDS = "key,summary,updated"
+JQL = 'project = "SU" ORDER BY created DESC'
+
+
+def _issue(key: str, summary: str, updated: str = "2024-01-01T10:00:00.000+0000") -> dict:
+    return {"key": key, "fields": {"summary": summary, "updated": updated}}
+
+
+class TestJiraIssueCache:
+    def test_search_is_none_before_first_sync(self, tmp_path):
+        cache = JiraIssueCache(tmp_path / "jira.sqlite3")
+
+        assert cache.search(JQL, FIELDS) is None
+
+    def test_replace_search(self, tmp_path):
+        cache = JiraIssueCache(tmp_path / "jira.sqlite3")
+
+        cache.replace_search(JQL, FIELDS, [_issue("SU-2", "B"), _issue("SU-1", "A")], complete=True, synced_at=10.0)
+
+        search = cache.search(JQL, FIELDS)
+        assert search is not None
+        assert search.issue_keys == ["SU-2", "SU-1"]
+        assert search.complete is True
+        assert search.synced_at == search.full_synced_at == 10.0
+        assert [issue["fields"]["summary"] for issue in cache.issues(JQL, FIELDS)] == ["B", "A"]
+
+    def test_merge_search_updates_changed_and_removes_left_issues(self, tmp_path):
+        cache = JiraIssueCache(tmp_path / "jira.sqlite3")
+        cache.replace_search(JQL, FIELDS, [_issue("SU-1", "A"), _issue("SU-2", "B")], complete=True, synced_at=10.0)
+
+        cache.merge_search(
+            JQL,
+            FIELDS,
+            [_issue("SU-1", "A(更新)", updated="2024-01-02T10:00:00.000+0000"), _issue("SU-3", "C")],
+            removed_keys=["SU-2"],
+            synced_at=20.0,
+        )
+
+        search = cache.search(JQL, FIELDS)
+        assert search is not None
+        assert search.issue_keys == ["SU-1", "SU-3"]
+        assert (search.synced_at, search.full_synced_at) == (20.0, 10.0)
+        assert [issue["fields"]["summary"] for issue in cache.issues(JQL, FIELDS)] == ["A(更新)", "C"]
+
+    def test_merge_search_without_updated_field_rewrites_issues(self, tmp_path):
+        """updated を問い合わせていない検索でも、取り直したチケットの内容で書き換える"""
+        cache = JiraIssueCache(tmp_path / "jira.sqlite3")
+        fields = "key,status"
+        cache.replace_search(
+            JQL, fields, [{"key": "SU-1", "fields": {"status": {"name": "To Do"}}}], complete=True, synced_at=10.0
+        )
+
+        cache.merge_search(
+            JQL, fields, [{"key": "SU-1", "fields": {"status": {"name": "Done"}}}], removed_keys=[], synced_at=20.0
+        )
+
+        assert [issue["fields"]["status"]["name"] for issue in cache.issues(JQL, fields)] == ["Done"]
+
+    def test_searches_are_separated_by_fields(self, tmp_path):
+        cache = JiraIssueCache(tmp_path / "jira.sqlite3")
+
+        cache.replace_search(JQL, FIELDS, [_issue("SU-1", "A")], complete=True, synced_at=10.0)
+
+        assert cache.search(JQL, "key") is None
+
+    def test_cache_survives_reopen(self, tmp_path):
+        path = tmp_path / "jira.sqlite3"
+        JiraIssueCache(path).replace_search(JQL, FIELDS, [_issue("SU-1", "A")], complete=False, synced_at=10.0)
+
+        search = JiraIssueCache(path).search(JQL, FIELDS)
+
+        assert search is not None
+        assert search.issue_keys == ["SU-1"]
+        assert search.complete is False
@@ -0,0 +1,141 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from lotion import BasePage
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
+
+from sandpiper.shared.infrastructure.notion_database_iterator import iter_database, retrieve_page
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
+
+
+def _page_entity(page_id: str) -> dict:
+    return {
+        "object": "page",
+        "id": page_id,
+        "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        "created_time": "2024-01-01T00:00:00.000Z",
+        "last_edited_time": "2024-01-01T00:00:00.000Z",
+        "created_by": {"object": "user", "id": "user"},
+        "last_edited_by": {"object": "user", "id": "user"},
+        "cover": None,
+        "icon": None,
+        "archived": False,
+        "properties": {},
+    }
+
+
+def _bad_gateway() -> APIResponseError:
+    return APIResponseError(
+        code="bad_gateway", status=502, message="error", headers=httpx.Headers({}), raw_body_text=""
+    )
+
+
+PAGE_1 = "11111111-1111-1111-1111-111111111111"
+PAGE_2 = "22222222-2222-2222-2222-222222222222"
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def rate_limiter() -> NotionRateLimiter:
+    return NotionRateLimiter(rate=1000, capacity=1000, sleep=lambda _: None)
+
+
+class TestIterDatabase:
+    def test_yields_pages_across_responses(self, client, rate_limiter):
+        client.client.request.side_effect = [
+            {"results": [_page_entity(PAGE_1)], "has_more": True, "next_cursor": "cursor-1"},
+            {"results": [_page_entity(PAGE_2)], "has_more": False},
+        ]
+
+        pages = list(
+            iter_database("db", filter_param={"property": "x"}, page_size=1, client=client, rate_limiter=rate_limiter)
+        )
+
+        assert [page.id for page in pages] == [PAGE_1, PAGE_2]
+        assert all(isinstance(page, BasePage) for page in pages)
+        second = client.client.request.call_args_list[1].kwargs
+        assert second["path"] == "databases/db/query"
+        assert second["body"] == {"page_size": 1, "filter": {"property": "x"}, "start_cursor": "cursor-1"}
+
+    def test_sorts_are_sent_in_body(self, client, rate_limiter):
+        client.client.request.return_value = {"results": [], "has_more": False}
+        sorts = [{"property": "実施期間", "direction": "ascending"}]
+
+        list(iter_database("db", sorts=sorts, client=client, rate_limiter=rate_limiter))
+
+        assert client.client.request.call_args.kwargs["body"] == {"page_size": 100, "sorts": sorts}
+
+    def test_next_response_is_requested_only_when_consumed(self, client, rate_limiter):
+        client.client.request.side_effect = [
+            {"results": [_page_entity(PAGE_1)], "has_more": True, "next_cursor": "cursor-1"},
+            {"results": [_page_entity(PAGE_2)], "has_more": False},
+        ]
+
+        pages = iter_database("db", client=client, rate_limiter=rate_limiter)
+        first = next(pages)
+
+        assert first.id == PAGE_1
+        assert client.client.request.call_count == 1
+
+    def test_rate_limited_request_is_retried(self, client, rate_limiter):
+        rate_limited = APIResponseError(
+            code="rate_limited",
+            status=429,
+            message="error",
+            headers=httpx.Headers({"Retry-After": "1"}),
+            raw_body_text="",
+        )
+        client.client.request.side_effect = [rate_limited, {"results": [_page_entity(PAGE_1)], "has_more": False}]
+
+        pages = list(iter_database("db", client=client, rate_limiter=rate_limiter))
+
+        assert [page.id for page in pages] == [PAGE_1]
+
+    def test_bad_gateway_is_retried(self, client, rate_limiter):
+        client.client.request.side_effect = [
+            _bad_gateway(),
+            {"results": [_page_entity(PAGE_1)], "has_more": False},
+        ]
+
+        pages = list(iter_database("db", client=client, rate_limiter=rate_limiter))
+
+        assert [page.id for page in pages] == [PAGE_1]
+
+    def test_error_is_raised_as_notion_api_error(self, client, rate_limiter):
+        client.client.request.side_effect = APIResponseError(
+            code="object_not_found", status=404, message="error", headers=httpx.Headers({}), raw_body_text=""
+        )
+
+        with pytest.raises(NotionApiError):
+            list(iter_database("db", client=client, rate_limiter=rate_limiter))
+
+
+class TestRetrievePage:
+    def test_retrieves_page_without_blocks(self, client, rate_limiter):
+        client.client.request.return_value = _page_entity(PAGE_1)
+
+        page = retrieve_page(PAGE_1, client=client, rate_limiter=rate_limiter)
+
+        assert page.id == PAGE_1
+        client.client.request.assert_called_once_with(method="GET", path=f"pages/{PAGE_1}")
+
+    def test_bad_gateway_is_retried(self, client, rate_limiter):
+        client.client.request.side_effect = [_bad_gateway(), _page_entity(PAGE_1)]
+
+        page = retrieve_page(PAGE_1, client=client, rate_limiter=rate_limiter)
+
+        assert page.id == PAGE_1
+
+    def test_error_is_raised_as_notion_api_error(self, client, rate_limiter):
+        client.client.request.side_effect = APIResponseError(
+            code="object_not_found", status=404, message="error", headers=httpx.Headers({}), raw_body_text=""
+        )
+
+        with pytest.raises(NotionApiError):
+            retrieve_page(PAGE_1, client=client, rate_limiter=rate_limiter)
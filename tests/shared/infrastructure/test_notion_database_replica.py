@@ -0,0 +1,243 @@
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from lotion import BasePage, Lotion
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
+
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica, is_page_gone_error
+
+DATABASE_ID = "2db6567a3bbf805ba379f942cdf0e264"
+PAGE_A = "11111111111111111111111111111111"
+PAGE_B = "22222222222222222222222222222222"
+
+
+def _entity(page_id: str, title: str, last_edited_time: str, archived: bool = False) -> dict:
+    return {
+        "id": page_id,
+        "url": f"https://www.notion.so/{page_id}",
+        "created_time": "2024-01-01T00:00:00.000Z",
+        "last_edited_time": last_edited_time,
+        "created_by": {"object": "user", "id": "user-id"},
+        "last_edited_by": {"object": "user", "id": "user-id"},
+        "cover": None,
+        "icon": None,
+        "archived": archived,
+        "properties": {
+            "名前": {
+                "id": "title",
+                "type": "title",
+                "title": [
+                    {"type": "text", "text": {"content": title}, "annotations": {}, "plain_text": title, "href": None}
+                ],
+            }
+        },
+    }
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client():
+    return Mock(spec=Lotion)
+
+
+@pytest.fixture
+def query():
+    with patch("sandpiper.shared.infrastructure.notion_database_replica.iter_database_entities") as mock:
+        yield mock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def replica(tmp_path, client, clock):
+    return NotionDatabaseReplica(tmp_path / "replica.sqlite3", client=client, full_sync_interval=3600, clock=clock)
+
+
+class TestNotionDatabaseReplica:
+    def test_first_read_is_full_sync(self, query, replica, client):
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+
+        pages = replica.retrieve_database(DATABASE_ID)
+
+        query.assert_called_once_with(DATABASE_ID, filter_param=None, client=client)
+        assert [page.get_title_text() for page in pages] == ["A"]
+        assert isinstance(pages[0], BasePage)
+
+    def test_next_read_queries_only_pages_edited_after_watermark(self, query, replica, client, clock):
+        query.return_value = [
+            _entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z"),
+            _entity(PAGE_B, "B", "2024-01-01T11:00:00.000Z"),
+        ]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 60
+        query.return_value = [_entity(PAGE_A, "A(更新)", "2024-01-01T12:00:00.000Z")]
+        pages = replica.retrieve_database(DATABASE_ID)
+
+        query.assert_called_with(
+            DATABASE_ID,
+            client=client,
+            filter_param={
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": "2024-01-01T11:00:00.000Z"},
+            },
+        )
+        assert sorted(page.get_title_text() for page in pages) == ["A(更新)", "B"]
+
+    def test_archived_page_in_delta_is_removed(self, query, replica, clock):
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 60
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T12:00:00.000Z", archived=True)]
+
+        assert replica.retrieve_database(DATABASE_ID) == []
+
+    def test_full_sync_detects_deleted_pages(self, query, replica, client, clock):
+        query.return_value = [
+            _entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z"),
+            _entity(PAGE_B, "B", "2024-01-01T10:00:00.000Z"),
+        ]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 3600
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        result = replica.refresh(DATABASE_ID)
+
+        assert result.full is True
+        assert result.removed_count == 1
+        query.assert_called_with(DATABASE_ID, filter_param=None, client=client)
+
+    def test_min_refresh_interval_skips_query(self, query, tmp_path, client, clock):
+        replica = NotionDatabaseReplica(
+            tmp_path / "replica.sqlite3", client=client, min_refresh_interval=10, clock=clock
+        )
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 5
+        replica.retrieve_database(DATABASE_ID)
+
+        assert query.call_count == 1
+
+    def test_replica_survives_reopen(self, query, tmp_path, client, clock):
+        path = tmp_path / "replica.sqlite3"
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        NotionDatabaseReplica(path, client=client, clock=clock).retrieve_database(DATABASE_ID)
+
+        clock.now = 60
+        query.return_value = []
+        pages = NotionDatabaseReplica(path, client=client, clock=clock).retrieve_database(DATABASE_ID)
+
+        # 再起動後も差分だけを問い合わせ、保存済みのページを返す
+        assert query.call_args.kwargs["filter_param"] is not None
+        assert [page.get_title_text() for page in pages] == ["A"]
+
+    def test_retrieve_without_refresh_reads_only_local_pages(self, query, replica, clock):
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 60
+        pages = replica.retrieve_database(DATABASE_ID, refresh=False)
+
+        assert query.call_count == 1
+        assert [page.get_title_text() for page in pages] == ["A"]
+
+    def test_remove_page(self, query, replica, clock):
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        replica.retrieve_database(DATABASE_ID)
+
+        replica.remove_page(DATABASE_ID, "11111111-1111-1111-1111-111111111111")
+        clock.now = 60
+        query.return_value = []
+
+        assert replica.retrieve_database(DATABASE_ID) == []
+
+    def test_changes_since_returns_only_changed_and_deleted_pages(self, query, replica, clock):
+        query.return_value = [
+            _entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z"),
+            _entity(PAGE_B, "B", "2024-01-01T10:00:00.000Z"),
+        ]
+        first = replica.changes_since(DATABASE_ID, 0)
+        assert sorted(page.get_title_text() for page in first.pages) == ["A", "B"]
+
+        clock.now = 60
+        query.return_value = [
+            _entity(PAGE_A, "A(更新)", "2024-01-01T12:00:00.000Z"),
+            _entity(PAGE_B, "B", "2024-01-01T12:00:00.000Z", archived=True),
+        ]
+        second = replica.changes_since(DATABASE_ID, first.generation)
+
+        assert second.generation > first.generation
+        assert [page.get_title_text() for page in second.pages] == ["A(更新)"]
+        assert second.deleted_page_ids == ["22222222-2222-2222-2222-222222222222"]
+
+    def test_changes_since_ignores_refetched_unchanged_pages(self, query, replica, clock):
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        first = replica.changes_since(DATABASE_ID, 0)
+
+        # ウォーターマークと同時刻のページは取り直されるが、内容が同じなら変更にならない
+        clock.now = 60
+        second = replica.changes_since(DATABASE_ID, first.generation)
+
+        assert second.generation == first.generation
+        assert second.pages == []
+        assert second.deleted_page_ids == []
+
+    def test_full_sync_interval_per_database(self, tmp_path, query, client, clock):
+        replica = NotionDatabaseReplica(
+            tmp_path / "replica.sqlite3",
+            client=client,
+            full_sync_interval=3600,
+            full_sync_intervals={"2db6567a-3bbf-805b-a379-f942cdf0e264": 600},
+            clock=clock,
+        )
+        query.return_value = [_entity(PAGE_A, "A", "2024-01-01T10:00:00.000Z")]
+        replica.retrieve_database(DATABASE_ID)
+
+        clock.now = 600
+        result = replica.refresh(DATABASE_ID)
+
+        assert result.full is True
+
+
+def _api_error(status: int, message: str) -> NotionApiError:
+    response_error = APIResponseError(
+        code="error", status=status, message=message, headers=httpx.Headers({}), raw_body_text=""
+    )
+    return NotionApiError(page_id=PAGE_A, e=response_error)
+
+
+class TestIsPageGoneError:
+    @pytest.mark.parametrize(
+        ("status", "message", "expected"),
+        [
+            (404, "Could not find page with ID", True),
+            (400, "Can't edit block that is archived. You must unarchive the block before editing.", True),
+            (400, "body failed validation", False),
+            (429, "rate limited", False),
+        ],
+    )
+    def test_is_page_gone_error(self, status, message, expected):
+        assert is_page_gone_error(_api_error(status, message)) is expected
+
+
+class TestHasSynced:
+    def test_has_synced_after_first_refresh(self, replica, query):
+        query.return_value = []
+
+        assert replica.has_synced(DATABASE_ID) is False
+        replica.refresh(DATABASE_ID)
+        assert replica.has_synced(DATABASE_ID) is True
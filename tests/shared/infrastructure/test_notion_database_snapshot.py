@@ -0,0 +1,172 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from unittest.mock import MagicMock, patch
+
+import pytest
+from lotion import BasePage
+
+from sandpiper.perform.infrastructure.notion_todo_repository import TodoPage
+from sandpiper.shared.infrastructure.notion_database_snapshot import NotionDatabaseSnapshot
+from sandpiper.shared.notion.databases.todo import TodoIsTodayProp, TodoName
+
+
+def _page(page_id: str, title: str = "タスク") -> BasePage:
+    page = BasePage.create(properties=[TodoName.from_plain_text(title), TodoIsTodayProp.false()])
+    page.update_id_and_url(page_id, f"https://www.notion.so/{page_id}")
+    return page
+
+
+class TestNotionDatabaseSnapshot:
+    @pytest.fixture
+    def mock_lotion(self):
+        with patch("sandpiper.shared.infrastructure.notion_database_snapshot.Lotion") as mock:
+            mock_instance = MagicMock()
+            mock.get_instance.return_value = mock_instance
+            yield mock_instance
+
+    def test_inactive_snapshot_always_queries_notion(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = []
+        snapshot = NotionDatabaseSnapshot()
+
+        snapshot.retrieve_database("db1")
+        snapshot.retrieve_database("db1")
+
+        assert snapshot.is_active is False
+        assert mock_lotion.retrieve_database.call_count == 2
+
+    def test_active_snapshot_fetches_each_database_once(self, mock_lotion):
+        mock_lotion.retrieve_database.side_effect = lambda database_id: [_page(database_id * 16)]
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            first = snapshot.retrieve_database("a1")
+            second = snapshot.retrieve_database("a1")
+            other = snapshot.retrieve_database("b2")
+
+        assert [p.id for p in first] == [p.id for p in second]
+        assert len(other) == 1
+        assert mock_lotion.retrieve_database.call_count == 2
+
+    def test_snapshot_is_discarded_after_activation(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = []
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            snapshot.retrieve_database("db1")
+        assert snapshot.is_active is False
+
+        with snapshot.activate():
+            snapshot.retrieve_database("db1")
+
+        assert mock_lotion.retrieve_database.call_count == 2
+
+    def test_put_adds_created_page(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = [_page("11111111111111111111111111111111")]
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            snapshot.retrieve_database("db1")
+            snapshot.put("db1", _page("22222222222222222222222222222222", "新規"))
+            titles = [p.get_title_text() for p in snapshot.retrieve_database("db1")]
+
+        assert titles == ["タスク", "新規"]
+
+    def test_put_is_ignored_for_unloaded_database(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = []
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            snapshot.put("db1", _page("22222222222222222222222222222222", "新規"))
+            pages = snapshot.retrieve_database("db1")
+
+        # 未取得のデータベースは初回参照時にNotionから取得する(作成済みページも含まれる)
+        assert pages == []
+        mock_lotion.retrieve_database.assert_called_once_with("db1")
+
+    def test_update_properties_is_reflected(self, mock_lotion):
+        page_id = "11111111111111111111111111111111"
+        mock_lotion.retrieve_database.return_value = [_page(page_id)]
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            snapshot.retrieve_database("db1")
+            snapshot.update_properties("db1", page_id, [TodoIsTodayProp.true()])
+            page = snapshot.retrieve_database("db1")[0]
+
+        assert page.get_checkbox("今日中にやる").checked is True
+
+    def test_remove_drops_page(self, mock_lotion):
+        page_id = "11111111111111111111111111111111"
+        mock_lotion.retrieve_database.return_value = [_page(page_id)]
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            snapshot.retrieve_database("db1")
+            snapshot.remove("db1", page_id)
+            pages = snapshot.retrieve_database("db1")
+
+        assert pages == []
+
+    def test_retrieve_database_casts_to_requested_page_class(self, mock_lotion):
+        mock_lotion.retrieve_database.return_value = [_page("11111111111111111111111111111111", "キャスト")]
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate():
+            pages = snapshot.retrieve_database("db1", cls=TodoPage)
+
+        assert isinstance(pages[0], TodoPage)
+        assert pages[0].get_title_text() == "キャスト"
+
+
+class TestConcurrentRetrieve:
+    @pytest.fixture
+    def mock_lotion(self):
+        with patch("sandpiper.shared.infrastructure.notion_database_snapshot.Lotion") as mock:
+            mock_instance = MagicMock()
+            mock.get_instance.return_value = mock_instance
+            yield mock_instance
+
+    def test_concurrent_callers_wait_for_the_first_fetch(self, mock_lotion):
+        started = threading.Event()
+        release = threading.Event()
+
+        def retrieve_database(_database_id):
+            started.set()
+            release.wait(timeout=5)
+            return [_page("a1" * 16)]
+
+        mock_lotion.retrieve_database.side_effect = retrieve_database
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate(), ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(copy_context().run, snapshot.retrieve_database, "db1")
+            started.wait(timeout=5)
+            others = [executor.submit(copy_context().run, snapshot.retrieve_database, "db1") for _ in range(2)]
+            release.set()
+            results = [first.result(), *(future.result() for future in others)]
+
+        assert mock_lotion.retrieve_database.call_count == 1
+        assert all(len(pages) == 1 for pages in results)
+
+    def test_waiters_see_the_fetch_error(self, mock_lotion):
+        started = threading.Event()
+        release = threading.Event()
+
+        def retrieve_database(_database_id):
+            started.set()
+            release.wait(timeout=5)
+            raise RuntimeError("notion down")
+
+        mock_lotion.retrieve_database.side_effect = retrieve_database
+        snapshot = NotionDatabaseSnapshot()
+
+        with snapshot.activate(), ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(copy_context().run, snapshot.retrieve_database, "db1")
+            started.wait(timeout=5)
+            waiter = executor.submit(copy_context().run, snapshot.retrieve_database, "db1")
+            release.set()
+            with pytest.raises(RuntimeError):
+                first.result()
+            with pytest.raises(RuntimeError):
+                waiter.result()
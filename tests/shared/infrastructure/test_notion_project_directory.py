@@ -0,0 +1,82 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from lotion import BasePage
+
+from sandpiper.shared.infrastructure.notion_database_replica import NotionDatabaseReplica, ReplicaChanges
+from sandpiper.shared.infrastructure.notion_project_directory import NotionProjectDirectory
+from sandpiper.shared.notion.databases import project as project_db
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _page(page_id: str) -> Mock:
+    page = Mock(spec=BasePage)
+    page.id = page_id
+    return page
+
+
+@pytest.fixture
+def replica():
+    replica = Mock(spec=NotionDatabaseReplica)
+    replica.changes_since.return_value = ReplicaChanges(
+        generation=1, pages=[_page("p1"), _page("p2")], deleted_page_ids=[]
+    )
+    return replica
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def directory(replica, clock):
+    return NotionProjectDirectory(replica=replica, ttl_seconds=60, clock=clock)
+
+
+class TestNotionProjectDirectory:
+    def test_pages_are_keyed_by_page_id(self, directory, replica):
+        pages = directory.pages()
+
+        assert list(pages) == ["p1", "p2"]
+        replica.changes_since.assert_called_once_with(project_db.DATABASE_ID, 0)
+
+    def test_replica_changes_are_applied_on_every_read(self, directory, replica):
+        directory.pages()
+        replica.changes_since.return_value = ReplicaChanges(generation=2, pages=[_page("p3")], deleted_page_ids=["p1"])
+
+        pages = directory.pages()
+
+        assert list(pages) == ["p2", "p3"]
+        replica.changes_since.assert_called_with(project_db.DATABASE_ID, 1)
+
+    def test_invalidate_forces_reload(self, directory, replica):
+        directory.pages()
+        replica.changes_since.return_value = ReplicaChanges(generation=2, pages=[_page("p3")], deleted_page_ids=[])
+
+        directory.invalidate()
+
+        assert list(directory.pages()) == ["p3"]
+        replica.changes_since.assert_called_with(project_db.DATABASE_ID, 0)
+
+    def test_pages_without_replica_are_cached_until_ttl_expires(self, clock):
+        client = Mock()
+        client.retrieve_database.return_value = [_page("p1")]
+        with patch("sandpiper.shared.infrastructure.notion_project_directory.Lotion.get_instance", return_value=client):
+            directory = NotionProjectDirectory(ttl_seconds=60, clock=clock)
+
+        directory.pages()
+        clock.now = 59
+        directory.pages()
+        assert client.retrieve_database.call_count == 1
+
+        clock.now = 60
+        directory.pages()
+        assert client.retrieve_database.call_count == 2
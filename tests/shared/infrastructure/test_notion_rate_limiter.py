@@ -0,0 +1,141 @@
+import httpx
+import pytest
+from lotion.lotion import NotionApiError
+from notion_client.errors import APIResponseError
+
+from sandpiper.shared.infrastructure.notion_rate_limiter import NotionRateLimiter
+
+
+class FakeClock:
+    """sleepした分だけ時間が進むテスト用の時計"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _api_error(status: int, headers: dict[str, str] | None = None, database_id: str | None = None) -> NotionApiError:
+    response_error = APIResponseError(
+        code="rate_limited",
+        status=status,
+        message="error",
+        headers=httpx.Headers(headers or {}),
+        raw_body_text="",
+    )
+    return NotionApiError(database_id=database_id, e=response_error)
+
+
+class TestNotionRateLimiter:
+    def test_acquire_within_capacity_does_not_wait(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=3, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+    def test_acquire_waits_for_refill_when_bucket_is_empty(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=3, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(6):
+            limiter.acquire()
+
+        # 最初の3件はバースト、残り3件は1/3秒ずつ待つ
+        assert clock.now == pytest.approx(1.0)
+
+    def test_acquire_cost_larger_than_capacity_is_capped(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=3, capacity=3, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire(10)
+
+        assert clock.sleeps == []
+
+    def test_call_retries_rate_limited_request_after_retry_after(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=100, capacity=100, clock=clock, sleep=clock.sleep)
+        results = iter([_api_error(429, {"Retry-After": "2"}), "created"])
+
+        def func() -> str:
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert limiter.call(func) == "created"
+        assert clock.sleeps == [2.0]
+
+    def test_call_does_not_retry_other_errors(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(clock=clock, sleep=clock.sleep)
+        calls: list[int] = []
+
+        def func() -> None:
+            calls.append(1)
+            raise _api_error(400)
+
+        with pytest.raises(NotionApiError):
+            limiter.call(func)
+        assert len(calls) == 1
+
+    def test_call_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=100, capacity=100, max_retries=2, clock=clock, sleep=clock.sleep)
+        calls: list[int] = []
+
+        def func() -> None:
+            calls.append(1)
+            raise _api_error(429)
+
+        with pytest.raises(NotionApiError):
+            limiter.call(func)
+        assert len(calls) == 3
+
+    def test_call_respects_should_retry(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(clock=clock, sleep=clock.sleep)
+        calls: list[int] = []
+
+        def func() -> None:
+            calls.append(1)
+            raise _api_error(429, {"Retry-After": "1"})
+
+        with pytest.raises(NotionApiError):
+            limiter.call(func, should_retry=lambda e: e.database_id is not None)
+        assert len(calls) == 1
+
+    def test_call_retries_server_errors_with_backoff_when_enabled(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(rate=100, capacity=100, clock=clock, sleep=clock.sleep)
+        results = iter([_api_error(502), _api_error(503), "found"])
+
+        def func() -> str:
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert limiter.call(func, retry_server_errors=True) == "found"
+        assert clock.sleeps == [1.0, 2.0]
+
+    def test_call_does_not_retry_server_errors_by_default(self):
+        clock = FakeClock()
+        limiter = NotionRateLimiter(clock=clock, sleep=clock.sleep)
+        calls: list[int] = []
+
+        def func() -> None:
+            calls.append(1)
+            raise _api_error(502)
+
+        with pytest.raises(NotionApiError):
+            limiter.call(func)
+        assert len(calls) == 1
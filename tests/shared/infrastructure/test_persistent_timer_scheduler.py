@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from sandpiper.shared.infrastructure.persistent_timer_scheduler import PersistentTimerScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def fired() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def scheduler(tmp_path, clock, fired) -> PersistentTimerScheduler:
+    return PersistentTimerScheduler(tmp_path / "timers.sqlite3", handler=fired.append, clock=clock)
+
+
+class TestPersistentTimerScheduler:
+    def test_fires_due_timers_in_order(self, scheduler, clock, fired):
+        scheduler.schedule("b", fire_at=1020.0, payload="second")
+        scheduler.schedule("a", fire_at=1010.0, payload="first")
+        scheduler.schedule("c", fire_at=1030.0, payload="third")
+
+        clock.now = 1020.0
+        assert scheduler.run_due() == 2
+
+        assert fired == ["first", "second"]
+        assert scheduler.pending_count() == 1
+
+    def test_reschedule_replaces_timer(self, scheduler, clock, fired):
+        scheduler.schedule("a", fire_at=1010.0, payload="old")
+        scheduler.schedule("a", fire_at=1050.0, payload="new")
+
+        clock.now = 1010.0
+        assert scheduler.run_due() == 0
+        clock.now = 1050.0
+        scheduler.run_due()
+
+        assert fired == ["new"]
+
+    def test_cancel(self, scheduler, clock, fired):
+        scheduler.schedule("a", fire_at=1010.0, payload="cancelled")
+
+        assert scheduler.cancel("a") is True
+        assert scheduler.cancel("a") is False
+
+        clock.now = 2000.0
+        scheduler.run_due()
+        assert fired == []
+        assert scheduler.pending_count() == 0
+
+    def test_timers_survive_restart(self, tmp_path, clock, fired):
+        path = tmp_path / "timers.sqlite3"
+        first = PersistentTimerScheduler(path, handler=fired.append, clock=clock)
+        first.schedule("a", fire_at=1010.0, payload="persisted")
+        first.stop()
+
+        restarted = PersistentTimerScheduler(path, handler=fired.append, clock=clock)
+        assert restarted.pending_count() == 1
+        clock.now = 1010.0
+        restarted.run_due()
+
+        assert fired == ["persisted"]
+
+    def test_timer_fires_only_once_across_processes(self, tmp_path, clock, fired):
+        path = tmp_path / "timers.sqlite3"
+        scheduler = PersistentTimerScheduler(path, handler=fired.append, clock=clock)
+        other = PersistentTimerScheduler(path, handler=fired.append, clock=clock)
+        scheduler.schedule("a", fire_at=1010.0, payload="once")
+        other.run_due()  # 別プロセスがディスクから読み込んだ状態
+
+        clock.now = 1010.0
+        other.run_due()
+        scheduler.run_due()
+
+        assert fired == ["once"]
+
+    def test_handler_error_does_not_stop_other_timers(self, tmp_path, clock):
+        fired: list[str] = []
+
+        def handler(payload: str) -> None:
+            if payload == "broken":
+                raise RuntimeError("boom")
+            fired.append(payload)
+
+        scheduler = PersistentTimerScheduler(tmp_path / "timers.sqlite3", handler=handler, clock=clock)
+        scheduler.schedule("a", fire_at=1000.0, payload="broken")
+        scheduler.schedule("b", fire_at=1000.0, payload="ok")
+
+        assert scheduler.run_due() == 2
+        assert fired == ["ok"]
+
+    def test_started_scheduler_fires_on_background_thread(self, tmp_path):
+        done = threading.Event()
+        scheduler = PersistentTimerScheduler(tmp_path / "timers.sqlite3", handler=lambda _: done.set())
+        scheduler.start()
+        try:
+            scheduler.schedule("a", fire_at=time.time() + 0.05, payload="fired")
+            assert done.wait(timeout=5)
+        finally:
+            scheduler.stop()
@@ -0,0 +1,192 @@
+import threading
+
+import pytest
+
+from sandpiper.shared.infrastructure.sqlite_job_queue import (
+    JobStatus,
+    JobWorkerPool,
+    NonRetryableJobError,
+    SqliteJobQueue,
+)
+
+PAGE_A = "page-a"
+PAGE_B = "page-b"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock) -> SqliteJobQueue:
+    return SqliteJobQueue(tmp_path / "jobs.sqlite3", max_attempts=3, backoff_base_seconds=2.0, clock=clock)
+
+
+class TestSqliteJobQueue:
+    def test_enqueue_and_claim(self, queue):
+        job = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+
+        claimed = queue.claim()
+
+        assert claimed is not None
+        assert claimed.id == job.id
+        assert claimed.status == JobStatus.RUNNING
+        assert claimed.attempts == 1
+        assert queue.claim() is None
+
+    def test_jobs_for_same_page_run_one_at_a_time_in_order(self, queue):
+        first = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        second = queue.enqueue(kind="complete_todo", page_id=PAGE_A)
+        other = queue.enqueue(kind="start_todo", page_id=PAGE_B)
+
+        assert queue.claim().id == first.id
+        # PAGE_A は実行中なので別ページのジョブだけが取り出せる
+        assert queue.claim().id == other.id
+        assert queue.claim() is None
+
+        queue.mark_succeeded(first.id)
+        assert queue.claim().id == second.id
+
+    def test_failed_job_is_retried_with_exponential_backoff(self, queue, clock):
+        job = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+
+        queue.claim()
+        failed = queue.mark_failed(job.id, "boom")
+        assert failed.status == JobStatus.PENDING
+        assert failed.next_run_at == clock.now + 2.0
+        assert queue.claim() is None
+
+        clock.now += 2.0
+        queue.claim()
+        failed = queue.mark_failed(job.id, "boom")
+        assert failed.next_run_at == clock.now + 4.0
+
+        clock.now += 4.0
+        queue.claim()
+        failed = queue.mark_failed(job.id, "boom")
+        assert failed.status == JobStatus.FAILED
+        assert failed.attempts == 3
+        assert failed.last_error == "boom"
+
+    def test_retry_waits_block_later_jobs_of_same_page(self, queue):
+        first = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        queue.enqueue(kind="complete_todo", page_id=PAGE_A)
+
+        queue.claim()
+        queue.mark_failed(first.id, "boom")
+
+        # 先行ジョブの再試行待ちの間は後続ジョブを追い越さない
+        assert queue.claim() is None
+
+    def test_non_retryable_failure(self, queue):
+        job = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        queue.claim()
+
+        failed = queue.mark_failed(job.id, "invalid", retryable=False)
+
+        assert failed.status == JobStatus.FAILED
+        assert failed.attempts == 1
+
+    def test_jobs_survive_reopen_and_running_jobs_are_recovered(self, tmp_path, clock):
+        path = tmp_path / "jobs.sqlite3"
+        queue = SqliteJobQueue(path, clock=clock)
+        job = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        queue.claim()
+        queue.close()
+
+        reopened = SqliteJobQueue(path, clock=clock)
+        assert reopened.recover_running() == 1
+        claimed = reopened.claim()
+        assert claimed is not None
+        assert claimed.id == job.id
+        assert claimed.attempts == 2
+
+    def test_list_jobs_and_counts(self, queue):
+        first = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        second = queue.enqueue(kind="start_todo", page_id=PAGE_B)
+        queue.claim()
+        queue.mark_succeeded(first.id)
+
+        assert [job.id for job in queue.list_jobs()] == [second.id, first.id]
+        assert [job.id for job in queue.list_jobs(status=JobStatus.SUCCEEDED)] == [first.id]
+        assert queue.count_by_status() == {"pending": 1, "running": 0, "succeeded": 1, "failed": 0}
+
+    def test_finished_jobs_are_pruned_by_age(self, tmp_path, clock):
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3", clock=clock, finished_max_age=60)
+        old = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        queue.claim()
+        queue.mark_succeeded(old.id)
+        waiting = queue.enqueue(kind="start_todo", page_id=PAGE_B)
+
+        clock.now += 61
+        recent = queue.enqueue(kind="start_todo", page_id=PAGE_A)
+        queue.claim()
+        queue.mark_failed(recent.id, "invalid", retryable=False)
+
+        assert queue.find(old.id) is None
+        assert queue.find(recent.id) is not None
+        # 実行待ちのジョブは古くても残す
+        assert queue.find(waiting.id) is not None
+
+    def test_finished_jobs_are_pruned_by_count(self, tmp_path, clock):
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3", clock=clock, finished_max_entries=2)
+        jobs = [queue.enqueue(kind="start_todo", page_id=f"page-{i}") for i in range(3)]
+        for job in jobs:
+            queue.claim()
+            queue.mark_succeeded(job.id)
+            clock.now += 1
+
+        assert [job.id for job in queue.list_jobs()] == [jobs[2].id, jobs[1].id]
+
+
+class TestJobWorkerPool:
+    def test_run_pending_executes_handlers(self, queue):
+        executed: list[str] = []
+        pool = JobWorkerPool(queue, handlers={"start_todo": executed.append})
+        job = pool.submit(kind="start_todo", page_id=PAGE_A)
+
+        assert pool.run_pending() == 1
+
+        assert executed == [PAGE_A]
+        assert queue.find(job.id).status == JobStatus.SUCCEEDED
+
+    def test_errors_are_recorded(self, queue):
+        def fail(_page_id: str) -> None:
+            raise RuntimeError("boom")
+
+        def reject(_page_id: str) -> None:
+            raise NonRetryableJobError("invalid")
+
+        pool = JobWorkerPool(queue, handlers={"fail": fail, "reject": reject})
+        retried = pool.submit(kind="fail", page_id=PAGE_A)
+        rejected = pool.submit(kind="reject", page_id=PAGE_B)
+        unknown = pool.submit(kind="unknown", page_id="page-c")
+
+        pool.run_pending()
+
+        assert queue.find(retried.id).status == JobStatus.PENDING
+        assert queue.find(retried.id).last_error == "boom"
+        assert queue.find(rejected.id).status == JobStatus.FAILED
+        assert queue.find(unknown.id).status == JobStatus.FAILED
+
+    def test_worker_threads_process_submitted_jobs(self, tmp_path):
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+        done = threading.Event()
+        pool = JobWorkerPool(queue, handlers={"start_todo": lambda _: done.set()}, workers=2, poll_interval=0.05)
+        pool.start()
+        try:
+            job = pool.submit(kind="start_todo", page_id=PAGE_A)
+            assert done.wait(timeout=5)
+        finally:
+            pool.stop()
+
+        assert queue.find(job.id).status == JobStatus.SUCCEEDED
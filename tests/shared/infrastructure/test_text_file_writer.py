@@ -0,0 +1,40 @@
+from sandpiper.shared.infrastructure.text_file_writer import write_files, write_if_changed
+
+
+class TestWriteIfChanged:
+    def test_creates_file_and_parent_directories(self, tmp_path):
+        path = tmp_path / "2024" / "01" / "15" / "donelist.md"
+
+        assert write_if_changed(path, "- タスク\n") is True
+        assert path.read_text(encoding="utf-8") == "- タスク\n"
+
+    def test_skips_unchanged_content(self, tmp_path):
+        path = tmp_path / "donelist.md"
+        path.write_text("- タスク\n", encoding="utf-8")
+        mtime = path.stat().st_mtime_ns
+
+        assert write_if_changed(path, "- タスク\n") is False
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_overwrites_changed_content(self, tmp_path):
+        path = tmp_path / "donelist.md"
+        path.write_text("- 古いタスク\n", encoding="utf-8")
+
+        assert write_if_changed(path, "- 新しいタスク\n") is True
+        assert path.read_text(encoding="utf-8") == "- 新しいタスク\n"
+
+
+class TestWriteFiles:
+    def test_reports_written_files(self, tmp_path):
+        unchanged = tmp_path / "a.md"
+        unchanged.write_text("same\n", encoding="utf-8")
+        changed = tmp_path / "b.md"
+        new = tmp_path / "c" / "c.md"
+
+        result = write_files({unchanged: "same\n", changed: "changed\n", new: ""}, max_workers=2)
+
+        assert result == {unchanged: False, changed: True, new: True}
+        assert new.read_text(encoding="utf-8") == ""
+
+    def test_empty_mapping(self):
+        assert write_files({}) == {}
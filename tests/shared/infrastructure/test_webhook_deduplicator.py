@@ -0,0 +1,50 @@
+from sandpiper.shared.infrastructure.webhook_deduplicator import WebhookDeduplicator
+
+EDITED_AT = "2024-01-01T00:00:00.000Z"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestWebhookDeduplicator:
+    def test_same_delivery_within_ttl_is_duplicate(self):
+        deduplicator = WebhookDeduplicator(ttl_seconds=60)
+
+        assert deduplicator.is_duplicate("page", "start_todo", EDITED_AT) is False
+        assert deduplicator.is_duplicate("page", "start_todo", EDITED_AT) is True
+
+        stats = deduplicator.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    def test_key_includes_endpoint_and_last_edited_time(self):
+        deduplicator = WebhookDeduplicator(ttl_seconds=60)
+
+        assert deduplicator.is_duplicate("page", "start_todo", EDITED_AT) is False
+        assert deduplicator.is_duplicate("page", "complete_todo", EDITED_AT) is False
+        assert deduplicator.is_duplicate("page", "start_todo", "2024-01-01T00:01:00.000Z") is False
+        assert deduplicator.is_duplicate("other", "start_todo", EDITED_AT) is False
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        deduplicator = WebhookDeduplicator(ttl_seconds=60, clock=clock)
+        deduplicator.is_duplicate("page", "start_todo", EDITED_AT)
+
+        clock.now = 60.0
+
+        assert deduplicator.stats().size == 0
+        assert deduplicator.is_duplicate("page", "start_todo", EDITED_AT) is False
+
+    def test_cache_is_bounded(self):
+        deduplicator = WebhookDeduplicator(ttl_seconds=60, max_entries=2)
+        for page_id in ("a", "b", "c"):
+            deduplicator.is_duplicate(page_id, "start_todo", EDITED_AT)
+
+        assert deduplicator.stats().size == 2
+        # 最も古いキーから捨てられる
+        assert deduplicator.is_duplicate("a", "start_todo", EDITED_AT) is False
+        assert deduplicator.is_duplicate("c", "start_todo", EDITED_AT) is True
@@ -0,0 +1,38 @@
+from lotion import BasePage
+
+from sandpiper.perform.infrastructure.notion_todo_repository import TodoPage
+from sandpiper.shared.notion.page_cast import cast_page
+
+
+def _page() -> BasePage:
+    return BasePage.from_data(
+        data={
+            "id": "11111111111111111111111111111111",
+            "url": "https://www.notion.so/11111111111111111111111111111111",
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": "2024-01-01T00:00:00.000Z",
+            "created_by": {"object": "user", "id": "user-id"},
+            "last_edited_by": {"object": "user", "id": "user-id"},
+            "cover": None,
+            "icon": None,
+            "archived": False,
+            "properties": {},
+        },
+        block_children=[],
+    )
+
+
+class TestCastPage:
+    def test_returns_same_page_when_already_target_class(self):
+        page = _page()
+
+        assert cast_page(page, BasePage) is page
+
+    def test_copies_fields_into_target_class(self):
+        page = _page()
+
+        cast = cast_page(page, TodoPage)
+
+        assert isinstance(cast, TodoPage)
+        assert cast.id == page.id
+        assert cast.properties is page.properties
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from sandpiper.access_log import AccessLogMiddleware
+
+
+def _create_app(logs: list[str], **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_endpoint() -> JSONResponse:
+        return JSONResponse(content={"message": "こんにちは"})
+
+    @app.get("/stream")
+    async def stream_endpoint() -> StreamingResponse:
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i}-".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/error")
+    async def error_endpoint() -> None:
+        raise RuntimeError("boom")
+
+    app.add_middleware(AccessLogMiddleware, log=logs.append, **kwargs)
+    return app
+
+
+class TestAccessLogMiddleware:
+    def test_logs_method_path_status_bytes_and_latency(self):
+        logs: list[str] = []
+        client = TestClient(_create_app(logs))
+
+        response = client.get("/json")
+
+        record = json.loads(logs[0])
+        assert record["method"] == "GET"
+        assert record["path"] == "/json"
+        assert record["status"] == 200
+        assert record["bytes"] == len(response.content)
+        assert record["duration_ms"] >= 0
+        assert "body" not in record
+
+    def test_streaming_response_is_passed_through(self):
+        logs: list[str] = []
+        client = TestClient(_create_app(logs))
+
+        response = client.get("/stream")
+
+        assert response.text == "chunk0-chunk1-chunk2-"
+        assert json.loads(logs[0])["bytes"] == len("chunk0-chunk1-chunk2-")
+
+    def test_body_capture_is_size_capped(self):
+        logs: list[str] = []
+        client = TestClient(_create_app(logs, capture_body=True, body_limit=10))
+
+        response = client.get("/stream")
+
+        record = json.loads(logs[0])
+        assert response.text == "chunk0-chunk1-chunk2-"
+        assert record["body"] == "chunk0-chu"
+        assert record["body_truncated"] is True
+
+    def test_exception_is_logged_as_500(self):
+        logs: list[str] = []
+        client = TestClient(_create_app(logs))
+
+        with pytest.raises(RuntimeError):
+            client.get("/error")
+
+        assert json.loads(logs[0])["status"] == 500
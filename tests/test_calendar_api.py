@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi import FastAPI
@@ -18,6 +18,9 @@ def mock_sandpiper_app():
     mock_create_calendar_event = Mock()
     mock_delete_calendar_events = Mock()
     mock_archive_deleted_pages = Mock()
+    # 作成・アーカイブのルートは非同期版のユースケースを await する
+    mock_create_calendar_event.execute_async = AsyncMock()
+    mock_archive_deleted_pages.execute_async = AsyncMock()
     mock_app.create_calendar_event = mock_create_calendar_event
     mock_app.delete_calendar_events = mock_delete_calendar_events
     mock_app.archive_deleted_pages = mock_archive_deleted_pages
@@ -56,7 +59,7 @@ class TestCalendarAPI:
             start_datetime=start_time,
             end_datetime=end_time,
         )
-        mock_sandpiper_app.create_calendar_event.execute.return_value = expected_inserted_event
+        mock_sandpiper_app.create_calendar_event.execute_async.return_value = expected_inserted_event
 
         request_data = {
             "name": "重要な会議",
@@ -79,7 +82,7 @@ class TestCalendarAPI:
         assert response_data["end_datetime"] == end_time.isoformat()
 
         # サービスが正しく呼び出されたことを確認
-        mock_sandpiper_app.create_calendar_event.execute.assert_called_once()
+        mock_sandpiper_app.create_calendar_event.execute_async.assert_called_once()
 
     @pytest.mark.parametrize("category", ["仕事", "プライベート", "TJPW"])
     def test_create_calendar_event_different_categories(self, test_app, mock_sandpiper_app, category):
@@ -96,7 +99,7 @@ class TestCalendarAPI:
             start_datetime=start_time,
             end_datetime=end_time,
         )
-        mock_sandpiper_app.create_calendar_event.execute.return_value = expected_inserted_event
+        mock_sandpiper_app.create_calendar_event.execute_async.return_value = expected_inserted_event
 
         request_data = {
             "name": "テストイベント",
@@ -209,7 +212,7 @@ class TestArchiveAPI:
     def test_archive_deleted_pages_success(self, test_app, mock_sandpiper_app):
         """論理削除されたページのアーカイブAPIが正常に動作することをテスト"""
         # Arrange
-        mock_sandpiper_app.archive_deleted_pages.execute.return_value = ArchiveDeletedPagesResult(
+        mock_sandpiper_app.archive_deleted_pages.execute_async.return_value = ArchiveDeletedPagesResult(
             deleted_counts={"db1": 3, "db2": 2},
         )
 
@@ -225,12 +228,25 @@ class TestArchiveAPI:
         assert response_data["total_deleted_count"] == 5
 
         # サービスが正しく呼び出されたことを確認
-        mock_sandpiper_app.archive_deleted_pages.execute.assert_called_once()
+        mock_sandpiper_app.archive_deleted_pages.execute_async.assert_called_once_with(dry_run=False)
+
+    def test_archive_deleted_pages_dry_run(self, test_app, mock_sandpiper_app):
+        """dry_run を指定すると削除せずに件数だけを返すことをテスト"""
+        mock_sandpiper_app.archive_deleted_pages.execute_async.return_value = ArchiveDeletedPagesResult(
+            deleted_counts={"db1": 1},
+        )
+
+        with TestClient(test_app) as client:
+            response = client.post("/api/notion/archive", params={"dry_run": "true"})
+
+        assert response.status_code == 200
+        assert response.json()["total_deleted_count"] == 1
+        mock_sandpiper_app.archive_deleted_pages.execute_async.assert_called_once_with(dry_run=True)
 
     def test_archive_deleted_pages_with_no_deleted_pages(self, test_app, mock_sandpiper_app):
         """削除対象がない場合のAPIレスポンスをテスト"""
         # Arrange
-        mock_sandpiper_app.archive_deleted_pages.execute.return_value = ArchiveDeletedPagesResult(
+        mock_sandpiper_app.archive_deleted_pages.execute_async.return_value = ArchiveDeletedPagesResult(
             deleted_counts={"db1": 0, "db2": 0},
         )
 
@@ -0,0 +1,92 @@
+"""export-donelist CLIコマンドのテスト"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+VAULT = Path("Library/Mobile Documents/iCloud~md~obsidian/Documents/my-vault/dailynote")
+
+
+@patch.dict("os.environ", {"GITHUB_TOKEN": "test_token", "NOTION_SECRET": "test_NOTION_SECRET"})
+def get_runner_and_app():
+    """テスト用のrunnerとappを取得する"""
+    modules_to_remove = [key for key in sys.modules if key.startswith("sandpiper")]
+    for module in modules_to_remove:
+        del sys.modules[module]
+
+    with patch("sandpiper.app.app.bootstrap") as mock_bootstrap:
+        mock_app = MagicMock()
+        mock_bootstrap.return_value = mock_app
+
+        from sandpiper.main import app
+
+        return CliRunner(), app, mock_app
+
+
+def _todo(title: str, start: datetime, end: datetime):
+    # sandpiper のモジュールはテストごとに読み込み直すので、読み込み後のクラスで作る
+    from sandpiper.review.query.activity_log_item import ActivityLogItem, ActivityType
+
+    return ActivityLogItem(
+        activity_type=ActivityType.TODO, title=title, start_datetime=start, end_datetime=end, kind="単発"
+    )
+
+
+class TestExportDonelistCommand:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        self.runner, self.app, self.mock_sandpiper_app = get_runner_and_app()
+        self.home = tmp_path
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        with patch("sandpiper.main.SlackNoticeMessanger"):
+            yield
+
+    def _donelist(self, day: str) -> Path:
+        return self.home / VAULT / day / "donelist.md"
+
+    def test_range_writes_items_per_day(self):
+        """期間の項目を日ごとのファイルに振り分け、書き込み・変更なし・スキップの日数を表示する"""
+        self.mock_sandpiper_app.get_todo_log.execute_between.return_value = [
+            _todo("朝のタスク", datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 0)),
+            _todo("夜のタスク", datetime(2024, 1, 15, 21, 0), datetime(2024, 1, 15, 22, 0)),
+            _todo("翌日のタスク", datetime(2024, 1, 17, 9, 0), datetime(2024, 1, 17, 9, 30)),
+        ]
+        # 1/17 は出力済みで内容が同じ
+        unchanged = self._donelist("2024/01/17")
+        unchanged.parent.mkdir(parents=True)
+        unchanged.write_text("- 【TODO 単発】翌日のタスク (09:00 - 09:30)\n", encoding="utf-8")
+
+        result = self.runner.invoke(self.app, ["export-donelist", "--from", "2024-01-15", "--to", "2024-01-17"])
+
+        assert result.exit_code == 0, result.stdout
+        assert self._donelist("2024/01/15").read_text(encoding="utf-8") == (
+            "- 【TODO 単発】朝のタスク (09:00 - 10:00)\n- 【TODO 単発】夜のタスク (21:00 - 22:00)\n"
+        )
+        assert "3日分 3件を出力(書き込み 1日、変更なし 1日、空のためスキップ 1日)" in result.stdout
+        self.mock_sandpiper_app.get_todo_log.execute_between.assert_called_once()
+
+    def test_range_does_not_create_empty_days(self):
+        """項目のない日は、ファイルもディレクトリも作らない"""
+        self.mock_sandpiper_app.get_todo_log.execute_between.return_value = []
+
+        result = self.runner.invoke(self.app, ["export-donelist", "--from", "2024-01-15", "--to", "2024-01-16"])
+
+        assert result.exit_code == 0, result.stdout
+        assert not (self.home / "Library").exists()
+
+    def test_range_clears_existing_file_for_empty_day(self):
+        """出力済みの日の項目がなくなった場合は、空の内容で書き直す"""
+        self.mock_sandpiper_app.get_todo_log.execute_between.return_value = []
+        existing = self._donelist("2024/01/15")
+        existing.parent.mkdir(parents=True)
+        existing.write_text("- 古いタスク\n", encoding="utf-8")
+
+        result = self.runner.invoke(self.app, ["export-donelist", "--from", "2024-01-15", "--to", "2024-01-15"])
+
+        assert result.exit_code == 0, result.stdout
+        assert existing.read_text(encoding="utf-8") == ""
+        assert "書き込み 1日" in result.stdout
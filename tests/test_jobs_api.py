@@ -0,0 +1,124 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from sandpiper.routers import jobs, notion
+from sandpiper.routers.dependency.deps import get_job_worker_pool, get_sandpiper_app, get_webhook_deduplicator
+from sandpiper.shared.infrastructure.sqlite_job_queue import JobStatus, JobWorkerPool, SqliteJobQueue
+from sandpiper.shared.infrastructure.webhook_deduplicator import WebhookDeduplicator
+
+PAGE_ID = "1f5b6e5a-4c6d-8066-a6b6-e8c3a1d4a0b1"
+
+
+def _webhook_payload(last_edited_time: str = "2024-01-01T00:00:00.000Z") -> dict:
+    return {
+        "source": {},
+        "data": {
+            "id": PAGE_ID,
+            "object": "page",
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": last_edited_time,
+            "created_by": {"object": "user", "id": "user-id"},
+            "last_edited_by": {"object": "user", "id": "user-id"},
+            "cover": None,
+            "icon": None,
+            "parent": {"type": "database_id", "database_id": "database-id"},
+            "archived": False,
+            "properties": {},
+            "url": "https://www.notion.so/test",
+        },
+    }
+
+
+@pytest.fixture
+def mock_sandpiper_app():
+    mock_app = Mock()
+    mock_app.task_end_scheduler = None
+    return mock_app
+
+
+@pytest.fixture
+def job_worker_pool(tmp_path, mock_sandpiper_app):
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    return JobWorkerPool(queue, handlers=notion.build_webhook_job_handlers(mock_sandpiper_app))
+
+
+@pytest.fixture
+def webhook_deduplicator():
+    return WebhookDeduplicator()
+
+
+@pytest.fixture
+def client(mock_sandpiper_app, job_worker_pool, webhook_deduplicator):
+    app = FastAPI()
+    app.dependency_overrides[get_sandpiper_app] = lambda: mock_sandpiper_app
+    app.dependency_overrides[get_job_worker_pool] = lambda: job_worker_pool
+    app.dependency_overrides[get_webhook_deduplicator] = lambda: webhook_deduplicator
+    app.include_router(notion.router, prefix="/api")
+    app.include_router(jobs.router, prefix="/api")
+    return TestClient(app)
+
+
+class TestWebhookJobs:
+    def test_webhook_enqueues_job(self, client, job_worker_pool, mock_sandpiper_app):
+        response = client.post("/api/notion/todo/start", json=_webhook_payload())
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "accepted"
+        assert body["page_id"] == PAGE_ID
+        # ワーカーが実行するまではユースケースは呼ばれない
+        mock_sandpiper_app.start_todo.execute.assert_not_called()
+
+        job_worker_pool.run_pending()
+
+        mock_sandpiper_app.start_todo.execute.assert_called_once_with(page_id=PAGE_ID)
+        assert job_worker_pool.queue.find(body["job_id"]).status == JobStatus.SUCCEEDED
+
+    def test_special_todo_without_handler_is_not_retried(self, client, job_worker_pool, mock_sandpiper_app):
+        mock_sandpiper_app.handle_special_todo.execute.return_value = Mock(success=False, message="not found")
+
+        job_id = client.post("/api/notion/todo/special", json=_webhook_payload()).json()["job_id"]
+        job_worker_pool.run_pending()
+
+        assert job_worker_pool.queue.find(job_id).status == JobStatus.FAILED
+
+    def test_duplicate_delivery_is_dropped(self, client, job_worker_pool, mock_sandpiper_app):
+        first = client.post("/api/notion/todo/start", json=_webhook_payload()).json()
+        duplicate = client.post("/api/notion/todo/start", json=_webhook_payload()).json()
+
+        assert first["status"] == "accepted"
+        assert duplicate["status"] == "duplicate"
+        assert duplicate["job_id"] is None
+        job_worker_pool.run_pending()
+        mock_sandpiper_app.start_todo.execute.assert_called_once_with(page_id=PAGE_ID)
+
+    def test_same_page_other_endpoint_is_not_duplicate(self, client):
+        assert client.post("/api/notion/todo/start", json=_webhook_payload()).json()["status"] == "accepted"
+        assert client.post("/api/notion/todo/complete", json=_webhook_payload()).json()["status"] == "accepted"
+
+    def test_pending_job_is_coalesced_when_page_was_edited_again(self, client):
+        first = client.post("/api/notion/todo/start", json=_webhook_payload()).json()
+        edited = client.post("/api/notion/todo/start", json=_webhook_payload("2024-01-01T00:01:00.000Z")).json()
+
+        # 実行前の同じジョブがあるので新しいジョブは作らない
+        assert edited["status"] == "accepted"
+        assert edited["job_id"] == first["job_id"]
+
+    def test_list_and_get_jobs(self, client):
+        job_id = client.post("/api/notion/todo/complete", json=_webhook_payload()).json()["job_id"]
+
+        listed = client.get("/api/jobs").json()
+        assert listed["counts"]["pending"] == 1
+        assert [job["id"] for job in listed["jobs"]] == [job_id]
+        assert listed["deduplication"] == {"hits": 0, "misses": 1, "size": 1}
+        assert listed["timers"] == {"task_end_pending": 0}
+        assert client.get("/api/jobs", params={"status": "failed"}).json()["jobs"] == []
+
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["kind"] == notion.JOB_COMPLETE_TODO
+        assert job["status"] == "pending"
+
+        assert client.get("/api/jobs/999").status_code == 404